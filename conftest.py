@@ -44,6 +44,20 @@ def _pin_test_shell_env(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("SHELL", "/bin/sh")
 
 
+@pytest.fixture(autouse=True, scope="session")
+def _isolate_config_cache(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> t.Iterator[None]:
+    """Keep the parsed-config cache out of the contributor's ``~/.cache``.
+
+    Session-scoped, so it is in place before module-scoped fixtures read
+    workspace files, and before the per-test ``HOME`` patch.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("xdg-cache")))
+        yield
+
+
 @pytest.fixture(autouse=USING_ZSH, scope="session")
 def zshrc(user_path: pathlib.Path) -> pathlib.Path | None:
     """Quiets ZSH default message.
@@ -114,7 +128,14 @@ def socket_name(request: pytest.FixtureRequest) -> str:
 
 # Modules that actually need tmux fixtures in their doctests
 DOCTEST_NEEDS_TMUX = {
+    "tmuxp.workspace.builder.accounting",
+    "tmuxp.workspace.builder.aio",
+    "tmuxp.workspace.builder.batch",
     "tmuxp.workspace.builder.classic",
+    "tmuxp.workspace.builder.control",
+    "tmuxp.workspace.builder.pool",
+    "tmuxp.workspace.builder.protocol",
+    "tmuxp.workspace.builder.readiness",
 }
 
 
@@ -0,0 +1,371 @@
+"""On-disk cache of parsed workspace files.
+
+Parsing YAML with :class:`yaml.SafeLoader` takes tens of milliseconds for a
+large workspace, and ``tmuxp ls --full`` or ``tmuxp search`` parse every file
+in the workspace directory. :class:`ConfigCache` keeps each file's parsed
+content in :mod:`marshal` form under ``$XDG_CACHE_HOME/tmuxp/config`` (or
+``~/.cache/tmuxp/config``), stamped with the file's path, modification time and
+size, the tmuxp version and the Python that wrote it; any difference is a miss,
+and the file is parsed again.
+
+A file modified in the last :data:`RACY_SECONDS` is not cached, since a second
+change within the file system's timestamp resolution could keep its size and
+modification time. Content :mod:`marshal` cannot store, such as YAML dates, is
+not cached either. Entries are evicted, least recently used first, once the
+cache holds more than :data:`CACHE_SIZE_LIMIT` bytes. Set
+``TMUXP_CONFIG_CACHE=0`` to turn the cache off.
+
+Examples
+--------
+>>> import os, pathlib
+>>> cache = ConfigCache(tmp_path / "cache")
+>>> workspace = tmp_path / "workspace.yaml"
+>>> _ = workspace.write_text("session_name: cached", encoding="utf-8")
+>>> os.utime(workspace, (0, 0))
+>>> cache.get(workspace, workspace.stat()) is None
+True
+>>> cache.put(workspace, workspace.stat(), {"session_name": "cached"})
+>>> cache.get(workspace, workspace.stat())
+{'session_name': 'cached'}
+
+Changing the file misses:
+
+>>> _ = workspace.write_text("session_name: changed", encoding="utf-8")
+>>> cache.get(workspace, workspace.stat()) is None
+True
+
+:class:`WorkspaceCache` goes one step further for ``tmuxp load``, keeping the
+workspace as :func:`~tmuxp.workspace.loader.expand` and
+:func:`~tmuxp.workspace.loader.trickle` left it, under
+``$XDG_CACHE_HOME/tmuxp/workspace``. Its entries are keyed by the file's
+content and directory, and hold what the expansion read from outside the file:
+environment variables, home directories, the current directory and resolved
+paths. An entry is used only while each of those still reads the same.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import marshal
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import typing as t
+
+from tmuxp.__about__ import __version__
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    WorkspaceRead: t.TypeAlias = tuple[str, str, str | None]
+
+logger = logging.getLogger(__name__)
+
+CACHE_SIZE_LIMIT = 8 * 1024 * 1024
+"""bytes of cache entries kept before the least recently used are evicted"""
+
+RACY_SECONDS = 2.0
+"""files modified more recently than this are parsed, not cached"""
+
+_ENTRY_FORMAT = 1
+_ENTRY_SUFFIX = ".marshal"
+# marshal's format is only stable within one Python version.
+_INTERPRETER = (marshal.version, sys.implementation.cache_tag)
+
+
+def get_cache_dir(name: str = "config") -> pathlib.Path:
+    """Return the directory a cache of workspace files is kept in.
+
+    Parameters
+    ----------
+    name : str
+        ``config`` for parsed files, ``workspace`` for expanded workspaces
+
+    Examples
+    --------
+    >>> monkeypatch.setenv("XDG_CACHE_HOME", "/tmp/xdg-cache")
+    >>> get_cache_dir()
+    PosixPath('/tmp/xdg-cache/tmuxp/config')
+    >>> get_cache_dir("workspace")
+    PosixPath('/tmp/xdg-cache/tmuxp/workspace')
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")  # NOQA: PTH111
+    return pathlib.Path(base) / "tmuxp" / name
+
+
+def cache_enabled() -> bool:
+    """Return ``False`` when ``TMUXP_CONFIG_CACHE=0`` turns the cache off.
+
+    Examples
+    --------
+    >>> monkeypatch.setenv("TMUXP_CONFIG_CACHE", "0")
+    >>> cache_enabled()
+    False
+    """
+    return os.getenv("TMUXP_CONFIG_CACHE", "1") != "0"
+
+
+class _MarshalCache:
+    """Entries in :mod:`marshal` form, evicted least recently used first.
+
+    Parameters
+    ----------
+    directory : :class:`pathlib.Path`
+        where entries are stored
+    size_limit : int
+        bytes of entries kept; see :data:`CACHE_SIZE_LIMIT`
+    """
+
+    def __init__(self, directory: pathlib.Path, size_limit: int) -> None:
+        self.directory = directory
+        self.size_limit = size_limit
+
+    def _read(self, entry: pathlib.Path) -> t.Any:
+        """Return what ``entry`` holds, or ``None`` if it cannot be read."""
+        try:
+            data = marshal.loads(entry.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        # Mark the entry as recently used.
+        with contextlib.suppress(OSError):
+            os.utime(entry)
+        return data
+
+    def _write(self, entry: pathlib.Path, data: t.Any, path: pathlib.Path) -> None:
+        """Store ``data`` in ``entry`` for ``path``, if it can be."""
+        try:
+            raw = marshal.dumps(data)
+        except ValueError:
+            logger.debug(
+                "config not cacheable",
+                extra={"tmux_config_path": str(path)},
+            )
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            tmp_path = pathlib.Path(tmp_name)
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    tmp.write(raw)
+                tmp_path.replace(entry)
+            except OSError:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            self._evict()
+        except OSError:
+            logger.debug(
+                "config cache not written",
+                extra={"tmux_config_path": str(path)},
+            )
+
+    def _entries(self) -> Iterator[tuple[float, int, pathlib.Path]]:
+        """Yield each entry's last use, size and path."""
+        for entry in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            with contextlib.suppress(OSError):
+                stat = entry.stat()
+                yield stat.st_mtime, stat.st_size, entry
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries beyond :attr:`size_limit`."""
+        entries = sorted(self._entries(), reverse=True)
+        total = 0
+        for _used, size, entry in entries:
+            total += size
+            if total > self.size_limit:
+                with contextlib.suppress(OSError):
+                    entry.unlink()
+
+
+class ConfigCache(_MarshalCache):
+    """Parsed workspace files, keyed by path, modification time and size.
+
+    Parameters
+    ----------
+    directory : :class:`pathlib.Path`, optional
+        where entries are stored; defaults to :func:`get_cache_dir`
+    size_limit : int
+        bytes of entries kept; see :data:`CACHE_SIZE_LIMIT`
+    """
+
+    def __init__(
+        self,
+        directory: pathlib.Path | None = None,
+        size_limit: int = CACHE_SIZE_LIMIT,
+    ) -> None:
+        super().__init__(
+            directory if directory is not None else get_cache_dir(),
+            size_limit,
+        )
+
+    def _entry(self, path: pathlib.Path) -> pathlib.Path:
+        """Return the file caching ``path``."""
+        key = hashlib.sha256(
+            repr((_INTERPRETER, os.path.abspath(path))).encode(),  # NOQA: PTH100
+        ).hexdigest()
+        return self.directory / f"{key[:32]}{_ENTRY_SUFFIX}"
+
+    @staticmethod
+    def _stamp(path: pathlib.Path, stat: os.stat_result) -> tuple[t.Any, ...]:
+        """Return what an entry must match to stand for ``path``."""
+        return (
+            _ENTRY_FORMAT,
+            __version__,
+            _INTERPRETER,
+            os.path.abspath(path),  # NOQA: PTH100
+            stat.st_mtime_ns,
+            stat.st_size,
+        )
+
+    def get(
+        self,
+        path: pathlib.Path,
+        stat: os.stat_result,
+    ) -> dict[str, t.Any] | None:
+        """Return the parsed content of ``path``, or ``None`` on a miss.
+
+        Parameters
+        ----------
+        path : :class:`pathlib.Path`
+            workspace file
+        stat : :class:`os.stat_result`
+            ``path``'s current status
+        """
+        try:
+            stamp, content = self._read(self._entry(path))
+        except (TypeError, ValueError):
+            return None
+        if stamp != self._stamp(path, stat) or not isinstance(content, dict):
+            return None
+        return content
+
+    def put(
+        self,
+        path: pathlib.Path,
+        stat: os.stat_result,
+        content: dict[str, t.Any],
+    ) -> None:
+        """Cache the parsed ``content`` of ``path``, if it can be.
+
+        Parameters
+        ----------
+        path : :class:`pathlib.Path`
+            workspace file
+        stat : :class:`os.stat_result`
+            ``path``'s status when it was read
+        content : dict
+            what ``path`` parsed to
+        """
+        if time.time() - stat.st_mtime < RACY_SECONDS:
+            return
+        self._write(self._entry(path), (self._stamp(path, stat), content), path)
+
+
+class WorkspaceCache(_MarshalCache):
+    """Expanded workspaces, keyed by content and what the expansion read.
+
+    Parameters
+    ----------
+    directory : :class:`pathlib.Path`, optional
+        where entries are stored; defaults to ``get_cache_dir("workspace")``
+    size_limit : int
+        bytes of entries kept; see :data:`CACHE_SIZE_LIMIT`
+
+    Examples
+    --------
+    >>> cache = WorkspaceCache(tmp_path / "cache")
+    >>> workspace = tmp_path / "workspace.yaml"
+    >>> content = b"session_name: $USER"
+    >>> reads = [("env", "USER", "alice")]
+    >>> cache.put(workspace, content, reads, {"session_name": "alice"})
+
+    An entry is used while each read still gives the same value:
+
+    >>> cache.get(workspace, content, lambda kind, key: "alice")
+    {'session_name': 'alice'}
+    >>> cache.get(workspace, content, lambda kind, key: "bob") is None
+    True
+    """
+
+    def __init__(
+        self,
+        directory: pathlib.Path | None = None,
+        size_limit: int = CACHE_SIZE_LIMIT,
+    ) -> None:
+        super().__init__(
+            directory if directory is not None else get_cache_dir("workspace"),
+            size_limit,
+        )
+
+    def _entry(self, stamp: tuple[t.Any, ...]) -> pathlib.Path:
+        """Return the file caching the workspace ``stamp`` stands for."""
+        key = hashlib.sha256(repr(stamp).encode()).hexdigest()
+        return self.directory / f"{key[:32]}{_ENTRY_SUFFIX}"
+
+    @staticmethod
+    def _stamp(path: pathlib.Path, content: bytes) -> tuple[t.Any, ...]:
+        """Return what an entry must match to stand for ``content``."""
+        return (
+            _ENTRY_FORMAT,
+            __version__,
+            _INTERPRETER,
+            path.suffix,
+            os.path.dirname(path),  # NOQA: PTH120
+            hashlib.sha256(content).hexdigest(),
+        )
+
+    def get(
+        self,
+        path: pathlib.Path,
+        content: bytes,
+        current: Callable[[str, str], str | None],
+    ) -> dict[str, t.Any] | None:
+        """Return the expanded workspace in ``content``, or ``None`` on a miss.
+
+        Parameters
+        ----------
+        path : :class:`pathlib.Path`
+            workspace file, as it is passed to the expansion
+        content : bytes
+            what ``path`` holds
+        current : callable
+            returns what a read, given its kind and key, gives now; see
+            :func:`tmuxp.workspace.loader.read_value`
+        """
+        stamp = self._stamp(path, content)
+        try:
+            entry_stamp, reads, workspace = self._read(self._entry(stamp))
+        except (TypeError, ValueError):
+            return None
+        if entry_stamp != stamp or not isinstance(workspace, dict):
+            return None
+        if any(current(kind, key) != value for kind, key, value in reads):
+            return None
+        return workspace
+
+    def put(
+        self,
+        path: pathlib.Path,
+        content: bytes,
+        reads: list[WorkspaceRead],
+        workspace: dict[str, t.Any],
+    ) -> None:
+        """Cache the expanded ``workspace`` of ``content``, if it can be.
+
+        Parameters
+        ----------
+        path : :class:`pathlib.Path`
+            workspace file, as it is passed to the expansion
+        content : bytes
+            what ``path`` held
+        reads : list of tuple
+            kind, key and value of each read the expansion made
+        workspace : dict
+            the expanded workspace
+        """
+        stamp = self._stamp(path, content)
+        self._write(self._entry(stamp), (stamp, reads, workspace), path)
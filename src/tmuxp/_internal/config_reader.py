@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import pathlib
 import typing as t
 
 import yaml
 
+from tmuxp._internal.config_cache import ConfigCache, cache_enabled
+
 logger = logging.getLogger(__name__)
 
 if t.TYPE_CHECKING:
@@ -19,6 +22,25 @@ if t.TYPE_CHECKING:
     RawConfigData: TypeAlias = dict[t.Any, t.Any]
 
 
+def yaml_backend() -> tuple[t.Any, t.Any]:
+    """Return the safe YAML loader and dumper classes to use.
+
+    libyaml's ``CSafeLoader`` and ``CSafeDumper`` when PyYAML was built with
+    it, which parse and emit the same documents several times faster; the
+    pure-Python ``SafeLoader`` and ``SafeDumper`` otherwise, or when
+    ``TMUXP_PURE_YAML=1`` asks for them.
+
+    Examples
+    --------
+    >>> monkeypatch.setenv("TMUXP_PURE_YAML", "1")
+    >>> yaml_backend()
+    (<class 'yaml.loader.SafeLoader'>, <class 'yaml.dumper.SafeDumper'>)
+    """
+    if os.getenv("TMUXP_PURE_YAML", "0") != "1" and yaml.__with_libyaml__:
+        return yaml.CSafeLoader, yaml.CSafeDumper
+    return yaml.SafeLoader, yaml.SafeDumper
+
+
 class ConfigReader:
     r"""Parse string data (YAML and JSON) into a dictionary.
 
@@ -47,7 +69,7 @@ class ConfigReader:
                 "dict[str, t.Any]",
                 yaml.load(
                     content,
-                    Loader=yaml.SafeLoader,
+                    Loader=yaml_backend()[0],
                 ),
             )
         if fmt == "json":
@@ -78,10 +100,32 @@ class ConfigReader:
             ),
         )
 
+    @staticmethod
+    def _format_of(path: pathlib.Path) -> FormatLiteral:
+        """Return the format of a config file, by its suffix.
+
+        >>> ConfigReader._format_of(pathlib.Path("workspace.yml"))
+        'yaml'
+
+        >>> ConfigReader._format_of(pathlib.Path("workspace.toml"))
+        Traceback (most recent call last):
+        ...
+        NotImplementedError: .toml not supported in workspace.toml
+        """
+        if path.suffix in {".yaml", ".yml"}:
+            return "yaml"
+        if path.suffix == ".json":
+            return "json"
+        msg = f"{path.suffix} not supported in {path}"
+        raise NotImplementedError(msg)
+
     @classmethod
     def _from_file(cls, path: pathlib.Path) -> dict[str, t.Any]:
         r"""Load data from file path directly to dictionary.
 
+        Parsed YAML is cached on disk; see
+        :mod:`tmuxp._internal.config_cache`.
+
         **YAML file**
 
         *For demonstration only,* create a YAML file:
@@ -110,20 +154,25 @@ class ConfigReader:
         """
         assert isinstance(path, pathlib.Path)
         logger.debug("loading config", extra={"tmux_config_path": str(path)})
-        content = path.open(encoding="utf-8").read()
 
-        if path.suffix in {".yaml", ".yml"}:
-            fmt: FormatLiteral = "yaml"
-        elif path.suffix == ".json":
-            fmt = "json"
-        else:
-            msg = f"{path.suffix} not supported in {path}"
-            raise NotImplementedError(msg)
-
-        return cls._load(
+        fmt = cls._format_of(path)
+        # json is parsed in C already; only YAML is worth caching.
+        cache = ConfigCache() if fmt == "yaml" and cache_enabled() else None
+        with path.open(encoding="utf-8") as f:
+            stat = os.fstat(f.fileno())
+            if cache is not None:
+                cached = cache.get(path, stat)
+                if cached is not None:
+                    return cached
+            content = f.read()
+
+        data = cls._load(
             fmt=fmt,
             content=content,
         )
+        if cache is not None and isinstance(data, dict):
+            cache.put(path, stat, data)
+        return data
 
     @classmethod
     def from_file(cls, path: pathlib.Path) -> ConfigReader:
@@ -185,7 +234,7 @@ class ConfigReader:
                 content,
                 indent=2,
                 default_flow_style=False,
-                Dumper=yaml.SafeDumper,
+                Dumper=yaml_backend()[1],
             )
         if fmt == "json":
             return json.dumps(
@@ -45,6 +45,12 @@ from .load import (
     create_load_subparser,
 )
 from .ls import LS_DESCRIPTION, CLILsNamespace, command_ls, create_ls_subparser
+from .plan import (
+    PLAN_DESCRIPTION,
+    CLIPlanNamespace,
+    command_plan,
+    create_plan_subparser,
+)
 from .search import (
     SEARCH_DESCRIPTION,
     CLISearchNamespace,
@@ -77,6 +83,13 @@ CLI_DESCRIPTION = build_description(
                 "tmuxp load -y dev staging",
             ],
         ),
+        (
+            "plan",
+            [
+                "tmuxp plan myproject",
+                "tmuxp plan --json myproject",
+            ],
+        ),
         (
             "freeze",
             [
@@ -149,6 +162,7 @@ if t.TYPE_CHECKING:
     CLISubparserName: TypeAlias = t.Literal[
         "ls",
         "load",
+        "plan",
         "freeze",
         "convert",
         "edit",
@@ -199,6 +213,13 @@ def create_parser() -> argparse.ArgumentParser:
         formatter_class=formatter_class,
     )
     create_load_subparser(load_parser)
+    plan_parser = subparsers.add_parser(
+        "plan",
+        help="print the tmux commands a workspace builds with",
+        description=PLAN_DESCRIPTION,
+        formatter_class=formatter_class,
+    )
+    create_plan_subparser(plan_parser)
     shell_parser = subparsers.add_parser(
         "shell",
         help="launch python shell for tmux server, session, window and pane",
@@ -307,6 +328,11 @@ def cli(_args: list[str] | None = None) -> None:
             args=CLILoadNamespace(**vars(args)),
             parser=parser,
         )
+    elif args.subparser_name == "plan":
+        command_plan(
+            args=CLIPlanNamespace(**vars(args)),
+            parser=parser,
+        )
     elif args.subparser_name == "shell":
         command_shell(
             args=CLIShellNamespace(**vars(args)),
@@ -0,0 +1,234 @@
+"""Build profiles for ``tmuxp load --profile``.
+
+Records a workspace builder's build events and writes them out in the Chrome
+trace-event format, so a build can be opened in ``chrome://tracing``,
+`Perfetto <https://ui.perfetto.dev>`_ or ``speedscope``.
+
+Events that close a phase (they carry a ``duration``) become complete spans;
+the rest become instant markers. Each window gets its own track, so windows
+built side by side with ``parallel_windows`` show up side by side. The tmux
+calls made during the build (see :mod:`tmuxp.workspace.builder.accounting`)
+get tracks of their own, and their counts by subcommand are kept in the
+trace's ``otherData``.
+
+Examples
+--------
+>>> from tmuxp.cli._profile import BuildProfile
+>>> profile = BuildProfile()
+>>> profile.on_build_event({"event": "session_created", "name": "myapp",
+...     "time": 10.0, "duration": 0.25})
+>>> profile.on_build_event({"event": "window_started", "name": "editor",
+...     "time": 10.25})
+>>> profile.on_build_event({"event": "window_done", "window": "editor",
+...     "time": 10.75, "duration": 0.5})
+>>> [(e["name"], e["ph"], e["tid"]) for e in profile.trace_events()
+...  if e["ph"] != "M"]
+[('session', 'X', 0), ('window_started', 'i', 1), ('window', 'X', 1)]
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import typing as t
+
+if t.TYPE_CHECKING:
+    from tmuxp.types import StrPath
+    from tmuxp.workspace.builder.accounting import TmuxCallLog
+
+logger = logging.getLogger(__name__)
+
+#: Span names for the build events that close a phase.
+SPAN_NAMES: dict[str, str] = {
+    "session_created": "session",
+    "before_script_done": "before_script",
+    "panes_created": "create panes",
+    "panes_ready": "wait for panes",
+    "commands_sent": "send commands",
+    "window_done": "window",
+    "workspace_built": "build",
+}
+
+_SESSION_TRACK = "session"
+_TMUX_TRACK = "tmux"
+
+
+class BuildProfile:
+    """Collect build events and render them as Chrome trace events.
+
+    Assign :meth:`on_build_event` as a builder's ``on_build_event``, or chain
+    it in front of another callback with ``forward``.
+
+    Parameters
+    ----------
+    forward : callable, optional
+        Callback each event is passed on to after it is recorded, e.g. the
+        spinner's :meth:`~tmuxp.cli._progress.Spinner.on_build_event`.
+    tmux_calls : :class:`~tmuxp.workspace.builder.accounting.TmuxCallLog`, optional
+        tmux calls to add to the trace.
+
+    Examples
+    --------
+    >>> seen = []
+    >>> profile = BuildProfile(forward=seen.append)
+    >>> profile.on_build_event({"event": "workspace_built", "time": 1.0,
+    ...     "duration": 1.0})
+    >>> [e["event"] for e in seen]
+    ['workspace_built']
+    >>> span = profile.trace_events()[-1]
+    >>> span["name"], span["ts"], span["dur"]
+    ('build', 0.0, 1000000.0)
+    """
+
+    def __init__(
+        self,
+        forward: t.Callable[[dict[str, t.Any]], None] | None = None,
+        tmux_calls: TmuxCallLog | None = None,
+    ) -> None:
+        self.forward = forward
+        self.tmux_calls = tmux_calls
+        self.events: list[dict[str, t.Any]] = []
+        self._lock = threading.Lock()
+
+    def on_build_event(self, event: dict[str, t.Any]) -> None:
+        """Record a build event, then pass it on to ``forward``.
+
+        Events from builders that do not stamp a ``time`` are stamped on
+        arrival.
+        """
+        with self._lock:
+            self.events.append({"time": time.monotonic(), **event})
+        if self.forward is not None:
+            self.forward(event)
+
+    def trace_events(self) -> list[dict[str, t.Any]]:
+        """Return the recorded events as Chrome trace events.
+
+        Timestamps are in microseconds from the start of the earliest span.
+        tmux calls that overlap (from windows built in parallel) are spread
+        over as many ``tmux`` tracks as it takes to keep them apart.
+
+        Examples
+        --------
+        >>> profile = BuildProfile()
+        >>> profile.on_build_event({"event": "panes_ready", "window": "logs",
+        ...     "pane_total": 2, "time": 3.0, "duration": 2.0})
+        >>> meta, span = profile.trace_events()[-2:]
+        >>> meta["args"], span["args"]
+        ({'name': 'logs'}, {'pane_total': 2})
+        """
+        with self._lock:
+            events = list(self.events)
+        calls = sorted(
+            self.tmux_calls.calls if self.tmux_calls is not None else [],
+            key=lambda call: call.started,
+        )
+        if not events and not calls:
+            return []
+        origin = min(
+            [e["time"] - e.get("duration", 0.0) for e in events]
+            + [call.started for call in calls],
+        )
+        pid = os.getpid()
+        tracks: dict[str, int] = {_SESSION_TRACK: 0}
+        trace: list[dict[str, t.Any]] = []
+
+        for event in events:
+            name = event["event"]
+            track = _SESSION_TRACK
+            if name == "window_started":
+                track = event.get("name") or track
+            elif event.get("window"):
+                track = event["window"]
+            tid = tracks.setdefault(track, len(tracks))
+            args = {
+                key: value
+                for key, value in event.items()
+                if key not in {"event", "time", "duration", "window"}
+            }
+            duration = event.get("duration")
+            if duration is None:
+                entry = {
+                    "name": name,
+                    "ph": "i",
+                    "s": "t",
+                    "ts": (event["time"] - origin) * 1e6,
+                }
+            else:
+                entry = {
+                    "name": SPAN_NAMES.get(name, name),
+                    "ph": "X",
+                    "ts": (event["time"] - duration - origin) * 1e6,
+                    "dur": duration * 1e6,
+                }
+            trace.append({**entry, "pid": pid, "tid": tid, "args": args})
+
+        lane_ends: list[float] = []
+        for call in calls:
+            lane = next(
+                (i for i, end in enumerate(lane_ends) if end <= call.started),
+                len(lane_ends),
+            )
+            if lane == len(lane_ends):
+                lane_ends.append(0.0)
+            lane_ends[lane] = call.started + call.duration
+            track = _TMUX_TRACK if lane == 0 else f"{_TMUX_TRACK} {lane + 1}"
+            trace.append(
+                {
+                    "name": call.name,
+                    "ph": "X",
+                    "ts": (call.started - origin) * 1e6,
+                    "dur": call.duration * 1e6,
+                    "pid": pid,
+                    "tid": tracks.setdefault(track, len(tracks)),
+                    "args": {
+                        "commands": len(call.commands),
+                        "targets": list(call.targets),
+                        "transport": call.transport,
+                    },
+                },
+            )
+
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": track},
+            }
+            for track, tid in tracks.items()
+        ]
+        return metadata + trace
+
+    def write(self, path: StrPath) -> None:
+        """Write the profile to ``path`` as a Chrome trace JSON file.
+
+        Examples
+        --------
+        >>> import json
+        >>> profile = BuildProfile()
+        >>> profile.on_build_event({"event": "workspace_built", "time": 1.0,
+        ...     "duration": 0.5})
+        >>> out = tmp_path / "profile.json"
+        >>> profile.write(out)
+        >>> trace = json.loads(out.read_text(encoding="utf-8"))
+        >>> trace["displayTimeUnit"], trace["traceEvents"][-1]["name"]
+        ('ms', 'build')
+        """
+        trace: dict[str, t.Any] = {
+            "traceEvents": self.trace_events(),
+            "displayTimeUnit": "ms",
+        }
+        if self.tmux_calls is not None:
+            trace["otherData"] = {
+                "tmux_calls": len(self.tmux_calls),
+                "tmux_processes": self.tmux_calls.processes,
+                "tmux_commands": dict(self.tmux_calls.by_command().most_common()),
+            }
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(trace, fh, indent=2)
+        logger.info("build profile written", extra={"tmux_config_path": str(path)})
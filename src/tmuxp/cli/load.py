@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import contextlib
 import importlib
 import logging
@@ -15,18 +16,21 @@ import typing as t
 from libtmux.server import Server
 
 from tmuxp import exc, log, util
-from tmuxp._internal import config_reader
 from tmuxp._internal.private_path import PrivatePath
 from tmuxp.workspace import loader
 from tmuxp.workspace.builder import (
+    AsyncWorkspaceBuilderProtocol,
     WorkspaceBuilderProtocol,
+    is_async_builder,
     prepended_sys_path,
     resolve_builder_class,
     resolve_builder_paths,
 )
+from tmuxp.workspace.builder.accounting import log_tmux_calls, record_tmux_calls
 from tmuxp.workspace.finders import find_workspace_file, get_workspace_dir
 
 from ._colors import ColorMode, Colors, build_description, get_color_mode
+from ._profile import BuildProfile
 from ._progress import (
     DEFAULT_OUTPUT_LINES,
     SUCCESS_TEMPLATE,
@@ -62,6 +66,30 @@ def _silence_stream_handlers(logger_name: str = "tmuxp") -> t.Iterator[None]:
             h.setLevel(level)
 
 
+@contextlib.contextmanager
+def _account_tmux_calls(
+    build_profile: BuildProfile | None,
+    profile: StrPath | None,
+) -> t.Iterator[None]:
+    """Record the build's tmux calls for the debug log and the build profile.
+
+    Writes the profile when the build ends, whether or not it succeeded.
+    Records nothing unless there is a profile to write or a debug log to
+    write to.
+    """
+    if build_profile is None and not logger.isEnabledFor(logging.DEBUG):
+        yield
+        return
+    with record_tmux_calls() as calls:
+        try:
+            yield
+        finally:
+            log_tmux_calls(calls)
+            if build_profile is not None and profile is not None:
+                build_profile.tmux_calls = calls
+                build_profile.write(profile)
+
+
 LOAD_DESCRIPTION = build_description(
     """
     Load tmuxp workspace file(s) and create or attach to a tmux session.
@@ -76,6 +104,8 @@ LOAD_DESCRIPTION = build_description(
                 "tmuxp load -y dev staging",
                 "tmuxp load -L other-socket myproject",
                 "tmuxp load -a myproject",
+                "tmuxp load --reconcile myproject",
+                "tmuxp load --profile build.json myproject",
             ],
         ),
     ),
@@ -122,6 +152,8 @@ class CLILoadNamespace(argparse.Namespace):
     answer_yes: bool | None
     detached: bool
     append: bool | None
+    reconcile: bool
+    profile: str | None
     colors: CLIColorsLiteral | None
     color: CLIColorModeLiteral
     log_file: str | None
@@ -249,6 +281,28 @@ def _reattach(builder: WorkspaceBuilderProtocol, colors: Colors | None = None) -
         builder.session.attach()
 
 
+def _run_build(
+    builder: WorkspaceBuilderProtocol,
+    session: Session | None = None,
+    append: bool = False,
+) -> None:
+    """Build the workspace, awaiting async builders on an event loop.
+
+    Parameters
+    ----------
+    builder: :class:`~tmuxp.workspace.builder.protocol.WorkspaceBuilderProtocol`
+    session : :class:`libtmux.Session`, optional
+        session to build into
+    append : bool
+        append windows in ``session``
+    """
+    if is_async_builder(builder):
+        async_builder = t.cast("AsyncWorkspaceBuilderProtocol", builder)
+        asyncio.run(async_builder.abuild(session, append=append))
+    else:
+        builder.build(session, append=append)
+
+
 def _load_attached(
     builder: WorkspaceBuilderProtocol,
     detached: bool,
@@ -265,7 +319,7 @@ def _load_attached(
         called after build, before attach/switch_client; use to stop the spinner
         so its cleanup sequences don't appear inside the tmux pane.
     """
-    builder.build()
+    _run_build(builder)
     assert builder.session is not None
 
     if pre_attach_hook is not None:
@@ -298,7 +352,7 @@ def _load_detached(
     pre_output_hook : Callable | None
         Called after build but before printing, e.g. to stop a spinner.
     """
-    builder.build()
+    _run_build(builder)
 
     assert builder.session is not None
 
@@ -321,10 +375,70 @@ def _load_append_windows_to_current_session(
     builder: :class:`~tmuxp.workspace.builder.protocol.WorkspaceBuilderProtocol`
     """
     current_attached_session = builder.find_current_attached_session()
-    builder.build(current_attached_session, append=True)
+    _run_build(builder, current_attached_session, append=True)
     assert builder.session is not None
 
 
+def _load_reconcile(
+    builder: WorkspaceBuilderProtocol,
+    detached: bool,
+    cli_colors: Colors,
+) -> Session | None:
+    """Create what the running session is missing, then attach unless detached.
+
+    Only builders with a ``reconcile`` method (the built-in ones) can do this.
+    A failure leaves the session running as it is: nothing that was already
+    there is touched, so there is nothing to kill.
+
+    Parameters
+    ----------
+    builder : WorkspaceBuilder
+        Builder whose workspace's session is running.
+    detached : bool
+        Leave the session in the background.
+    cli_colors : :class:`~tmuxp._internal.colors.Colors`
+        Colors instance for styled output.
+
+    Returns
+    -------
+    Session | None
+        The reconciled session, or ``None`` if reconciling failed.
+    """
+    reconcile = getattr(builder, "reconcile", None)
+    if not callable(reconcile):
+        tmuxp_echo(
+            cli_colors.error("[Builder Error]")
+            + f" {type(builder).__name__} cannot reconcile a running session",
+        )
+        sys.exit(1)
+
+    try:
+        steps = reconcile()
+    except exc.TmuxpException as e:
+        logger.debug("workspace reconcile failed", exc_info=True)
+        tmuxp_echo(cli_colors.error("[Error]") + f" {e}")
+        return None
+
+    checkmark = cli_colors.success("\u2713")
+    session_name = cli_colors.highlight(str(builder.session.name))
+    if steps:
+        window_count = sum(1 for step in steps if step.missing)
+        pane_count = sum(step.missing_panes for step in steps)
+        tmuxp_echo(
+            f"{checkmark} Reconciled {session_name} "
+            + cli_colors.muted(f"[created {window_count} win, {pane_count} panes]"),
+        )
+    else:
+        tmuxp_echo(
+            f"{checkmark} {session_name} "
+            + cli_colors.muted("has every window and pane, nothing to create"),
+        )
+
+    if not detached:
+        _reattach(builder, cli_colors)
+    return builder.session
+
+
 def _setup_plugins(builder: WorkspaceBuilderProtocol) -> Session:
     """Execute hooks for plugins running after ``before_script``.
 
@@ -466,6 +580,8 @@ def load_workspace(
     detached: bool = False,
     answer_yes: bool = False,
     append: bool = False,
+    reconcile: bool = False,
+    profile: StrPath | None = None,
     cli_colors: Colors | None = None,
     progress_format: str | None = None,
     panel_lines: int | None = None,
@@ -493,6 +609,12 @@ def load_workspace(
     append : bool
        Assume current when given prompt to append windows in same session.
        Default False.
+    reconcile : bool
+       If the session is already running, create only its missing windows and
+       panes instead of offering to attach. Default False.
+    profile : str or :class:`pathlib.Path`, optional
+       Write the build's phases to this file as a Chrome trace (see
+       :class:`~tmuxp.cli._profile.BuildProfile`).
     cli_colors : :class:`~tmuxp._internal.colors.Colors`, optional
         Colors instance for CLI output formatting. If None, uses
         :attr:`~tmuxp._internal.colors.ColorMode.AUTO`.
@@ -521,6 +643,9 @@ def load_workspace(
     */var/moo/hi.yaml* has *./* in its workspaces, we want to be sure any file
     path with *./* is relative to */var/moo*, not the user's PWD.
 
+    :func:`~tmuxp.workspace.loader.expand_file` does both, and caches the
+    result for the next load of the same file.
+
     A :class:`libtmux.Server` object is created. No tmux server is started yet,
     just the object.
 
@@ -531,9 +656,9 @@ def load_workspace(
     an exception if tmux isn't found.
 
     If a tmux session under the same name as ``session_name`` in the tmuxp
-    workspace exists, tmuxp offers to attach the session. Currently, tmuxp
-    does not allow appending a workspace / incremental building on top of a
-    current session (pull requests are welcome!).
+    workspace exists, tmuxp offers to attach the session. With ``reconcile``
+    it instead creates only the windows and panes the session is missing
+    (see :mod:`tmuxp.workspace.builder.reconcile`), leaving the rest running.
 
     :meth:`~tmuxp.workspace.builder.protocol.WorkspaceBuilderProtocol.build`
     will build the session in the background via using tmux's detached state
@@ -575,22 +700,14 @@ def load_workspace(
             + cli_colors.highlight(str(PrivatePath(workspace_file))),
         )
 
-    # ConfigReader allows us to open a yaml or json file as a dict
-    raw_workspace = config_reader.ConfigReader._from_file(workspace_file) or {}
-
-    # shapes workspaces relative to config / profile file location
-    expanded_workspace = loader.expand(
-        raw_workspace,
-        cwd=os.path.dirname(workspace_file),
-    )
+    # reads the yaml or json file, shapes it relative to the file's location and
+    # propagates inheritance (e.g. session -> window, window -> pane); cached
+    expanded_workspace = loader.expand_file(workspace_file)
 
     # Overridden session name
     if new_session_name:
         expanded_workspace["session_name"] = new_session_name
 
-    # propagate workspace inheritance (e.g. session -> window, window -> pane)
-    expanded_workspace = loader.trickle(expanded_workspace)
-
     t = Server(  # create tmux server object
         socket_name=socket_name,
         socket_path=socket_path,
@@ -632,6 +749,9 @@ def load_workspace(
 
     # Session-exists check — outside spinner so prompt_yes_no is safe
     if builder.session_exists(session_name) and not append:
+        if reconcile:
+            with prepended_sys_path(builder_paths):
+                return _load_reconcile(builder, detached, cli_colors)
         if not detached and (
             answer_yes
             or prompt_yes_no(
@@ -643,9 +763,16 @@ def load_workspace(
             _reattach(builder, cli_colors)
         return None
 
+    build_profile = BuildProfile() if profile is not None else None
+
     if _progress_disabled:
         _private_path = str(PrivatePath(workspace_file))
-        with prepended_sys_path(builder_paths):
+        if build_profile is not None:
+            builder.on_build_event = build_profile.on_build_event
+        with (
+            _account_tmux_calls(build_profile, profile),
+            prepended_sys_path(builder_paths),
+        ):
             result = _dispatch_build(
                 builder,
                 detached,
@@ -716,12 +843,18 @@ def load_workspace(
         _spinner as spinner,
     ):
         builder.on_build_event = spinner.on_build_event
+        if build_profile is not None:
+            build_profile.forward = spinner.on_build_event
+            builder.on_build_event = build_profile.on_build_event
         _resolved_panel = (
             _panel_lines if _panel_lines is not None else DEFAULT_OUTPUT_LINES
         )
         if _resolved_panel != 0:
             builder.on_script_output = spinner.add_output_line
-        with prepended_sys_path(builder_paths):
+        with (
+            _account_tmux_calls(build_profile, profile),
+            prepended_sys_path(builder_paths),
+        ):
             result = _dispatch_build(
                 builder,
                 detached,
@@ -793,6 +926,25 @@ def create_load_subparser(parser: argparse.ArgumentParser) -> argparse.ArgumentP
         action="store_true",
         help="load workspace, appending windows to the current session",
     )
+    parser.add_argument(
+        "--reconcile",
+        dest="reconcile",
+        action="store_true",
+        help=(
+            "if the session is already running, create only its missing "
+            "windows and panes"
+        ),
+    )
+    profile = parser.add_argument(
+        "--profile",
+        metavar="file_path",
+        dest="profile",
+        default=None,
+        help=(
+            "write the build's timings to this file as a Chrome trace "
+            "(open in chrome://tracing or ui.perfetto.dev)"
+        ),
+    )
     colorsgroup = parser.add_mutually_exclusive_group()
 
     colorsgroup.add_argument(
@@ -861,6 +1013,7 @@ def create_load_subparser(parser: argparse.ArgumentParser) -> argparse.ArgumentP
         workspace_files.complete = shtab.FILE  # type: ignore
         tmux_config_file.complete = shtab.FILE  # type: ignore
         log_file.complete = shtab.FILE  # type: ignore
+        profile.complete = shtab.FILE  # type: ignore
     except ImportError:
         pass
 
@@ -935,6 +1088,8 @@ def command_load(
             detached=detached,
             answer_yes=args.answer_yes or False,
             append=args.append or False,
+            reconcile=args.reconcile,
+            profile=args.profile,
             cli_colors=cli_colors,
             progress_format=args.progress_format,
             panel_lines=args.panel_lines,
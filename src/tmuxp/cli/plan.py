@@ -0,0 +1,187 @@
+"""CLI for ``tmuxp plan`` subcommand."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import pathlib
+import typing as t
+
+from tmuxp._internal.private_path import PrivatePath
+from tmuxp.workspace import loader
+from tmuxp.workspace.before_script import before_script_steps
+from tmuxp.workspace.builder.plan import compile_workspace
+from tmuxp.workspace.finders import find_workspace_file, get_workspace_dir
+
+from ._colors import Colors, build_description, get_color_mode
+from ._output import OutputFormatter, OutputMode, get_output_mode
+
+if t.TYPE_CHECKING:
+    from typing import TypeAlias
+
+    from tmuxp.workspace.builder.plan import WorkspacePlan
+
+    CLIColorModeLiteral: TypeAlias = t.Literal["auto", "always", "never"]
+
+logger = logging.getLogger(__name__)
+
+PLAN_DESCRIPTION = build_description(
+    """
+    Print the tmux commands a workspace builds with, without running them.
+    """,
+    (
+        (
+            None,
+            [
+                "tmuxp plan myproject",
+                "tmuxp plan ./workspace.yaml",
+                "tmuxp plan --json myproject",
+            ],
+        ),
+    ),
+)
+
+
+class CLIPlanNamespace(argparse.Namespace):
+    """Typed :class:`argparse.Namespace` for tmuxp plan command.
+
+    Examples
+    --------
+    >>> ns = CLIPlanNamespace()
+    >>> ns.workspace_file = "myproject"
+    >>> ns.workspace_file
+    'myproject'
+    """
+
+    color: CLIColorModeLiteral
+    workspace_file: str
+    output_json: bool
+    output_ndjson: bool
+
+
+def create_plan_subparser(
+    parser: argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    """Augment :class:`argparse.ArgumentParser` with ``plan`` subcommand.
+
+    Examples
+    --------
+    >>> import argparse
+    >>> parser = argparse.ArgumentParser()
+    >>> create_plan_subparser(parser) is parser
+    True
+    """
+    workspace_file = parser.add_argument(
+        dest="workspace_file",
+        metavar="workspace-file",
+        type=str,
+        help="checks current tmuxp and current directory for workspace files.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="output_json",
+        help="output as JSON",
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        dest="output_ndjson",
+        help="output as NDJSON (one command per line)",
+    )
+    try:
+        import shtab
+
+        workspace_file.complete = shtab.FILE  # type: ignore
+    except ImportError:
+        pass
+    return parser
+
+
+def load_plan(workspace_file: str | pathlib.Path) -> WorkspacePlan:
+    r"""Read, expand and trickle a workspace file as ``tmuxp load`` does, then plan it.
+
+    Examples
+    --------
+    >>> workspace_file = tmp_path / "plan.yaml"
+    >>> _ = workspace_file.write_text(
+    ...     "session_name: demo\nwindows:\n- panes:\n  - echo hi\n"
+    ... )
+    >>> load_plan(workspace_file).counts()["send-keys"]
+    1
+    """
+    return compile_workspace(loader.expand_file(workspace_file))
+
+
+def _output_plan(
+    plan: WorkspacePlan,
+    workspace_file: pathlib.Path,
+    formatter: OutputFormatter,
+    colors: Colors,
+) -> None:
+    """Print ``plan`` for people: its commands, counts and estimate."""
+    formatter.emit_text(
+        colors.heading(f"Plan for {plan.session_name}")
+        + " "
+        + colors.muted(f"({PrivatePath(workspace_file)})"),
+    )
+    if isinstance(plan.before_script, str):
+        formatter.emit_text(
+            colors.muted("  before_script: ") + colors.info(plan.before_script),
+        )
+    elif plan.before_script:
+        formatter.emit_text(colors.muted("  before_script:"))
+        for step in before_script_steps(plan.before_script):
+            needs = (
+                colors.muted(f" (needs {', '.join(step.needs)})") if step.needs else ""
+            )
+            formatter.emit_text(
+                f"    {colors.highlight(step.name)}: {colors.info(step.script)}{needs}",
+            )
+    for command in plan.commands:
+        delay = colors.warning(f" (after {command.delay:g}s)") if command.delay else ""
+        formatter.emit_text(
+            f"  {colors.muted(f'{command.chain:>3}')} {command}{delay}",
+        )
+
+    formatter.emit_text("")
+    counts = ", ".join(
+        f"{subcommand} {colors.highlight(str(count))}"
+        for subcommand, count in plan.counts().items()
+    )
+    formatter.emit_text(f"{colors.heading('Commands:')} {counts}")
+    estimate = plan.estimate()
+    formatter.emit_text(
+        f"{colors.heading('Estimate:')} "
+        f"{colors.highlight(str(estimate.commands))} tmux commands in "
+        f"{colors.highlight(str(estimate.processes))} processes, "
+        f"{colors.highlight(str(estimate.batched_processes))} "
+        "with batch_commands"
+        + (
+            f"; pauses up to {colors.highlight(f'{estimate.pause_seconds:g}s')}"
+            if estimate.pause_seconds
+            else ""
+        ),
+    )
+
+
+def command_plan(
+    args: CLIPlanNamespace,
+    parser: argparse.ArgumentParser | None = None,
+) -> None:
+    """Entrypoint for ``tmuxp plan``, print the tmux commands a workspace runs."""
+    colors = Colors(get_color_mode(args.color))
+    formatter = OutputFormatter(get_output_mode(args.output_json, args.output_ndjson))
+
+    workspace_file = pathlib.Path(
+        find_workspace_file(args.workspace_file, workspace_dir=get_workspace_dir()),
+    )
+    plan = load_plan(workspace_file)
+
+    if formatter.mode == OutputMode.JSON:
+        formatter.emit_object(plan.to_dict())
+    elif formatter.mode == OutputMode.NDJSON:
+        for command in plan.to_dict()["commands"]:
+            formatter.emit(command)
+    else:
+        _output_plan(plan, workspace_file, formatter, colors)
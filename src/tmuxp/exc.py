@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 
 from libtmux._internal.query_list import ObjectDoesNotExist
+from libtmux.exc import LibTmuxException
 
 from ._compat import implements_to_string
 
@@ -204,6 +205,84 @@ class InvalidWorkspaceBuilderOption(WorkspaceBuilderError):
         )
 
 
+class TmuxCommandBatchError(WorkspaceError, LibTmuxException):
+    """A chained tmux invocation from a command batch reported an error.
+
+    Also a :exc:`libtmux.exc.LibTmuxException`, so callers that catch libtmux
+    failures from unbatched builds keep catching them from batched ones.
+
+    >>> print(TmuxCommandBatchError(["unknown command: nope"], [("nope",)]))
+    tmux command batch failed: unknown command: nope (commands: nope)
+    """
+
+    def __init__(
+        self,
+        stderr: list[str],
+        commands: list[tuple[str, ...]],
+        *args: object,
+    ) -> None:
+        self.stderr = stderr
+        self.commands = commands
+        names = ", ".join(command[0] for command in commands)
+        msg = f"tmux command batch failed: {'; '.join(stderr)} (commands: {names})"
+        super().__init__(msg, *args)
+
+
+class TmuxCommandsFailedError(TmuxCommandBatchError):
+    """Commands of a batch failed when re-run one at a time.
+
+    Raised by :meth:`~tmuxp.workspace.builder.batch.TmuxCommandBatch.flush`
+    with ``report_all``, listing every failing command rather than only the one
+    that stopped the chain.
+
+    >>> print(TmuxCommandsFailedError([
+    ...     (("set-option", "-t", "$1", "bad-a", "1"), ["invalid option: bad-a"]),
+    ...     (("set-option", "-t", "$1", "bad-b", "2"), ["invalid option: bad-b"]),
+    ... ]))
+    2 tmux commands failed:
+      set-option -t $1 bad-a 1: invalid option: bad-a
+      set-option -t $1 bad-b 2: invalid option: bad-b
+    """
+
+    def __init__(
+        self,
+        failures: list[tuple[tuple[str, ...], list[str]]],
+        *args: object,
+    ) -> None:
+        self.failures = failures
+        self.stderr = [line for _command, stderr in failures for line in stderr]
+        self.commands = [command for command, _stderr in failures]
+        lines = [
+            f"  {' '.join(command)}: {'; '.join(stderr)}"
+            for command, stderr in failures
+        ]
+        noun = "command" if len(failures) == 1 else "commands"
+        msg = "\n".join([f"{len(failures)} tmux {noun} failed:", *lines])
+        super(TmuxCommandBatchError, self).__init__(msg, *args)
+
+
+class TmuxControlModeError(WorkspaceError, LibTmuxException):
+    """A ``tmux -C`` control-mode client could not be started or used.
+
+    >>> print(TmuxControlModeError("client exited"))
+    tmux control-mode client failed: client exited
+    """
+
+    def __init__(self, reason: str, *args: object) -> None:
+        super().__init__(f"tmux control-mode client failed: {reason}", *args)
+
+
+class InvalidBeforeScript(WorkspaceError):
+    """A ``before_script`` list or mapping is invalid.
+
+    >>> print(InvalidBeforeScript("step 'db' needs unknown step 'cache'"))
+    Invalid before_script: step 'db' needs unknown step 'cache'
+    """
+
+    def __init__(self, reason: str, *args: object, **kwargs: object) -> None:
+        super().__init__(f"Invalid before_script: {reason}", *args, **kwargs)
+
+
 class TmuxpPluginException(TmuxpException):
     """Base Exception for Tmuxp Errors."""
 
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import codecs
+import collections
+import locale
 import logging
 import os
+import selectors
 import shlex
 import subprocess
 import sys
@@ -25,6 +29,49 @@ logger = logging.getLogger(__name__)
 PY2 = sys.version_info[0] == 2
 
 
+BEFORE_SCRIPT_STDERR_TAIL = 100
+"""stderr lines of a ``before_script`` kept for
+:exc:`~tmuxp.exc.BeforeLoadScriptError`; earlier ones are dropped"""
+
+_PIPE_READ_SIZE = 65536
+_MAX_LINE_LENGTH = 65536
+
+
+class _PipeLines:
+    r"""Decode a pipe's bytes into lines as they arrive.
+
+    Holds back at most one unfinished line, and passes on a line that grows
+    past ``_MAX_LINE_LENGTH`` characters in pieces, so memory stays flat
+    however much a script prints.
+
+    Examples
+    --------
+    >>> lines = _PipeLines("utf-8")
+    >>> lines.feed(b"one\ntw")
+    ['one\n']
+    >>> lines.feed(b"o\nthree")
+    ['two\n']
+    >>> lines.feed(b"", final=True)
+    ['three']
+    """
+
+    def __init__(self, encoding: str) -> None:
+        self._decoder = codecs.getincrementaldecoder(encoding)(
+            errors="backslashreplace",
+        )
+        self._pending = ""
+
+    def feed(self, data: bytes, final: bool = False) -> list[str]:
+        """Return the lines completed by ``data``; ``final`` flushes the rest."""
+        text = self._pending + self._decoder.decode(data, final=final)
+        *complete, self._pending = text.split("\n")
+        lines = [f"{line}\n" for line in complete]
+        if final or len(self._pending) >= _MAX_LINE_LENGTH:
+            lines.append(self._pending)
+            self._pending = ""
+        return [line for line in lines if line]
+
+
 def run_before_script(
     script_file: str | pathlib.Path,
     cwd: pathlib.Path | None = None,
@@ -32,7 +79,10 @@ def run_before_script(
 ) -> int:
     """Execute shell script, streaming output to callback or terminal (if TTY).
 
-    Output is buffered and optionally forwarded via the ``on_line`` callback.
+    stdout and stderr are read as they are written, whichever has output, and
+    each line is passed to the ``on_line`` callback. Only the last
+    :data:`BEFORE_SCRIPT_STDERR_TAIL` lines of stderr are kept, for the
+    :exc:`~tmuxp.exc.BeforeLoadScriptError` of a failing script.
     """
     script_cmd = shlex.split(str(script_file))
 
@@ -42,8 +92,6 @@ def run_before_script(
             cwd=cwd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,  # decode to str
-            errors="backslashreplace",
         )
     except FileNotFoundError as e:
         raise exc.BeforeLoadScriptNotExists(
@@ -51,55 +99,55 @@ def run_before_script(
             os.path.abspath(script_file),  # NOQA: PTH100
         ) from e
 
-    out_buffer = []
-    err_buffer = []
-
-    # While process is running, read lines from stdout/stderr
-    # and write them to this process's stdout/stderr if isatty
-    is_out_tty = sys.stdout.isatty()
-    is_err_tty = sys.stderr.isatty()
-
-    # You can do a simple loop reading in real-time:
-    while True:
-        # Use .poll() to check if the child has exited
-        return_code = proc.poll()
-
-        # Read one line from stdout, if available
-        line_out = proc.stdout.readline() if proc.stdout else ""
-
-        # Read one line from stderr, if available
-        line_err = proc.stderr.readline() if proc.stderr else ""
-
-        if line_out and line_out.strip():
-            out_buffer.append(line_out)
-            if on_line is not None:
-                on_line(line_out)
-            elif is_out_tty:
-                sys.stdout.write(line_out)
-                sys.stdout.flush()
-
-        if line_err and line_err.strip():
-            err_buffer.append(line_err)
-            if on_line is not None:
-                on_line(line_err)
-            elif is_err_tty:
-                sys.stderr.write(line_err)
-                sys.stderr.flush()
-
-        # If no more data from pipes and process ended, break
-        if not line_out and not line_err and return_code is not None:
-            break
-
-    # At this point, the process has finished
+    assert proc.stdout is not None
+    assert proc.stderr is not None
+    encoding = locale.getpreferredencoding(False)
+    err_tail: collections.deque[str] = collections.deque(
+        maxlen=BEFORE_SCRIPT_STDERR_TAIL,
+    )
+
+    # Without on_line, lines go to this process's stdout/stderr if isatty
+    echo_out = sys.stdout if sys.stdout.isatty() else None
+    echo_err = sys.stderr if sys.stderr.isatty() else None
+
+    with selectors.DefaultSelector() as selector:
+        selector.register(
+            proc.stdout,
+            selectors.EVENT_READ,
+            (_PipeLines(encoding), echo_out, None),
+        )
+        selector.register(
+            proc.stderr,
+            selectors.EVENT_READ,
+            (_PipeLines(encoding), echo_err, err_tail),
+        )
+        # Block until either pipe has output; both close when the script exits.
+        while selector.get_map():
+            for key, _events in selector.select():
+                lines, echo, tail = key.data
+                data = os.read(key.fd, _PIPE_READ_SIZE)
+                if not data:
+                    selector.unregister(key.fileobj)
+                for line in lines.feed(data, final=not data):
+                    if not line.strip():
+                        continue
+                    if tail is not None:
+                        tail.append(line)
+                    if on_line is not None:
+                        on_line(line)
+                    elif echo is not None:
+                        echo.write(line)
+                        echo.flush()
+
+    proc.stdout.close()
+    proc.stderr.close()
     return_code = proc.wait()
 
     if return_code != 0:
-        # Join captured stderr lines for your exception
-        stderr_str = "".join(err_buffer).strip()
         raise exc.BeforeLoadScriptError(
             return_code,
             os.path.abspath(script_file),  # NOQA: PTH100
-            stderr_str,
+            "".join(err_tail).strip(),
         )
 
     return return_code
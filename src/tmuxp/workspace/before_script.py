@@ -0,0 +1,276 @@
+"""``before_script`` steps and the order they run in.
+
+``before_script`` is usually one script. It may also be a list or a mapping of
+steps, which are run at the same time, each on a worker thread, except where
+a step ``needs`` others: it starts once they have all succeeded.
+
+Example
+-------
+.. code-block:: yaml
+
+   before_script:
+     containers: ./scripts/compose-up.sh
+     secrets: ./scripts/fetch-secrets.sh
+     migrate:
+       script: ./scripts/migrate.sh
+       needs: [containers, secrets]
+
+Each output line of a step is passed to ``on_line`` tagged with its name, as
+``[migrate] ...``. When a step fails, no further steps start; those already
+running are waited for, and the first failure is raised.
+"""
+
+from __future__ import annotations
+
+import logging
+import pathlib
+import shlex
+import sys
+import threading
+import typing as t
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from tmuxp import exc
+from tmuxp.util import run_before_script
+
+logger = logging.getLogger(__name__)
+
+
+class BeforeScriptStep(t.NamedTuple):
+    """One step of a ``before_script`` list or mapping."""
+
+    name: str
+    """tags the step's output lines; other steps name it in ``needs``"""
+    script: str
+    """the script to run, with its arguments"""
+    needs: tuple[str, ...] = ()
+    """steps that must succeed before this one starts"""
+
+
+def _step_name(script: str) -> str:
+    """Name an unnamed step after its script's file name.
+
+    >>> _step_name("./scripts/compose-up.sh --wait")
+    'compose-up.sh'
+    """
+    words = shlex.split(script) or [script]
+    return pathlib.PurePath(words[0]).name or script
+
+
+def normalize_before_script(value: t.Any) -> str | list[dict[str, t.Any]]:
+    """Return ``before_script`` in its expanded form.
+
+    One script stays a string. A list or mapping of steps becomes a list of
+    ``{"name": ..., "script": ..., "needs": [...]}`` dicts.
+
+    Parameters
+    ----------
+    value : str, list or dict
+        ``before_script`` as written in the workspace
+
+    Returns
+    -------
+    str or list of dict
+
+    Examples
+    --------
+    >>> normalize_before_script("./bootstrap.sh")
+    './bootstrap.sh'
+
+    >>> normalize_before_script(["./up.sh", {"script": "./seed.sh", "needs": "up.sh"}])
+    [{'name': 'up.sh', 'script': './up.sh', 'needs': []},
+     {'name': 'seed.sh', 'script': './seed.sh', 'needs': ['up.sh']}]
+
+    >>> normalize_before_script({"up": "./up.sh", "seed": {"script": "./seed.sh"}})
+    [{'name': 'up', 'script': './up.sh', 'needs': []},
+     {'name': 'seed', 'script': './seed.sh', 'needs': []}]
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        entries = [
+            {"script": step} if isinstance(step, str) else {**step, "name": name}
+            for name, step in value.items()
+        ]
+        names = list(value)
+    elif isinstance(value, list):
+        entries = [
+            {"script": step} if isinstance(step, str) else step for step in value
+        ]
+        names = [None] * len(entries)
+    else:
+        msg = f"expected a script, a list or a mapping, got {type(value).__name__}"
+        raise exc.InvalidBeforeScript(msg)
+
+    steps: list[dict[str, t.Any]] = []
+    for entry, name in zip(entries, names, strict=True):
+        if not isinstance(entry, dict) or not isinstance(entry.get("script"), str):
+            msg = f"step {entry!r} has no script"
+            raise exc.InvalidBeforeScript(msg)
+        needs = entry.get("needs") or []
+        steps.append(
+            {
+                "name": str(name or entry.get("name") or _step_name(entry["script"])),
+                "script": entry["script"],
+                "needs": [needs] if isinstance(needs, str) else list(needs),
+            },
+        )
+    return steps
+
+
+def before_script_steps(value: t.Any) -> list[BeforeScriptStep]:
+    """Return the steps of ``before_script``, each after the steps it needs.
+
+    Parameters
+    ----------
+    value : str, list or dict
+        ``before_script``, as written or as expanded by
+        :func:`normalize_before_script`
+
+    Returns
+    -------
+    list of :class:`BeforeScriptStep`
+
+    Raises
+    ------
+    :exc:`~tmuxp.exc.InvalidBeforeScript`
+        when two steps share a name, or a step needs an unknown step or, in
+        the end, itself
+
+    Examples
+    --------
+    >>> before_script_steps("./bootstrap.sh")
+    [BeforeScriptStep(name='bootstrap.sh', script='./bootstrap.sh', needs=())]
+
+    >>> steps = before_script_steps(
+    ...     {"seed": {"script": "./seed.sh", "needs": "up"}, "up": "./up.sh"},
+    ... )
+    >>> [step.name for step in steps]
+    ['up', 'seed']
+
+    >>> before_script_steps(
+    ...     {
+    ...         "a": {"script": "./a.sh", "needs": "b"},
+    ...         "b": {"script": "./b.sh", "needs": "a"},
+    ...     },
+    ... )
+    Traceback (most recent call last):
+    ...
+    tmuxp.exc.InvalidBeforeScript: Invalid before_script: steps a, b need each other
+    """
+    normalized = normalize_before_script(value)
+    if isinstance(normalized, str):
+        return [BeforeScriptStep(_step_name(normalized), normalized)]
+
+    steps = {}
+    for entry in normalized:
+        step = BeforeScriptStep(entry["name"], entry["script"], tuple(entry["needs"]))
+        if step.name in steps:
+            msg = f"more than one step is named {step.name!r}"
+            raise exc.InvalidBeforeScript(msg)
+        steps[step.name] = step
+    for step in steps.values():
+        for need in step.needs:
+            if need not in steps:
+                msg = f"step {step.name!r} needs unknown step {need!r}"
+                raise exc.InvalidBeforeScript(msg)
+
+    ordered: list[BeforeScriptStep] = []
+    done: set[str] = set()
+    waiting = list(steps.values())
+    while waiting:
+        ready = [step for step in waiting if done.issuperset(step.needs)]
+        if not ready:
+            names = ", ".join(step.name for step in waiting)
+            msg = f"steps {names} need each other"
+            raise exc.InvalidBeforeScript(msg)
+        ordered.extend(ready)
+        done.update(step.name for step in ready)
+        waiting = [step for step in waiting if step.name not in done]
+    return ordered
+
+
+def run_before_scripts(
+    value: t.Any,
+    cwd: pathlib.Path | None = None,
+    on_line: t.Callable[[str], None] | None = None,
+) -> None:
+    r"""Run ``before_script``: one script, or steps as their ``needs`` allow.
+
+    One script runs as :func:`~tmuxp.util.run_before_script` runs it. Steps
+    run on a worker pool, each as soon as the steps it needs have succeeded;
+    their output lines reach ``on_line`` (or a terminal's stdout) tagged with
+    the step's name. An empty list or mapping runs nothing.
+
+    Parameters
+    ----------
+    value : str, list or dict
+        ``before_script``
+    cwd : :class:`pathlib.Path`, optional
+        directory the scripts run in
+    on_line : callable, optional
+        called with each output line; may be called from several threads
+
+    Raises
+    ------
+    :exc:`~tmuxp.exc.BeforeLoadScriptError`
+        the first step to fail, once the steps already running have ended; or
+        :exc:`~tmuxp.exc.BeforeLoadScriptNotExists` if its script is missing
+
+    Examples
+    --------
+    >>> lines = []
+    >>> run_before_scripts(
+    ...     {"one": "echo one", "two": {"script": "echo two", "needs": "one"}},
+    ...     on_line=lines.append,
+    ... )
+    >>> lines
+    ['[one] one\n', '[two] two\n']
+    """
+    if isinstance(value, str):
+        run_before_script(value, cwd=cwd, on_line=on_line)
+        return
+
+    steps = before_script_steps(value)
+    if not steps:
+        return
+    lock = threading.Lock()
+    echo = sys.stdout if on_line is None and sys.stdout.isatty() else None
+
+    def run(step: BeforeScriptStep) -> None:
+        def tagged(line: str) -> None:
+            line = f"[{step.name}] {line}"
+            if on_line is not None:
+                on_line(line)
+            elif echo is not None:
+                with lock:
+                    echo.write(line)
+                    echo.flush()
+
+        logger.debug("running before script step %s", step.name)
+        run_before_script(step.script, cwd=cwd, on_line=tagged)
+
+    done: set[str] = set()
+    waiting = list(steps)
+    running: dict[Future[None], BeforeScriptStep] = {}
+    error: BaseException | None = None
+    with ThreadPoolExecutor(
+        max_workers=len(steps),
+        thread_name_prefix="tmuxp-before-script",
+    ) as pool:
+        while waiting or running:
+            if error is None:
+                for step in [s for s in waiting if done.issuperset(s.needs)]:
+                    waiting.remove(step)
+                    running[pool.submit(run, step)] = step
+            if not running:
+                break
+            finished, _pending = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step = running.pop(future)
+                if future.exception() is None:
+                    done.add(step.name)
+                elif error is None:
+                    error = future.exception()
+    if error is not None:
+        raise error
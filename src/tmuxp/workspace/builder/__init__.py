@@ -11,12 +11,19 @@ implementation. A workspace may select a different builder with the
 
 from __future__ import annotations
 
+from tmuxp.workspace.builder.aio import AsyncioWorkspaceBuilder
+from tmuxp.workspace.builder.batch import TmuxCommand, TmuxCommandBatch
 from tmuxp.workspace.builder.classic import (
     ClassicWorkspaceBuilder,
     get_default_columns,
     get_default_rows,
 )
-from tmuxp.workspace.builder.protocol import WorkspaceBuilderProtocol
+from tmuxp.workspace.builder.control import ControlModeWorkspaceBuilder
+from tmuxp.workspace.builder.protocol import (
+    AsyncWorkspaceBuilderProtocol,
+    WorkspaceBuilderProtocol,
+    is_async_builder,
+)
 from tmuxp.workspace.builder.registry import (
     WORKSPACE_BUILDERS_GROUP,
     available_builders,
@@ -31,12 +38,18 @@ WorkspaceBuilder = ClassicWorkspaceBuilder
 
 __all__ = [
     "WORKSPACE_BUILDERS_GROUP",
+    "AsyncWorkspaceBuilderProtocol",
+    "AsyncioWorkspaceBuilder",
     "ClassicWorkspaceBuilder",
+    "ControlModeWorkspaceBuilder",
+    "TmuxCommand",
+    "TmuxCommandBatch",
     "WorkspaceBuilder",
     "WorkspaceBuilderProtocol",
     "available_builders",
     "get_default_columns",
     "get_default_rows",
+    "is_async_builder",
     "prepended_sys_path",
     "resolve_builder_class",
     "resolve_builder_paths",
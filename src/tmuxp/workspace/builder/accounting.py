@@ -0,0 +1,302 @@
+"""Count and time the tmux commands a build issues.
+
+Every ``tmux`` process libtmux spawns goes through
+:class:`libtmux.common.tmux_cmd`. :func:`record_tmux_calls` wraps it for the
+duration of a ``with`` block and collects each invocation in a
+:class:`TmuxCallLog`, so a build's cost in tmux round trips can be broken
+down by subcommand and by target window or pane. Builders that reach tmux
+another way report their calls with :func:`record_call`: the asyncio builder
+for its own subprocesses, the control-mode builder for each line it writes to
+its ``tmux -C`` client.
+
+``tmuxp load --profile`` adds the calls to its trace, ``--log-level debug``
+logs a summary (see :func:`log_tmux_calls`), and the test suite uses them to
+hold builders to a call budget.
+
+Examples
+--------
+>>> from tmuxp.workspace.builder.accounting import record_tmux_calls
+>>> with record_tmux_calls() as calls:
+...     _ = session.cmd("display-message", "-p", "hi")
+...     _ = window.cmd("select-layout", "tiled")
+>>> calls.by_command()["display-message"], calls.by_command()["select-layout"]
+(1, 1)
+>>> calls.by_target()[str(window.window_id)]
+1
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import dataclasses
+import functools
+import itertools
+import logging
+import threading
+import time
+import typing as t
+
+from libtmux.common import tmux_cmd
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+logger = logging.getLogger(__name__)
+
+_active_logs: list[TmuxCallLog] = []
+_active_lock = threading.Lock()
+
+
+@dataclasses.dataclass(frozen=True)
+class TmuxCall:
+    """One invocation of tmux: a process, or a line sent to a control client.
+
+    A chained invocation (``tmux cmd1 ; cmd2``) is one call of several
+    commands.
+
+    Examples
+    --------
+    >>> call = TmuxCall(
+    ...     args=("send-keys", "-t", "%1", "ls", ";", "send-keys", "-t", "%2", "ls"),
+    ...     started=1.0,
+    ...     duration=0.002,
+    ... )
+    >>> call.names
+    ('send-keys', 'send-keys')
+    >>> call.name
+    'send-keys'
+    >>> call.targets
+    ('%1', '%2')
+    """
+
+    args: tuple[str, ...]
+    """tmux arguments after the flags that address the server"""
+
+    started: float
+    """:func:`time.monotonic` when the call was made"""
+
+    duration: float
+    """seconds until tmux answered"""
+
+    transport: str = "process"
+    """``process`` for a spawned ``tmux``, ``control`` for a control-mode line"""
+
+    @property
+    def commands(self) -> tuple[tuple[str, ...], ...]:
+        """Return each command of the call, split at the ``;`` separators."""
+        commands: list[tuple[str, ...]] = []
+        command: list[str] = []
+        for arg in self.args:
+            if arg == ";":
+                commands.append(tuple(command))
+                command = []
+            else:
+                command.append(arg)
+        commands.append(tuple(command))
+        return tuple(c for c in commands if c)
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Return the subcommand of each command, e.g. ``split-window``."""
+        return tuple(command[0] for command in self.commands)
+
+    @property
+    def name(self) -> str:
+        """Return the call's subcommands, once each, joined with ``+``."""
+        return "+".join(dict.fromkeys(self.names))
+
+    @property
+    def targets(self) -> tuple[str, ...]:
+        """Return the ``-t`` target of each command that has one."""
+        targets: list[str] = []
+        for command in self.commands:
+            for flag, value in itertools.pairwise(command):
+                if flag == "-t":
+                    targets.append(value)
+                    break
+        return tuple(targets)
+
+
+class TmuxCallLog:
+    """The tmux calls made while a :func:`record_tmux_calls` block ran.
+
+    Examples
+    --------
+    >>> log = TmuxCallLog()
+    >>> log.add(TmuxCall(("list-windows",), started=0.0, duration=0.25))
+    >>> log.add(TmuxCall(("split-window", "-t", "@1"), started=0.5, duration=0.25))
+    >>> log.add(TmuxCall(("split-window", "-t", "@1"), started=1.0, duration=0.5))
+    >>> len(log), log.processes
+    (3, 3)
+    >>> log.by_command().most_common(1)
+    [('split-window', 2)]
+    >>> log.seconds_by_command()["split-window"]
+    0.75
+    >>> dict(log.by_target())
+    {'@1': 2}
+    """
+
+    def __init__(self) -> None:
+        self.calls: list[TmuxCall] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of calls."""
+        return len(self.calls)
+
+    def add(self, call: TmuxCall) -> None:
+        """Record a call; safe to use from several threads."""
+        with self._lock:
+            self.calls.append(call)
+
+    @property
+    def processes(self) -> int:
+        """Return how many ``tmux`` processes were spawned."""
+        return sum(1 for call in self.calls if call.transport == "process")
+
+    def by_command(self) -> collections.Counter[str]:
+        """Count the commands run, by subcommand."""
+        return collections.Counter(name for call in self.calls for name in call.names)
+
+    def seconds_by_command(self) -> dict[str, float]:
+        """Return the time spent in tmux, by :attr:`TmuxCall.name`."""
+        seconds: dict[str, float] = collections.defaultdict(float)
+        for call in self.calls:
+            seconds[call.name] += call.duration
+        return dict(seconds)
+
+    def by_target(self) -> collections.Counter[str]:
+        """Count the commands run, by their ``-t`` window or pane."""
+        return collections.Counter(
+            target for call in self.calls for target in call.targets
+        )
+
+    def matching(self, *args: str) -> list[TmuxCall]:
+        """Return the calls with a command that includes every one of ``args``.
+
+        Examples
+        --------
+        >>> log = TmuxCallLog()
+        >>> log.add(TmuxCall(
+        ...     ("show-options", "-gwv", "pane-base-index"), started=0.0, duration=0.0,
+        ... ))
+        >>> len(log.matching("show-options", "pane-base-index"))
+        1
+        >>> log.matching("list-windows")
+        []
+        """
+        return [
+            call
+            for call in self.calls
+            if any(set(args) <= set(command) for command in call.commands)
+        ]
+
+
+def _strip_server_args(args: Sequence[t.Any]) -> tuple[str, ...]:
+    """Drop the leading flags (``-L``, ``-S``, ``-f`` ...) that pick the server.
+
+    Examples
+    --------
+    >>> _strip_server_args(["-Lsocket", "-f/dev/null", "list-sessions"])
+    ('list-sessions',)
+    >>> _strip_server_args(["-V"])
+    ('-V',)
+    """
+    argv = tuple(str(arg) for arg in args)
+    for index, arg in enumerate(argv):
+        if not arg.startswith("-"):
+            return argv[index:]
+    return argv
+
+
+def record_call(
+    args: Sequence[t.Any],
+    started: float,
+    transport: str = "process",
+) -> None:
+    """Add a tmux call that began at ``started`` and just ended to active logs.
+
+    A no-op outside :func:`record_tmux_calls`.
+
+    Parameters
+    ----------
+    args : sequence
+        the call's arguments; leading server flags are dropped
+    started : float
+        :func:`time.monotonic` when the call was made
+    transport : str
+        ``process`` or ``control``
+    """
+    if not _active_logs:
+        return
+    call = TmuxCall(
+        args=_strip_server_args(args),
+        started=started,
+        duration=time.monotonic() - started,
+        transport=transport,
+    )
+    with _active_lock:
+        logs = list(_active_logs)
+    for log in logs:
+        log.add(call)
+
+
+_untraced_init = tmux_cmd.__init__
+
+
+@functools.wraps(_untraced_init)
+def _traced_init(self: tmux_cmd, *args: t.Any, tmux_bin: str | None = None) -> None:
+    started = time.monotonic()
+    try:
+        _untraced_init(self, *args, tmux_bin=tmux_bin)
+    finally:
+        record_call(args, started)
+
+
+@contextlib.contextmanager
+def record_tmux_calls() -> Iterator[TmuxCallLog]:
+    """Record every tmux call made while the block runs.
+
+    Blocks may nest; each gets the calls made while it was open.
+
+    Yields
+    ------
+    :class:`TmuxCallLog`
+    """
+    log = TmuxCallLog()
+    with _active_lock:
+        if not _active_logs:
+            tmux_cmd.__init__ = _traced_init  # type: ignore[method-assign]
+        _active_logs.append(log)
+    try:
+        yield log
+    finally:
+        with _active_lock:
+            _active_logs.remove(log)
+            if not _active_logs:
+                tmux_cmd.__init__ = _untraced_init  # type: ignore[method-assign]
+
+
+def log_tmux_calls(calls: TmuxCallLog) -> None:
+    """Log a summary of ``calls`` at debug level.
+
+    One line for the totals, then the command count per subcommand, the time
+    per kind of call and the command count per target, busiest first.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    seconds = sum(call.duration for call in calls.calls)
+    logger.debug(
+        "tmux calls: %d (%d processes), %.3fs",
+        len(calls),
+        calls.processes,
+        seconds,
+    )
+    for name, count in calls.by_command().most_common():
+        logger.debug("tmux %s: %d", name, count, extra={"tmux_subcommand": name})
+    by_seconds = sorted(calls.seconds_by_command().items(), key=lambda i: -i[1])
+    for name, spent in by_seconds:
+        logger.debug("tmux %s: %.3fs", name, spent, extra={"tmux_subcommand": name})
+    for target, count in calls.by_target().most_common():
+        logger.debug("tmux target %s: %d", target, count)
@@ -0,0 +1,625 @@
+"""Workspace builder that builds windows concurrently on an event loop.
+
+:class:`AsyncioWorkspaceBuilder` implements
+:class:`~tmuxp.workspace.builder.protocol.AsyncWorkspaceBuilderProtocol`. It
+sets the session up exactly as the classic builder does, creates the windows
+in order (so indexes match the workspace), then builds every window's panes in
+its own task: splits, readiness polling, ``send-keys`` and
+``sleep_before``/``sleep_after`` pauses of one window overlap with the others.
+Each task chains its tmux commands through
+:func:`asyncio.create_subprocess_exec`, so waiting on one window's shells never
+blocks another's.
+
+Within a window, panes are still filled in order, so ``sleep_before`` /
+``sleep_after`` keep sequencing commands across that window's panes. Build
+events are replayed in window order once each window is done, so progress
+output reads the same as a classic build.
+
+Select it with ``workspace_builder: asyncio``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import shutil
+import time
+import typing as t
+
+from libtmux.exc import TmuxCommandNotFound
+from libtmux.neo import parse_output
+from libtmux.pane import Pane
+from libtmux.window import Window
+
+from tmuxp.log import TmuxpLoggerAdapter
+from tmuxp.workspace.builder.accounting import record_call
+from tmuxp.workspace.builder.batch import (
+    TmuxCommandBatch,
+    chain_args,
+    chunk_commands,
+    server_args,
+)
+from tmuxp.workspace.builder.classic import (
+    _LAZY_PLACEHOLDER,
+    ClassicWorkspaceBuilder,
+    _builds_lazily,
+    _new_window_args,
+    _new_window_settings,
+    _option_value,
+    _send_keys_args,
+    _send_keys_groups,
+    _split_window_args,
+)
+from tmuxp.workspace.builder.layout import plan_splits
+from tmuxp.workspace.builder.readiness import (
+    _PANE_CURSOR_FORMAT,
+    _ready_pane_ids,
+    readiness_intervals,
+)
+
+if t.TYPE_CHECKING:
+    from libtmux.server import Server
+    from libtmux.session import Session
+
+    from tmuxp.workspace.builder.batch import TmuxCommand
+
+logger = logging.getLogger(__name__)
+
+
+async def run_tmux(server: Server, args: list[str]) -> tuple[list[str], list[str]]:
+    """Run ``tmux args`` against ``server`` in a subprocess, asynchronously.
+
+    Returns
+    -------
+    tuple of (list of str, list of str)
+        stdout and stderr lines, split as :class:`libtmux.common.tmux_cmd` does
+
+    Examples
+    --------
+    >>> asyncio.run(run_tmux(server, ["display-message", "-p", "hi"]))
+    (['hi'], [])
+    """
+    tmux_bin = server.tmux_bin or shutil.which("tmux")
+    if not tmux_bin:
+        raise TmuxCommandNotFound
+
+    started = time.monotonic()
+    process = await asyncio.create_subprocess_exec(
+        tmux_bin,
+        *server_args(server),
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    out, err = await process.communicate()
+    record_call(args, started)
+
+    stdout = out.decode("utf-8", errors="backslashreplace").split("\n")
+    while stdout and stdout[-1] == "":
+        stdout.pop()
+    stderr = err.decode("utf-8", errors="backslashreplace").split("\n")
+    return stdout, list(filter(None, stderr))
+
+
+class AsyncTmuxCommandBatch(TmuxCommandBatch):
+    """A command batch that can be flushed without blocking the event loop.
+
+    Examples
+    --------
+    >>> batch = AsyncTmuxCommandBatch(server=server)
+    >>> slot = batch.queue(
+    ...     "new-window", "-d", "-t", f"{session.session_id}:",
+    ...     capture="#{window_id}",
+    ... )
+    >>> asyncio.run(batch.aflush())[slot].startswith("@")
+    True
+    """
+
+    async def aflush(self, report_all: bool = False) -> list[str | None]:
+        """Run every queued command in one ``tmux`` subprocess, asynchronously.
+
+        Takes ``report_all``, returns and raises like
+        :meth:`~TmuxCommandBatch.flush`.
+        """
+        if not self._commands:
+            return []
+        commands, self._commands = self._commands, []
+
+        stdout: list[str] = []
+        stderr: list[str] = []
+        for chunk in chunk_commands(commands):
+            chunk_stdout, stderr = await self._adispatch(chunk)
+            stdout.extend(chunk_stdout)
+            if stderr:
+                break
+        if stderr and report_all:
+            # The build is failing anyway; re-running one command per process
+            # on the blocking path keeps the error report simple.
+            self._report_each(commands)
+        return self._results(commands, stdout, stderr)
+
+    async def _adispatch(
+        self,
+        commands: list[TmuxCommand],
+    ) -> tuple[list[str], list[str]]:
+        return await run_tmux(self.server, chain_args(commands))
+
+
+class AsyncioWorkspaceBuilder(ClassicWorkspaceBuilder):
+    """Build a workspace's windows concurrently.
+
+    :meth:`build` runs :meth:`abuild` on a fresh event loop; ``tmuxp load``
+    awaits :meth:`abuild` directly.
+
+    Examples
+    --------
+    >>> builder = AsyncioWorkspaceBuilder(
+    ...     session_config={
+    ...         "session_name": "asyncio-example",
+    ...         "windows": [
+    ...             {"window_name": "one", "panes": [{"shell_command": []}] * 2},
+    ...             {"window_name": "two", "panes": [{"shell_command": []}]},
+    ...         ],
+    ...     },
+    ...     server=server,
+    ... )
+    >>> builder.build()
+    >>> [(w.window_name, len(w.panes)) for w in builder.session.windows]
+    [('one', 2), ('two', 1)]
+    """
+
+    supports_async: t.ClassVar[bool] = True
+
+    def build(self, session: Session | None = None, append: bool = False) -> None:
+        """Build tmux workspace in session, running :meth:`abuild` to completion.
+
+        Parameters
+        ----------
+        session : :class:`libtmux.Session`
+            session to build workspace in
+        append : bool
+            append windows in current active session
+        """
+        asyncio.run(self.abuild(session=session, append=append))
+
+    async def abuild(
+        self, session: Session | None = None, append: bool = False
+    ) -> None:
+        """Build tmux workspace in session, one task per window.
+
+        Parameters
+        ----------
+        session : :class:`libtmux.Session`
+            session to build workspace in
+        append : bool
+            append windows in current active session
+        """
+        # Session creation, plugin hooks and before_script block: run them off
+        # the event loop so the caller's other tasks go on meanwhile.
+        session = await asyncio.to_thread(self._start_build, session)
+        state = await asyncio.to_thread(
+            self._get_session_state,
+            str(session.session_id),
+        )
+        pane_base_index = state.pane_base_index
+
+        created: list[tuple[Window, Pane, dict[str, t.Any], float]] = []
+        focus: Window | None = None
+        for window_iterator, window_config in enumerate(
+            self.session_config["windows"],
+            start=1,
+        ):
+            window_started = time.monotonic()
+            window, first_pane = await self._acreate_window(
+                session,
+                window_iterator,
+                window_config,
+                append,
+            )
+            for plugin in self.plugins:
+                plugin.on_window_create(window)
+            if window_config.get("focus"):
+                focus = window
+            created.append((window, first_pane, window_config, window_started))
+
+        tasks = [
+            asyncio.ensure_future(
+                self._abuild_window(
+                    window,
+                    first_pane,
+                    window_config,
+                    window_iterator,
+                    pane_base_index,
+                    window_started,
+                ),
+            )
+            for window_iterator, (
+                window,
+                first_pane,
+                window_config,
+                window_started,
+            ) in enumerate(created, start=1)
+        ]
+        try:
+            for window_iterator, (
+                task,
+                (window, _first_pane, window_config, window_started),
+            ) in enumerate(zip(tasks, created, strict=True), start=1):
+                for replay in await task:
+                    replay()
+                for plugin in self.plugins:
+                    plugin.after_window_finished(window)
+                self._timed_event(
+                    {
+                        "event": "window_done",
+                        "window": window_config.get("window_name")
+                        or str(window_iterator),
+                    },
+                    window_started,
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if focus is not None:
+            batch = AsyncTmuxCommandBatch(server=self.server)
+            batch.queue("select-window", "-t", focus.window_id)
+            await batch.aflush()
+
+        await asyncio.to_thread(self._finish_build)
+
+    def _new_command_batch(self) -> None:
+        # Each window task runs its own AsyncTmuxCommandBatch.
+        return None
+
+    async def _acreate_window(
+        self,
+        session: Session,
+        window_iterator: int,
+        window_config: dict[str, t.Any],
+        append: bool,
+    ) -> tuple[Window, Pane]:
+        """Create a window, apply its options and return it with its first pane."""
+        batch = AsyncTmuxCommandBatch(server=self.server)
+        version, format_string = self._captured_pane_format()
+
+        start_directory, window_shell, environment = _new_window_settings(
+            window_config,
+        )
+        first_window_pass = self.first_window_pass(window_iterator, session, append)
+        lazy = _builds_lazily(window_config, first_window_pass, self.session_config)
+        if lazy:
+            window_shell, environment = _LAZY_PLACEHOLDER, None
+        if first_window_pass and self._can_reuse_initial_window(session):
+            window = self._reuse_initial_window(
+                batch,
+                session,
+                window_name=window_config.get("window_name"),
+                start_directory=start_directory,
+                window_index=window_config.get("window_index", ""),
+                window_shell=window_shell,
+                environment=environment,
+            )
+            first_pane = self._first_panes.pop(str(window.window_id))
+        else:
+            replaces = self._initial_window_id(session) if first_window_pass else None
+            if replaces is not None:
+                batch.queue(
+                    "move-window",
+                    "-s",
+                    replaces,
+                    "-t",
+                    f"{session.session_id}:99",
+                )
+            window_args = _new_window_args(
+                str(session.session_id),
+                window_name=window_config.get("window_name"),
+                start_directory=start_directory,
+                window_index=window_config.get("window_index", ""),
+                window_shell=window_shell,
+                environment=environment,
+            )
+            slot = batch.queue("new-window", *window_args, capture=format_string)
+            if replaces is not None:
+                batch.queue("kill-window", "-t", replaces)
+            output = (await batch.aflush())[slot]
+            assert output is not None
+            row = parse_output(output, "list-panes", version)
+            window = Window(server=self.server, **row)
+            first_pane = Pane(server=self.server, **row)
+        if lazy:
+            self._lazy_window_ids.add(str(window.window_id))
+        TmuxpLoggerAdapter(
+            logger,
+            {
+                "tmux_session": session.name or "",
+                "tmux_window": window.window_name or "",
+            },
+        ).debug("window created")
+
+        if isinstance(window_config.get("options"), dict):
+            for key, val in window_config["options"].items():
+                batch.queue(
+                    "set-option",
+                    "-w",
+                    "-t",
+                    window.window_id,
+                    key,
+                    _option_value(val),
+                )
+        await batch.aflush(report_all=True)
+
+        return window, first_pane
+
+    async def _abuild_window(
+        self,
+        window: Window,
+        first_pane: Pane,
+        window_config: dict[str, t.Any],
+        window_iterator: int,
+        pane_base_index: int,
+        window_started: float,
+    ) -> list[t.Callable[[], None]]:
+        """Create a window's panes and send their commands.
+
+        Build events are stamped with their ``time`` as they happen, not when
+        they are replayed.
+
+        Returns
+        -------
+        list of callables
+            progress callbacks to replay, in order, once earlier windows finish
+        """
+        replay: list[t.Callable[[], None]] = []
+        window_name = window_config.get("window_name") or str(window_iterator)
+        pane_configs = window_config["panes"]
+        pane_models = self._window_model(window_config).panes
+        if self.on_progress:
+            replay.append(
+                functools.partial(self._progress, f"Creating window: {window_name}"),
+            )
+        if self.on_build_event:
+            started = {
+                "event": "window_started",
+                "name": window_name,
+                "pane_total": len(pane_configs),
+                "time": window_started,
+            }
+            replay.append(functools.partial(self._build_event, started))
+        span: dict[str, t.Any] = {
+            "window": window_name,
+            "pane_total": len(pane_configs),
+        }
+        phase_started = time.monotonic()
+
+        batch = AsyncTmuxCommandBatch(server=self.server)
+        version, format_string = self._captured_pane_format()
+        layout = window_config.get("layout")
+        window_target = str(window.window_id)
+
+        if window_target in self._lazy_window_ids:
+            # The hook types the window's commands.
+            await self._ajoin_before_script()
+            batch.queue(
+                "set-hook",
+                *self._lazy_window_hook_args(
+                    window,
+                    str(first_pane.pane_id),
+                    window_config,
+                    pane_base_index,
+                ),
+            )
+            replay.append(
+                functools.partial(
+                    self._build_event,
+                    {
+                        "event": "window_deferred",
+                        "window": window_name,
+                        "time": time.monotonic(),
+                    },
+                ),
+            )
+            # Its options_after are set by the hook, after its panes.
+            await batch.aflush()
+            return replay
+
+        steps = plan_splits(layout, len(pane_configs))
+        split_slots: dict[int, int] = {}
+        for pane_num, step in enumerate([None, *steps], start=1):
+            if self.on_progress:
+                message = f"Creating pane: {pane_base_index + pane_num - 1}"
+                replay.append(functools.partial(self._progress, message))
+            if self.on_build_event:
+                creating = {
+                    "event": "pane_creating",
+                    "pane_num": pane_num,
+                    "pane_total": len(pane_configs),
+                    "time": time.monotonic(),
+                }
+                replay.append(functools.partial(self._build_event, creating))
+            if step is None:
+                continue
+            split_args = _split_window_args(
+                f"{window_target}.{pane_base_index + step.position}",
+                pane_models[step.pane],
+                step,
+            )
+            split_slots[step.pane] = batch.queue(
+                "split-window",
+                *split_args,
+                capture=format_string,
+            )
+
+        results = await batch.aflush()
+        panes = [first_pane]
+        for number in range(1, len(pane_configs)):
+            output = results[split_slots[number]]
+            assert output is not None
+            panes.append(
+                Pane(server=self.server, **parse_output(output, "list-panes", version)),
+            )
+        if steps and steps[-1].pane != len(panes) - 1:
+            batch.queue("select-pane", "-t", panes[-1].pane_id)
+        self._replay_timed_event(
+            replay, {"event": "panes_created", **span}, phase_started
+        )
+
+        pane_logs = [
+            TmuxpLoggerAdapter(
+                logger,
+                {
+                    "tmux_session": window.session_name or "",
+                    "tmux_window": window.window_name or "",
+                    "tmux_pane": pane.pane_id or "",
+                },
+            )
+            for pane in panes
+        ]
+        for pane_log in pane_logs:
+            pane_log.debug("pane created")
+
+        if self._pane_readiness_wait:
+            phase_started = time.monotonic()
+            await self._await_panes_ready(
+                [
+                    pane
+                    for pane, pane_model in zip(panes, pane_models, strict=True)
+                    if pane_model.shell is None
+                ],
+            )
+            self._replay_timed_event(
+                replay,
+                {"event": "panes_ready", **span},
+                phase_started,
+            )
+
+        await self._ajoin_before_script()
+        phase_started = time.monotonic()
+
+        if layout:
+            batch.queue("select-layout", "-t", window_target, layout)
+
+        for pane, pane_model, pane_log in zip(
+            panes,
+            pane_models,
+            pane_logs,
+            strict=True,
+        ):
+            for group in _send_keys_groups(
+                pane_model.commands,
+                merge=self._builder_options.batch_send_keys,
+            ):
+                if group[0].sleep_before is not None:
+                    await batch.aflush()
+                    await asyncio.sleep(group[0].sleep_before)
+
+                batch.queue("send-keys", "-t", pane.pane_id, *_send_keys_args(group))
+                for command in group:
+                    pane_log.debug("sent command %s", command.cmd)
+
+                if group[-1].sleep_after is not None:
+                    await batch.aflush()
+                    await asyncio.sleep(group[-1].sleep_after)
+
+            if pane_model.focus:
+                batch.queue("select-pane", "-t", pane.pane_id)
+        self._replay_timed_event(
+            replay, {"event": "commands_sent", **span}, phase_started
+        )
+
+        await self._aset_options_after(batch, window_target, window_config)
+        return replay
+
+    async def _ajoin_before_script(self) -> None:
+        """Wait for a ``before_script`` running in the background, if any.
+
+        The wait runs on a worker thread, so other windows' tasks go on
+        meanwhile; see :meth:`_join_before_script`.
+        """
+        if self._before_script is not None:
+            await asyncio.to_thread(self._before_script.wait)
+        self._join_before_script()
+
+    async def _aset_options_after(
+        self,
+        batch: AsyncTmuxCommandBatch,
+        window_target: str,
+        window_config: dict[str, t.Any],
+    ) -> None:
+        """Flush ``batch``, then set the window's ``options_after``."""
+        # Flushed apart from the commands already queued, which must not be
+        # re-sent if an option fails and the options are retried one by one.
+        await batch.aflush()
+        if isinstance(window_config.get("options_after"), dict):
+            for key, val in window_config["options_after"].items():
+                batch.queue(
+                    "set-option",
+                    "-w",
+                    "-t",
+                    window_target,
+                    key,
+                    _option_value(val),
+                )
+            await batch.aflush(report_all=True)
+
+    def _replay_timed_event(
+        self,
+        replay: list[t.Callable[[], None]],
+        event: dict[str, t.Any],
+        started: float,
+    ) -> None:
+        """Queue a build event for a phase that began at ``started`` for replay.
+
+        Its ``time`` and ``duration`` are taken now, as with
+        :meth:`~tmuxp.workspace.builder.classic.ClassicWorkspaceBuilder._timed_event`.
+        """
+        if not self.on_build_event:
+            return
+        now = time.monotonic()
+        timed = {**event, "time": now, "duration": now - started}
+        replay.append(functools.partial(self._build_event, timed))
+
+    async def _await_panes_ready(
+        self,
+        panes: list[Pane],
+        timeout: float = 2.0,
+        interval: float = 0.05,
+    ) -> set[str]:
+        """Wait for panes' shells to draw their prompts without blocking the loop.
+
+        Same check as the classic builder: one ``list-panes`` per tick, a
+        deadline for the whole group, paced by ``pane_readiness_strategy``.
+        The ``event`` strategy backs off here instead, since every window's
+        task would otherwise attach its own listener client.
+        """
+        ready: set[str] = set()
+        waiting = {str(pane.pane_id) for pane in panes}
+        intervals = readiness_intervals(
+            self._builder_options.pane_readiness_strategy,
+            interval,
+        )
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        args = ["list-panes", "-a", "-F", _PANE_CURSOR_FORMAT]
+        while waiting and loop.time() < deadline:
+            stdout, stderr = await run_tmux(self.server, args)
+            if stderr:
+                logger.debug(
+                    "pane listing failed during readiness check",
+                    extra={"tmux_stderr": stderr},
+                )
+                return ready
+            now_ready, gone = _ready_pane_ids(stdout, waiting)
+            ready |= now_ready
+            waiting -= now_ready | gone
+            if waiting:
+                await asyncio.sleep(min(next(intervals), deadline - loop.time()))
+        if waiting:
+            logger.debug(
+                "pane readiness check timed out after %.1f seconds",
+                timeout,
+                extra={"tmux_pane": " ".join(sorted(waiting))},
+            )
+        return ready
@@ -0,0 +1,375 @@
+"""Dispatch queued tmux commands as one chained ``tmux`` invocation.
+
+Every libtmux call spawns its own ``tmux`` process. Building a large workspace
+through libtmux therefore costs one fork/exec per ``new-window``,
+``split-window``, ``set-option``, ``select-layout`` and ``send-keys``.
+:class:`TmuxCommandBatch` queues commands instead and flushes them as a single
+``tmux cmd1 ; cmd2 ; ...`` process, so the build is paced by tmux rather than
+by process-spawn latency.
+
+Commands that create objects are queued with a ``capture`` format; they are
+given ``-P -F <format>`` and the line each prints is handed back by
+:meth:`TmuxCommandBatch.flush`, in queue order.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import typing as t
+
+from tmuxp import exc
+
+if t.TYPE_CHECKING:
+    from libtmux.server import Server
+
+logger = logging.getLogger(__name__)
+
+
+def escape_tmux_arg(arg: t.Any) -> str:
+    r"""Return ``arg`` as a string tmux will not read as a command separator.
+
+    tmux ends a command at any argument that *ends* in ``;``. Escaping the
+    final semicolon keeps it literal, inside a chain and out of it.
+
+    Parameters
+    ----------
+    arg : Any
+        command argument; non-strings are converted with :class:`str`
+
+    Returns
+    -------
+    str
+
+    Examples
+    --------
+    >>> escape_tmux_arg("echo hi")
+    'echo hi'
+    >>> escape_tmux_arg("echo hi;")
+    'echo hi\\;'
+    >>> escape_tmux_arg(";")
+    '\\;'
+    >>> escape_tmux_arg(50)
+    '50'
+    """
+    value = str(arg)
+    if value.endswith(";"):
+        return value[:-1] + "\\;"
+    return value
+
+
+def server_args(server: Server) -> list[str]:
+    """Return the ``tmux`` flags that address ``server``.
+
+    The same socket and config flags :meth:`libtmux.Server.cmd` passes, for
+    callers that spawn ``tmux`` themselves.
+
+    Examples
+    --------
+    >>> from libtmux.server import Server
+    >>> server_args(Server(socket_name="tmuxp_test", config_file="/dev/null"))
+    ['-Ltmuxp_test', '-f/dev/null']
+    """
+    args: list[str] = []
+    if server.socket_name:
+        args.append(f"-L{server.socket_name}")
+    if server.socket_path:
+        args.append(f"-S{server.socket_path}")
+    if server.config_file:
+        args.append(f"-f{server.config_file}")
+    return args
+
+
+@dataclasses.dataclass(frozen=True)
+class TmuxCommand:
+    """A tmux command waiting in a :class:`TmuxCommandBatch`.
+
+    Examples
+    --------
+    >>> cmd = TmuxCommand(("set-option", "-t", "$1", "status", "off"))
+    >>> cmd.name
+    'set-option'
+    >>> cmd.capture
+    False
+    """
+
+    args: tuple[str, ...]
+    """tmux subcommand followed by its arguments"""
+
+    capture: bool = False
+    """whether the command prints one line (``-P -F``) to hand back on flush"""
+
+    @property
+    def name(self) -> str:
+        """Return the tmux subcommand, e.g. ``split-window``."""
+        return self.args[0]
+
+
+def chain_args(commands: t.Iterable[TmuxCommand]) -> list[str]:
+    r"""Return ``commands`` as one escaped ``tmux cmd1 ; cmd2`` argument list.
+
+    Examples
+    --------
+    >>> chain_args([
+    ...     TmuxCommand(("send-keys", "-t", "%1", "echo hi;")),
+    ...     TmuxCommand(("send-keys", "-t", "%1", "Enter")),
+    ... ])
+    ['send-keys', '-t', '%1', 'echo hi\\;', ';', 'send-keys', '-t', '%1', 'Enter']
+    """
+    argv: list[str] = []
+    for command in commands:
+        if argv:
+            argv.append(";")
+        argv.extend(escape_tmux_arg(arg) for arg in command.args)
+    return argv
+
+
+def quote_tmux_arg(arg: t.Any) -> str:
+    r"""Quote ``arg`` for tmux's command parser.
+
+    Command strings (control-mode lines, hook commands) are parsed like a
+    tmux configuration file, where ``;``, ``#``, ``$``, ``~`` and braces are
+    special. Single quotes disable all of them; an embedded single quote is
+    closed, escaped and reopened.
+
+    Examples
+    --------
+    >>> quote_tmux_arg("echo hi;")
+    "'echo hi;'"
+    >>> quote_tmux_arg("#{window_id}")
+    "'#{window_id}'"
+    >>> print(quote_tmux_arg("it's"))
+    'it'\''s'
+    """
+    return "'" + str(arg).replace("'", "'\\''") + "'"
+
+
+def command_line(commands: t.Iterable[t.Sequence[t.Any]]) -> str:
+    """Return ``commands`` as one ``cmd1 ; cmd2`` tmux command string.
+
+    Examples
+    --------
+    >>> print(command_line([("send-keys", "-t", "%1", "ls;"), ("kill-pane",)]))
+    'send-keys' '-t' '%1' 'ls;' ; 'kill-pane'
+    """
+    return " ; ".join(
+        " ".join(quote_tmux_arg(arg) for arg in command) for command in commands
+    )
+
+
+MAX_CHAIN_BYTES = 8192
+"""argument bytes per chained invocation; tmux rejects a client command line
+larger than one 16 KiB protocol message"""
+
+
+def chunk_commands(
+    commands: t.Sequence[TmuxCommand],
+    limit: int = MAX_CHAIN_BYTES,
+) -> t.Iterator[list[TmuxCommand]]:
+    """Split ``commands`` into runs whose chained arguments fit in ``limit`` bytes.
+
+    A single command larger than ``limit`` still gets a run of its own.
+
+    Examples
+    --------
+    >>> commands = [TmuxCommand(("send-keys", "-t", "%1", "x" * 40))] * 5
+    >>> [len(chunk) for chunk in chunk_commands(commands, limit=130)]
+    [2, 2, 1]
+    """
+    chunk: list[TmuxCommand] = []
+    size = 0
+    for command in commands:
+        command_size = sum(len(arg.encode()) + 2 for arg in command.args) + 2
+        if chunk and size + command_size > limit:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(command)
+        size += command_size
+    if chunk:
+        yield chunk
+
+
+class TmuxCommandBatch:
+    """Queue tmux commands and flush them as a single ``tmux`` process.
+
+    tmux stops a chain at the first failing command, so a flush either runs
+    every queued command or raises :exc:`~tmuxp.exc.TmuxCommandBatchError`
+    carrying tmux's error output. A chain too long for one tmux command line
+    is sent as a few consecutive ones (see :func:`chunk_commands`).
+
+    Examples
+    --------
+    >>> batch = TmuxCommandBatch(server=session.server)
+    >>> slot = batch.queue(
+    ...     "new-window", "-d", "-t", f"{session.session_id}:",
+    ...     capture="#{window_id}",
+    ... )
+    >>> batch.queue("rename-window", "-t", f"{session.session_id}:", "batched")
+    1
+    >>> len(batch)
+    2
+    >>> results = batch.flush()
+    >>> results[slot].startswith("@")
+    True
+    >>> results[1] is None
+    True
+    >>> len(batch)
+    0
+
+    Flushing an empty batch spawns nothing:
+
+    >>> batch.flush()
+    []
+    """
+
+    def __init__(self, server: Server) -> None:
+        self.server = server
+        self._commands: list[TmuxCommand] = []
+
+    def __len__(self) -> int:
+        """Return the number of commands waiting to be flushed."""
+        return len(self._commands)
+
+    @property
+    def commands(self) -> tuple[TmuxCommand, ...]:
+        """Return the commands waiting to be flushed."""
+        return tuple(self._commands)
+
+    def fork(self) -> TmuxCommandBatch:
+        """Return an empty batch that flushes the same way as this one.
+
+        Each thread queueing commands needs a batch of its own.
+        """
+        return type(self)(server=self.server)
+
+    def queue(
+        self,
+        cmd: str,
+        *args: t.Any,
+        capture: str | None = None,
+        prints: bool = False,
+    ) -> int:
+        """Queue a tmux command for the next :meth:`flush`.
+
+        Parameters
+        ----------
+        cmd : str
+            tmux subcommand, e.g. ``split-window``
+        *args
+            subcommand arguments
+        capture : str, optional
+            tmux format for ``-P -F``; the line the command prints is returned
+            by :meth:`flush` at this command's position
+        prints : bool
+            the command prints one line without ``-P``, e.g.
+            ``display-message -p``; it is returned like a captured line
+
+        Returns
+        -------
+        int
+            position of the command in the list :meth:`flush` returns
+        """
+        argv = [cmd, *(str(arg) for arg in args)]
+        if capture is not None:
+            argv[1:1] = ["-P", "-F", capture]
+        self._commands.append(
+            TmuxCommand(args=tuple(argv), capture=capture is not None or prints)
+        )
+        return len(self._commands) - 1
+
+    def flush(self, report_all: bool = False) -> list[str | None]:
+        """Run every queued command in one ``tmux`` process.
+
+        Parameters
+        ----------
+        report_all : bool
+            if the chain fails, re-run each command on its own and report
+            every one that fails, not just the first. Only for commands that
+            can safely run twice, such as ``set-option``.
+
+        Returns
+        -------
+        list of str or None
+            one entry per queued command: the captured line for commands
+            queued with ``capture``, otherwise ``None``
+
+        Raises
+        ------
+        :exc:`~tmuxp.exc.TmuxCommandBatchError`
+            tmux reported an error; commands after the failing one did not run
+        :exc:`~tmuxp.exc.TmuxCommandsFailedError`
+            with ``report_all``, one or more commands failed; every other
+            command ran
+        """
+        if not self._commands:
+            return []
+        commands, self._commands = self._commands, []
+
+        stdout: list[str] = []
+        stderr: list[str] = []
+        for chunk in chunk_commands(commands):
+            chunk_stdout, stderr = self._dispatch(chunk)
+            stdout.extend(chunk_stdout)
+            if stderr:
+                break
+        if stderr and report_all:
+            self._report_each(commands)
+        return self._results(commands, stdout, stderr)
+
+    def _report_each(self, commands: list[TmuxCommand]) -> None:
+        """Re-run ``commands`` one at a time and raise for every failure.
+
+        Returns without raising if none fails on its own.
+        """
+        failures: list[tuple[tuple[str, ...], list[str]]] = []
+        for command in commands:
+            _stdout, stderr = self._dispatch([command])
+            if stderr:
+                logger.error(
+                    "tmux command failed",
+                    extra={
+                        "tmux_subcommand": command.name,
+                        "tmux_stderr": stderr,
+                    },
+                )
+                failures.append((command.args, stderr))
+        if failures:
+            raise exc.TmuxCommandsFailedError(failures)
+
+    def _results(
+        self,
+        commands: list[TmuxCommand],
+        stdout: list[str],
+        stderr: list[str],
+    ) -> list[str | None]:
+        """Map a dispatched chain's output back onto its commands."""
+        logger.debug(
+            "tmux command batch flushed",
+            extra={
+                "tmux_subcommand": ",".join(c.name for c in commands),
+                "tmux_stdout_len": len(stdout),
+            },
+        )
+
+        outputs = iter(stdout)
+        results = [next(outputs, None) if c.capture else None for c in commands]
+        if stderr:
+            raise exc.TmuxCommandBatchError(
+                stderr=stderr,
+                commands=[c.args for c in commands],
+            )
+        return results
+
+    def _dispatch(self, commands: list[TmuxCommand]) -> tuple[list[str], list[str]]:
+        """Run ``commands`` as one chained ``tmux`` process.
+
+        Subclasses may send the chain over another transport; see
+        :mod:`tmuxp.workspace.builder.control`.
+
+        Returns
+        -------
+        tuple of (list of str, list of str)
+            stdout and stderr lines of the chain
+        """
+        proc = self.server.cmd(*chain_args(commands))
+        return proc.stdout, proc.stderr
@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import collections
+import contextlib
+import functools
 import logging
 import os
+import pathlib
+import shlex
 import shutil
+import threading
 import time
 import typing as t
+from concurrent.futures import Future, ThreadPoolExecutor
 
+from libtmux import exc as tmux_exc
 from libtmux._internal.query_list import ObjectDoesNotExist
+from libtmux.common import get_version, raise_if_stderr, session_check_name
+from libtmux.constants import PaneDirection
+from libtmux.formats import FORMAT_SEPARATOR
+from libtmux.neo import get_output_format, parse_output
 from libtmux.pane import Pane
 from libtmux.server import Server
 from libtmux.session import Session
@@ -16,16 +28,34 @@ from libtmux.window import Window
 
 from tmuxp import exc
 from tmuxp.log import TmuxpLoggerAdapter
-from tmuxp.util import get_current_pane, run_before_script
+from tmuxp.util import get_current_pane
+from tmuxp.workspace import model
+from tmuxp.workspace.before_script import run_before_scripts
+from tmuxp.workspace.builder.batch import (
+    TmuxCommandBatch,
+    command_line,
+    escape_tmux_arg,
+)
+from tmuxp.workspace.builder.layout import SplitStep, plan_splits
+from tmuxp.workspace.builder.pool import ShellPool
+from tmuxp.workspace.builder.readiness import (
+    _PANE_CURSOR_FORMAT,
+    PaneOutputListener,
+    _ready_pane_ids,
+    readiness_intervals,
+)
+from tmuxp.workspace.builder.reconcile import LiveWindow, ReconcileStep, plan_reconcile
+from tmuxp.workspace.builder.schedule import PauseScheduler, run_steps
 from tmuxp.workspace.options import (
     PaneReadiness,
+    PaneReadinessStrategy,
     WorkspaceBuilderOptions,
     resolve_session_shell,
     shell_is_zsh,
 )
 
 if t.TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterator, Sequence
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +68,8 @@ def _wait_for_pane_ready(
     """Wait for pane shell to draw its prompt.
 
     Polls the pane's cursor position until it moves from origin (0, 0),
-    indicating the shell has finished initializing and drawn its prompt.
+    indicating the shell has finished initializing and drawn its prompt. A
+    single-pane :func:`_wait_for_panes_ready`.
 
     Parameters
     ----------
@@ -63,30 +94,546 @@ def _wait_for_pane_ready(
     >>> _wait_for_pane_ready(pane, timeout=5.0)
     True
     """
-    start = time.monotonic()
-    while time.monotonic() - start < timeout:
+    ready = _wait_for_panes_ready(
+        [pane],
+        timeout=timeout,
+        interval=interval,
+        strategy=PaneReadinessStrategy.POLL,
+    )
+    return str(pane.pane_id) in ready
+
+
+def _wait_for_panes_ready(
+    panes: Sequence[Pane],
+    timeout: float = 2.0,
+    interval: float = 0.05,
+    strategy: PaneReadinessStrategy = PaneReadinessStrategy.BACKOFF,
+    list_panes: t.Callable[[], tuple[list[str], list[str]]] | None = None,
+) -> set[str]:
+    """Wait for several panes' shells to draw their prompts, together.
+
+    Each check runs a single ``list-panes -a`` for every pane still waiting,
+    and ``timeout`` is a deadline for the whole group rather than per pane,
+    so a window of N panes waits about as long as its slowest shell instead
+    of the sum of all of them. ``strategy`` paces the checks; see
+    :mod:`tmuxp.workspace.builder.readiness`.
+
+    Parameters
+    ----------
+    panes : sequence of :class:`libtmux.Pane`
+        panes to wait for
+    timeout : float
+        maximum seconds to wait for the group before giving up
+    interval : float
+        seconds before the second check; ``backoff`` doubles it from there
+    strategy : :class:`~tmuxp.workspace.options.PaneReadinessStrategy`
+        how to pace the checks
+    list_panes : callable, optional
+        runs ``list-panes -a`` with the readiness format and returns its
+        stdout and stderr lines; by default a ``tmux`` process of the panes'
+        server. Builders pass their own transport.
+
+    Returns
+    -------
+    set of str
+        ids of the panes that became ready
+
+    Examples
+    --------
+    >>> pane = session.active_window.active_pane
+    >>> other = pane.split()
+    >>> _wait_for_panes_ready([pane, other], timeout=5.0) == {
+    ...     pane.pane_id, other.pane_id
+    ... }
+    True
+
+    Or wake up when the panes print, rather than on a timer:
+
+    >>> third = other.split()
+    >>> _wait_for_panes_ready(
+    ...     [third], timeout=5.0, strategy=PaneReadinessStrategy.EVENT
+    ... ) == {third.pane_id}
+    True
+    """
+    ready: set[str] = set()
+    if not panes:
+        return ready
+    server = panes[0].server
+    if list_panes is None:
+
+        def list_panes() -> tuple[list[str], list[str]]:
+            proc = server.cmd("list-panes", "-a", "-F", _PANE_CURSOR_FORMAT)
+            return proc.stdout, proc.stderr
+
+    waiting = {str(pane.pane_id) for pane in panes}
+    deadline = time.monotonic() + timeout
+    intervals = readiness_intervals(strategy, interval)
+
+    listener = None
+    if strategy is PaneReadinessStrategy.EVENT:
         try:
-            pane.refresh()
-        except Exception:
-            logger.debug(
-                "pane refresh failed during readiness check",
-                exc_info=True,
-                extra={"tmux_pane": str(pane.pane_id)},
+            listener = PaneOutputListener(
+                server=server,
+                target=str(panes[0].session_id),
             )
-            return False
-        if pane.cursor_x != "0" or pane.cursor_y != "0":
+        except exc.TmuxControlModeError:
             logger.debug(
-                "pane ready, cursor moved from origin",
-                extra={"tmux_pane": str(pane.pane_id)},
+                "pane output listener unavailable, backing off instead",
+                exc_info=True,
             )
-            return True
-        time.sleep(interval)
-    logger.debug(
-        "pane readiness check timed out after %.1f seconds",
-        timeout,
-        extra={"tmux_pane": str(pane.pane_id)},
-    )
-    return False
+
+    try:
+        while waiting and time.monotonic() < deadline:
+            stdout, stderr = list_panes()
+            if stderr:
+                logger.debug(
+                    "pane listing failed during readiness check",
+                    extra={"tmux_stderr": stderr},
+                )
+                return ready
+            now_ready, gone = _ready_pane_ids(stdout, waiting)
+            for pane_id in sorted(now_ready):
+                logger.debug(
+                    "pane ready, cursor moved from origin",
+                    extra={"tmux_pane": pane_id},
+                )
+            for pane_id in sorted(gone):
+                logger.debug(
+                    "pane exited during readiness check",
+                    extra={"tmux_pane": pane_id},
+                )
+            ready |= now_ready
+            waiting -= now_ready | gone
+            if not waiting:
+                break
+            remaining = max(deadline - time.monotonic(), 0)
+            if listener is not None:
+                listener.wait(waiting, timeout=remaining)
+            else:
+                time.sleep(min(next(intervals), remaining))
+    finally:
+        if listener is not None:
+            listener.close()
+
+    if waiting:
+        logger.debug(
+            "pane readiness check timed out after %.1f seconds",
+            timeout,
+            extra={"tmux_pane": " ".join(sorted(waiting))},
+        )
+    return ready
+
+
+def _option_value(value: t.Any) -> t.Any:
+    """Return ``value`` as tmux ``set-option`` expects it (booleans as on/off).
+
+    Mirrors the conversion :meth:`libtmux.Window.set_option` applies, for
+    options queued on a :class:`~tmuxp.workspace.builder.batch.TmuxCommandBatch`.
+
+    Examples
+    --------
+    >>> _option_value(True), _option_value(False), _option_value(50)
+    ('on', 'off', 50)
+    """
+    if isinstance(value, bool):
+        return "on" if value else "off"
+    return value
+
+
+def _new_window_settings(
+    window_config: dict[str, t.Any],
+) -> tuple[str | None, str | None, dict[str, str] | None]:
+    """Return ``start_directory``, shell and environment for ``new-window``.
+
+    The window's first pane is created with the window, so its settings win
+    over the window's own.
+
+    Examples
+    --------
+    >>> _new_window_settings({
+    ...     "start_directory": "/srv",
+    ...     "window_shell": "top",
+    ...     "panes": [{"start_directory": "/tmp", "environment": {"A": "1"}}],
+    ... })
+    ('/tmp', 'top', {'A': '1'})
+    """
+    panes = window_config["panes"]
+    start_directory = window_config.get("start_directory")
+    if panes and "start_directory" in panes[0]:
+        start_directory = panes[0]["start_directory"]
+
+    window_shell = window_config.get("window_shell")
+    try:
+        if panes[0]["shell"] != "":
+            window_shell = panes[0]["shell"]
+    except (KeyError, IndexError):
+        pass
+
+    environment = panes[0].get("environment", window_config.get("environment"))
+    return start_directory, window_shell, environment
+
+
+def _can_respawn_initial_window(session_config: dict[str, t.Any]) -> bool:
+    """Return True if the session's initial window may be respawned as the first.
+
+    ``respawn-window`` restarts a pane with the shell it was created with, so
+    a workspace setting ``default-shell`` or ``default-command`` gets a new
+    first window instead. Shared by the builder and
+    :func:`~tmuxp.workspace.builder.plan.compile_workspace`.
+
+    Examples
+    --------
+    >>> _can_respawn_initial_window({"options": {"base-index": 1}})
+    True
+    >>> _can_respawn_initial_window({"global_options": {"default-shell": "/bin/sh"}})
+    False
+    """
+    settings = {
+        **session_config.get("options", {}),
+        **session_config.get("global_options", {}),
+    }
+    return "default-shell" not in settings and "default-command" not in settings
+
+
+def _new_window_args(
+    session_id: str,
+    window_name: str | None,
+    start_directory: str | None,
+    window_index: str,
+    window_shell: str | None,
+    environment: dict[str, str] | None,
+) -> list[str]:
+    """Return ``new-window`` arguments matching :meth:`libtmux.Session.new_window`.
+
+    Examples
+    --------
+    >>> _new_window_args("$1", "editor", None, "", None, {"A": "1"})
+    ['-d', '-n', 'editor', '-eA=1', '-t$1:']
+    """
+    args: list[str] = ["-d"]
+    if start_directory:
+        args.append(f"-c{pathlib.Path(start_directory).expanduser()}")
+    if window_name is not None:
+        args.extend(["-n", window_name])
+    if environment:
+        args.extend(f"-e{k}={v}" for k, v in environment.items())
+    args.append(f"-t{session_id}:{window_index}")
+    if window_shell:
+        args.append(window_shell)
+    return args
+
+
+def _respawn_window_args(
+    window_id: str,
+    start_directory: str | None,
+    window_shell: str | None,
+    environment: dict[str, str] | None,
+) -> list[str]:
+    """Return ``respawn-window`` arguments that restart a window as ``new-window``.
+
+    The session's initial window is reused as the first configured window by
+    restarting its shell with the settings :func:`_new_window_args` would pass.
+
+    Examples
+    --------
+    >>> _respawn_window_args("@1", None, "top", {"A": "1"})
+    ['-k', '-eA=1', '-t', '@1', 'top']
+    """
+    args: list[str] = ["-k"]
+    if start_directory:
+        args.append(f"-c{pathlib.Path(start_directory).expanduser()}")
+    if environment:
+        args.extend(f"-e{k}={v}" for k, v in environment.items())
+    args.extend(["-t", window_id])
+    if window_shell:
+        args.append(window_shell)
+    return args
+
+
+def _split_window_args(
+    target: str,
+    pane: model.Pane,
+    step: SplitStep | None = None,
+) -> list[str]:
+    """Return ``split-window`` arguments for a pane after the window's first.
+
+    ``step`` gives the split's direction and size (see
+    :func:`~tmuxp.workspace.builder.layout.plan_splits`); without one, the
+    target is split in half, top to bottom.
+
+    Examples
+    --------
+    >>> from tmuxp.workspace.model import Pane
+    >>> pane = Pane.from_config(
+    ...     {"shell": "top", "shell_command": []},
+    ...     {"start_directory": "/srv"},
+    ... )
+    >>> _split_window_args("@1.0", pane)
+    ['-v', '-t', '@1.0', '-c/srv', 'top']
+
+    >>> from tmuxp.workspace.builder.layout import SplitStep
+    >>> step = SplitStep(pane=1, target=0, position=0, vertical=False, percent=67)
+    >>> _split_window_args("@1.0", Pane.from_config({"shell_command": []}, {}), step)
+    ['-h', '-t', '@1.0', '-l67%']
+    """
+    vertical = step is None or step.vertical
+    args: list[str] = ["-v" if vertical else "-h", "-t", target]
+    if step is not None and step.percent is not None:
+        args.append(f"-l{step.percent}%")
+    if pane.start_directory:
+        args.append(f"-c{pathlib.Path(pane.start_directory).expanduser()}")
+    if pane.environment:
+        args.extend(f"-e{k}={v}" for k, v in pane.environment.items())
+    if pane.shell:
+        args.append(pane.shell)
+    return args
+
+
+_LAZY_PLACEHOLDER = "cat"
+"""what a lazy window's only pane runs until the window is first selected"""
+
+
+def _builds_lazily(
+    window_config: dict[str, t.Any],
+    first_window: bool,
+    session_config: dict[str, t.Any],
+) -> bool:
+    """Return True if a window's panes wait until the window is first selected.
+
+    tmux runs the hook that builds a lazy window only when the session's
+    current window changes, so ``lazy`` is ignored on the window that is
+    current once the build is done: the one with ``focus``, or the first
+    window of a new session when no window has ``focus``.
+
+    Examples
+    --------
+    >>> workspace = {"windows": [{"panes": [{}]}, {"panes": [{}], "lazy": True}]}
+    >>> _builds_lazily(workspace["windows"][1], False, workspace)
+    True
+    >>> _builds_lazily({"panes": [{}], "lazy": True}, True, workspace)
+    False
+    >>> _builds_lazily({"panes": [{}], "lazy": True, "focus": True}, False, workspace)
+    False
+    """
+    if (
+        not window_config.get("lazy")
+        or not window_config["panes"]
+        or window_config.get("focus")
+    ):
+        return False
+    return not first_window or any(w.get("focus") for w in session_config["windows"])
+
+
+def _lazy_window_commands(
+    window_target: str,
+    placeholder: str,
+    window_config: dict[str, t.Any],
+    pane_base_index: int,
+    merge: bool = False,
+) -> list[tuple[str, ...]]:
+    """Return the commands that build a lazy window in place of its placeholder.
+
+    The window's first pane is split off the ``placeholder`` pane, which is
+    then killed; the other panes are split as
+    :meth:`ClassicWorkspaceBuilder._iter_create_panes_batched` splits them.
+    The layout is applied, each pane's commands are typed, with
+    ``run-shell -d`` for ``sleep_before`` / ``sleep_after``, the focused (or
+    last) pane is selected and ``options_after`` are set.
+
+    Examples
+    --------
+    >>> for command in _lazy_window_commands(
+    ...     "@4",
+    ...     "%9",
+    ...     {
+    ...         "layout": "even-horizontal",
+    ...         "options_after": {"synchronize-panes": True},
+    ...         "panes": [
+    ...             {"shell_command": [{"cmd": "top"}]},
+    ...             {"shell_command": [{"cmd": "ls", "sleep_before": 1}]},
+    ...         ],
+    ...     },
+    ...     pane_base_index=0,
+    ... ):
+    ...     print(command)
+    ('split-window', '-v', '-t', '%9')
+    ('kill-pane', '-t', '%9')
+    ('split-window', '-h', '-t', '@4.0', '-l50%')
+    ('select-layout', '-t', '@4', 'even-horizontal')
+    ('send-keys', '-t', '@4.0', ' top', 'Enter')
+    ('run-shell', '-d', '1')
+    ('send-keys', '-t', '@4.1', ' ls', 'Enter')
+    ('select-pane', '-t', '@4.1')
+    ('set-option', '-w', '-t', '@4', 'synchronize-panes', 'on')
+    """
+    window = model.Window.from_config(window_config)
+    layout = window.layout
+    commands: list[tuple[str, ...]] = [
+        ("split-window", *_split_window_args(placeholder, window.panes[0])),
+        ("kill-pane", "-t", placeholder),
+    ]
+    for step in plan_splits(layout, len(window.panes)):
+        target = f"{window_target}.{pane_base_index + step.position}"
+        commands.append(
+            (
+                "split-window",
+                *_split_window_args(target, window.panes[step.pane], step),
+            ),
+        )
+    if layout:
+        commands.append(("select-layout", "-t", window_target, layout))
+
+    focus = f"{window_target}.{pane_base_index + len(window.panes) - 1}"
+    for number, pane_model in enumerate(window.panes):
+        pane = f"{window_target}.{pane_base_index + number}"
+        for group in _send_keys_groups(pane_model.commands, merge=merge):
+            if group[0].sleep_before is not None:
+                commands.append(("run-shell", "-d", str(group[0].sleep_before)))
+            commands.append(("send-keys", "-t", pane, *_send_keys_args(group)))
+            if group[-1].sleep_after is not None:
+                commands.append(("run-shell", "-d", str(group[-1].sleep_after)))
+        if pane_model.focus:
+            focus = pane
+    commands.append(("select-pane", "-t", focus))
+
+    options_after = window_config.get("options_after")
+    if isinstance(options_after, dict):
+        commands.extend(
+            ("set-option", "-w", "-t", window_target, key, str(_option_value(value)))
+            for key, value in options_after.items()
+        )
+    return commands
+
+
+def _lazy_window_hook(
+    session_target: str,
+    window_target: str,
+    commands: list[tuple[str, ...]],
+) -> tuple[str, str]:
+    """Return the ``set-hook`` name and command that run ``commands`` once.
+
+    The hook fires whenever the session's current window changes; it runs
+    ``commands`` only when the new current window is ``window_target``, and
+    then removes itself. Each lazy window gets a hook of its own, indexed by
+    its window ID.
+
+    Examples
+    --------
+    >>> hook, command = _lazy_window_hook("$1", "@4", [("kill-pane", "-t", "%9")])
+    >>> hook
+    'session-window-changed[4]'
+    >>> print(command)
+    if-shell -F '#{==:#{window_id},@4}' { 'kill-pane' '-t' '%9' ; 'set-hook' ...}
+    """
+    hook = f"session-window-changed[{window_target.lstrip('@')}]"
+    body = command_line([*commands, ("set-hook", "-u", "-t", session_target, hook)])
+    condition = f"#{{==:#{{window_id}},{window_target}}}"
+    return hook, f"if-shell -F '{condition}' {{ {body} }}"
+
+
+def _join_pane_args(
+    pane_id: str,
+    target: str,
+    step: SplitStep | None = None,
+) -> list[str]:
+    """Return ``join-pane`` arguments that put ``pane_id`` where a split would.
+
+    The pooled shell ``pane_id`` lands where :func:`_split_window_args` would
+    have split a new pane off ``target``, with the same direction and size.
+
+    Examples
+    --------
+    >>> from tmuxp.workspace.builder.layout import SplitStep
+    >>> step = SplitStep(pane=1, target=0, position=0, vertical=False, percent=67)
+    >>> _join_pane_args("%7", "@1.0", step)
+    ['-h', '-s', '%7', '-t', '@1.0', '-l67%']
+    >>> _join_pane_args("%7", "@1.0")
+    ['-v', '-s', '%7', '-t', '@1.0']
+    """
+    vertical = step is None or step.vertical
+    args: list[str] = ["-v" if vertical else "-h", "-s", pane_id, "-t", target]
+    if step is not None and step.percent is not None:
+        args.append(f"-l{step.percent}%")
+    return args
+
+
+def _cd_keys(directory: str) -> list[str]:
+    """Return ``send-keys`` key arguments that move a pooled shell to ``directory``.
+
+    Examples
+    --------
+    >>> _cd_keys("/srv/my app")
+    [" cd -- '/srv/my app'", 'Enter']
+    """
+    path = str(pathlib.Path(directory).expanduser())
+    return [f" cd -- {shlex.quote(path)}", "Enter"]
+
+
+def _send_keys_groups(
+    commands: Sequence[model.Command],
+    merge: bool = True,
+) -> list[list[model.Command]]:
+    """Group a pane's commands into runs that can share one ``send-keys``.
+
+    A run breaks before a command with ``sleep_before`` and after one with
+    ``sleep_after`` or ``enter: false``, so every pause and every unfinished
+    line still falls between two ``send-keys``. With ``merge`` off, each
+    command is a run of its own.
+
+    Examples
+    --------
+    >>> from tmuxp.workspace.model import Pane
+    >>> commands = Pane.from_config(
+    ...     {
+    ...         "shell_command": [
+    ...             {"cmd": "a"},
+    ...             {"cmd": "b"},
+    ...             {"cmd": "c", "sleep_before": 1},
+    ...             {"cmd": "d", "sleep_before": None, "enter": False},
+    ...             {"cmd": "e"},
+    ...         ],
+    ...     },
+    ...     {},
+    ... ).commands
+    >>> [[c.cmd for c in run] for run in _send_keys_groups(commands)]
+    [['a', 'b'], ['c', 'd'], ['e']]
+    >>> len(_send_keys_groups(commands, merge=False))
+    5
+    """
+    groups: list[list[model.Command]] = []
+    for command in commands:
+        if (
+            merge
+            and groups
+            and command.sleep_before is None
+            and groups[-1][-1].sleep_after is None
+            and groups[-1][-1].enter
+        ):
+            groups[-1].append(command)
+        else:
+            groups.append([command])
+    return groups
+
+
+def _send_keys_args(group: Sequence[model.Command]) -> list[str]:
+    """Return the ``send-keys`` key arguments that type ``group``.
+
+    Examples
+    --------
+    >>> from tmuxp.workspace.model import Pane
+    >>> commands = Pane.from_config(
+    ...     {"shell_command": [{"cmd": "a"}, {"cmd": "b", "enter": False}]},
+    ...     {},
+    ... ).commands
+    >>> _send_keys_args(commands)
+    [' a', 'Enter', ' b']
+    """
+    keys: list[str] = []
+    for command in group:
+        keys.append((" " if command.suppress_history else "") + command.cmd)
+        if command.enter:
+            keys.append("Enter")
+    return keys
 
 
 COLUMNS_FALLBACK = 80
@@ -112,6 +659,99 @@ def get_default_rows() -> int:
     )
 
 
+_SESSION_STATE_FORMAT = FORMAT_SEPARATOR.join(
+    ["#{base-index}", "#{pane-base-index}", "#{session_windows}", ""],
+)
+
+
+class _SessionState(t.NamedTuple):
+    """What the builder knows of a session without asking tmux again.
+
+    Read from the output of ``new-session`` when the builder creates the
+    session, otherwise from one ``display-message``.
+    """
+
+    row: dict[str, t.Any]
+    """``list-panes`` row of the session's active window and pane"""
+    base_index: int
+    pane_base_index: int
+    window_count: int
+
+    @property
+    def session_id(self) -> str:
+        """Return the session's ID."""
+        return str(self.row["session_id"])
+
+    @classmethod
+    def from_output(cls, output: str, version: str) -> _SessionState:
+        """Parse a line printed with ``_SESSION_STATE_FORMAT`` + ``list-panes``."""
+        base_index, pane_base_index, window_count, pane = output.split(
+            FORMAT_SEPARATOR,
+            3,
+        )
+        return cls(
+            row=dict(parse_output(pane, "list-panes", version)),
+            base_index=int(base_index),
+            pane_base_index=int(pane_base_index),
+            window_count=int(window_count),
+        )
+
+
+class _UnfinishedWindow(t.NamedTuple):
+    """A window whose panes are built, waiting for :meth:`_finish_window`."""
+
+    window: Window
+    window_config: dict[str, t.Any]
+    replay: list[t.Callable[[], None]]
+    """progress and build events held back while earlier windows finish"""
+    focus_pane: Pane | None = None
+
+
+class _BeforeScript:
+    """A ``before_script`` running on a thread of its own while the build goes on.
+
+    Started by ``background_before_script``; :meth:`wait` waits for it to end,
+    and :attr:`error` holds what it raised.
+    """
+
+    def __init__(
+        self,
+        script: str | list[dict[str, t.Any]],
+        cwd: pathlib.Path | None,
+        on_line: t.Callable[[str], None] | None,
+    ) -> None:
+        self.started = time.monotonic()
+        self.finished: float | None = None
+        self.error: Exception | None = None
+        self.reported = False
+        """whether the build has reported the script's end"""
+        self.lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(script, cwd, on_line),
+            name="tmuxp-before-script",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(
+        self,
+        script: str | list[dict[str, t.Any]],
+        cwd: pathlib.Path | None,
+        on_line: t.Callable[[str], None] | None,
+    ) -> None:
+        try:
+            run_before_scripts(script, cwd=cwd, on_line=on_line)
+        except Exception as e:  # noqa: BLE001 - re-raised by the build
+            self.error = e
+        finally:
+            self.finished = time.monotonic()
+
+    def wait(self) -> None:
+        """Wait for the script to end."""
+        self._thread.join()
+
+
 class ClassicWorkspaceBuilder:
     """Load workspace from workspace :class:`dict` object.
 
@@ -241,12 +881,23 @@ class ClassicWorkspaceBuilder:
     ...     on_build_event=events.append,
     ... )
     >>> builder.build()
-    >>> [e["event"] for e in events]
-    ['session_created', 'window_started', 'pane_creating',
-     'window_done', 'workspace_built']
+    >>> [e["event"] for e in events if e["event"] != "panes_ready"]
+    ['session_created', 'window_started', 'pane_creating', 'panes_created',
+     'commands_sent', 'window_done', 'workspace_built']
     >>> next(e for e in events if e["event"] == "session_created")["session_pane_total"]
     1
 
+    Every event carries its :func:`time.monotonic` ``time``; those closing a
+    phase (the session's creation, ``before_script``, a window's panes, their
+    readiness wait and commands, each window, the whole build) also carry its
+    ``duration`` in seconds:
+
+    >>> window_done = next(e for e in events if e["event"] == "window_done")
+    >>> window_done["window"], window_done["duration"] >= 0
+    ('main', True)
+    >>> all(e["time"] <= events[-1]["time"] for e in events)
+    True
+
     **Build events with before_script:**
 
     ``before_script_started`` fires before the script runs;
@@ -325,6 +976,7 @@ class ClassicWorkspaceBuilder:
     on_build_event: t.Callable[[dict[str, t.Any]], None] | None
     _builder_options: WorkspaceBuilderOptions
     _pane_readiness_wait: bool
+    _build_command_batch: TmuxCommandBatch | None
 
     def __init__(
         self,
@@ -395,6 +1047,41 @@ class ClassicWorkspaceBuilder:
         # Safe default for direct iter_create_panes() use that bypasses build();
         # build() replaces this with the policy-resolved value.
         self._pane_readiness_wait = True
+        # Set by build(): takes sleep_before/sleep_after pauses off the build's
+        # path. None (direct iter_create_panes() use) sleeps inline.
+        self._pause_scheduler: PauseScheduler | None = None
+        # Per-thread state for parallel_windows: deferred callbacks and the
+        # thread's own command batch.
+        self._local = threading.local()
+        # Set by build() when ``batch_commands`` is on; None sends each command
+        # through libtmux as its own tmux process.
+        self._command_batch = None
+        # First pane of each window created through the batch, or reused from
+        # the session's initial window, so iter_create_panes needn't look it up.
+        self._first_panes: dict[str, Pane] = {}
+        # Name and start time of each window being built, by window ID, for
+        # the ``duration`` of its build events.
+        self._window_spans: dict[str, tuple[str, float]] = {}
+        # Set when a build starts, for the ``duration`` of ``workspace_built``.
+        self._build_started = time.monotonic()
+        # The session's initial window, base-index, pane-base-index and window
+        # count: read from new-session's output, or asked of tmux once per build.
+        self._session_state: _SessionState | None = None
+        # The pane new-session started, which the first window may respawn.
+        self._created_pane_id: str | None = None
+        # Set by build() when ``shell_pool`` is on and the workspace can use it.
+        self._shell_pool: ShellPool | None = None
+        # Panes moved in from the shell pool; their prompt is already drawn.
+        self._pooled_pane_ids: set[str] = set()
+        # Windows whose panes a hook builds when they are first selected.
+        self._lazy_window_ids: set[str] = set()
+        # Set by build() when ``background_before_script`` starts the script;
+        # pane commands wait for it in _join_before_script().
+        self._before_script: _BeforeScript | None = None
+        # Set by build(): the workspace resolved once into models, and its
+        # windows by the ID of their config; see _window_model().
+        self._session_model: model.Session | None = None
+        self._window_models: dict[int, model.Window] = {}
 
         if self.server is not None and self.session_exists(
             session_name=self.session_config["session_name"],
@@ -445,6 +1132,568 @@ class ClassicWorkspaceBuilder:
         append : bool
             append windows in current active session
         """
+        session = self._start_build(session)
+
+        self._pause_scheduler = PauseScheduler()
+        try:
+            if self._builder_options.parallel_windows > 1:
+                focus = self._build_windows_parallel(session, append)
+            else:
+                focus = self._build_windows(session, append)
+            self._pause_scheduler.wait()
+        finally:
+            self._pause_scheduler.close()
+            self._pause_scheduler = None
+
+        if focus:
+            focus.select()
+
+        self._finish_build()
+
+    def reconcile(self, session: Session | None = None) -> list[ReconcileStep]:
+        """Create only the windows and panes a running session is missing.
+
+        Windows are matched to the session's by ``window_index`` and name (see
+        :func:`~tmuxp.workspace.builder.reconcile.plan_reconcile`). Missing
+        windows are built as :meth:`build` would, in their old slot where it is
+        free; a window with fewer panes than configured gets the rest split
+        off its last pane, and only those panes' commands are sent. Existing
+        windows and panes, and whatever runs in them, are left alone; so are
+        windows the workspace does not mention. ``before_script`` and session
+        options are not run again.
+
+        Parameters
+        ----------
+        session : :class:`libtmux.Session`, optional
+            session to reconcile; defaults to the workspace's running session
+
+        Returns
+        -------
+        list of :class:`~tmuxp.workspace.builder.reconcile.ReconcileStep`
+            what was created, one step per window that needed anything
+
+        Examples
+        --------
+        >>> workspace = {
+        ...     "session_name": "reconcile-doctest",
+        ...     "windows": [
+        ...         {
+        ...             "window_name": "one",
+        ...             "panes": [{"shell_command": []}, {"shell_command": []}],
+        ...         },
+        ...         {"window_name": "two", "panes": [{"shell_command": []}]},
+        ...     ],
+        ... }
+        >>> builder = ClassicWorkspaceBuilder(session_config=workspace, server=server)
+        >>> builder.build()
+        >>> builder.session.windows.get(window_name="two").kill()
+        >>> builder.session.windows[0].panes[1].kill()
+
+        >>> builder = ClassicWorkspaceBuilder(session_config=workspace, server=server)
+        >>> [step.missing for step in builder.reconcile()]
+        [False, True]
+        >>> [(w.window_name, len(w.panes)) for w in builder.session.windows]
+        [('one', 2), ('two', 1)]
+        >>> builder.reconcile()
+        []
+        """
+        self._build_started = time.monotonic()
+        self._session_state = None
+        self._created_pane_id = None
+        self._before_script = None
+        if session is not None:
+            self._session = session
+        session = self.session
+
+        live_windows = list(session.windows)
+        # The base-index in effect for the session, set on it or globally.
+        base_index = self._get_session_state(str(session.session_id)).base_index
+        steps = plan_reconcile(
+            self.session_config["windows"],
+            [
+                LiveWindow(
+                    window.window_name or "",
+                    int(window.window_index or 0),
+                    len(window.panes),
+                )
+                for window in live_windows
+            ],
+            base_index,
+        )
+        window_configs = self.session_config["windows"]
+        missing_windows = [
+            {**window_configs[step.position], "window_index": step.window_index}
+            for step in steps
+            if step.missing
+        ]
+
+        if self.on_progress:
+            self.on_progress(f"Session found: {session.name}")
+        self._build_event(
+            {
+                "event": "session_created",
+                "name": session.name,
+                "window_total": len(missing_windows),
+                "session_pane_total": sum(step.missing_panes for step in steps),
+                "duration": time.monotonic() - self._build_started,
+            }
+        )
+        TmuxpLoggerAdapter(
+            logger,
+            {"tmux_session": self.session_config["session_name"]},
+        ).info(
+            "session reconciling",
+            extra={
+                "tmux_window_count": len(missing_windows),
+                "tmux_pane_count": sum(step.missing_panes for step in steps),
+            },
+        )
+
+        if not steps:
+            self._finish_build()
+            return steps
+
+        self._prepare_windows()
+        focus = None
+        self._pause_scheduler = PauseScheduler()
+        try:
+            for step in steps:
+                if step.live is not None:
+                    self._add_missing_panes(
+                        live_windows[step.live],
+                        window_configs[step.position],
+                        step.missing_panes,
+                    )
+            if missing_windows:
+                if self._builder_options.parallel_windows > 1:
+                    focus = self._build_windows_parallel(
+                        session,
+                        append=True,
+                        window_configs=missing_windows,
+                    )
+                else:
+                    focus = self._build_windows(
+                        session,
+                        append=True,
+                        window_configs=missing_windows,
+                    )
+            self._pause_scheduler.wait()
+        finally:
+            self._pause_scheduler.close()
+            self._pause_scheduler = None
+
+        if focus:
+            focus.select()
+
+        self._finish_build()
+        return steps
+
+    def _add_missing_panes(
+        self,
+        window: Window,
+        window_config: dict[str, t.Any],
+        count: int,
+    ) -> None:
+        """Split a live window's last ``count`` configured panes off its last pane.
+
+        The window's ``layout`` is applied again afterwards; its other panes
+        keep running untouched.
+        """
+        pane_models = self._window_model(window_config).panes[-count:]
+        version, format_string = self._captured_pane_format()
+        target = window.panes[-1]
+        panes: list[Pane] = []
+        for pane_model in pane_models:
+            self._progress(f"Adding pane to window: {window.window_name}")
+            args = _split_window_args(str(target.pane_id), pane_model)
+            stdout = self._run_or_raise(
+                "split-window",
+                "-P",
+                "-F",
+                format_string,
+                *args,
+            )
+            row = parse_output(stdout[0], "list-panes", version)
+            target = Pane(server=self.server, **row)
+            panes.append(target)
+
+        if self._pane_readiness_wait:
+            _wait_for_panes_ready(
+                [
+                    pane
+                    for pane, pane_model in zip(panes, pane_models, strict=True)
+                    if pane_model.shell is None
+                ],
+                strategy=self._builder_options.pane_readiness_strategy,
+                list_panes=self._list_pane_cursors,
+            )
+
+        batch = self._command_batch
+        if batch is not None:
+            if "layout" in window_config:
+                batch.queue(
+                    "select-layout", "-t", window.window_id, window_config["layout"]
+                )
+        elif "layout" in window_config:
+            window.select_layout(window_config["layout"])
+
+        for pane, pane_model in zip(panes, pane_models, strict=True):
+            pane_log = TmuxpLoggerAdapter(
+                logger,
+                {
+                    "tmux_session": window.session_name or "",
+                    "tmux_window": window.name or "",
+                    "tmux_pane": pane.pane_id or "",
+                },
+            )
+            pane_log.debug("pane created")
+            if batch is not None:
+                self._queue_pane_commands(batch, pane, pane_model.commands, pane_log)
+                if pane_model.focus:
+                    batch.queue("select-pane", "-t", pane.pane_id)
+                continue
+            self._send_pane_commands(pane, pane_model.commands, pane_log)
+            if pane_model.focus:
+                pane.select()
+        if batch is not None:
+            batch.flush()
+
+    def _build_windows(
+        self,
+        session: Session,
+        append: bool,
+        window_configs: Sequence[dict[str, t.Any]] | None = None,
+    ) -> Window | None:
+        """Create and fill each window in turn.
+
+        A window whose panes are still waiting out a ``sleep_before`` /
+        ``sleep_after`` pause is finished (``options_after``, hooks,
+        ``window_done``) once its pauses are over, so later windows need not
+        wait for it. Their progress and build events are held back meanwhile
+        and replayed in window order.
+
+        Returns
+        -------
+        :class:`libtmux.Window` or None
+            the window to focus once the build is done
+        """
+        assert self._pause_scheduler is not None
+        focus = None
+        unfinished: collections.deque[_UnfinishedWindow] = collections.deque()
+        windows = self.iter_create_windows(session, append, window_configs)
+        while True:
+            replay: list[t.Callable[[], None]] = []
+            with self._deferred_callbacks(replay if unfinished else None):
+                created = next(windows, None)
+                if created is None:
+                    break
+                window, window_config = created
+                assert isinstance(window, Window)
+
+                for plugin in self.plugins:
+                    plugin.on_window_create(window)
+
+                if window_config.get("focus"):
+                    focus = window
+
+                focus_pane = self._fill_window(window, window_config)
+
+            unfinished.append(
+                _UnfinishedWindow(window, window_config, replay, focus_pane),
+            )
+            while unfinished and not self._pause_scheduler.pending(
+                unfinished[0].window.window_id,
+            ):
+                self._finish_window(unfinished.popleft())
+
+        while unfinished:
+            self._finish_window(unfinished.popleft())
+        return focus
+
+    def _build_windows_parallel(
+        self,
+        session: Session,
+        append: bool,
+        window_configs: Sequence[dict[str, t.Any]] | None = None,
+    ) -> Window | None:
+        """Create windows in order, then fill them on a thread pool.
+
+        Windows are created one after another on this thread, so their indexes
+        and ``on_window_create`` hooks follow the workspace. Up to
+        ``parallel_windows`` threads then create each window's panes and send
+        their commands, each through its own command batch. Progress and build
+        events are held back per window and replayed in window order, each
+        window's followed by its ``after_window_finished`` hooks, just as a
+        sequential build reports them.
+
+        Returns
+        -------
+        :class:`libtmux.Window` or None
+            the window to focus once the build is done
+        """
+        focus = None
+        pending: list[tuple[_UnfinishedWindow, Future[Pane | None]]] = []
+        pool = ThreadPoolExecutor(
+            max_workers=self._builder_options.parallel_windows,
+            thread_name_prefix="tmuxp-window",
+        )
+        try:
+            windows = self.iter_create_windows(session, append, window_configs)
+            while True:
+                replay: list[t.Callable[[], None]] = []
+                with self._deferred_callbacks(replay):
+                    created = next(windows, None)
+                if created is None:
+                    break
+                window, window_config = created
+                assert isinstance(window, Window)
+
+                for plugin in self.plugins:
+                    plugin.on_window_create(window)
+
+                if window_config.get("focus"):
+                    focus = window
+
+                future = pool.submit(
+                    self._fill_window_in_thread,
+                    window,
+                    window_config,
+                    replay,
+                )
+                pending.append(
+                    (_UnfinishedWindow(window, window_config, replay), future),
+                )
+
+            for unfinished, future in pending:
+                focus_pane = future.result()
+                self._finish_window(unfinished._replace(focus_pane=focus_pane))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        return focus
+
+    def _fill_window(
+        self,
+        window: Window,
+        window_config: dict[str, t.Any],
+    ) -> Pane | None:
+        """Create a window's panes and type their commands.
+
+        Returns
+        -------
+        :class:`libtmux.Pane` or None
+            the pane marked ``focus``, if any
+        """
+        if str(window.window_id) in self._lazy_window_ids:
+            self._defer_window(window, window_config)
+            return None
+
+        focus_pane = None
+        for pane, pane_config in self.iter_create_panes(window, window_config):
+            assert isinstance(pane, Pane)
+
+            if pane_config.get("focus"):
+                focus_pane = pane
+
+        return focus_pane
+
+    def _defer_window(self, window: Window, window_config: dict[str, t.Any]) -> None:
+        """Hand a lazy window's panes to a hook run when it is first selected.
+
+        The window holds only its placeholder pane. The commands that build
+        its panes (see :func:`_lazy_window_commands`) are set as a
+        ``session-window-changed`` hook on the session instead of being run.
+        """
+        placeholder = (
+            self._first_panes.pop(str(window.window_id), None) or window.active_pane
+        )
+        assert placeholder is not None
+        # The hook types the window's commands.
+        self._join_before_script()
+        args = self._lazy_window_hook_args(
+            window,
+            str(placeholder.pane_id),
+            window_config,
+            self._get_pane_base_index(window),
+        )
+        batch = self._command_batch
+        if batch is None:
+            proc = self.server.cmd("set-hook", *args)
+            raise_if_stderr(proc, "set-hook")
+        else:
+            batch.queue("set-hook", *args)
+            batch.flush()
+        self._build_event(
+            {"event": "window_deferred", "window": self._window_label(window)},
+        )
+        TmuxpLoggerAdapter(
+            logger,
+            {
+                "tmux_session": window.session_name or "",
+                "tmux_window": window.window_name or "",
+            },
+        ).debug("window deferred until selected")
+
+    def _lazy_window_hook_args(
+        self,
+        window: Window,
+        placeholder: str,
+        window_config: dict[str, t.Any],
+        pane_base_index: int,
+    ) -> list[str]:
+        """Return the ``set-hook`` arguments that build a lazy window on selection."""
+        hook, command = _lazy_window_hook(
+            str(window.session_id),
+            str(window.window_id),
+            _lazy_window_commands(
+                str(window.window_id),
+                placeholder,
+                window_config,
+                pane_base_index,
+                merge=self._builder_options.batch_send_keys,
+            ),
+        )
+        return ["-t", str(window.session_id), hook, command]
+
+    def _fill_window_in_thread(
+        self,
+        window: Window,
+        window_config: dict[str, t.Any],
+        replay: list[t.Callable[[], None]],
+    ) -> Pane | None:
+        """Run :meth:`_fill_window` on a pool thread, deferring its callbacks."""
+        shared_batch = self._command_batch
+        if shared_batch is not None:
+            self._local.command_batch = shared_batch.fork()
+        try:
+            with self._deferred_callbacks(replay):
+                return self._fill_window(window, window_config)
+        finally:
+            if shared_batch is not None:
+                del self._local.command_batch
+
+    def _finish_window(self, unfinished: _UnfinishedWindow) -> None:
+        """Finish a filled window once its panes' pauses are over.
+
+        Replays the window's held-back events, applies ``options_after``, runs
+        ``after_window_finished`` hooks and reports the window as done.
+        """
+        window = unfinished.window
+        if self._pause_scheduler is not None:
+            self._pause_scheduler.wait(window.window_id)
+
+        for callback in unfinished.replay:
+            callback()
+
+        # A lazy window's options_after are set by its hook, after its panes.
+        if str(window.window_id) not in self._lazy_window_ids:
+            self.config_after_window(window, unfinished.window_config)
+
+        for plugin in self.plugins:
+            plugin.after_window_finished(window)
+
+        if unfinished.focus_pane:
+            unfinished.focus_pane.select()
+
+        name, started = self._window_spans.pop(
+            str(window.window_id),
+            (window.window_name or "", time.monotonic()),
+        )
+        self._timed_event({"event": "window_done", "window": name}, started)
+
+    @contextlib.contextmanager
+    def _deferred_callbacks(
+        self,
+        replay: list[t.Callable[[], None]] | None,
+    ) -> Iterator[None]:
+        """Collect this thread's progress and build events into ``replay``.
+
+        ``None`` reports them as they happen.
+        """
+        previous = getattr(self._local, "replay", None)
+        self._local.replay = replay
+        try:
+            yield
+        finally:
+            self._local.replay = previous
+
+    def _progress(self, message: str) -> None:
+        """Report progress, or hold it back while callbacks are deferred."""
+        if not self.on_progress:
+            return
+        replay = getattr(self._local, "replay", None)
+        if replay is None:
+            self.on_progress(message)
+        else:
+            replay.append(functools.partial(self.on_progress, message))
+
+    def _build_event(self, event: dict[str, t.Any]) -> None:
+        """Report a build event, or hold it back while callbacks are deferred.
+
+        Events are stamped with their ``time`` (:func:`time.monotonic`) here,
+        not when a held-back event is replayed.
+        """
+        if not self.on_build_event:
+            return
+        event.setdefault("time", time.monotonic())
+        replay = getattr(self._local, "replay", None)
+        if replay is None:
+            self.on_build_event(event)
+        else:
+            replay.append(functools.partial(self.on_build_event, event))
+
+    def _timed_event(self, event: dict[str, t.Any], started: float) -> None:
+        """Report a build event for a phase that began at ``started``.
+
+        Adds the phase's ``duration`` in seconds, up to the event's ``time``.
+        """
+        now = time.monotonic()
+        self._build_event({**event, "time": now, "duration": now - started})
+
+    def _window_label(self, window: Window) -> str:
+        """Return the name a window's build events report it by."""
+        label, _started = self._window_spans.get(
+            str(window.window_id),
+            (window.window_name or "", 0.0),
+        )
+        return label
+
+    @property
+    def _command_batch(self) -> TmuxCommandBatch | None:
+        """Return the command batch for the running thread.
+
+        Threads filling windows under ``parallel_windows`` each queue on their
+        own batch, forked from the build's; every other caller shares it.
+        """
+        batch: TmuxCommandBatch | None = getattr(
+            self._local,
+            "command_batch",
+            self._build_command_batch,
+        )
+        return batch
+
+    @_command_batch.setter
+    def _command_batch(self, batch: TmuxCommandBatch | None) -> None:
+        self._build_command_batch = batch
+
+    def _start_build(self, session: Session | None) -> Session:
+        """Create (or adopt) the session and prepare it for windows.
+
+        Runs everything :meth:`build` does before the first window: session
+        creation, the ``before_workspace_builder`` plugin hook, ``before_script``,
+        session options and environment, and the pane-readiness decision.
+
+        Parameters
+        ----------
+        session : :class:`libtmux.Session`, optional
+            session to build workspace in; created when ``None``
+
+        Returns
+        -------
+        :class:`libtmux.Session`
+        """
+        self._build_started = time.monotonic()
+        self._session_state = None
+        self._created_pane_id = None
         if not session:
             if not self.server:
                 msg = (
@@ -467,11 +1716,7 @@ class ClassicWorkspaceBuilder:
                 new_session_kwargs["x"] = terminal_size.columns
                 new_session_kwargs["y"] = terminal_size.lines
 
-            session = self.server.new_session(
-                session_name=self.session_config["session_name"],
-                **new_session_kwargs,
-            )
-            assert session is not None
+            session = self._new_session(**new_session_kwargs)
 
             assert self.session_config["session_name"] == session.name
             assert len(self.session_config["session_name"]) > 0
@@ -483,17 +1728,17 @@ class ClassicWorkspaceBuilder:
             self.on_progress(f"Session created: {session.name}")
 
         self._session = session
-        if self.on_build_event:
-            self.on_build_event(
-                {
-                    "event": "session_created",
-                    "name": session.name,
-                    "window_total": len(self.session_config["windows"]),
-                    "session_pane_total": sum(
-                        len(w.get("panes", [])) for w in self.session_config["windows"]
-                    ),
-                }
-            )
+        self._timed_event(
+            {
+                "event": "session_created",
+                "name": session.name,
+                "window_total": len(self.session_config["windows"]),
+                "session_pane_total": sum(
+                    len(w.get("panes", [])) for w in self.session_config["windows"]
+                ),
+            },
+            self._build_started,
+        )
         _log = TmuxpLoggerAdapter(
             logger,
             {"tmux_session": self.session_config["session_name"]},
@@ -503,8 +1748,6 @@ class ClassicWorkspaceBuilder:
         assert session.server is not None
 
         self.server: Server = session.server
-        assert self.server.sessions is not None
-        assert self.server.has_session(session.name)
         assert session.id
 
         assert isinstance(session, Session)
@@ -512,54 +1755,185 @@ class ClassicWorkspaceBuilder:
         for plugin in self.plugins:
             plugin.before_workspace_builder(self.session)
 
-        focus = None
-
+        self._before_script = None
         if "before_script" in self.session_config:
-            if self.on_before_script:
-                self.on_before_script()
-            if self.on_build_event:
-                self.on_build_event({"event": "before_script_started"})
-            try:
-                cwd = None
-
-                # we want to run the before_script file cwd'd from the
-                # session start directory, if it exists.
-                if "start_directory" in self.session_config:
-                    cwd = self.session_config["start_directory"]
-                _log.debug(
-                    "running before script",
-                )
-                run_before_script(
-                    self.session_config["before_script"],
-                    cwd=cwd,
-                    on_line=self.on_script_output,
-                )
-            except Exception:
-                _log.error(
-                    "before script failed",
-                    extra={
-                        "tmux_config_path": str(
-                            self.session_config["before_script"],
-                        ),
-                    },
-                )
-                self.session.kill()
-                raise
-            finally:
-                if self.on_build_event:
-                    self.on_build_event({"event": "before_script_done"})
+            self._run_before_script()
+        self._apply_session_settings()
+
+        # Plugins and the before_script may add windows, and the session's
+        # options may renumber them: ask tmux again when the windows are made.
+        session_settings = {
+            **self.session_config.get("options", {}),
+            **self.session_config.get("global_options", {}),
+        }
+        if (
+            self.plugins
+            or ("before_script" in self.session_config and self._before_script is None)
+            or "base-index" in session_settings
+            or "pane-base-index" in session_settings
+        ):
+            self._session_state = None
+
+        # Resolved after the plugins, which may change the workspace.
+        self._session_model = model.Session.from_config(self.session_config)
+        self._window_models = {
+            id(window.config): window for window in self._session_model.windows
+        }
+        self._prepare_windows()
+
+        return session
+
+    def _window_model(self, window_config: dict[str, t.Any]) -> model.Window:
+        """Return the model of ``window_config``, resolved once per build.
+
+        A window config the build's session model does not hold, such as the
+        copies :meth:`reconcile` makes or one passed to
+        :meth:`iter_create_panes` directly, is resolved on the spot.
+        """
+        window = self._window_models.get(id(window_config))
+        if window is None or window.config is not window_config:
+            return model.Window.from_config(window_config)
+        return window
+
+    def _run_before_script(self) -> None:
+        """Run ``before_script`` from the session's start directory.
 
-        if "options" in self.session_config:
-            for option, value in self.session_config["options"].items():
-                self.session.set_option(option, value)
+        With ``background_before_script``, the script is only started here;
+        see :meth:`_join_before_script`. Otherwise the build waits for it, and
+        the session is killed if it fails.
+        """
+        if self.on_before_script:
+            self.on_before_script()
+        self._build_event({"event": "before_script_started"})
+        # we want to run the before_script file cwd'd from the
+        # session start directory, if it exists.
+        cwd = self.session_config.get("start_directory")
+        _log = TmuxpLoggerAdapter(
+            logger,
+            {"tmux_session": self.session_config["session_name"]},
+        )
+        if self._builder_options.background_before_script:
+            _log.debug("starting before script in the background")
+            self._before_script = _BeforeScript(
+                self.session_config["before_script"],
+                cwd=cwd,
+                on_line=self.on_script_output,
+            )
+            return
+
+        script_started = time.monotonic()
+        try:
+            _log.debug(
+                "running before script",
+            )
+            run_before_scripts(
+                self.session_config["before_script"],
+                cwd=cwd,
+                on_line=self.on_script_output,
+            )
+        except Exception:
+            self._before_script_failed()
+            raise
+        finally:
+            self._timed_event({"event": "before_script_done"}, script_started)
 
-        if "global_options" in self.session_config:
-            for option, value in self.session_config["global_options"].items():
-                self.session.set_option(option, value, global_=True)
+    def _join_before_script(self) -> None:
+        """Wait for a ``before_script`` running in the background, if any.
 
-        if "environment" in self.session_config:
-            for option, value in self.session_config["environment"].items():
-                self.session.set_environment(option, value)
+        Called before the first command is typed into a pane, and at the end
+        of the build. The first caller reports ``before_script_done``; if the
+        script failed, the session is killed and the script's error raised.
+        """
+        script = self._before_script
+        if script is None:
+            return
+        script.wait()
+        with script.lock:
+            first = not script.reported
+            script.reported = True
+        if first:
+            assert script.finished is not None
+            event = {
+                "event": "before_script_done",
+                "time": script.finished,
+                "duration": script.finished - script.started,
+            }
+            if script.error is None:
+                self._build_event(event)
+            else:
+                self._before_script_failed()
+                # A failed build replays no held-back events: report it now.
+                with self._deferred_callbacks(None):
+                    self._build_event(event)
+        if script.error is not None:
+            raise script.error
+
+    def _before_script_failed(self) -> None:
+        """Log a failed ``before_script`` and kill the session."""
+        TmuxpLoggerAdapter(
+            logger,
+            {"tmux_session": self.session_config["session_name"]},
+        ).error(
+            "before script failed",
+            extra={
+                "tmux_config_path": str(
+                    self.session_config["before_script"],
+                ),
+            },
+        )
+        self.session.kill()
+
+    def _new_session(
+        self,
+        start_directory: str | None = None,
+        x: int | None = None,
+        y: int | None = None,
+    ) -> Session:
+        """Create the workspace's session and note its initial state.
+
+        Works as :meth:`libtmux.Server.new_session`, except that ``new-session``
+        prints the ``list-panes`` row of the initial window and pane along with
+        the session's ``base-index`` and ``pane-base-index``, which the first
+        window pass then uses without asking tmux.
+        """
+        session_name = self.session_config["session_name"]
+        session_check_name(session_name)
+
+        version, format_string = self._captured_pane_format()
+        args: list[str] = [
+            "-P",
+            f"-F{_SESSION_STATE_FORMAT}{format_string}",
+            f"-s{session_name}",
+            "-d",
+        ]
+        if start_directory:
+            args.extend(["-c", str(pathlib.Path(start_directory).expanduser())])
+        if x is not None:
+            args.extend(["-x", str(x)])
+        if y is not None:
+            args.extend(["-y", str(y)])
+
+        env = os.environ.pop("TMUX", None)
+        try:
+            proc = self.server.cmd("new-session", *args)
+        finally:
+            if env:
+                os.environ["TMUX"] = env
+        if proc.stderr and "duplicate session" in proc.stderr[0]:
+            msg = f"Session named {session_name} exists"
+            raise tmux_exc.TmuxSessionExists(msg)
+        raise_if_stderr(proc, "new-session")
+
+        self._session_state = _SessionState.from_output(proc.stdout[0], version)
+        self._created_pane_id = str(self._session_state.row["pane_id"])
+        return Session(server=self.server, **self._session_state.row)
+
+    def _prepare_windows(self) -> None:
+        """Decide on pane readiness and open the command batch for windows."""
+        _log = TmuxpLoggerAdapter(
+            logger,
+            {"tmux_session": self.session_config["session_name"]},
+        )
 
         # Resolve the pane-readiness decision once, now that the session exists
         # and its options (including `default-shell`) have been applied above.
@@ -582,51 +1956,48 @@ class ClassicWorkspaceBuilder:
             },
         )
 
-        for window, window_config in self.iter_create_windows(session, append):
-            assert isinstance(window, Window)
-
-            for plugin in self.plugins:
-                plugin.on_window_create(window)
-
-            focus_pane = None
-            for pane, pane_config in self.iter_create_panes(window, window_config):
-                assert isinstance(pane, Pane)
-
-                if pane_config.get("focus"):
-                    focus_pane = pane
-
-            if window_config.get("focus"):
-                focus = window
-
-            self.config_after_window(window, window_config)
-
-            for plugin in self.plugins:
-                plugin.after_window_finished(window)
-
-            if focus_pane:
-                focus_pane.select()
+        self._command_batch = self._new_command_batch()
 
-            if self.on_build_event:
-                self.on_build_event({"event": "window_done"})
+        self._shell_pool = None
+        if (
+            self._command_batch is not None
+            and self._builder_options.shell_pool
+            and self._can_use_shell_pool()
+        ):
+            self._shell_pool = ShellPool(
+                self.server,
+                size=self._builder_options.shell_pool,
+            )
+            self._shell_pool.load()
 
-        if focus:
-            focus.select()
+    def _finish_build(self) -> None:
+        """Refill the shell pool, if any, and report the workspace as built.
 
+        A ``before_script`` still running in the background is waited for
+        first, so a failing script fails the build even when no pane has
+        commands.
+        """
+        self._join_before_script()
+        if self._shell_pool is not None:
+            self._shell_pool.replenish()
         if self.on_progress:
             self.on_progress("Workspace built")
-        _log.info("workspace built")
-        if self.on_build_event:
-            self.on_build_event({"event": "workspace_built"})
+        TmuxpLoggerAdapter(
+            logger,
+            {"tmux_session": self.session_config["session_name"]},
+        ).info("workspace built")
+        self._timed_event({"event": "workspace_built"}, self._build_started)
 
     def iter_create_windows(
         self,
         session: Session,
         append: bool = False,
+        window_configs: Sequence[dict[str, t.Any]] | None = None,
     ) -> Iterator[t.Any]:
         """Return :class:`libtmux.Window` iterating through session config dict.
 
         Generator yielding :class:`libtmux.Window` by iterating through
-        ``session_config['windows']``.
+        ``session_config['windows']``, or through ``window_configs`` if given.
 
         Applies ``window_options`` to window.
 
@@ -636,6 +2007,8 @@ class ClassicWorkspaceBuilder:
             session to create windows in
         append : bool
             append windows in current active session
+        window_configs : list of dict, optional
+            windows to create instead of the whole workspace's
 
         Returns
         -------
@@ -643,22 +2016,21 @@ class ClassicWorkspaceBuilder:
             Newly created window, and the section from the tmuxp configuration
             that was used to create the window.
         """
-        for window_iterator, window_config in enumerate(
-            self.session_config["windows"],
-            start=1,
-        ):
+        if window_configs is None:
+            window_configs = self.session_config["windows"]
+        for window_iterator, window_config in enumerate(window_configs, start=1):
             window_name = window_config.get("window_name", None)
+            window_label = window_name or str(window_iterator)
+            window_started = time.monotonic()
 
-            if self.on_progress:
-                self.on_progress(f"Creating window: {window_name or window_iterator}")
-            if self.on_build_event:
-                self.on_build_event(
-                    {
-                        "event": "window_started",
-                        "name": window_name or str(window_iterator),
-                        "pane_total": len(window_config["panes"]),
-                    }
-                )
+            self._progress(f"Creating window: {window_label}")
+            self._build_event(
+                {
+                    "event": "window_started",
+                    "name": window_label,
+                    "pane_total": len(window_config["panes"]),
+                }
+            )
 
             is_first_window_pass = self.first_window_pass(
                 window_iterator,
@@ -666,38 +2038,69 @@ class ClassicWorkspaceBuilder:
                 append,
             )
 
-            w1 = None
-            if is_first_window_pass:  # if first window, use window 1
-                w1 = session.active_window
-                w1.move_window("99")
-
-            start_directory = window_config.get("start_directory", None)
-
-            # If the first pane specifies a start_directory, use that instead.
-            panes = window_config["panes"]
-            if panes and "start_directory" in panes[0]:
-                start_directory = panes[0]["start_directory"]
-
-            window_shell = window_config.get("window_shell", None)
-
-            # If the first pane specifies a shell, use that instead.
-            try:
-                if window_config["panes"][0]["shell"] != "":
-                    window_shell = window_config["panes"][0]["shell"]
-            except (KeyError, IndexError):
-                pass
-
-            environment = panes[0].get("environment", window_config.get("environment"))
+            start_directory, window_shell, environment = _new_window_settings(
+                window_config,
+            )
 
-            window = session.new_window(
-                window_name=window_name,
-                start_directory=start_directory,
-                attach=False,  # do not move to the new window
-                window_index=window_config.get("window_index", ""),
-                window_shell=window_shell,
-                environment=environment,
+            window_settings: dict[str, t.Any] = {
+                "window_name": window_name,
+                "start_directory": start_directory,
+                "window_index": window_config.get("window_index", ""),
+                "window_shell": window_shell,
+                "environment": environment,
+            }
+            lazy = _builds_lazily(
+                window_config,
+                is_first_window_pass,
+                self.session_config,
             )
+            if lazy:
+                # A placeholder holds the window's place until it is selected.
+                window_settings["window_shell"] = _LAZY_PLACEHOLDER
+                window_settings["environment"] = None
+
+            batch = self._command_batch
+            if batch is None and is_first_window_pass:
+                # The first window's commands go out together even unbatched.
+                batch = TmuxCommandBatch(server=self.server)
+
+            pooled_pane_id = self._take_pooled_pane(
+                window_settings["window_shell"],
+                window_settings["environment"],
+            )
+            if batch is None:
+                window = session.new_window(
+                    attach=False,  # do not move to the new window
+                    **window_settings,
+                )
+            elif pooled_pane_id is not None:
+                window = self._pooled_new_window(
+                    batch,
+                    session,
+                    pooled_pane_id,
+                    replaces=self._initial_window_id(session)
+                    if is_first_window_pass
+                    else None,
+                    **window_settings,
+                )
+            elif is_first_window_pass and self._can_reuse_initial_window(session):
+                window = self._reuse_initial_window(batch, session, **window_settings)
+            else:
+                window = self._batched_new_window(
+                    batch,
+                    session,
+                    replaces=self._initial_window_id(session)
+                    if is_first_window_pass
+                    else None,
+                    **window_settings,
+                )
+            if batch is not None and batch is not self._command_batch:
+                # Structural commands: not safe to retry one by one.
+                batch.flush()
             assert isinstance(window, Window)
+            self._window_spans[str(window.window_id)] = (window_label, window_started)
+            if lazy:
+                self._lazy_window_ids.add(str(window.window_id))
             window_log = TmuxpLoggerAdapter(
                 logger,
                 {
@@ -707,15 +2110,32 @@ class ClassicWorkspaceBuilder:
             )
             window_log.debug("window created")
 
-            if is_first_window_pass:  # if first window, use window 1
-                session.active_window.kill()
+            if self._command_batch is not None:
+                batch = self._command_batch
+                # Flushed apart from the commands already queued, which must
+                # not be re-sent if an option fails and is retried on its own.
+                batch.flush()
+                if isinstance(window_config.get("options"), dict):
+                    for key, val in window_config["options"].items():
+                        batch.queue(
+                            "set-option",
+                            "-w",
+                            "-t",
+                            window.window_id,
+                            key,
+                            _option_value(val),
+                        )
+                if window_config.get("focus"):
+                    batch.queue("select-window", "-t", window.window_id)
+                batch.flush(report_all=True)
+                yield window, window_config
+                continue
 
             if "options" in window_config and isinstance(
                 window_config["options"],
                 dict,
             ):
-                for key, val in window_config["options"].items():
-                    window.set_option(key, val)
+                self._set_window_options(window, window_config["options"])
 
             if window_config.get("focus"):
                 window.select()
@@ -746,123 +2166,160 @@ class ClassicWorkspaceBuilder:
         """
         assert isinstance(window, Window)
 
-        pane_base_index = window.show_option("pane-base-index", global_=True)
-        assert pane_base_index is not None
-
-        pane = None
+        pane_base_index = self._get_pane_base_index(window)
 
-        for pane_index, pane_config in enumerate(
-            window_config["panes"],
+        if self._command_batch is not None:
+            yield from self._iter_create_panes_batched(
+                window,
+                window_config,
+                pane_base_index,
+            )
+            return
+
+        # Create every pane first, then wait for their shells together, so a
+        # window's readiness waits overlap instead of adding up pane by pane.
+        # The split plan creates each pane at about its final size, so the
+        # layout is applied once, after the waits.
+        pane_configs = window_config["panes"]
+        pane_models = self._window_model(window_config).panes
+        steps = plan_splits(window_config.get("layout"), len(pane_configs))
+        created: dict[int, Pane] = {}
+        span: dict[str, t.Any] = {
+            "window": self._window_label(window),
+            "pane_total": len(pane_configs),
+        }
+        phase_started = time.monotonic()
+
+        for pane_index, step in enumerate(
+            [None, *steps],
             start=pane_base_index,
         ):
-            if self.on_progress:
-                self.on_progress(f"Creating pane: {pane_index}")
-            if self.on_build_event:
-                self.on_build_event(
-                    {
-                        "event": "pane_creating",
-                        "pane_num": pane_index - int(pane_base_index) + 1,
-                        "pane_total": len(window_config["panes"]),
-                    }
-                )
+            self._progress(f"Creating pane: {pane_index}")
+            self._build_event(
+                {
+                    "event": "pane_creating",
+                    "pane_num": pane_index - pane_base_index + 1,
+                    "pane_total": len(pane_configs),
+                }
+            )
 
-            if pane_index == int(pane_base_index):
-                pane = window.active_pane
+            if step is None:
+                pane = self._first_panes.pop(str(window.window_id), None)
+                if pane is None:
+                    pane = window.active_pane
             else:
-
-                def get_pane_start_directory(
-                    pane_config: dict[str, str],
-                    window_config: dict[str, str],
-                ) -> str | None:
-                    if "start_directory" in pane_config:
-                        return pane_config["start_directory"]
-                    if "start_directory" in window_config:
-                        return window_config["start_directory"]
-                    return None
-
-                def get_pane_shell(
-                    pane_config: dict[str, str],
-                    window_config: dict[str, str],
-                ) -> str | None:
-                    if "shell" in pane_config:
-                        return pane_config["shell"]
-                    if "window_shell" in window_config:
-                        return window_config["window_shell"]
-                    return None
-
-                environment = pane_config.get(
-                    "environment",
-                    window_config.get("environment"),
-                )
-
-                assert pane is not None
-
-                pane = pane.split(
+                pane_model = pane_models[step.pane]
+                pane = created[step.target].split(
                     attach=True,
-                    start_directory=get_pane_start_directory(
-                        pane_config=pane_config,
-                        window_config=window_config,
-                    ),
-                    shell=get_pane_shell(
-                        pane_config=pane_config,
-                        window_config=window_config,
+                    direction=(
+                        PaneDirection.Below if step.vertical else PaneDirection.Right
                     ),
-                    environment=environment,
+                    size=f"{step.percent}%" if step.percent is not None else None,
+                    start_directory=pane_model.start_directory,
+                    shell=pane_model.shell,
+                    environment=pane_model.environment,
                 )
 
             assert isinstance(pane, Pane)
+            created[0 if step is None else step.pane] = pane
+
+        panes = [created[number] for number in range(len(pane_configs))]
+        # A plan may end by splitting an earlier pane; leave the last pane
+        # active, as splitting the panes in order does.
+        if steps and steps[-1].pane != len(panes) - 1:
+            assert panes[-1].pane_id is not None
+            window.select_pane(panes[-1].pane_id)
+        self._timed_event({"event": "panes_created", **span}, phase_started)
+
+        pane_logs: list[TmuxpLoggerAdapter] = []
+        for pane in panes:
             pane_log = TmuxpLoggerAdapter(
                 logger,
                 {
-                    "tmux_session": window.session.name or "",
+                    "tmux_session": window.session_name or "",
                     "tmux_window": window.name or "",
                     "tmux_pane": pane.pane_id or "",
                 },
             )
             pane_log.debug("pane created")
+            pane_logs.append(pane_log)
+
+        # Skip readiness wait when a custom shell/command launcher is set.
+        # The shell/window_shell key runs a command (e.g. "top", "sleep 999")
+        # that replaces the default shell — the pane exits when the command
+        # exits, so there is no interactive prompt to wait for. The
+        # pane_readiness policy (resolved in build()) further gates whether
+        # default-shell panes wait at all.
+        if self._pane_readiness_wait:
+            phase_started = time.monotonic()
+            _wait_for_panes_ready(
+                [
+                    pane
+                    for pane, pane_model in zip(panes, pane_models, strict=True)
+                    if pane_model.shell is None
+                ],
+                strategy=self._builder_options.pane_readiness_strategy,
+                list_panes=self._list_pane_cursors,
+            )
+            self._timed_event({"event": "panes_ready", **span}, phase_started)
+
+        # Lay out once more now the shells have drawn their prompts.
+        if "layout" in window_config:
+            window.select_layout(window_config["layout"])
+
+        self._join_before_script()
+        phase_started = time.monotonic()
+        for pane, pane_model, pane_log in zip(
+            panes,
+            pane_models,
+            pane_logs,
+            strict=True,
+        ):
+            self._send_pane_commands(pane, pane_model.commands, pane_log)
 
-            # Skip readiness wait when a custom shell/command launcher is set.
-            # The shell/window_shell key runs a command (e.g. "top", "sleep 999")
-            # that replaces the default shell — the pane exits when the command
-            # exits, so there is no interactive prompt to wait for. The
-            # pane_readiness policy (resolved in build()) further gates whether
-            # default-shell panes wait at all.
-            pane_shell = pane_config.get("shell", window_config.get("window_shell"))
-            if pane_shell is None and self._pane_readiness_wait:
-                _wait_for_pane_ready(pane)
-
-            if "layout" in window_config:
-                window.select_layout(window_config["layout"])
-
-            if "suppress_history" in pane_config:
-                suppress = pane_config["suppress_history"]
-            elif "suppress_history" in window_config:
-                suppress = window_config["suppress_history"]
-            else:
-                suppress = True
-
-            enter = pane_config.get("enter", True)
-            sleep_before = pane_config.get("sleep_before", None)
-            sleep_after = pane_config.get("sleep_after", None)
-            for cmd in pane_config["shell_command"]:
-                enter = cmd.get("enter", enter)
-                sleep_before = cmd.get("sleep_before", sleep_before)
-                sleep_after = cmd.get("sleep_after", sleep_after)
-
-                if sleep_before is not None:
-                    time.sleep(sleep_before)
+            if pane_model.focus:
+                assert pane.pane_id is not None
+                window.select_pane(pane.pane_id)
 
-                pane.send_keys(cmd["cmd"], suppress_history=suppress, enter=enter)
-                pane_log.debug("sent command %s", cmd["cmd"])
+            yield pane, pane_model.config
+        self._timed_event({"event": "commands_sent", **span}, phase_started)
 
-                if sleep_after is not None:
-                    time.sleep(sleep_after)
+    def _send_pane_commands(
+        self,
+        pane: Pane,
+        commands: Sequence[model.Command],
+        pane_log: TmuxpLoggerAdapter,
+    ) -> None:
+        """Type a pane's commands, pausing where they ask.
 
-            if pane_config.get("focus"):
-                assert pane.pane_id is not None
-                window.select_pane(pane.pane_id)
+        With ``batch_send_keys``, each run of commands is one ``send-keys``;
+        see :func:`_send_keys_groups`. During :meth:`build`, pauses go to the
+        build's :class:`~tmuxp.workspace.builder.schedule.PauseScheduler`.
+        """
+        merge = self._builder_options.batch_send_keys
 
-            yield pane, pane_config
+        def send(group: list[model.Command]) -> None:
+            if merge:
+                keys = (escape_tmux_arg(key) for key in _send_keys_args(group))
+                pane.cmd("send-keys", *keys)
+            else:
+                (command,) = group
+                pane.send_keys(
+                    command.cmd,
+                    suppress_history=command.suppress_history,
+                    enter=command.enter,
+                )
+            for command in group:
+                pane_log.debug("sent command %s", command.cmd)
+
+        steps: list[float | t.Callable[[], None]] = []
+        for group in _send_keys_groups(commands, merge=merge):
+            if group[0].sleep_before is not None:
+                steps.append(group[0].sleep_before)
+            steps.append(functools.partial(send, group))
+            if group[-1].sleep_after is not None:
+                steps.append(group[-1].sleep_after)
+        run_steps(steps, self._pause_scheduler, key=pane.window_id)
 
     def config_after_window(
         self,
@@ -886,8 +2343,500 @@ class ClassicWorkspaceBuilder:
             window_config["options_after"],
             dict,
         ):
-            for key, val in window_config["options_after"].items():
-                window.set_option(key, val)
+            if self._command_batch is not None:
+                # See iter_create_windows: keep the retried options apart.
+                self._command_batch.flush()
+                for key, val in window_config["options_after"].items():
+                    self._command_batch.queue(
+                        "set-option",
+                        "-w",
+                        "-t",
+                        window.window_id,
+                        key,
+                        _option_value(val),
+                    )
+                self._command_batch.flush(report_all=True)
+                return
+            self._set_window_options(window, window_config["options_after"])
+
+    def _apply_session_settings(self) -> None:
+        """Apply the session's ``options``, ``global_options`` and ``environment``.
+
+        Each section is sent as one chained ``tmux`` command. If tmux rejects
+        any setting, every setting of that section is retried on its own, and
+        :exc:`~tmuxp.exc.TmuxCommandsFailedError` names each one that failed.
+        """
+        session_id = str(self.session.session_id)
+        sections: list[tuple[str, tuple[str, ...]]] = [
+            ("options", ("set-option", "-t", session_id)),
+            ("global_options", ("set-option", "-t", session_id, "-g")),
+            ("environment", ("set-environment", "-t", session_id)),
+        ]
+        for section, command in sections:
+            settings = self.session_config.get(section)
+            if not settings:
+                continue
+            batch = TmuxCommandBatch(server=self.server)
+            for name, value in settings.items():
+                if section != "environment":
+                    value = _option_value(value)
+                batch.queue(*command, name, value)
+            batch.flush(report_all=True)
+
+    def _set_window_options(
+        self,
+        window: Window,
+        options: dict[str, t.Any],
+    ) -> None:
+        """Set ``options`` on ``window`` in one chained ``tmux`` command."""
+        batch = TmuxCommandBatch(server=self.server)
+        for key, val in options.items():
+            batch.queue(
+                "set-option",
+                "-w",
+                "-t",
+                window.window_id,
+                key,
+                _option_value(val),
+            )
+        batch.flush(report_all=True)
+
+    def _new_command_batch(self) -> TmuxCommandBatch | None:
+        """Return the command batch for this build, or ``None`` to run unbatched.
+
+        Called by :meth:`build` once the session exists. Subclasses may return
+        a batch that dispatches over another transport.
+        """
+        if self._builder_options.batch_commands:
+            return TmuxCommandBatch(server=self.server)
+        return None
+
+    def _captured_pane_format(self) -> tuple[str, str]:
+        """Return the tmux version and ``list-panes`` format batched commands capture.
+
+        Capturing the full ``list-panes`` row from ``new-window`` and
+        ``split-window`` lets the builder construct populated
+        :class:`libtmux.Window` / :class:`libtmux.Pane` objects without a
+        follow-up query per object.
+        """
+        version = str(get_version(tmux_bin=self.server.tmux_bin))
+        _fields, format_string = get_output_format("list-panes", version)
+        return version, format_string
+
+    def _run_command(self, *args: str) -> tuple[list[str], list[str]]:
+        """Run one tmux command; return its stdout and stderr lines.
+
+        A ``tmux`` process of its own here; subclasses may send it over
+        another transport.
+        """
+        proc = self.server.cmd(*args)
+        return proc.stdout, proc.stderr
+
+    def _run_or_raise(self, *args: str) -> list[str]:
+        """Run one tmux command with :meth:`_run_command`; return its stdout.
+
+        Raises :exc:`~tmuxp.exc.TmuxCommandsFailedError` if tmux reports an
+        error.
+        """
+        stdout, stderr = self._run_command(*args)
+        if stderr:
+            raise exc.TmuxCommandsFailedError([(args, stderr)])
+        return stdout
+
+    def _list_pane_cursors(self) -> tuple[list[str], list[str]]:
+        """List every pane's cursor for :func:`_wait_for_panes_ready`."""
+        return self._run_command("list-panes", "-a", "-F", _PANE_CURSOR_FORMAT)
+
+    def _initial_window_id(self, session: Session) -> str:
+        """Return the ID of the window tmux created with ``session``."""
+        return str(self._get_session_state(str(session.session_id)).row["window_id"])
+
+    def _can_reuse_initial_window(self, session: Session) -> bool:
+        """Return True if the initial window can become the first window.
+
+        ``respawn-window`` restarts a pane with the shell it was created with,
+        so only a pane the builder created, in a workspace that leaves
+        ``default-shell`` and ``default-command`` alone (see
+        :func:`_can_respawn_initial_window`), restarts as a ``new-window`` pane
+        would start.
+        """
+        if not _can_respawn_initial_window(self.session_config):
+            return False
+        state = self._get_session_state(str(session.session_id))
+        return (
+            self._created_pane_id is not None
+            and state.row.get("pane_id") == self._created_pane_id
+        )
+
+    def _reuse_initial_window(
+        self,
+        batch: TmuxCommandBatch,
+        session: Session,
+        window_name: str | None,
+        start_directory: str | None,
+        window_index: str,
+        window_shell: str | None,
+        environment: dict[str, str] | None,
+    ) -> Window:
+        """Queue commands on ``batch`` that make the initial window the first one.
+
+        Instead of creating the first window beside the one tmux made with the
+        session and killing that one, its shell is respawned with the first
+        window's settings, then it is renamed and, if its index is not the one
+        ``new-window`` would pick, moved. The window and its first pane are
+        known from :meth:`_get_session_state`, so nothing is asked of tmux.
+        """
+        state = self._get_session_state(str(session.session_id))
+        window_id = str(state.row["window_id"])
+        batch.queue(
+            "respawn-window",
+            *_respawn_window_args(
+                window_id, start_directory, window_shell, environment
+            ),
+        )
+
+        row = dict(state.row)
+        if window_name is not None:
+            batch.queue("rename-window", "-t", window_id, window_name)
+            row["window_name"] = window_name
+        target_index = str(window_index) or str(state.base_index)
+        if target_index != str(row["window_index"]):
+            batch.queue(
+                "move-window",
+                "-s",
+                window_id,
+                "-t",
+                f"{session.session_id}:{target_index}",
+            )
+            row["window_index"] = target_index
+
+        self._first_panes[window_id] = Pane(server=self.server, **state.row)
+        return Window(server=self.server, **row)
+
+    def _batched_new_window(
+        self,
+        batch: TmuxCommandBatch,
+        session: Session,
+        replaces: str | None,
+        window_name: str | None,
+        start_directory: str | None,
+        window_index: str,
+        window_shell: str | None,
+        environment: dict[str, str] | None,
+    ) -> Window:
+        """Create a window through ``batch`` in one tmux process.
+
+        ``replaces`` is the ID of the session's initial window on a first
+        window pass that cannot reuse it; it is moved out of the way, and
+        killed once the new window exists, in the same invocation.
+        """
+        version, format_string = self._captured_pane_format()
+
+        if replaces is not None:
+            batch.queue("move-window", "-s", replaces, "-t", f"{session.session_id}:99")
+
+        window_args = _new_window_args(
+            str(session.session_id),
+            window_name=window_name,
+            start_directory=start_directory,
+            window_index=window_index,
+            window_shell=window_shell,
+            environment=environment,
+        )
+        slot = batch.queue("new-window", *window_args, capture=format_string)
+
+        if replaces is not None:
+            batch.queue("kill-window", "-t", replaces)
+
+        output = batch.flush()[slot]
+        assert output is not None
+        row = parse_output(output, "list-panes", version)
+        window = Window(server=self.server, **row)
+        self._first_panes[str(window.window_id)] = Pane(
+            server=self.server,
+            **row,
+        )
+        return window
+
+    def _can_use_shell_pool(self) -> bool:
+        """Return True if the workspace's panes may come from the shell pool.
+
+        The pool's shells were started by the server's default shell, outside
+        this session: a workspace that sets its own ``default-shell``,
+        ``default-command`` or session ``environment`` gets new shells.
+        """
+        settings = {
+            **self.session_config.get("options", {}),
+            **self.session_config.get("global_options", {}),
+        }
+        return not (
+            "default-shell" in settings
+            or "default-command" in settings
+            or self.session_config.get("environment")
+        )
+
+    def _take_pooled_pane(
+        self,
+        shell: str | None,
+        environment: dict[str, str] | None,
+    ) -> str | None:
+        """Return a pooled shell's pane ID for a new pane, or ``None``.
+
+        Only a pane that would start the default shell, with no environment of
+        its own, can be a pooled shell.
+        """
+        if self._shell_pool is None or shell or environment:
+            return None
+        pane_id = self._shell_pool.take()
+        if pane_id is not None:
+            self._pooled_pane_ids.add(pane_id)
+        return pane_id
+
+    def _pooled_new_window(
+        self,
+        batch: TmuxCommandBatch,
+        session: Session,
+        pane_id: str,
+        replaces: str | None,
+        window_name: str | None,
+        start_directory: str | None,
+        window_index: str,
+        window_shell: str | None,
+        environment: dict[str, str] | None,
+    ) -> Window:
+        """Make the pooled shell ``pane_id`` a new window, in one tmux process.
+
+        Works as :meth:`_batched_new_window`, with ``break-pane`` moving the
+        pane in from the pool instead of ``new-window`` starting a shell. The
+        window is sized to the session, as a new one would be, and the shell is
+        sent a ``cd`` to the start directory when the batch next flushes.
+        """
+        version, format_string = self._captured_pane_format()
+
+        if replaces is not None:
+            batch.queue("move-window", "-s", replaces, "-t", f"{session.session_id}:99")
+
+        break_args = ["-d", "-s", pane_id]
+        if window_name is not None:
+            break_args.extend(["-n", window_name])
+        break_args.extend(["-t", f"{session.session_id}:{window_index}"])
+        batch.queue("break-pane", *break_args)
+        # The pane brings the pool window's size along; fit it to the session.
+        batch.queue("resize-window", "-A", "-t", pane_id)
+        batch.queue("set-option", "-wu", "-t", pane_id, "window-size")
+        slot = batch.queue(
+            "display-message",
+            "-p",
+            "-t",
+            pane_id,
+            format_string,
+            prints=True,
+        )
+
+        if replaces is not None:
+            batch.queue("kill-window", "-t", replaces)
+
+        output = batch.flush()[slot]
+        assert output is not None
+        row = parse_output(output, "list-panes", version)
+        window = Window(server=self.server, **row)
+        self._first_panes[str(window.window_id)] = Pane(server=self.server, **row)
+        batch.queue(
+            "send-keys",
+            "-t",
+            pane_id,
+            *_cd_keys(start_directory or str(row["session_path"])),
+        )
+        return window
+
+    def _iter_create_panes_batched(
+        self,
+        window: Window,
+        window_config: dict[str, t.Any],
+        pane_base_index: int,
+    ) -> Iterator[t.Any]:
+        """Create a window's panes and send their commands through the batch.
+
+        All splits, planned by :func:`~tmuxp.workspace.builder.layout.plan_splits`,
+        go out in one tmux process. After any readiness waits, the layout and
+        every pane's ``send-keys`` go out in another; ``sleep_before`` /
+        ``sleep_after`` flush early so the pause lands between the commands it
+        separates.
+        """
+        assert self._command_batch is not None
+        batch = self._command_batch
+        version, format_string = self._captured_pane_format()
+        pane_configs = window_config["panes"]
+        pane_models = self._window_model(window_config).panes
+        layout = window_config.get("layout")
+        window_target = str(window.window_id)
+
+        first_pane = self._first_panes.pop(window_target, None)
+        if first_pane is None:
+            first_pane = window.active_pane
+        assert isinstance(first_pane, Pane)
+
+        span: dict[str, t.Any] = {
+            "window": self._window_label(window),
+            "pane_total": len(pane_configs),
+        }
+        phase_started = time.monotonic()
+        steps = plan_splits(layout, len(pane_configs))
+        split_slots: dict[int, int] = {}
+        for pane_index, step in enumerate([None, *steps], start=pane_base_index):
+            self._progress(f"Creating pane: {pane_index}")
+            self._build_event(
+                {
+                    "event": "pane_creating",
+                    "pane_num": pane_index - pane_base_index + 1,
+                    "pane_total": len(pane_configs),
+                }
+            )
+            if step is None:
+                continue
+
+            target = f"{window_target}.{pane_base_index + step.position}"
+            pane_model = pane_models[step.pane]
+            pooled_pane_id = self._take_pooled_pane(
+                pane_model.shell,
+                pane_model.environment,
+            )
+            if pooled_pane_id is not None:
+                batch.queue(
+                    "join-pane",
+                    *_join_pane_args(pooled_pane_id, target, step),
+                )
+                split_slots[step.pane] = batch.queue(
+                    "display-message",
+                    "-p",
+                    "-t",
+                    pooled_pane_id,
+                    format_string,
+                    prints=True,
+                )
+                continue
+
+            split_args = _split_window_args(target, pane_model, step)
+            split_slots[step.pane] = batch.queue(
+                "split-window",
+                *split_args,
+                capture=format_string,
+            )
+
+        results = batch.flush()
+        panes: list[Pane] = [first_pane]
+        for number in range(1, len(pane_configs)):
+            output = results[split_slots[number]]
+            assert output is not None
+            pane = Pane(
+                server=self.server,
+                **parse_output(output, "list-panes", version),
+            )
+            if pane.pane_id in self._pooled_pane_ids:
+                start_directory = pane_models[number].start_directory
+                batch.queue(
+                    "send-keys",
+                    "-t",
+                    pane.pane_id,
+                    *_cd_keys(start_directory or str(window.session_path)),
+                )
+            panes.append(pane)
+        if steps and steps[-1].pane != len(panes) - 1:
+            batch.queue("select-pane", "-t", panes[-1].pane_id)
+        self._timed_event({"event": "panes_created", **span}, phase_started)
+
+        pane_logs: list[TmuxpLoggerAdapter] = []
+        for pane in panes:
+            pane_log = TmuxpLoggerAdapter(
+                logger,
+                {
+                    "tmux_session": window.session_name or "",
+                    "tmux_window": window.window_name or "",
+                    "tmux_pane": pane.pane_id or "",
+                },
+            )
+            pane_log.debug("pane created")
+            pane_logs.append(pane_log)
+
+        if self._pane_readiness_wait:
+            phase_started = time.monotonic()
+            _wait_for_panes_ready(
+                [
+                    pane
+                    for pane, pane_model in zip(panes, pane_models, strict=True)
+                    if pane_model.shell is None
+                    and pane.pane_id not in self._pooled_pane_ids
+                ],
+                strategy=self._builder_options.pane_readiness_strategy,
+                list_panes=self._list_pane_cursors,
+            )
+            self._timed_event({"event": "panes_ready", **span}, phase_started)
+
+        self._join_before_script()
+        phase_started = time.monotonic()
+        if layout:
+            batch.queue("select-layout", "-t", window_target, layout)
+
+        for pane, pane_model, pane_log in zip(
+            panes,
+            pane_models,
+            pane_logs,
+            strict=True,
+        ):
+            self._queue_pane_commands(batch, pane, pane_model.commands, pane_log)
+
+            if pane_model.focus:
+                batch.queue("select-pane", "-t", pane.pane_id)
+
+        batch.flush()
+        self._timed_event({"event": "commands_sent", **span}, phase_started)
+        yield from zip(panes, pane_configs, strict=True)
+
+    def _queue_pane_commands(
+        self,
+        batch: TmuxCommandBatch,
+        pane: Pane,
+        commands: Sequence[model.Command],
+        pane_log: TmuxpLoggerAdapter,
+    ) -> None:
+        """Queue a pane's ``send-keys`` on ``batch``, pausing where they ask.
+
+        Commands up to the first pause join ``batch``. The batch is flushed
+        before the pause, and later commands each go out on a batch of their
+        own, since they may run on the pause scheduler's thread.
+        """
+
+        def send(group: list[model.Command], after_pause: bool) -> None:
+            target = batch.fork() if after_pause else batch
+            target.queue("send-keys", "-t", pane.pane_id, *_send_keys_args(group))
+            if after_pause:
+                target.flush()
+            for command in group:
+                pane_log.debug("sent command %s", command.cmd)
+
+        def flush() -> None:
+            batch.flush()
+
+        steps: list[float | t.Callable[[], None]] = []
+        paused = False
+
+        def pause(seconds: float | None) -> None:
+            nonlocal paused
+            if seconds is None:
+                return
+            if not paused:
+                steps.append(flush)
+                paused = True
+            steps.append(seconds)
+
+        for group in _send_keys_groups(
+            commands,
+            merge=self._builder_options.batch_send_keys,
+        ):
+            pause(group[0].sleep_before)
+            steps.append(functools.partial(send, group, paused))
+            pause(group[-1].sleep_after)
+        run_steps(steps, self._pause_scheduler, key=pane.window_id)
 
     def find_current_attached_session(self) -> Session:
         """Return current attached session."""
@@ -907,5 +2856,32 @@ class ClassicWorkspaceBuilder:
         )
 
     def first_window_pass(self, i: int, session: Session, append: bool) -> bool:
-        """Return True first window, used when iterating session windows."""
-        return len(session.windows) == 1 and i == 1 and not append
+        """Return True first window, used when iterating session windows.
+
+        True when the session still has only the window tmux created with it,
+        which the first configured window then reuses.
+        """
+        if i != 1 or append:
+            return False
+        return self._get_session_state(str(session.session_id)).window_count == 1
+
+    def _get_session_state(self, session_id: str) -> _SessionState:
+        """Return the state of ``session_id``, asking tmux only if unknown."""
+        state = self._session_state
+        if state is None or state.session_id != session_id:
+            version, format_string = self._captured_pane_format()
+            proc = self.server.cmd(
+                "display-message",
+                "-p",
+                "-t",
+                session_id,
+                f"{_SESSION_STATE_FORMAT}{format_string}",
+            )
+            raise_if_stderr(proc, "display-message")
+            state = _SessionState.from_output(proc.stdout[0], version)
+            self._session_state = state
+        return state
+
+    def _get_pane_base_index(self, window: Window) -> int:
+        """Return the ``pane-base-index`` of ``window``'s session."""
+        return self._get_session_state(str(window.session_id)).pane_base_index
@@ -0,0 +1,263 @@
+"""Workspace builder that talks to tmux over one control-mode connection.
+
+:class:`ControlModeWorkspaceBuilder` builds like the classic builder with
+``batch_commands`` on, but flushes each batch over a single long-lived
+``tmux -C`` client instead of spawning a ``tmux`` process per flush. tmux
+answers every command on that pipe with a ``%begin`` … ``%end`` (or
+``%error``) block, which :class:`ControlModeClient` parses back into stdout and
+stderr lines.
+
+Select it with ``workspace_builder: control``.
+
+The client attaches with ``ignore-size,no-output`` so it neither resizes the
+session's windows nor streams pane output back to tmuxp, and it is closed when
+the build finishes.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import shutil
+import subprocess
+import threading
+import time
+import typing as t
+
+from libtmux.exc import TmuxCommandNotFound
+
+from tmuxp import exc
+from tmuxp.workspace.builder.accounting import record_call
+from tmuxp.workspace.builder.batch import (
+    TmuxCommandBatch,
+    command_line,
+    server_args,
+)
+from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+
+if t.TYPE_CHECKING:
+    from collections.abc import Sequence
+    from types import TracebackType
+
+    from libtmux.server import Server
+    from libtmux.session import Session
+    from typing_extensions import Self
+
+    from tmuxp.workspace.builder.batch import TmuxCommand
+    from tmuxp.workspace.builder.reconcile import ReconcileStep
+
+logger = logging.getLogger(__name__)
+
+
+class ControlModeClient:
+    """A ``tmux -C attach-session`` client commands can be sent through.
+
+    Each :meth:`run` writes one chained command line and reads one response
+    block per command. tmux skips the rest of a chain after a failing command,
+    so reading stops at the first ``%error`` block. Runs from several threads
+    take turns on the pipe.
+
+    Examples
+    --------
+    >>> with ControlModeClient(server=server, target=session.session_id) as client:
+    ...     client.run([("display-message", "-p", "hi;"), ("list-clients", "-F", "x")])
+    (['hi;', 'x'], [])
+    """
+
+    def __init__(self, server: Server, target: str) -> None:
+        tmux_bin = server.tmux_bin or shutil.which("tmux")
+        if not tmux_bin:
+            raise TmuxCommandNotFound
+
+        argv = [tmux_bin, *server_args(server)]
+        argv += ["-C", "attach-session", "-f", "ignore-size,no-output", "-t", target]
+
+        self.process = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="backslashreplace",
+        )
+        self._lock = threading.Lock()
+        logger.debug("tmux control client started", extra={"tmux_target": target})
+
+        # The attach itself is answered with the first block.
+        _output, failed = self._read_block()
+        if failed:
+            self.close()
+            msg = f"could not attach to {target}"
+            raise exc.TmuxControlModeError(msg)
+
+    def __enter__(self) -> Self:
+        """Return the client; it is closed on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the client."""
+        self.close()
+
+    def _readline(self) -> str:
+        assert self.process.stdout is not None
+        line = self.process.stdout.readline()
+        if not line:
+            msg = "client exited"
+            raise exc.TmuxControlModeError(msg)
+        return line.rstrip("\n")
+
+    def _read_block(self) -> tuple[list[str], bool]:
+        """Read the next response block, skipping notifications before it.
+
+        Returns
+        -------
+        tuple of (list of str, bool)
+            the block's lines, and whether it ended in ``%error``
+        """
+        line = self._readline()
+        while not line.startswith("%begin "):
+            line = self._readline()
+        guard = line.split(" ")[1:3]
+
+        lines: list[str] = []
+        while True:
+            line = self._readline()
+            tag, _, rest = line.partition(" ")
+            if tag in {"%end", "%error"} and rest.split(" ")[:2] == guard:
+                return lines, tag == "%error"
+            lines.append(line)
+
+    def run(self, commands: Sequence[Sequence[str]]) -> tuple[list[str], list[str]]:
+        """Run ``commands`` as one chained line.
+
+        Returns
+        -------
+        tuple of (list of str, list of str)
+            stdout lines of the commands that ran, and the error lines of the
+            command that failed, if any
+        """
+        line = command_line(commands)
+        with self._lock:
+            started = time.monotonic()
+            try:
+                return self._run_line(line, len(commands))
+            finally:
+                record_call(
+                    [arg for command in commands for arg in (";", *command)][1:],
+                    started,
+                    transport="control",
+                )
+
+    def _run_line(self, line: str, count: int) -> tuple[list[str], list[str]]:
+        assert self.process.stdin is not None
+        try:
+            self.process.stdin.write(line + "\n")
+            self.process.stdin.flush()
+        except OSError as e:
+            msg = "client exited"
+            raise exc.TmuxControlModeError(msg) from e
+
+        stdout: list[str] = []
+        for _command in range(count):
+            output, failed = self._read_block()
+            if failed:
+                return stdout, output or ["unknown error"]
+            stdout.extend(output)
+        return stdout, []
+
+    def close(self) -> None:
+        """Detach the client and wait for it to exit."""
+        if self.process.poll() is not None:
+            return
+        assert self.process.stdin is not None
+        with contextlib.suppress(OSError):
+            self.process.stdin.close()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        logger.debug("tmux control client closed")
+
+
+class ControlModeCommandBatch(TmuxCommandBatch):
+    """A command batch flushed over a :class:`ControlModeClient`."""
+
+    def __init__(self, server: Server, client: ControlModeClient) -> None:
+        super().__init__(server=server)
+        self.client = client
+
+    def fork(self) -> ControlModeCommandBatch:
+        """Return an empty batch sharing this batch's client."""
+        return ControlModeCommandBatch(server=self.server, client=self.client)
+
+    def _dispatch(self, commands: list[TmuxCommand]) -> tuple[list[str], list[str]]:
+        return self.client.run([command.args for command in commands])
+
+
+class ControlModeWorkspaceBuilder(ClassicWorkspaceBuilder):
+    """Build a workspace through one persistent ``tmux -C`` connection.
+
+    Always builds batched, whatever ``batch_commands`` says; each flush is a
+    line on the control-mode pipe rather than a new ``tmux`` process, as are
+    its pane readiness checks and the panes :meth:`reconcile` adds.
+
+    Examples
+    --------
+    >>> builder = ControlModeWorkspaceBuilder(
+    ...     session_config={
+    ...         "session_name": "control-example",
+    ...         "windows": [
+    ...             {"window_name": "one", "panes": [{"shell_command": []}] * 2},
+    ...         ],
+    ...     },
+    ...     server=server,
+    ... )
+    >>> builder.build()
+    >>> [len(w.panes) for w in builder.session.windows]
+    [2]
+    >>> builder.session.session_attached
+    '0'
+    """
+
+    _control_client: ControlModeClient | None = None
+
+    def build(self, session: Session | None = None, append: bool = False) -> None:
+        """Build the workspace, then close the control-mode client."""
+        try:
+            super().build(session=session, append=append)
+        finally:
+            self._close_control_client()
+
+    def reconcile(self, session: Session | None = None) -> list[ReconcileStep]:
+        """Create what the running session is missing, then close the client."""
+        try:
+            return super().reconcile(session=session)
+        finally:
+            self._close_control_client()
+
+    def _close_control_client(self) -> None:
+        if self._control_client is not None:
+            self._control_client.close()
+            self._control_client = None
+        self._command_batch = None
+
+    def _run_command(self, *args: str) -> tuple[list[str], list[str]]:
+        """Run one tmux command over the control-mode client, once it is open."""
+        if self._control_client is None:
+            return super()._run_command(*args)
+        return self._control_client.run([args])
+
+    def _new_command_batch(self) -> TmuxCommandBatch:
+        client = ControlModeClient(
+            server=self.server,
+            target=str(self.session.session_id),
+        )
+        self._control_client = client
+        return ControlModeCommandBatch(server=self.server, client=client)
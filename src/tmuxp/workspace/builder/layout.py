@@ -0,0 +1,295 @@
+"""Plan a window's splits from its target layout.
+
+Re-applying ``select-layout`` after every split keeps later splits from running
+out of room, at the cost of a layout recompute (and a ``tmux`` process) per
+pane. :func:`plan_splits` instead works out, from the window's ``layout``, which
+pane to split, in which direction and by what percentage, so every pane is
+created at roughly its final size and the layout is applied once at the end.
+
+Named layouts (``even-horizontal``, ``even-vertical``, ``main-horizontal``,
+``main-vertical``, ``tiled``) and custom layout strings (as printed by
+``#{window_layout}``) are planned from their cell tree. Other layout names are
+planned as ``tiled``, the most compact arrangement.
+
+tmux lists a new pane right after the pane it split, and ``select-layout``
+assigns panes to cells in list order. Plans keep the list in workspace order,
+so the first pane config still lands in the layout's first cell.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import typing as t
+
+BORDER = 1
+"""cells taken by the border between two panes"""
+
+
+class SplitStep(t.NamedTuple):
+    """One ``split-window`` in a window's plan.
+
+    Panes are numbered in workspace order, from 0.
+    """
+
+    pane: int
+    """the pane this split creates"""
+
+    target: int
+    """the existing pane to split"""
+
+    position: int
+    """``target``'s position in the window's pane list when the split runs"""
+
+    vertical: bool
+    """``True`` to put the new pane below ``target`` (``-v``), ``False`` to its
+    right (``-h``)"""
+
+    percent: int | None
+    """the new pane's share of ``target``, or ``None`` for tmux's even split"""
+
+
+@dataclasses.dataclass
+class LayoutCell:
+    """A cell of a tmux layout tree.
+
+    ``size`` is measured along the parent's split direction.
+    """
+
+    size: int
+    vertical: bool = False
+    """children are stacked top to bottom (``[...]``) rather than side by side"""
+    children: list[LayoutCell] = dataclasses.field(default_factory=list)
+
+    @property
+    def pane_count(self) -> int:
+        """Return the number of panes (leaf cells) in this cell."""
+        if not self.children:
+            return 1
+        return sum(child.pane_count for child in self.children)
+
+
+def _even(count: int, vertical: bool, size: int = 100) -> LayoutCell:
+    if count == 1:
+        return LayoutCell(size=size)
+    return LayoutCell(
+        size=size,
+        vertical=vertical,
+        children=[LayoutCell(size=100) for _ in range(count)],
+    )
+
+
+def _tiled(count: int) -> LayoutCell:
+    # Same grid tmux's tiled layout picks: grow rows, then columns.
+    rows = columns = 1
+    while rows * columns < count:
+        rows += 1
+        if rows * columns < count:
+            columns += 1
+    row_cells = []
+    remaining = count
+    for _row in range(rows):
+        row_cells.append(_even(min(columns, remaining), vertical=False))
+        remaining -= columns
+        if remaining <= 0:
+            break
+    if len(row_cells) == 1:
+        return row_cells[0]
+    return LayoutCell(size=100, vertical=True, children=row_cells)
+
+
+def named_layout_cell(layout: str, pane_count: int) -> LayoutCell:
+    """Return the cell tree a named layout arranges ``pane_count`` panes in.
+
+    Examples
+    --------
+    >>> cell = named_layout_cell("main-vertical", 3)
+    >>> cell.vertical, [c.pane_count for c in cell.children]
+    (False, [1, 2])
+    >>> cell = named_layout_cell("tiled", 5)
+    >>> cell.vertical, [c.pane_count for c in cell.children]
+    (True, [2, 2, 1])
+    """
+    if pane_count == 1:
+        return LayoutCell(size=100)
+    if layout == "even-horizontal":
+        return _even(pane_count, vertical=False)
+    if layout == "even-vertical":
+        return _even(pane_count, vertical=True)
+    if layout in {"main-horizontal", "main-vertical"}:
+        # The main pane on top (or left), the others sharing the rest.
+        vertical = layout == "main-horizontal"
+        return LayoutCell(
+            size=100,
+            vertical=vertical,
+            children=[
+                LayoutCell(size=100),
+                _even(pane_count - 1, vertical=not vertical),
+            ],
+        )
+    return _tiled(pane_count)
+
+
+def parse_layout(layout: str) -> LayoutCell | None:
+    """Parse a custom layout string, or return ``None`` if it is not one.
+
+    Examples
+    --------
+    >>> cell = parse_layout("bb62,159x48,0,0{79x48,0,0,1,79x48,80,0,2}")
+    >>> cell.vertical, [c.size for c in cell.children]
+    (False, [79, 79])
+    >>> cell = parse_layout("7666,100x40,0,0[100x13,0,0{49x13,0,0,0,50x13,50,0,2},"
+    ...                     "100x26,0,14,1]")
+    >>> cell.vertical, cell.pane_count
+    (True, 3)
+    >>> parse_layout("bb62,159x48,0,0{79x48,0,0,79x48,80,0}").pane_count
+    2
+    >>> parse_layout("main-vertical") is None
+    True
+    """
+    checksum, _, body = layout.partition(",")
+    if len(checksum) != 4 or not body:
+        return None
+    try:
+        cell, end = _parse_cell(body, 0, parent_vertical=False)
+    except (ValueError, IndexError):
+        return None
+    if end != len(body):
+        return None
+    return cell
+
+
+def _parse_cell(text: str, index: int, parent_vertical: bool) -> tuple[LayoutCell, int]:
+    """Parse ``WxH,X,Y`` plus a pane id or child list, starting at ``index``."""
+
+    def number(index: int) -> tuple[int, int]:
+        end = index
+        while end < len(text) and text[end].isdigit():
+            end += 1
+        return int(text[index:end]), end
+
+    width, index = number(index)
+    if text[index] != "x":
+        raise ValueError(text)
+    height, index = number(index + 1)
+    for _ in range(2):  # x and y offsets
+        if text[index] != ",":
+            raise ValueError(text)
+        _offset, index = number(index + 1)
+
+    cell = LayoutCell(size=height if parent_vertical else width)
+    if index < len(text) and text[index] == "," and text[index + 1].isdigit():
+        # A pane id, unless it is the width of a sibling cell (older layout
+        # strings omit pane ids).
+        _pane_id, end = number(index + 1)
+        if end == len(text) or text[end] != "x":
+            return cell, end
+    if index < len(text) and text[index] in "{[":
+        closing = "}" if text[index] == "{" else "]"
+        cell.vertical = text[index] == "["
+        index += 1
+        while True:
+            child, index = _parse_cell(text, index, parent_vertical=cell.vertical)
+            cell.children.append(child)
+            if text[index] == ",":
+                index += 1
+                continue
+            if text[index] != closing:
+                raise ValueError(text)
+            return cell, index + 1
+    return cell, index
+
+
+def _percent(part: int, whole: int) -> int:
+    return max(1, min(99, round(100 * part / whole)))
+
+
+def _plan_cell(
+    cell: LayoutCell,
+    first: int,
+    order: list[int],
+    steps: list[SplitStep],
+) -> None:
+    """Append the splits that fill ``cell``, which pane ``first`` now covers.
+
+    Each child is carved off the remainder before the previous child is
+    filled in, so the plan ends by creating the last pane, just as splitting
+    panes in workspace order does.
+    """
+    children = cell.children
+    firsts = [first]
+    for child in children[:-1]:
+        firsts.append(firsts[-1] + child.pane_count)
+
+    for index in range(len(children)):
+        if index + 1 < len(children):
+            holder = firsts[index]
+            rest = children[index + 1 :]
+            new_size = sum(c.size for c in rest) + BORDER * (len(rest) - 1)
+            region = children[index].size + BORDER + new_size
+            position = order.index(holder)
+            steps.append(
+                SplitStep(
+                    pane=firsts[index + 1],
+                    target=holder,
+                    position=position,
+                    vertical=cell.vertical,
+                    percent=_percent(new_size, region),
+                ),
+            )
+            order.insert(position + 1, firsts[index + 1])
+        if children[index].children:
+            _plan_cell(children[index], firsts[index], order, steps)
+
+
+def plan_splits(layout: str | None, pane_count: int) -> list[SplitStep]:
+    """Return the splits that create a window's panes for ``layout``.
+
+    Without a layout, each pane splits the one before it in half, as the
+    builder always has.
+
+    Parameters
+    ----------
+    layout : str or None
+        the window's ``layout``: a layout name or a custom layout string
+    pane_count : int
+        number of panes in the window
+
+    Returns
+    -------
+    list of :class:`SplitStep`
+        ``pane_count - 1`` splits, in the order to run them
+
+    Examples
+    --------
+    >>> [(s.pane, s.target, s.vertical, s.percent)
+    ...  for s in plan_splits("even-vertical", 3)]
+    [(1, 0, True, 67), (2, 1, True, 50)]
+
+    >>> [(s.pane, s.target, s.position, s.vertical)
+    ...  for s in plan_splits("tiled", 4)]
+    [(2, 0, 0, True), (1, 0, 0, False), (3, 2, 2, False)]
+
+    >>> [(s.pane, s.target, s.percent) for s in plan_splits(None, 3)]
+    [(1, 0, None), (2, 1, None)]
+    """
+    if pane_count < 2:
+        return []
+    if not layout:
+        return [
+            SplitStep(
+                pane=pane,
+                target=pane - 1,
+                position=pane - 1,
+                vertical=True,
+                percent=None,
+            )
+            for pane in range(1, pane_count)
+        ]
+
+    cell = parse_layout(layout)
+    if cell is None or cell.pane_count != pane_count:
+        cell = named_layout_cell(layout, pane_count)
+
+    steps: list[SplitStep] = []
+    _plan_cell(cell, 0, [0], steps)
+    return steps
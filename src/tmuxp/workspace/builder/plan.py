@@ -0,0 +1,459 @@
+"""Compile a workspace into the flat list of tmux commands that builds it.
+
+:func:`compile_workspace` takes an expanded, trickled workspace (see
+:func:`~tmuxp.workspace.loader.expand` and :func:`~tmuxp.workspace.loader.trickle`)
+and returns a :class:`WorkspacePlan`: the tmux commands the classic builder
+runs, in order, without starting tmux. ``tmuxp plan`` prints it, so the cost of
+a workspace can be read before anything is spawned.
+
+tmux hands out ids as objects are created, so the plan names them with
+placeholders in tmux's own target syntax:
+
+- ``$session`` is the session;
+- ``@1``, ``@2``, … are the configured windows, numbered from 1 in workspace
+  order; ``@1`` is the window tmux creates with the session, reused, unless
+  the workspace sets ``default-shell`` or ``default-command``: then that
+  window is ``@0``, replaced by a new ``@1``;
+- ``%1.0``, ``%1.1``, … are window 1's panes, numbered from 0 in workspace
+  order (as in :mod:`~tmuxp.workspace.builder.layout`);
+- ``@1.0``, ``@1.1``, … are window 1's panes by their position in the window
+  when the command runs, which is how ``split-window`` targets them.
+
+Each command carries the ``chain`` it joins when ``batch_commands`` is on:
+commands of one chain go to tmux as a single process. A ``delay`` is the
+``sleep_before`` / ``sleep_after`` pause before a pane's command.
+
+Pane readiness waits depend on the shell that starts, so they are not part of
+the plan.
+"""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import re
+import typing as t
+
+from tmuxp.workspace import model
+from tmuxp.workspace.builder.classic import (
+    _LAZY_PLACEHOLDER,
+    _builds_lazily,
+    _can_respawn_initial_window,
+    _lazy_window_commands,
+    _lazy_window_hook,
+    _new_window_args,
+    _new_window_settings,
+    _option_value,
+    _respawn_window_args,
+    _send_keys_args,
+    _send_keys_groups,
+    _split_window_args,
+)
+from tmuxp.workspace.builder.layout import plan_splits
+from tmuxp.workspace.options import WorkspaceBuilderOptions
+
+SESSION_TARGET = "$session"
+"""placeholder for the session's id"""
+
+# Commands the classic builder sends together even without ``batch_commands``:
+# one process per run of a group within a chain.
+_UNBATCHED_GROUPS = {
+    "set-option": "settings",
+    "set-environment": "settings",
+    "respawn-window": "initial window",
+    "rename-window": "initial window",
+    "move-window": "initial window",
+    # Replacing the initial window: move-window, new-window, kill-window.
+    "new-window": "initial window",
+    "kill-window": "initial window",
+}
+_NEEDS_QUOTES = re.compile(r"[\s'\"\\;]")
+
+
+class PlannedCommand(t.NamedTuple):
+    """One tmux command of a :class:`WorkspacePlan`."""
+
+    args: tuple[str, ...]
+    """the tmux subcommand and its arguments"""
+
+    chain: int
+    """commands with the same chain run as one tmux process when batched"""
+
+    delay: float = 0.0
+    """seconds the pane pauses after its previous command, before this one"""
+
+    @property
+    def subcommand(self) -> str:
+        """Return the tmux subcommand, e.g. ``new-window``."""
+        return self.args[0]
+
+    def __str__(self) -> str:
+        """Return the command as it would be typed after ``tmux``.
+
+        Examples
+        --------
+        >>> print(PlannedCommand(("send-keys", "-t", "%1.0", " git log", "Enter"), 3))
+        send-keys -t %1.0 ' git log' Enter
+        """
+        return " ".join(
+            "'" + arg.replace("'", "'\\''") + "'"
+            if not arg or _NEEDS_QUOTES.search(arg)
+            else arg
+            for arg in self.args
+        )
+
+
+class PlanEstimate(t.NamedTuple):
+    """What running a :class:`WorkspacePlan` costs."""
+
+    commands: int
+    """tmux commands in the plan"""
+
+    processes: int
+    """tmux processes the classic builder spawns for them"""
+
+    batched_processes: int
+    """tmux processes with ``batch_commands`` on"""
+
+    pause_seconds: float
+    """the longest run of ``sleep_before`` / ``sleep_after`` pauses in one
+    pane; panes pause alongside each other"""
+
+
+@dataclasses.dataclass
+class WorkspacePlan:
+    """The tmux commands that build a workspace, in order.
+
+    Built by :func:`compile_workspace`. Plans are plain data: :meth:`to_dict`
+    returns a JSON-serializable form.
+    """
+
+    session_name: str
+    commands: list[PlannedCommand] = dataclasses.field(default_factory=list)
+    before_script: str | list[dict[str, t.Any]] | None = None
+
+    def counts(self) -> dict[str, int]:
+        """Return how many times each tmux subcommand is run.
+
+        Examples
+        --------
+        >>> plan = WorkspacePlan(
+        ...     "demo",
+        ...     [
+        ...         PlannedCommand(("new-session", "-d"), 0),
+        ...         PlannedCommand(("send-keys", "-t", "%1.0", "ls", "Enter"), 1),
+        ...         PlannedCommand(("send-keys", "-t", "%1.0", "pwd", "Enter"), 1),
+        ...     ],
+        ... )
+        >>> plan.counts()
+        {'new-session': 1, 'send-keys': 2}
+        """
+        return dict(collections.Counter(c.subcommand for c in self.commands))
+
+    def estimate(self) -> PlanEstimate:
+        """Return the plan's cost in tmux processes and pause time.
+
+        Without ``batch_commands`` every command is a process of its own,
+        except settings and the commands that reuse the session's initial
+        window: each run of ``set-option`` / ``set-environment``, or of
+        ``respawn-window`` / ``rename-window`` / ``move-window``, sharing a chain
+        goes in one.
+
+        Examples
+        --------
+        >>> plan = WorkspacePlan(
+        ...     "demo",
+        ...     [
+        ...         PlannedCommand(("new-session", "-d"), 0),
+        ...         PlannedCommand(("set-option", "-t", "$session", "a", "1"), 1),
+        ...         PlannedCommand(("set-option", "-t", "$session", "b", "2"), 1),
+        ...         PlannedCommand(("send-keys", "-t", "%1.0", "ls"), 2),
+        ...         PlannedCommand(("send-keys", "-t", "%1.0", "pwd"), 3, delay=1.5),
+        ...     ],
+        ... )
+        >>> plan.estimate()
+        PlanEstimate(commands=5, processes=4, batched_processes=4, pause_seconds=1.5)
+        """
+        processes = 0
+        grouped: set[tuple[int, str]] = set()
+        pauses: collections.defaultdict[str, float] = collections.defaultdict(float)
+        for command in self.commands:
+            group = _UNBATCHED_GROUPS.get(command.subcommand)
+            if group is not None:
+                if (command.chain, group) in grouped:
+                    continue
+                grouped.add((command.chain, group))
+            processes += 1
+            if command.delay:
+                pauses[command.args[2]] += command.delay
+        return PlanEstimate(
+            commands=len(self.commands),
+            processes=processes,
+            batched_processes=len({command.chain for command in self.commands}),
+            pause_seconds=max(pauses.values(), default=0.0),
+        )
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """Return the plan as JSON-serializable data.
+
+        Examples
+        --------
+        >>> plan = WorkspacePlan("demo", [PlannedCommand(("new-session", "-d"), 0)])
+        >>> plan.to_dict()["commands"]
+        [{'args': ['new-session', '-d'], 'chain': 0, 'delay': 0.0}]
+        """
+        return {
+            "session_name": self.session_name,
+            "before_script": self.before_script,
+            "commands": [
+                {"args": list(c.args), "chain": c.chain, "delay": c.delay}
+                for c in self.commands
+            ],
+            "counts": self.counts(),
+            "estimate": self.estimate()._asdict(),
+        }
+
+
+class _Compiler:
+    """Append planned commands, numbering chains as it goes."""
+
+    def __init__(self, plan: WorkspacePlan) -> None:
+        self.plan = plan
+        self.chain = -1
+
+    def new_chain(self) -> None:
+        self.chain += 1
+
+    def add(self, *args: t.Any, delay: float = 0.0) -> None:
+        self.plan.commands.append(
+            PlannedCommand(tuple(str(arg) for arg in args), self.chain, delay),
+        )
+
+
+def compile_workspace(session_config: dict[str, t.Any]) -> WorkspacePlan:
+    """Return the tmux commands that build ``session_config``, in order.
+
+    Parameters
+    ----------
+    session_config : dict
+        an expanded, trickled workspace
+
+    Returns
+    -------
+    :class:`WorkspacePlan`
+
+    Examples
+    --------
+    >>> from tmuxp.workspace import loader
+    >>> workspace = loader.trickle(loader.expand({
+    ...     "session_name": "demo",
+    ...     "options": {"base-index": 1},
+    ...     "windows": [
+    ...         {
+    ...             "window_name": "editor",
+    ...             "layout": "main-vertical",
+    ...             "panes": ["vim", {"shell_command": ["git status"], "focus": True}],
+    ...         },
+    ...     ],
+    ... }))
+    >>> plan = compile_workspace(workspace)
+    >>> for command in plan.commands:
+    ...     print(command.chain, command)
+    0 new-session -d -s demo
+    1 set-option -t $session base-index 1
+    2 respawn-window -k -t @1
+    2 rename-window -t @1 editor
+    3 split-window -h -t @1.0 -l50%
+    4 select-layout -t @1 main-vertical
+    4 send-keys -t %1.0 ' vim' Enter
+    4 send-keys -t %1.1 ' git status' Enter
+    4 select-pane -t %1.1
+    >>> plan.estimate()
+    PlanEstimate(commands=9, processes=8, batched_processes=5, pause_seconds=0.0)
+    """
+    options = WorkspaceBuilderOptions.from_config(session_config)
+    plan = WorkspacePlan(
+        session_name=session_config["session_name"],
+        before_script=session_config.get("before_script"),
+    )
+    compiler = _Compiler(plan)
+
+    compiler.new_chain()
+    new_session = ["new-session", "-d", "-s", session_config["session_name"]]
+    if "start_directory" in session_config:
+        new_session.extend(["-c", session_config["start_directory"]])
+    compiler.add(*new_session)
+
+    for section, command in (
+        ("options", ("set-option", "-t", SESSION_TARGET)),
+        ("global_options", ("set-option", "-t", SESSION_TARGET, "-g")),
+        ("environment", ("set-environment", "-t", SESSION_TARGET)),
+    ):
+        settings = session_config.get(section)
+        if not settings:
+            continue
+        compiler.new_chain()
+        for name, value in settings.items():
+            if section != "environment":
+                value = _option_value(value)
+            compiler.add(*command, name, value)
+
+    session = model.Session.from_config(session_config)
+    respawn = _can_respawn_initial_window(session_config)
+    for number, window_model in enumerate(session.windows, start=1):
+        lazy = _builds_lazily(window_model.config, number == 1, session_config)
+        _compile_window(compiler, number, window_model, options, lazy, respawn)
+
+    return plan
+
+
+def _compile_window(
+    compiler: _Compiler,
+    number: int,
+    window_model: model.Window,
+    options: WorkspaceBuilderOptions,
+    lazy: bool = False,
+    respawn: bool = True,
+) -> None:
+    """Plan one window as the batched classic builder runs it.
+
+    With ``respawn``, the first window reuses the one tmux creates with the
+    session, moved only to a ``window_index`` of its own: the plan assumes the
+    session's ``base-index`` is where tmux put it. Without, that window is
+    moved aside and killed once the first window is created. A ``lazy``
+    window is planned as its placeholder and the ``set-hook`` that builds it
+    once selected.
+    """
+    window = f"@{number}"
+    window_config = window_model.config
+    pane_configs = window_config["panes"]
+    pane_models = window_model.panes
+    layout = window_model.layout
+
+    compiler.new_chain()
+    window_name = window_config.get("window_name")
+    window_index = str(window_config.get("window_index", ""))
+    start_directory, window_shell, environment = _new_window_settings(window_config)
+    if lazy:
+        window_shell, environment = _LAZY_PLACEHOLDER, None
+    if number == 1 and respawn:
+        compiler.add(
+            "respawn-window",
+            *_respawn_window_args(window, start_directory, window_shell, environment),
+        )
+        if window_name is not None:
+            compiler.add("rename-window", "-t", window, window_name)
+        if window_index:
+            compiler.add(
+                "move-window",
+                "-s",
+                window,
+                "-t",
+                f"{SESSION_TARGET}:{window_index}",
+            )
+    else:
+        if number == 1:
+            compiler.add("move-window", "-s", "@0", "-t", f"{SESSION_TARGET}:99")
+        compiler.add(
+            "new-window",
+            *_new_window_args(
+                SESSION_TARGET,
+                window_name=window_name,
+                start_directory=start_directory,
+                window_index=window_index,
+                window_shell=window_shell,
+                environment=environment,
+            ),
+        )
+        if number == 1:
+            compiler.add("kill-window", "-t", "@0")
+
+    window_options = window_config.get("options")
+    if not isinstance(window_options, dict):
+        window_options = {}
+    if window_options or window_config.get("focus"):
+        # Apart from the window's creation, so a failing option is retried
+        # alone.
+        compiler.new_chain()
+        for key, value in window_options.items():
+            compiler.add("set-option", "-w", "-t", window, key, _option_value(value))
+        if window_config.get("focus"):
+            compiler.add("select-window", "-t", window)
+
+    if lazy:
+        compiler.new_chain()
+        hook, command = _lazy_window_hook(
+            SESSION_TARGET,
+            window,
+            _lazy_window_commands(
+                window,
+                f"%{number}.0",
+                window_config,
+                pane_base_index=0,
+                merge=options.batch_send_keys,
+            ),
+        )
+        compiler.add("set-hook", "-t", SESSION_TARGET, hook, command)
+        return
+
+    steps = plan_splits(layout, len(pane_configs))
+    if steps:
+        compiler.new_chain()
+        for step in steps:
+            compiler.add(
+                "split-window",
+                *_split_window_args(
+                    f"{window}.{step.position}",
+                    pane_models[step.pane],
+                    step,
+                ),
+            )
+        if steps[-1].pane != len(pane_configs) - 1:
+            compiler.add("select-pane", "-t", f"%{number}.{len(pane_configs) - 1}")
+
+    compiler.new_chain()
+    if layout:
+        compiler.add("select-layout", "-t", window, layout)
+    later: list[tuple[str, list[str], float]] = []
+    for pane_number, pane_model in enumerate(pane_models):
+        pane = f"%{number}.{pane_number}"
+        delay = 0.0
+        paused = False
+        for group in _send_keys_groups(
+            pane_model.commands,
+            merge=options.batch_send_keys,
+        ):
+            if group[0].sleep_before is not None:
+                delay += group[0].sleep_before
+                paused = True
+            args = ["send-keys", "-t", pane, *_send_keys_args(group)]
+            if paused:
+                later.append((pane, args, delay))
+            else:
+                compiler.add(*args)
+            delay = 0.0
+            if group[-1].sleep_after is not None:
+                delay = group[-1].sleep_after
+                paused = True
+        if pane_model.focus:
+            compiler.add("select-pane", "-t", pane)
+
+    # Commands after a pause go out on their own, once the pause is over.
+    for _pane, args, delay in later:
+        compiler.new_chain()
+        compiler.add(*args, delay=delay)
+
+    _compile_options_after(compiler, window, window_config)
+
+
+def _compile_options_after(
+    compiler: _Compiler,
+    window: str,
+    window_config: dict[str, t.Any],
+) -> None:
+    """Plan a window's ``options_after``, set once its panes exist."""
+    options_after = window_config.get("options_after")
+    if isinstance(options_after, dict) and options_after:
+        compiler.new_chain()
+        for key, value in options_after.items():
+            compiler.add("set-option", "-w", "-t", window, key, _option_value(value))
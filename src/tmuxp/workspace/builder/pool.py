@@ -0,0 +1,142 @@
+"""A pool of warm shells for new panes.
+
+Most of the time before a new pane is usable goes to its shell starting up:
+reading rc files, loading plugins, drawing the prompt. With
+``workspace_builder_options.shell_pool`` set, tmuxp keeps that many shells
+running in a detached session, :data:`POOL_SESSION`, one window each. A
+batched build moves a ready one into place instead of starting a new shell:
+``join-pane`` replaces ``split-window`` and ``break-pane`` replaces
+``new-window``, and the pane is then sent a ``cd`` to its start directory.
+Once the build is done, :meth:`ShellPool.replenish` starts shells to refill the
+pool in one tmux process; tmux runs them in the background, so they are ready
+by the next load.
+
+Only panes that would start the session's default shell, with no
+``environment`` of their own, are taken from the pool.
+
+Examples
+--------
+>>> from tmuxp.workspace.builder.pool import ShellPool
+>>> pool = ShellPool(server, size=2, session_name="_tmuxp_pool_demo")
+>>> pool.load()
+0
+>>> pool.take() is None
+True
+>>> pool.replenish()
+2
+>>> server.has_session("_tmuxp_pool_demo")
+True
+>>> pool.replenish()
+0
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import typing as t
+
+from tmuxp.workspace.builder.batch import TmuxCommandBatch
+from tmuxp.workspace.builder.readiness import _PANE_CURSOR_FORMAT, _ready_pane_ids
+
+if t.TYPE_CHECKING:
+    from libtmux.server import Server
+
+logger = logging.getLogger(__name__)
+
+POOL_SESSION = "_tmuxp_pool"
+"""name of the detached session that holds the pool's shells"""
+
+
+class ShellPool:
+    """Warm shells in :data:`POOL_SESSION`, waiting to become panes.
+
+    Parameters
+    ----------
+    server : :class:`libtmux.Server`
+        tmux server the pool and the workspace live on
+    size : int
+        how many shells :meth:`replenish` keeps in the pool
+    session_name : str
+        name of the pool's session
+    """
+
+    def __init__(
+        self,
+        server: Server,
+        size: int,
+        session_name: str = POOL_SESSION,
+    ) -> None:
+        self.server = server
+        self.size = size
+        self.session_name = session_name
+        self._ready: list[str] = []
+        self._pane_total = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> int:
+        """Find the pool's shells and note those that have drawn a prompt.
+
+        Returns
+        -------
+        int
+            how many shells are ready to :meth:`take`
+        """
+        proc = self.server.cmd(
+            "list-panes",
+            "-s",
+            "-t",
+            f"={self.session_name}",
+            "-F",
+            _PANE_CURSOR_FORMAT,
+        )
+        lines = [] if proc.stderr else proc.stdout
+        pane_ids = {line.partition(" ")[0] for line in lines}
+        ready, _gone = _ready_pane_ids(lines, pane_ids)
+        with self._lock:
+            self._pane_total = len(pane_ids)
+            self._ready = sorted(ready, key=lambda pane_id: int(pane_id[1:]))
+        logger.debug(
+            "shell pool loaded",
+            extra={"tmux_pane": " ".join(self._ready)},
+        )
+        return len(self._ready)
+
+    def take(self) -> str | None:
+        """Return the ID of a ready shell's pane, or ``None`` if none is left.
+
+        The pane is the caller's from then on; safe to call from several
+        threads.
+        """
+        with self._lock:
+            if not self._ready:
+                return None
+            self._pane_total -= 1
+            return self._ready.pop(0)
+
+    def replenish(self) -> int:
+        """Start shells until the pool holds :attr:`size` of them.
+
+        The pool's session is created if it is missing, and each further shell
+        gets a window of its own; all in one tmux process.
+
+        Returns
+        -------
+        int
+            how many shells were started
+        """
+        with self._lock:
+            missing = max(self.size - self._pane_total, 0)
+            self._pane_total += missing
+        if not missing:
+            return 0
+        batch = TmuxCommandBatch(server=self.server)
+        windows = missing
+        if not self.server.has_session(self.session_name):
+            batch.queue("new-session", "-d", "-s", self.session_name)
+            windows -= 1
+        for _ in range(windows):
+            batch.queue("new-window", "-d", "-t", f"={self.session_name}:")
+        batch.flush()
+        logger.debug("shell pool replenished with %d shells", missing)
+        return missing
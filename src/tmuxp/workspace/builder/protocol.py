@@ -9,14 +9,17 @@ the ``workspace_builder`` config key (see
 This module is intentionally dependency-light (typing only) so builder authors
 can import the contract without pulling in tmuxp's resolution machinery.
 
-The contract is synchronous today. Async builders are an *additive* future
-extension: a subclass protocol can declare an ``async`` build entry point and a
-capability flag, discovered through the same entry-point group, without
-changing this sync surface.
+The contract is synchronous. Async builders extend it additively:
+:class:`AsyncWorkspaceBuilderProtocol` adds an ``async`` :meth:`abuild` entry
+point and a ``supports_async`` capability flag. The flag is a class attribute,
+so a builder resolved through the same entry-point group can be recognized
+(:func:`is_async_builder`) without changing the sync surface, and ``tmuxp load``
+drives such builders through an event loop.
 """
 
 from __future__ import annotations
 
+import inspect
 import typing as t
 
 if t.TYPE_CHECKING:
@@ -106,3 +109,50 @@ class WorkspaceBuilderProtocol(t.Protocol):
     def find_current_attached_session(self) -> Session:
         """Return the session currently attached within ``$TMUX``."""
         ...
+
+
+@t.runtime_checkable
+class AsyncWorkspaceBuilderProtocol(WorkspaceBuilderProtocol, t.Protocol):
+    """Contract for a builder that can also build from an event loop.
+
+    An async builder still satisfies :class:`WorkspaceBuilderProtocol` (its
+    :meth:`build` may simply run :meth:`abuild` to completion), and declares
+    ``supports_async = True`` so callers know to await :meth:`abuild` instead.
+
+    Examples
+    --------
+    >>> from tmuxp.workspace.builder.protocol import AsyncWorkspaceBuilderProtocol
+    >>> from tmuxp.workspace.builder.aio import AsyncioWorkspaceBuilder
+    >>> builder = AsyncioWorkspaceBuilder(
+    ...     session_config={"session_name": "x", "windows": []}, server=server,
+    ... )
+    >>> isinstance(builder, AsyncWorkspaceBuilderProtocol)
+    True
+    """
+
+    supports_async: bool
+
+    async def abuild(
+        self,
+        session: Session | None = None,
+        append: bool = False,
+    ) -> None:
+        """Build the workspace, creating or populating a tmux session."""
+        ...
+
+
+def is_async_builder(builder: t.Any) -> bool:
+    """Return ``True`` if ``builder`` (a class or instance) builds asynchronously.
+
+    Examples
+    --------
+    >>> from tmuxp.workspace.builder.aio import AsyncioWorkspaceBuilder
+    >>> from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+    >>> is_async_builder(AsyncioWorkspaceBuilder)
+    True
+    >>> is_async_builder(ClassicWorkspaceBuilder)
+    False
+    """
+    return getattr(builder, "supports_async", False) is True and (
+        inspect.iscoroutinefunction(getattr(builder, "abuild", None))
+    )
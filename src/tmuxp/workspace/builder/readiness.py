@@ -0,0 +1,245 @@
+"""Pacing for pane readiness waits.
+
+Builders that wait for a pane's shell to draw its prompt poll the pane cursor
+(see :func:`tmuxp.workspace.builder.classic._wait_for_panes_ready`). How often
+they poll is a :class:`~tmuxp.workspace.options.PaneReadinessStrategy`:
+
+- ``poll`` re-checks at a fixed interval;
+- ``backoff`` doubles the pause after every check, so a slow-starting shell
+  costs a handful of ``tmux`` invocations instead of dozens;
+- ``event`` attaches a read-only control-mode client and re-checks only when
+  one of the waiting panes prints something (its ``%output`` notifications),
+  falling back to ``backoff`` when no client can attach.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import selectors
+import shutil
+import subprocess
+import time
+import typing as t
+
+from libtmux.exc import TmuxCommandNotFound
+
+from tmuxp import exc
+from tmuxp.workspace.builder.batch import server_args
+from tmuxp.workspace.options import PaneReadinessStrategy
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+
+    from libtmux.server import Server
+    from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+MAX_INTERVAL = 0.5
+"""longest pause between two readiness checks under ``backoff``"""
+
+
+_PANE_CURSOR_FORMAT = "#{pane_id} #{cursor_x} #{cursor_y}"
+
+
+def _ready_pane_ids(
+    lines: Iterable[str],
+    waiting: set[str],
+) -> tuple[set[str], set[str]]:
+    """Sort ``waiting`` panes by a ``list-panes`` cursor listing.
+
+    Parameters
+    ----------
+    lines : iterable of str
+        output of ``list-panes -F '#{pane_id} #{cursor_x} #{cursor_y}'``
+    waiting : set of str
+        ids of panes still waiting for their prompt
+
+    Returns
+    -------
+    tuple of (set of str, set of str)
+        ids of panes whose cursor has left the origin, and ids of panes
+        missing from the listing (they exited, so there is nothing to wait for)
+
+    Examples
+    --------
+    >>> ready, gone = _ready_pane_ids(
+    ...     ["%1 0 0", "%2 14 0", "%9 3 1"],
+    ...     {"%1", "%2", "%3"},
+    ... )
+    >>> sorted(ready), sorted(gone)
+    (['%2'], ['%3'])
+    """
+    cursors: dict[str, str] = {}
+    for line in lines:
+        pane_id, _, cursor = line.partition(" ")
+        cursors[pane_id] = cursor
+    ready = {
+        pane_id
+        for pane_id in waiting
+        if pane_id in cursors and cursors[pane_id] != "0 0"
+    }
+    gone = {pane_id for pane_id in waiting if pane_id not in cursors}
+    return ready, gone
+
+
+def readiness_intervals(
+    strategy: PaneReadinessStrategy,
+    interval: float = 0.05,
+    max_interval: float = MAX_INTERVAL,
+) -> Iterator[float]:
+    """Yield the pause before each successive readiness check.
+
+    Parameters
+    ----------
+    strategy : :class:`~tmuxp.workspace.options.PaneReadinessStrategy`
+        how to pace the checks; ``event`` paces its fallback like ``backoff``
+    interval : float
+        first pause, in seconds
+    max_interval : float
+        longest pause under ``backoff``
+
+    Examples
+    --------
+    >>> import itertools
+    >>> list(itertools.islice(readiness_intervals(PaneReadinessStrategy.POLL), 3))
+    [0.05, 0.05, 0.05]
+    >>> backoff = readiness_intervals(PaneReadinessStrategy.BACKOFF)
+    >>> list(itertools.islice(backoff, 6))
+    [0.05, 0.1, 0.2, 0.4, 0.5, 0.5]
+    """
+    while True:
+        yield interval
+        if strategy is not PaneReadinessStrategy.POLL:
+            interval = min(interval * 2, max_interval)
+
+
+def output_pane_id(line: bytes) -> str | None:
+    """Return the pane a control-mode output notification is for.
+
+    Examples
+    --------
+    >>> output_pane_id(b"%output %3 hello")
+    '%3'
+    >>> output_pane_id(b"%extended-output %12 40 : hello")
+    '%12'
+    >>> output_pane_id(b"%window-add @4") is None
+    True
+    """
+    tag, _, rest = line.partition(b" ")
+    if tag not in {b"%output", b"%extended-output"}:
+        return None
+    return rest.partition(b" ")[0].decode("ascii", errors="replace")
+
+
+class PaneOutputListener:
+    """A read-only ``tmux -C`` client reporting which panes print output.
+
+    The client attaches with ``ignore-size`` and ``read-only``, so it neither
+    resizes windows nor accepts input; it exists only to receive ``%output``
+    notifications. Once the constructor returns, the client is attached and no
+    later output is missed.
+
+    Examples
+    --------
+    >>> pane = session.active_window.active_pane
+    >>> with PaneOutputListener(server=server, target=session.session_id) as events:
+    ...     pane.send_keys("echo ping", enter=True)
+    ...     pane.pane_id in events.wait({pane.pane_id}, timeout=5.0)
+    True
+    """
+
+    def __init__(self, server: Server, target: str) -> None:
+        tmux_bin = server.tmux_bin or shutil.which("tmux")
+        if not tmux_bin:
+            raise TmuxCommandNotFound
+
+        argv = [tmux_bin, *server_args(server), "-C", "attach-session"]
+        argv += ["-f", "ignore-size,read-only", "-t", target]
+        self.process = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        assert self.process.stdout is not None
+        self._fd = self.process.stdout.fileno()
+        self._buffer = b""
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._fd, selectors.EVENT_READ)
+        logger.debug("tmux output listener started", extra={"tmux_target": target})
+
+        # The attach is answered with the first %begin ... %end block.
+        deadline = time.monotonic() + 5.0
+        while True:
+            line = self._readline(deadline)
+            if line is None or line.startswith(b"%error"):
+                self.close()
+                msg = f"could not attach to {target}"
+                raise exc.TmuxControlModeError(msg)
+            if line.startswith(b"%end"):
+                break
+
+    def __enter__(self) -> Self:
+        """Return the listener; it is closed on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the listener."""
+        self.close()
+
+    def _readline(self, deadline: float) -> bytes | None:
+        """Return the next line, or ``None`` at ``deadline`` or end of output."""
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._selector.select(remaining):
+                return None
+            chunk = os.read(self._fd, 65536)
+            if not chunk:
+                return None
+            self._buffer += chunk
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return line
+
+    def wait(self, pane_ids: set[str], timeout: float) -> set[str]:
+        """Wait up to ``timeout`` seconds for any of ``pane_ids`` to print.
+
+        Returns
+        -------
+        set of str
+            the panes among ``pane_ids`` that printed; empty on timeout
+        """
+        deadline = time.monotonic() + timeout
+        seen: set[str] = set()
+        while True:
+            line = self._readline(deadline)
+            if line is None:
+                return seen
+            pane_id = output_pane_id(line)
+            if pane_id in pane_ids:
+                seen.add(pane_id)
+                # Collect what has already arrived, then let the caller check.
+                deadline = 0
+
+    def close(self) -> None:
+        """Detach the client and wait for it to exit."""
+        self._selector.close()
+        assert self.process.stdin is not None
+        assert self.process.stdout is not None
+        with contextlib.suppress(OSError):
+            self.process.stdin.close()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+        logger.debug("tmux output listener closed")
@@ -0,0 +1,204 @@
+"""Plan the windows and panes a running session is missing.
+
+``tmuxp load --reconcile`` compares the expanded workspace with the session
+that is already running, instead of offering only to attach to it or to kill
+and rebuild it. :func:`plan_reconcile` matches each configured window to a
+live one and works out what has to be created: whole windows that are gone,
+and panes missing from windows that are still there. Live windows and panes
+are never changed, so whatever runs in them keeps running.
+
+A configured window matches a live window when:
+
+- it sets ``window_index`` and the live window at that index has its
+  ``window_name`` (or the configured window has no name);
+- it is named, and a live window of that name has not been matched yet;
+- it is unnamed, and the live window at its position (``base-index`` plus its
+  place in the workspace) has not been matched yet. tmux renames unnamed
+  windows after the running program, so the position is all there is to go
+  on.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+if t.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+class LiveWindow(t.NamedTuple):
+    """A window of the running session, as :func:`plan_reconcile` sees it."""
+
+    name: str
+    window_index: int
+    pane_count: int
+
+
+class ReconcileStep(t.NamedTuple):
+    """What a configured window needs to match the workspace.
+
+    ``live`` is the position of the matched window in the live windows passed
+    to :func:`plan_reconcile`, or ``None`` when the window has to be created.
+    ``window_index`` is where a missing window goes (``""`` lets tmux pick the
+    first free index). ``missing_panes`` counts the panes to add to a live
+    window, or the panes of a missing one.
+    """
+
+    position: int
+    live: int | None
+    window_index: str
+    missing_panes: int
+
+    @property
+    def missing(self) -> bool:
+        """Return whether the window itself has to be created."""
+        return self.live is None
+
+
+def plan_reconcile(
+    window_configs: Sequence[dict[str, t.Any]],
+    live_windows: Sequence[LiveWindow],
+    base_index: int = 0,
+) -> list[ReconcileStep]:
+    """Match configured windows to live ones and plan what is missing.
+
+    Parameters
+    ----------
+    window_configs : list of dict
+        the expanded workspace's ``windows``
+    live_windows : list of :class:`LiveWindow`
+        the running session's windows
+    base_index : int
+        the session's ``base-index`` option
+
+    Returns
+    -------
+    list of :class:`ReconcileStep`
+        one per configured window that is missing, or is missing panes
+
+    Examples
+    --------
+    >>> windows = [
+    ...     {"window_name": "editor", "panes": [{}, {}]},
+    ...     {"window_name": "server", "panes": [{}]},
+    ...     {"window_name": "logs", "panes": [{}]},
+    ... ]
+
+    Nothing is missing:
+
+    >>> live = [
+    ...     LiveWindow("editor", 1, 2),
+    ...     LiveWindow("server", 2, 1),
+    ...     LiveWindow("logs", 3, 1),
+    ... ]
+    >>> plan_reconcile(windows, live, base_index=1)
+    []
+
+    The ``server`` window is gone, so it goes back in its old slot, and
+    ``editor`` lost a pane:
+
+    >>> live = [LiveWindow("editor", 1, 1), LiveWindow("logs", 3, 1)]
+    >>> for step in plan_reconcile(windows, live, base_index=1):
+    ...     print(step)
+    ReconcileStep(position=0, live=0, window_index='', missing_panes=1)
+    ReconcileStep(position=1, live=None, window_index='2', missing_panes=1)
+
+    When that slot is taken, tmux picks the first free index instead:
+
+    >>> live = [LiveWindow("editor", 1, 2), LiveWindow("htop", 2, 1)]
+    >>> for step in plan_reconcile(windows, live, base_index=1):
+    ...     print(step)
+    ReconcileStep(position=1, live=None, window_index='', missing_panes=1)
+    ReconcileStep(position=2, live=None, window_index='', missing_panes=1)
+    """
+    claimed: set[int] = set()
+    matches: list[int | None] = [None] * len(window_configs)
+    by_index = {
+        window.window_index: position for position, window in enumerate(live_windows)
+    }
+
+    def claim(config_position: int, live_position: int | None) -> None:
+        if live_position is not None and live_position not in claimed:
+            claimed.add(live_position)
+            matches[config_position] = live_position
+
+    # Windows pinned to an index first, then named ones, then the rest by
+    # position, so a looser rule never takes a window a stricter one wants.
+    for position, window_config in enumerate(window_configs):
+        window_index = window_config.get("window_index")
+        if window_index is None or window_index == "":
+            continue
+        live_position = by_index.get(int(window_index))
+        name = window_config.get("window_name")
+        if live_position is not None and name not in {
+            None,
+            live_windows[live_position].name,
+        }:
+            live_position = None
+        claim(position, live_position)
+
+    for position, window_config in enumerate(window_configs):
+        name = window_config.get("window_name")
+        if name is None or window_config.get("window_index") not in {None, ""}:
+            continue
+        claim(
+            position,
+            next(
+                (
+                    live_position
+                    for live_position, window in enumerate(live_windows)
+                    if window.name == name and live_position not in claimed
+                ),
+                None,
+            ),
+        )
+
+    for position, window_config in enumerate(window_configs):
+        if window_config.get("window_name") is not None or window_config.get(
+            "window_index",
+        ) not in {None, ""}:
+            continue
+        claim(position, by_index.get(base_index + position))
+
+    steps: list[ReconcileStep] = []
+    taken = {window.window_index for window in live_windows}
+    previous_index: int | None = base_index - 1
+    for position, window_config in enumerate(window_configs):
+        pane_total = len(window_config.get("panes", []))
+        live_position = matches[position]
+        if live_position is not None:
+            live_window = live_windows[live_position]
+            previous_index = live_window.window_index
+            if pane_total > live_window.pane_count:
+                steps.append(
+                    ReconcileStep(
+                        position,
+                        live_position,
+                        "",
+                        pane_total - live_window.pane_count,
+                    ),
+                )
+            continue
+
+        window_index = window_config.get("window_index")
+        if window_index is not None and window_index != "":
+            slot: int | None = int(window_index)
+            if slot in taken:
+                slot = None
+        elif previous_index is not None and previous_index + 1 not in taken:
+            slot = previous_index + 1
+        else:
+            slot = None
+
+        if slot is not None:
+            taken.add(slot)
+        previous_index = slot
+        steps.append(
+            ReconcileStep(
+                position,
+                None,
+                "" if slot is None else str(slot),
+                pane_total,
+            ),
+        )
+    return steps
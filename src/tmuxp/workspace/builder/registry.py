@@ -27,6 +27,7 @@ from importlib import metadata
 from tmuxp import exc
 from tmuxp._internal.private_path import PrivatePath
 from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+from tmuxp.workspace.builder.protocol import is_async_builder
 from tmuxp.workspace.loader import expandshell
 
 if t.TYPE_CHECKING:
@@ -219,7 +220,8 @@ def _validate_builder(obj: t.Any, target: str) -> None:
 
     A class must expose a callable ``build`` method and a constructor accepting
     ``session_config``, ``server``, and ``plugins`` (or ``**kwargs``) — the
-    arguments ``tmuxp load`` always passes. Non-class callables (factories) are
+    arguments ``tmuxp load`` always passes. A class that sets ``supports_async``
+    must also define an ``async`` ``abuild``. Non-class callables (factories) are
     trusted and validated at instantiation.
 
     Examples
@@ -238,6 +240,11 @@ def _validate_builder(obj: t.Any, target: str) -> None:
                 target,
                 reason="class has no callable 'build' method",
             )
+        if getattr(obj, "supports_async", False) and not is_async_builder(obj):
+            raise exc.InvalidWorkspaceBuilder(
+                target,
+                reason="declares 'supports_async' but has no async 'abuild' method",
+            )
         try:
             params = inspect.signature(obj).parameters
         except (TypeError, ValueError):
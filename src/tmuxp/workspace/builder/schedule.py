@@ -0,0 +1,185 @@
+"""Deferred ``sleep_before`` / ``sleep_after`` pauses.
+
+A pane's commands are typed in order, with ``sleep_before`` / ``sleep_after``
+pauses between them. Sleeping inline holds up every pane and window built
+after it, so during a build the classic builder hands each pause to a
+:class:`PauseScheduler` instead. The rest of that pane's commands run on the
+scheduler's thread once the pause is over, while the build moves on to the
+next pane.
+
+Each pane's steps form one chain, so commands within a pane keep their order
+and their pauses. Panes no longer wait for each other's pauses.
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import heapq
+import itertools
+import logging
+import threading
+import time
+import typing as t
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class PauseScheduler:
+    """Run callbacks on a background thread once their delay has passed.
+
+    Callbacks are tracked by ``key`` (the builder uses the window id), so a
+    caller can wait for one window's panes, or for everything.
+
+    Examples
+    --------
+    >>> scheduler = PauseScheduler()
+    >>> calls = []
+    >>> scheduler.call_later(0.05, lambda: calls.append("late"), key="@1")
+    >>> scheduler.call_later(0.0, lambda: calls.append("early"), key="@2")
+    >>> scheduler.wait("@1")
+    >>> calls
+    ['early', 'late']
+    >>> scheduler.pending()
+    False
+    >>> scheduler.close()
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._queue: list[tuple[float, int, Hashable, Callable[[], None]]] = []
+        self._order = itertools.count()
+        self._pending: collections.Counter[Hashable] = collections.Counter()
+        self._errors: list[BaseException] = []
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def call_later(
+        self,
+        delay: float,
+        callback: Callable[[], None],
+        key: Hashable = None,
+    ) -> None:
+        """Run ``callback`` on the scheduler thread after ``delay`` seconds."""
+        with self._condition:
+            if self._closed:
+                msg = "scheduler is closed"
+                raise RuntimeError(msg)
+            due = time.monotonic() + delay
+            heapq.heappush(self._queue, (due, next(self._order), key, callback))
+            self._pending[key] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="tmuxp-pauses",
+                    daemon=True,
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def pending(self, key: Hashable = None) -> bool:
+        """Return whether callbacks for ``key`` (or any key, if ``None``) wait."""
+        with self._condition:
+            return self._has_pending(key)
+
+    def _has_pending(self, key: Hashable) -> bool:
+        if key is None:
+            return bool(self._pending)
+        return self._pending[key] > 0
+
+    def wait(self, key: Hashable = None) -> None:
+        """Block until every callback for ``key`` (or all, if ``None``) has run.
+
+        Raises
+        ------
+        Exception
+            the first exception a callback raised, if any
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: not self._has_pending(key))
+            if self._errors:
+                raise self._errors.pop(0)
+
+    def close(self) -> None:
+        """Drop callbacks that have not run and stop the scheduler thread."""
+        with self._condition:
+            self._closed = True
+            self._queue.clear()
+            self._pending.clear()
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        return
+                    if self._queue:
+                        remaining = self._queue[0][0] - time.monotonic()
+                        if remaining <= 0:
+                            _due, _order, key, callback = heapq.heappop(self._queue)
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+            try:
+                callback()
+            except Exception as e:
+                logger.debug("deferred pane step failed", exc_info=True)
+                with self._condition:
+                    self._errors.append(e)
+            finally:
+                with self._condition:
+                    if self._pending[key] > 0:
+                        self._pending[key] -= 1
+                        if not self._pending[key]:
+                            del self._pending[key]
+                    self._condition.notify_all()
+
+
+def run_steps(
+    steps: Sequence[float | Callable[[], None]],
+    scheduler: PauseScheduler | None = None,
+    key: Hashable = None,
+) -> None:
+    """Run ``steps`` in order; a number is a pause of that many seconds.
+
+    Steps before the first pause run now. With a ``scheduler``, the remaining
+    steps run on its thread once the pause is over; without one, the pause
+    is slept inline.
+
+    Examples
+    --------
+    >>> calls = []
+    >>> run_steps([lambda: calls.append(1), 0.0, lambda: calls.append(2)])
+    >>> calls
+    [1, 2]
+
+    >>> scheduler = PauseScheduler()
+    >>> run_steps(
+    ...     [lambda: calls.append(3), 0.05, lambda: calls.append(4)],
+    ...     scheduler,
+    ...     key="@1",
+    ... )
+    >>> calls
+    [1, 2, 3]
+    >>> scheduler.wait("@1")
+    >>> calls
+    [1, 2, 3, 4]
+    >>> scheduler.close()
+    """
+    for index, step in enumerate(steps):
+        if callable(step):
+            step()
+        elif scheduler is None:
+            time.sleep(step)
+        else:
+            rest = functools.partial(run_steps, steps[index + 1 :], scheduler, key)
+            scheduler.call_later(step, rest, key=key)
+            return
@@ -2,13 +2,94 @@
 
 from __future__ import annotations
 
+import contextlib
+import contextvars
 import logging
 import os
 import pathlib
+import re
 import typing as t
 
+from tmuxp._internal.config_cache import WorkspaceCache, cache_enabled
+from tmuxp._internal.config_reader import ConfigReader
+from tmuxp.workspace.before_script import normalize_before_script
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from tmuxp._internal.config_cache import WorkspaceRead
+
 logger = logging.getLogger(__name__)
 
+_reads: contextvars.ContextVar[dict[tuple[str, str], str | None] | None] = (
+    contextvars.ContextVar("_reads", default=None)
+)
+
+#: variables :func:`os.path.expandvars` substitutes, as it finds them
+_VARIABLE = re.compile(r"\$(\w+|\{[^}]*\})", re.ASCII)
+
+
+#: ``shell_command`` values that mean a pane with no commands
+_BLANK_COMMANDS = (None, "blank", "pane")
+
+
+def _note_read(kind: str, key: str, value: str | None) -> None:
+    """Note, while :func:`recording_reads`, that expansion read ``value``."""
+    reads = _reads.get()
+    if reads is not None:
+        reads[kind, key] = value
+
+
+@contextlib.contextmanager
+def recording_reads() -> Iterator[list[WorkspaceRead]]:
+    """Record what :func:`expand` reads from outside the workspace.
+
+    Yields a list that, once the block exits, holds a ``(kind, key, value)``
+    tuple for each environment variable (``env``), home directory (``user``),
+    current directory (``cwd``) and resolved path (``resolve``) the expansion
+    depended on. :func:`read_value` reads each one again.
+
+    Examples
+    --------
+    >>> monkeypatch.setenv("PROJECT", "tmuxp")
+    >>> with recording_reads() as reads:
+    ...     expandshell("${PROJECT}/docs")
+    'tmuxp/docs'
+    >>> reads
+    [('env', 'PROJECT', 'tmuxp')]
+    """
+    reads: list[WorkspaceRead] = []
+    token = _reads.set({})
+    try:
+        yield reads
+    finally:
+        recorded = _reads.get() or {}
+        _reads.reset(token)
+        reads.extend((kind, key, value) for (kind, key), value in recorded.items())
+
+
+def read_value(kind: str, key: str) -> str | None:
+    """Return what a read recorded by :func:`recording_reads` gives now.
+
+    Examples
+    --------
+    >>> monkeypatch.setenv("PROJECT", "tmuxp")
+    >>> read_value("env", "PROJECT")
+    'tmuxp'
+    >>> read_value("resolve", "/")
+    '/'
+    """
+    if kind == "env":
+        return os.environ.get(key)
+    if kind == "user":
+        return os.path.expanduser(key)  # NOQA: PTH111
+    if kind == "cwd":
+        return str(pathlib.Path.cwd())
+    if kind == "resolve":
+        return str(pathlib.Path(key).resolve(strict=False))
+    msg = f"unknown workspace read: {kind}"
+    raise ValueError(msg)
+
 
 def expandshell(value: str) -> str:
     """Resolve shell variables based on user's ``$HOME`` and ``env``.
@@ -25,11 +106,26 @@ def expandshell(value: str) -> str:
     str
         value with shell variables expanded
     """
+    if _reads.get() is not None:
+        if value.startswith("~"):
+            user = value.split("/", 1)[0]
+            _note_read("user", user, os.path.expanduser(user))  # NOQA: PTH111
+        for name in _VARIABLE.findall(os.path.expanduser(value)):  # NOQA: PTH111
+            name = name.strip("{}")
+            _note_read("env", name, os.environ.get(name))
     return os.path.expandvars(os.path.expanduser(value))  # NOQA: PTH111
 
 
 def expand_cmd(p: dict[str, t.Any]) -> dict[str, t.Any]:
     """Resolve shell variables and expand shorthands in a tmuxp config mapping."""
+    return _expand_commands(p, expandshell)
+
+
+def _expand_commands(
+    p: dict[str, t.Any],
+    expand_value: Callable[[str], str],
+) -> dict[str, t.Any]:
+    """Do :func:`expand_cmd`'s work, expanding each command with ``expand_value``."""
     if isinstance(p, str):
         p = {"shell_command": [p]}
     elif isinstance(p, list):
@@ -44,20 +140,16 @@ def expand_cmd(p: dict[str, t.Any]) -> dict[str, t.Any]:
         if isinstance(p["shell_command"], str):
             cmds = [cmds]
 
-        if not cmds or any(a == cmds for a in [None, "blank", "pane"]):
+        if not cmds or cmds in _BLANK_COMMANDS:
             cmds = []
 
-        if (
-            isinstance(cmds, list)
-            and len(cmds) == 1
-            and any(a in cmds for a in [None, "blank", "pane"])
-        ):
+        if isinstance(cmds, list) and len(cmds) == 1 and cmds[0] in _BLANK_COMMANDS:
             cmds = []
 
         for cmd_idx, cmd in enumerate(cmds):
             if isinstance(cmd, str):
                 cmds[cmd_idx] = {"cmd": cmd}
-            cmds[cmd_idx]["cmd"] = expandshell(cmds[cmd_idx]["cmd"])
+            cmds[cmd_idx]["cmd"] = expand_value(cmds[cmd_idx]["cmd"])
 
         p["shell_command"] = cmds
     else:
@@ -65,88 +157,68 @@ def expand_cmd(p: dict[str, t.Any]) -> dict[str, t.Any]:
     return p
 
 
-def expand(
+def _expand_level(
     workspace_dict: dict[str, t.Any],
-    cwd: pathlib.Path | str | None = None,
-    parent: t.Any | None = None,
-) -> dict[str, t.Any]:
-    """Resolve workspace variables and expand shorthand style / inline properties.
-
-    This is necessary to keep the code in
-    :class:`~tmuxp.workspace.builder.classic.ClassicWorkspaceBuilder` clean and
-    also allow for neat, short-hand "sugarified" syntax.
-
-    As a simple example, internally, tmuxp expects that workspace options
-    like ``shell_command`` are a list (array)::
+    cwd: pathlib.Path | str | None,
+    parent: t.Any | None,
+    expand_value: Callable[[str], str],
+) -> None:
+    """Expand one level of a workspace in place; not its windows or panes.
 
-        'shell_command': ['htop']
-
-    tmuxp workspace allow for it to be simply a string::
-
-        'shell_command': 'htop'
-
-    ConfigReader will load JSON/YAML files into python dicts for you.
-
-    Parameters
-    ----------
-    workspace_dict : dict
-        the tmuxp workspace for the session
-    cwd : str
-        directory to expand relative paths against. should be the dir of the
-        workspace directory.
-    parent : str
-        (used on recursive entries) start_directory of parent window or session
-        object.
-
-    Returns
-    -------
-    dict
+    See :func:`expand`; shell variables are expanded with ``expand_value``.
     """
-    logger.debug(
-        "expanding workspace config",
-        extra={"tmux_session": workspace_dict.get("session_name", "")},
-    )
-
     # Note: cli.py will expand workspaces relative to project's workspace directory
     # for the first cwd argument.
-    cwd = pathlib.Path().cwd() if not cwd else pathlib.Path(cwd)
+    # Without one, the current directory is only looked up once a relative path
+    # needs it.
+    process_cwd = not cwd
+    base = pathlib.Path(cwd) if cwd else None
+
+    def base_directory() -> pathlib.Path:
+        """Return the directory relative paths are joined to."""
+        nonlocal base
+        if base is None:
+            base = pathlib.Path.cwd()
+        if process_cwd:
+            _note_read("cwd", "", str(base))
+        return base
+
+    def relative(value: str) -> str:
+        """Return ``value`` joined to the base directory if it is relative."""
+        if value.startswith("."):
+            value = str(base_directory() / value)
+        return value
 
     if "session_name" in workspace_dict:
-        workspace_dict["session_name"] = expandshell(workspace_dict["session_name"])
+        workspace_dict["session_name"] = expand_value(workspace_dict["session_name"])
     if "window_name" in workspace_dict:
-        workspace_dict["window_name"] = expandshell(workspace_dict["window_name"])
+        workspace_dict["window_name"] = expand_value(workspace_dict["window_name"])
     if "environment" in workspace_dict:
         for key in workspace_dict["environment"]:
             val = workspace_dict["environment"][key]
-            val = expandshell(val)
-            if any(val.startswith(a) for a in [".", "./"]):
-                val = str(cwd / val)
+            val = relative(expand_value(val))
             workspace_dict["environment"][key] = val
     if "global_options" in workspace_dict:
         for key in workspace_dict["global_options"]:
             val = workspace_dict["global_options"][key]
             if isinstance(val, str):
-                val = expandshell(val)
-                if any(val.startswith(a) for a in [".", "./"]):
-                    val = str(cwd / val)
+                val = relative(expand_value(val))
             workspace_dict["global_options"][key] = val
     if "options" in workspace_dict:
         for key in workspace_dict["options"]:
             val = workspace_dict["options"][key]
             if isinstance(val, str):
-                val = expandshell(val)
-                if any(val.startswith(a) for a in [".", "./"]):
-                    val = str(cwd / val)
+                val = relative(expand_value(val))
             workspace_dict["options"][key] = val
 
     # Any workspace section, session, window, pane that can contain the
     # 'shell_command' value
     if "start_directory" in workspace_dict:
-        workspace_dict["start_directory"] = expandshell(
+        workspace_dict["start_directory"] = expand_value(
             workspace_dict["start_directory"],
         )
         start_path = workspace_dict["start_directory"]
-        if any(start_path.startswith(a) for a in [".", "./"]):
+        if start_path.startswith("."):
             # if window has a session, or pane has a window with a
             # start_directory of . or ./, make sure the start_directory can be
             # relative to the parent.
@@ -154,16 +226,23 @@ def expand(
             # This is for the case where you may be loading a workspace from
             # outside your shell current directory.
             if parent:
-                cwd = pathlib.Path(parent["start_directory"])
+                base = pathlib.Path(parent["start_directory"])
+                process_cwd = False
 
-            start_path = str((cwd / start_path).resolve(strict=False))
+            joined_path = base_directory() / start_path
+            start_path = str(joined_path.resolve(strict=False))
+            _note_read("resolve", str(joined_path), start_path)
 
             workspace_dict["start_directory"] = start_path
 
     if "before_script" in workspace_dict:
-        workspace_dict["before_script"] = expandshell(workspace_dict["before_script"])
-        if any(workspace_dict["before_script"].startswith(a) for a in [".", "./"]):
-            workspace_dict["before_script"] = str(cwd / workspace_dict["before_script"])
+        before_script = normalize_before_script(workspace_dict["before_script"])
+        if isinstance(before_script, str):
+            before_script = relative(expand_value(before_script))
+        else:
+            for step in before_script:
+                step["script"] = relative(expand_value(step["script"]))
+        workspace_dict["before_script"] = before_script
 
     if "shell_command" in workspace_dict and isinstance(
         workspace_dict["shell_command"],
@@ -174,7 +253,55 @@ def expand(
     if "shell_command_before" in workspace_dict:
         shell_command_before = workspace_dict["shell_command_before"]
 
-        workspace_dict["shell_command_before"] = expand_cmd(shell_command_before)
+        workspace_dict["shell_command_before"] = _expand_commands(
+            shell_command_before,
+            expand_value,
+        )
+
+
+def expand(
+    workspace_dict: dict[str, t.Any],
+    cwd: pathlib.Path | str | None = None,
+    parent: t.Any | None = None,
+) -> dict[str, t.Any]:
+    """Resolve workspace variables and expand shorthand style / inline properties.
+
+    This is necessary to keep the code in
+    :class:`~tmuxp.workspace.builder.classic.ClassicWorkspaceBuilder` clean and
+    also allow for neat, short-hand "sugarified" syntax.
+
+    As a simple example, internally, tmuxp expects that workspace options
+    like ``shell_command`` are a list (array)::
+
+        'shell_command': ['htop']
+
+    tmuxp workspace allow for it to be simply a string::
+
+        'shell_command': 'htop'
+
+    ConfigReader will load JSON/YAML files into python dicts for you.
+
+    Parameters
+    ----------
+    workspace_dict : dict
+        the tmuxp workspace for the session
+    cwd : str
+        directory to expand relative paths against. should be the dir of the
+        workspace directory.
+    parent : str
+        (used on recursive entries) start_directory of parent window or session
+        object.
+
+    Returns
+    -------
+    dict
+    """
+    logger.debug(
+        "expanding workspace config",
+        extra={"tmux_session": workspace_dict.get("session_name", "")},
+    )
+
+    _expand_level(workspace_dict, cwd, parent, expandshell)
 
     # recurse into window and pane workspace items
     if "windows" in workspace_dict:
@@ -230,9 +357,7 @@ def trickle(workspace_dict: dict[str, t.Any]) -> dict[str, t.Any]:
         if session_start_directory:
             if "start_directory" not in window_dict:
                 window_dict["start_directory"] = session_start_directory
-            elif not any(
-                window_dict["start_directory"].startswith(a) for a in ["~", "/"]
-            ):
+            elif not window_dict["start_directory"].startswith(("~", "/")):
                 window_start_path = (
                     pathlib.Path(session_start_directory)
                     / window_dict["start_directory"]
@@ -272,3 +397,159 @@ def trickle(workspace_dict: dict[str, t.Any]) -> dict[str, t.Any]:
             # pane_dict['shell_command'] = commands_before
 
     return workspace_dict
+
+
+def normalize(
+    workspace_dict: dict[str, t.Any],
+    cwd: pathlib.Path | str | None = None,
+) -> dict[str, t.Any]:
+    """Return ``workspace_dict`` expanded and trickled in a single pass.
+
+    Gives the same workspace as ``trickle(expand(workspace_dict, cwd))``, in
+    one loop over the windows and their panes: each pane is expanded and given
+    its inherited commands in the same visit. Shell variables are expanded once
+    per distinct value, and the session and window ``shell_command_before``
+    are joined once per window, then prefixed to each of its panes' commands.
+
+    Parameters
+    ----------
+    workspace_dict : dict
+        the tmuxp workspace for the session
+    cwd : str
+        directory to expand relative paths against; see :func:`expand`
+
+    Returns
+    -------
+    dict
+
+    Examples
+    --------
+    >>> workspace = normalize(
+    ...     {
+    ...         "session_name": "docs",
+    ...         "shell_command_before": "cd docs",
+    ...         "windows": [{"window_name": "editor", "panes": ["vim", None]}],
+    ...     },
+    ... )
+    >>> workspace["windows"][0]["panes"]
+    [{'shell_command': [{'cmd': 'cd docs'}, {'cmd': 'vim'}]},
+     {'shell_command': [{'cmd': 'cd docs'}]}]
+    """
+    logger.debug(
+        "normalizing workspace config",
+        extra={"tmux_session": workspace_dict.get("session_name", "")},
+    )
+    expanded: dict[str, str] = {}
+
+    def expand_value(value: str) -> str:
+        try:
+            return expanded[value]
+        except KeyError:
+            expanded[value] = result = expandshell(value)
+            return result
+
+    _expand_level(workspace_dict, cwd, None, expand_value)
+    session_start_directory = workspace_dict.get("start_directory")
+    suppress_history = workspace_dict.get("suppress_history")
+    session_before = workspace_dict.get("shell_command_before", {}).get(
+        "shell_command",
+        [],
+    )
+
+    for window_dict in workspace_dict["windows"]:
+        _expand_level(window_dict, None, workspace_dict, expand_value)
+        window_before = [
+            *session_before,
+            *window_dict.get("shell_command_before", {}).get("shell_command", []),
+        ]
+
+        if "panes" in window_dict:
+            pane_dicts = window_dict["panes"]
+            for pane_idx, pane in enumerate(pane_dicts):
+                # A copy, so a pane repeated through a YAML alias is trickled once.
+                pane_dict = dict(_expand_commands(pane, expand_value))
+                _expand_level(pane_dict, None, window_dict, expand_value)
+                pane_dict["shell_command"] = [
+                    *window_before,
+                    *pane_dict.get("shell_command_before", {}).get(
+                        "shell_command",
+                        [],
+                    ),
+                    *pane_dict["shell_command"],
+                ]
+                pane_dicts[pane_idx] = pane_dict
+
+        if session_start_directory:
+            if "start_directory" not in window_dict:
+                window_dict["start_directory"] = session_start_directory
+            elif not window_dict["start_directory"].startswith(("~", "/")):
+                window_dict["start_directory"] = str(
+                    pathlib.Path(session_start_directory)
+                    / window_dict["start_directory"],
+                )
+        if suppress_history is not None and "suppress_history" not in window_dict:
+            window_dict["suppress_history"] = suppress_history
+        if "panes" not in window_dict:
+            window_dict["panes"] = [{"shell_command": window_before}]
+
+    return workspace_dict
+
+
+def expand_file(workspace_file: pathlib.Path | str) -> dict[str, t.Any]:
+    r"""Return the workspace in ``workspace_file``, expanded and trickled.
+
+    The file is read with :class:`~tmuxp._internal.config_reader.ConfigReader`,
+    then passed through :func:`normalize`, relative to its directory. The
+    result is cached, see :class:`~tmuxp._internal.config_cache.WorkspaceCache`,
+    and reused while the file's content and everything the expansion read stay
+    the same.
+
+    Parameters
+    ----------
+    workspace_file : :class:`pathlib.Path` or str
+        workspace file to load
+
+    Returns
+    -------
+    dict
+
+    Examples
+    --------
+    >>> workspace_file = tmp_path / "workspace.yaml"
+    >>> _ = workspace_file.write_text(
+    ...     "session_name: docs\n"
+    ...     "start_directory: ./docs\n"
+    ...     "windows:\n"
+    ...     "- window_name: editor\n",
+    ...     encoding="utf-8",
+    ... )
+    >>> workspace = expand_file(workspace_file)
+    >>> workspace["windows"][0]["start_directory"] == str(tmp_path / "docs")
+    True
+    >>> workspace["windows"][0]["panes"]
+    [{'shell_command': []}]
+    """
+    workspace_file = pathlib.Path(workspace_file)
+    cache = WorkspaceCache() if cache_enabled() else None
+    if cache is not None:
+        content = workspace_file.read_bytes()
+        cached = cache.get(workspace_file, content, read_value)
+        if cached is not None:
+            return cached
+        # Parse the bytes the entry is keyed by, not the file again: it may
+        # have changed since.
+        raw_workspace = (
+            ConfigReader._load(
+                ConfigReader._format_of(workspace_file),
+                content.decode("utf-8"),
+            )
+            or {}
+        )
+    else:
+        raw_workspace = ConfigReader._from_file(workspace_file) or {}
+    with recording_reads() as reads:
+        workspace = normalize(raw_workspace, cwd=os.path.dirname(workspace_file))  # NOQA: PTH120
+
+    if cache is not None:
+        cache.put(workspace_file, content, reads, workspace)
+    return workspace
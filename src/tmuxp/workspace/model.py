@@ -0,0 +1,198 @@
+"""Typed, immutable view of an expanded workspace.
+
+The builders create panes in tight loops, and each pane used to look its
+settings up again in its own and its window's config: ``shell`` falling back
+to ``window_shell``, ``start_directory`` and ``environment`` to the window's,
+``suppress_history`` to the window's and ``enter`` / ``sleep_before`` /
+``sleep_after`` carried from command to command. :class:`Session.from_config`
+resolves all of that once per build, into :class:`Window`, :class:`Pane` and
+:class:`Command` named tuples: immutable, and without a ``__dict__`` per
+instance.
+
+Workspaces still travel as dicts, which plugins and third-party builders read
+and which ``iter_create_panes`` yields; every model keeps the dict it was made
+from as ``config``.
+
+Examples
+--------
+>>> window = Window.from_config(
+...     {
+...         "window_name": "editor",
+...         "start_directory": "/srv",
+...         "window_shell": "top",
+...         "suppress_history": False,
+...         "panes": [
+...             {"shell_command": [{"cmd": "vim"}], "focus": True},
+...             {"shell": "htop", "shell_command": []},
+...         ],
+...     },
+... )
+>>> first, second = window.panes
+>>> first.start_directory, first.shell, first.focus
+('/srv', 'top', True)
+>>> first.commands
+(Command(cmd='vim', suppress_history=False, enter=True, sleep_before=None, ...),)
+>>> second.shell
+'htop'
+>>> second.config is window.config["panes"][1]
+True
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+
+class Command(t.NamedTuple):
+    """A ``shell_command`` entry with the settings it inherits resolved."""
+
+    cmd: str
+    suppress_history: bool
+    enter: bool
+    sleep_before: float | None
+    sleep_after: float | None
+
+
+class Pane(t.NamedTuple):
+    """A pane, with what it inherits from its window resolved."""
+
+    start_directory: str | None
+    shell: str | None
+    environment: dict[str, str] | None
+    focus: bool
+    commands: tuple[Command, ...]
+    config: dict[str, t.Any]
+
+    @classmethod
+    def from_config(
+        cls,
+        pane_config: dict[str, t.Any],
+        window_config: dict[str, t.Any],
+    ) -> Pane:
+        """Return the pane ``pane_config`` describes, inside ``window_config``.
+
+        ``shell``, ``start_directory`` and ``environment`` come from the pane,
+        then the window (``window_shell`` for the shell). ``suppress_history``
+        comes from the pane, then the window, then defaults on; ``enter`` and
+        the sleeps start from the pane and carry forward from each command to
+        the next.
+
+        Examples
+        --------
+        >>> pane = Pane.from_config(
+        ...     {
+        ...         "sleep_after": 1,
+        ...         "shell_command": [{"cmd": "a"}, {"cmd": "b", "enter": False}],
+        ...     },
+        ...     {"suppress_history": False, "environment": {"A": "1"}},
+        ... )
+        >>> pane.environment
+        {'A': '1'}
+        >>> first, second = pane.commands
+        >>> first
+        Command(cmd='a', suppress_history=False, enter=True, sleep_before=None, ...)
+        >>> second.enter, second.sleep_after
+        (False, 1)
+        """
+        if "suppress_history" in pane_config:
+            suppress = pane_config["suppress_history"]
+        elif "suppress_history" in window_config:
+            suppress = window_config["suppress_history"]
+        else:
+            suppress = True
+
+        enter = pane_config.get("enter", True)
+        sleep_before = pane_config.get("sleep_before")
+        sleep_after = pane_config.get("sleep_after")
+        commands: list[Command] = []
+        for cmd in pane_config["shell_command"]:
+            enter = cmd.get("enter", enter)
+            sleep_before = cmd.get("sleep_before", sleep_before)
+            sleep_after = cmd.get("sleep_after", sleep_after)
+            commands.append(
+                Command(cmd["cmd"], suppress, enter, sleep_before, sleep_after),
+            )
+
+        return cls(
+            pane_config.get("start_directory", window_config.get("start_directory")),
+            pane_config.get("shell", window_config.get("window_shell")),
+            pane_config.get("environment", window_config.get("environment")),
+            bool(pane_config.get("focus")),
+            tuple(commands),
+            pane_config,
+        )
+
+
+class Window(t.NamedTuple):
+    """A window and its resolved panes."""
+
+    name: str | None
+    layout: str | None
+    focus: bool
+    lazy: bool
+    panes: tuple[Pane, ...]
+    config: dict[str, t.Any]
+
+    @classmethod
+    def from_config(cls, window_config: dict[str, t.Any]) -> Window:
+        """Return the window ``window_config`` describes, panes resolved.
+
+        Examples
+        --------
+        >>> window = Window.from_config(
+        ...     {"layout": "tiled", "panes": [{"shell_command": []}]},
+        ... )
+        >>> window.layout, len(window.panes)
+        ('tiled', 1)
+        """
+        return cls(
+            window_config.get("window_name"),
+            window_config.get("layout"),
+            bool(window_config.get("focus")),
+            bool(window_config.get("lazy")),
+            tuple(
+                [
+                    Pane.from_config(pane_config, window_config)
+                    for pane_config in window_config.get("panes", ())
+                ],
+            ),
+            window_config,
+        )
+
+
+class Session(t.NamedTuple):
+    """A workspace's session and its resolved windows."""
+
+    name: str
+    windows: tuple[Window, ...]
+    config: dict[str, t.Any]
+
+    @classmethod
+    def from_config(cls, session_config: dict[str, t.Any]) -> Session:
+        """Return the session an expanded, trickled workspace describes.
+
+        Examples
+        --------
+        >>> from tmuxp.workspace import loader
+        >>> session = Session.from_config(
+        ...     loader.normalize(
+        ...         {
+        ...             "session_name": "docs",
+        ...             "suppress_history": False,
+        ...             "windows": [{"window_name": "editor", "panes": ["vim"]}],
+        ...         },
+        ...     ),
+        ... )
+        >>> [window.name for window in session.windows]
+        ['editor']
+        >>> session.windows[0].panes[0].commands[0].suppress_history
+        False
+        """
+        return cls(
+            name=session_config["session_name"],
+            windows=tuple(
+                Window.from_config(window_config)
+                for window_config in session_config["windows"]
+            ),
+            config=session_config,
+        )
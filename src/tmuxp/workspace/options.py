@@ -3,8 +3,8 @@
 The ``workspace_builder_options`` config catalog holds settings that tune how a
 workspace builder runs, independent of *which* builder is selected. It is a
 sibling to the tmux ``options`` / ``global_options`` / ``environment`` catalogs
-and is the home for builder-behavior knobs (today: pane readiness; later:
-parallel/async builder settings).
+and is the home for builder-behavior knobs (pane readiness, command batching,
+parallel window construction, the shell pool, ``before_script``).
 
 Example
 -------
@@ -12,10 +12,17 @@ Example
 
    workspace_builder_options:
      pane_readiness: auto   # auto | always | never (+ truthy/falsy aliases)
+     pane_readiness_strategy: backoff   # poll | backoff | event
+     batch_commands: true   # chain tmux commands into fewer processes
+     batch_send_keys: true  # type runs of pane commands in one send-keys
+     parallel_windows: 4    # build up to 4 windows' panes at once
+     shell_pool: 8          # keep 8 warm shells to move into new panes
+     background_before_script: true  # build windows while before_script runs
 """
 
 from __future__ import annotations
 
+import contextlib
 import dataclasses
 import enum
 import os
@@ -33,7 +40,7 @@ class PaneReadiness(enum.Enum):
 
     tmuxp waits for each default-shell pane to draw its prompt before
     dispatching layout and commands, which avoids a zsh prompt-redraw artifact
-    (see :func:`tmuxp.workspace.builder.classic._wait_for_pane_ready`). The wait
+    (see :func:`tmuxp.workspace.builder.classic._wait_for_panes_ready`). The wait
     is only needed for zsh, so the default
     :attr:`~tmuxp.workspace.options.PaneReadiness.AUTO` policy waits only when
     the session's interactive shell is zsh.
@@ -106,6 +113,178 @@ class PaneReadiness(enum.Enum):
         raise ValueError(msg)
 
 
+class PaneReadinessStrategy(enum.Enum):
+    """How the builder learns that a pane's shell has drawn its prompt.
+
+    Only consulted when :class:`PaneReadiness` decides to wait.
+    :attr:`POLL` checks every 50 ms, :attr:`BACKOFF` (the default) starts
+    there and doubles the pause between checks, and :attr:`EVENT` listens for
+    the pane's output over a read-only control-mode client and checks only
+    when the pane has printed something, backing off when no client can attach.
+    """
+
+    POLL = "poll"
+    BACKOFF = "backoff"
+    EVENT = "event"
+
+    @classmethod
+    def from_config(cls, value: t.Any) -> PaneReadinessStrategy:
+        """Parse a ``pane_readiness_strategy`` config value.
+
+        Parameters
+        ----------
+        value : Any
+            value from ``workspace_builder_options.pane_readiness_strategy``;
+            ``None`` (key absent) resolves to :attr:`BACKOFF`
+
+        Returns
+        -------
+        PaneReadinessStrategy
+
+        Examples
+        --------
+        >>> PaneReadinessStrategy.from_config(None)
+        <PaneReadinessStrategy.BACKOFF: 'backoff'>
+        >>> PaneReadinessStrategy.from_config(" Event ")
+        <PaneReadinessStrategy.EVENT: 'event'>
+
+        >>> PaneReadinessStrategy.from_config("sometimes")
+        Traceback (most recent call last):
+        ...
+        ValueError: invalid pane_readiness_strategy value: 'sometimes'; expected one
+        of: poll, backoff, event
+        """
+        if value is None:
+            return cls.BACKOFF
+        if isinstance(value, cls):
+            return value
+        normalized = str(value).strip().lower()
+        for strategy in cls:
+            if strategy.value == normalized:
+                return strategy
+        msg = (
+            f"invalid pane_readiness_strategy value: {value!r}; expected "
+            "one of: poll, backoff, event"
+        )
+        raise ValueError(msg)
+
+
+def parse_flag(name: str, value: t.Any, default: bool = False) -> bool:
+    """Parse a boolean ``workspace_builder_options`` value.
+
+    Accepts booleans and the same truthy/falsy aliases as ``pane_readiness``.
+
+    Parameters
+    ----------
+    name : str
+        option name, used in the error message
+    value : Any
+        configured value; ``None`` (key absent) yields ``default``
+    default : bool
+        value for an absent key
+
+    Returns
+    -------
+    bool
+
+    Examples
+    --------
+    >>> parse_flag("batch_commands", None)
+    False
+    >>> parse_flag("batch_commands", True)
+    True
+    >>> parse_flag("batch_commands", "on")
+    True
+    >>> parse_flag("batch_commands", "no", default=True)
+    False
+
+    >>> parse_flag("batch_commands", "sometimes")
+    Traceback (most recent call last):
+    ...
+    ValueError: invalid batch_commands value: 'sometimes'; expected one of:
+    true/on/yes/1, false/off/no/0
+    """
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower()
+    if normalized in _ALWAYS_ALIASES:
+        return True
+    if normalized in _NEVER_ALIASES:
+        return False
+    msg = (
+        f"invalid {name} value: {value!r}; expected one of: "
+        "true/on/yes/1, false/off/no/0"
+    )
+    raise ValueError(msg)
+
+
+def parse_count(
+    name: str,
+    value: t.Any,
+    default: int = 1,
+    minimum: int = 1,
+) -> int:
+    """Parse an integer ``workspace_builder_options`` value.
+
+    Parameters
+    ----------
+    name : str
+        option name, used in the error message
+    value : Any
+        configured value; ``None`` (key absent) yields ``default``
+    default : int
+        value for an absent key
+    minimum : int
+        smallest value accepted; ``0`` lets a count switch a feature off
+
+    Returns
+    -------
+    int
+
+    Examples
+    --------
+    >>> parse_count("parallel_windows", None)
+    1
+    >>> parse_count("parallel_windows", 4)
+    4
+    >>> parse_count("parallel_windows", " 8 ")
+    8
+
+    >>> parse_count("parallel_windows", 0)
+    Traceback (most recent call last):
+    ...
+    ValueError: invalid parallel_windows value: 0; expected a positive integer
+    >>> parse_count("parallel_windows", True)
+    Traceback (most recent call last):
+    ...
+    ValueError: invalid parallel_windows value: True; expected a positive integer
+
+    >>> parse_count("shell_pool", 0, default=0, minimum=0)
+    0
+    >>> parse_count("shell_pool", -1, default=0, minimum=0)
+    Traceback (most recent call last):
+    ...
+    ValueError: invalid shell_pool value: -1; expected an integer of at least 0
+    """
+    if value is None:
+        return default
+    count = minimum - 1
+    if not isinstance(value, bool):
+        with contextlib.suppress(ValueError):
+            count = int(str(value).strip())
+    if count < minimum:
+        expected = (
+            "a positive integer"
+            if minimum == 1
+            else f"an integer of at least {minimum}"
+        )
+        msg = f"invalid {name} value: {value!r}; expected {expected}"
+        raise ValueError(msg)
+    return count
+
+
 @dataclasses.dataclass(frozen=True)
 class WorkspaceBuilderOptions:
     """Parsed ``workspace_builder_options`` catalog.
@@ -120,6 +299,30 @@ class WorkspaceBuilderOptions:
     pane_readiness: PaneReadiness = PaneReadiness.AUTO
     """pane-prompt wait policy; defaults to :attr:`PaneReadiness.AUTO`"""
 
+    pane_readiness_strategy: PaneReadinessStrategy = PaneReadinessStrategy.BACKOFF
+    """how a pane-prompt wait polls; defaults to
+    :attr:`PaneReadinessStrategy.BACKOFF`"""
+
+    batch_commands: bool = False
+    """chain structural tmux commands into one process per step; see
+    :mod:`tmuxp.workspace.builder.batch`"""
+
+    batch_send_keys: bool = False
+    """type each run of a pane's commands with a single ``send-keys``"""
+
+    parallel_windows: int = 1
+    """how many windows' panes to build at once, each on its own thread; ``1``
+    builds windows one after another"""
+
+    shell_pool: int = 0
+    """how many warm shells to keep in the pool session for new panes; ``0``
+    turns the pool off. Needs :attr:`batch_commands`; see
+    :mod:`tmuxp.workspace.builder.pool`"""
+
+    background_before_script: bool = False
+    """run ``before_script`` while windows and panes are created; commands are
+    typed into panes only once it has succeeded"""
+
     @classmethod
     def from_config(cls, session_config: dict[str, t.Any]) -> WorkspaceBuilderOptions:
         """Build options from a full workspace ``session_config`` dict.
@@ -145,6 +348,30 @@ class WorkspaceBuilderOptions:
         >>> cfg = {"workspace_builder_options": {"pane_readiness": "always"}}
         >>> WorkspaceBuilderOptions.from_config(cfg).pane_readiness
         <PaneReadiness.ALWAYS: 'always'>
+
+        >>> cfg = {"workspace_builder_options": {"pane_readiness_strategy": "event"}}
+        >>> WorkspaceBuilderOptions.from_config(cfg).pane_readiness_strategy
+        <PaneReadinessStrategy.EVENT: 'event'>
+
+        >>> cfg = {"workspace_builder_options": {"batch_commands": True}}
+        >>> WorkspaceBuilderOptions.from_config(cfg).batch_commands
+        True
+
+        >>> cfg = {"workspace_builder_options": {"parallel_windows": 4}}
+        >>> WorkspaceBuilderOptions.from_config(cfg).parallel_windows
+        4
+
+        >>> cfg = {"workspace_builder_options": {"background_before_script": "on"}}
+        >>> WorkspaceBuilderOptions.from_config(cfg).background_before_script
+        True
+
+        The shell pool moves panes with batched commands:
+
+        >>> cfg = {"workspace_builder_options": {"shell_pool": 4}}
+        >>> WorkspaceBuilderOptions.from_config(cfg)
+        Traceback (most recent call last):
+        ...
+        tmuxp.exc.InvalidWorkspaceBuilderOption: ...: shell_pool needs batch_commands
         """
         catalog = session_config.get("workspace_builder_options") or {}
         if not isinstance(catalog, dict):
@@ -152,9 +379,45 @@ class WorkspaceBuilderOptions:
             raise exc.InvalidWorkspaceBuilderOption(msg)
         try:
             pane_readiness = PaneReadiness.from_config(catalog.get("pane_readiness"))
+            pane_readiness_strategy = PaneReadinessStrategy.from_config(
+                catalog.get("pane_readiness_strategy"),
+            )
+            batch_commands = parse_flag(
+                "batch_commands",
+                catalog.get("batch_commands"),
+            )
+            batch_send_keys = parse_flag(
+                "batch_send_keys",
+                catalog.get("batch_send_keys"),
+            )
+            parallel_windows = parse_count(
+                "parallel_windows",
+                catalog.get("parallel_windows"),
+            )
+            shell_pool = parse_count(
+                "shell_pool",
+                catalog.get("shell_pool"),
+                default=0,
+                minimum=0,
+            )
+            background_before_script = parse_flag(
+                "background_before_script",
+                catalog.get("background_before_script"),
+            )
         except ValueError as e:
             raise exc.InvalidWorkspaceBuilderOption(str(e)) from e
-        return cls(pane_readiness=pane_readiness)
+        if shell_pool and not batch_commands:
+            msg = "shell_pool needs batch_commands"
+            raise exc.InvalidWorkspaceBuilderOption(msg)
+        return cls(
+            pane_readiness=pane_readiness,
+            pane_readiness_strategy=pane_readiness_strategy,
+            batch_commands=batch_commands,
+            batch_send_keys=batch_send_keys,
+            parallel_windows=parallel_windows,
+            shell_pool=shell_pool,
+            background_before_script=background_before_script,
+        )
 
 
 def shell_is_zsh(shell: str | None) -> bool:
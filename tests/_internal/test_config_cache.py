@@ -0,0 +1,210 @@
+"""Tests for the on-disk cache of parsed workspace files."""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import typing as t
+
+import pytest
+
+from tmuxp._internal import config_cache
+from tmuxp._internal.config_cache import ConfigCache, WorkspaceCache
+from tmuxp._internal.config_reader import ConfigReader
+
+WORKSPACE = "session_name: cached\nwindows:\n- window_name: main\n"
+
+
+@pytest.fixture
+def cache_dir(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Point the config cache at a temporary directory and turn it on."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    monkeypatch.delenv("TMUXP_CONFIG_CACHE", raising=False)
+    return tmp_path / "xdg" / "tmuxp" / "config"
+
+
+def _workspace(tmp_path: pathlib.Path, content: str = WORKSPACE) -> pathlib.Path:
+    """Write a workspace file last modified long enough ago to be cached."""
+    path = tmp_path / "workspace.yaml"
+    path.write_text(content, encoding="utf-8")
+    os.utime(path, (1_000_000, 1_000_000))
+    return path
+
+
+def test_from_file_reuses_parsed_yaml(
+    cache_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A second read of an unchanged file skips the YAML parser."""
+    path = _workspace(tmp_path)
+    first = ConfigReader._from_file(path)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    def no_parse(*args: t.Any, **kwargs: t.Any) -> t.NoReturn:
+        raise AssertionError
+
+    monkeypatch.setattr(ConfigReader, "_load", no_parse)
+    second = ConfigReader._from_file(path)
+    assert (
+        second
+        == first
+        == {"session_name": "cached", "windows": [{"window_name": "main"}]}
+    )
+
+    # Callers may change what they are given without touching the cache.
+    second["session_name"] = "changed"
+    assert ConfigReader._from_file(path)["session_name"] == "cached"
+
+
+class MissFixture(t.NamedTuple):
+    """Test fixture for a change that makes the cached entry stale."""
+
+    test_id: str
+    change: t.Callable[[pathlib.Path], None]
+
+
+def _rewrite_other_size(path: pathlib.Path) -> None:
+    """Change a file's content and size."""
+    _workspace(path.parent, "session_name: other\n")
+
+
+def _rewrite_same_size(path: pathlib.Path) -> None:
+    """Change a file's content, keeping its size, at a new modification time."""
+    path.write_text(WORKSPACE.replace("cached", "cachex"), encoding="utf-8")
+    os.utime(path, (2_000_000, 2_000_000))
+
+
+MISS_FIXTURES: list[MissFixture] = [
+    MissFixture("content-and-size", _rewrite_other_size),
+    MissFixture("same-size-new-mtime", _rewrite_same_size),
+]
+
+
+@pytest.mark.parametrize(
+    list(MissFixture._fields),
+    MISS_FIXTURES,
+    ids=[f.test_id for f in MISS_FIXTURES],
+)
+def test_from_file_parses_changed_file(
+    cache_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    test_id: str,
+    change: t.Callable[[pathlib.Path], None],
+) -> None:
+    """A file whose size or modification time changed is parsed again."""
+    path = _workspace(tmp_path)
+    ConfigReader._from_file(path)
+    change(path)
+    assert ConfigReader._from_file(path) == ConfigReader._load(
+        "yaml",
+        path.read_text(encoding="utf-8"),
+    )
+
+
+def test_version_change_misses(
+    cache_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Entries written by another tmuxp version are ignored."""
+    path = _workspace(tmp_path)
+    ConfigCache().put(path, path.stat(), {"session_name": "stale"})
+    monkeypatch.setattr(config_cache, "__version__", "0.0.0")
+    assert ConfigCache().get(path, path.stat()) is None
+
+
+def test_interpreter_change_misses(
+    cache_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Entries written by another Python, whose marshal may differ, are ignored."""
+    path = _workspace(tmp_path)
+    content = path.read_bytes()
+    ConfigCache().put(path, path.stat(), {"session_name": "stale"})
+    WorkspaceCache().put(path, content, [], {"session_name": "stale"})
+    monkeypatch.setattr(config_cache, "_INTERPRETER", (0, "other-00"))
+    assert ConfigCache().get(path, path.stat()) is None
+    assert WorkspaceCache().get(path, content, lambda kind, key: None) is None
+
+
+class UncachedFixture(t.NamedTuple):
+    """Test fixture for a read that must not be cached."""
+
+    test_id: str
+    content: str
+    mtime: float | None
+    env: dict[str, str]
+
+
+UNCACHED_FIXTURES: list[UncachedFixture] = [
+    UncachedFixture("recently-modified", WORKSPACE, None, {}),
+    UncachedFixture("yaml-date", "session_name: 2024-01-01\n", 1_000_000, {}),
+    UncachedFixture("turned-off", WORKSPACE, 1_000_000, {"TMUXP_CONFIG_CACHE": "0"}),
+]
+
+
+@pytest.mark.parametrize(
+    list(UncachedFixture._fields),
+    UNCACHED_FIXTURES,
+    ids=[f.test_id for f in UNCACHED_FIXTURES],
+)
+def test_from_file_not_cached(
+    cache_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    test_id: str,
+    content: str,
+    mtime: float | None,
+    env: dict[str, str],
+) -> None:
+    """Racy, unmarshalable or opted-out reads are parsed and not cached."""
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    path = tmp_path / "workspace.yaml"
+    path.write_text(content, encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+    assert ConfigReader._from_file(path) == ConfigReader._load("yaml", content)
+    assert not cache_dir.exists() or not list(cache_dir.iterdir())
+
+
+def test_corrupt_entry_falls_back(
+    cache_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+) -> None:
+    """An unreadable entry is a miss, and is replaced."""
+    path = _workspace(tmp_path)
+    ConfigReader._from_file(path)
+    (entry,) = cache_dir.iterdir()
+    entry.write_bytes(b"\x00not marshal")
+
+    assert ConfigReader._from_file(path)["session_name"] == "cached"
+    assert ConfigCache().get(path, path.stat()) is not None
+
+
+def test_least_recently_used_entries_evicted(tmp_path: pathlib.Path) -> None:
+    """Entries beyond the size limit go, least recently used first."""
+    content = {"session_name": "x" * 200}
+    paths = []
+    for number in range(3):
+        path = tmp_path / f"workspace-{number}.yaml"
+        path.write_text("session_name: x\n", encoding="utf-8")
+        os.utime(path, (1_000_000, 1_000_000))
+        paths.append(path)
+
+    cache = ConfigCache(tmp_path / "cache")
+    for number, path in enumerate(paths[:2]):
+        cache.put(path, path.stat(), content)
+        os.utime(cache._entry(path), (number, number))
+    # Room for two entries, not three.
+    cache.size_limit = cache._entry(paths[0]).stat().st_size * 5 // 2
+    # Use the older entry, so the other is evicted when a third arrives.
+    assert cache.get(paths[0], paths[0].stat()) == content
+    cache.put(paths[2], paths[2].stat(), content)
+
+    assert cache.get(paths[0], paths[0].stat()) == content
+    assert cache.get(paths[1], paths[1].stat()) is None
+    assert cache.get(paths[2], paths[2].stat()) == content
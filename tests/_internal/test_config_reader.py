@@ -0,0 +1,81 @@
+"""Tests for ConfigReader's YAML backends."""
+
+from __future__ import annotations
+
+import pathlib
+
+import pytest
+import yaml
+
+from tmuxp._internal.config_reader import ConfigReader, yaml_backend
+from tmuxp.workspace import loader
+
+from ..constants import EXAMPLE_PATH, FIXTURE_PATH
+
+YAML_FIXTURES = sorted(
+    path
+    for directory in (FIXTURE_PATH, EXAMPLE_PATH)
+    for pattern in ("*.yaml", "*.yml")
+    for path in directory.rglob(pattern)
+)
+
+requires_libyaml = pytest.mark.skipif(
+    not yaml.__with_libyaml__,
+    reason="PyYAML is built without libyaml",
+)
+
+
+def _parse(content: str) -> object:
+    """Parse ``content``, or return the type of error it raises."""
+    try:
+        return ConfigReader._load("yaml", content)
+    except yaml.YAMLError as e:
+        return type(e).__name__
+
+
+@requires_libyaml
+def test_libyaml_backend_is_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The libyaml safe loader and dumper are used when available."""
+    monkeypatch.delenv("TMUXP_PURE_YAML", raising=False)
+    assert yaml_backend() == (yaml.CSafeLoader, yaml.CSafeDumper)
+
+
+@requires_libyaml
+@pytest.mark.parametrize(
+    "path",
+    YAML_FIXTURES,
+    ids=[str(path.relative_to(FIXTURE_PATH.parent.parent)) for path in YAML_FIXTURES],
+)
+def test_backends_agree(
+    path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Both backends parse, and dump, every fixture the same way."""
+    content = path.read_text(encoding="utf-8")
+
+    monkeypatch.setenv("TMUXP_PURE_YAML", "1")
+    pure = _parse(content)
+    pure_dump = ConfigReader._dump("yaml", pure) if isinstance(pure, dict) else None
+
+    monkeypatch.setenv("TMUXP_PURE_YAML", "0")
+    fast = _parse(content)
+    fast_dump = ConfigReader._dump("yaml", fast) if isinstance(fast, dict) else None
+
+    assert fast == pure
+    assert fast_dump == pure_dump
+
+
+@requires_libyaml
+def test_backends_agree_on_expanded_workspace(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An expanded workspace dumps the same with either backend."""
+    workspace = loader.expand(
+        ConfigReader._from_file(EXAMPLE_PATH / "2-pane-vertical.yaml"),
+        cwd=EXAMPLE_PATH,
+    )
+
+    monkeypatch.setenv("TMUXP_PURE_YAML", "1")
+    pure = ConfigReader._dump("yaml", workspace)
+    monkeypatch.setenv("TMUXP_PURE_YAML", "0")
+    assert ConfigReader._dump("yaml", workspace) == pure
@@ -106,6 +106,7 @@ def test_main_help_examples_are_valid_subcommands() -> None:
     # Extract valid subcommands from help output
     valid_subcommands = {
         "load",
+        "plan",
         "shell",
         "import",
         "convert",
@@ -129,6 +130,7 @@ def test_main_help_examples_are_valid_subcommands() -> None:
     "subcommand",
     [
         "load",
+        "plan",
         "shell",
         "import",
         "convert",
@@ -226,6 +228,16 @@ def test_debug_info_subcommand_examples_are_valid() -> None:
         assert example.startswith("tmuxp debug-info"), f"Bad example format: {example}"
 
 
+def test_plan_subcommand_examples_are_valid() -> None:
+    """Plan subcommand examples should have valid flags."""
+    help_text = _get_help_text("plan")
+    examples = extract_examples_from_help(help_text)
+
+    # Verify each example has valid structure
+    for example in examples:
+        assert example.startswith("tmuxp plan"), f"Bad example format: {example}"
+
+
 def test_search_subcommand_examples_are_valid() -> None:
     """Search subcommand examples should have valid flags."""
     help_text = _get_help_text("search")
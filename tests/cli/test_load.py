@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import contextlib
 import io
+import json
+import logging
 import pathlib
 import typing as t
 
@@ -24,7 +26,7 @@ from tmuxp.cli.load import (
     load_workspace,
 )
 from tmuxp.workspace import loader
-from tmuxp.workspace.builder import WorkspaceBuilder
+from tmuxp.workspace.builder import AsyncioWorkspaceBuilder, WorkspaceBuilder
 
 
 def test_load_workspace(
@@ -747,6 +749,79 @@ def test_load_workspace_builder_error_exits(
     assert expected_substring in capsys.readouterr().out
 
 
+def test_load_workspace_async_builder(
+    tmp_path: pathlib.Path,
+    server: Server,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An async builder is driven through ``abuild`` on an event loop."""
+
+    def sync_build(*args: t.Any, **kwargs: t.Any) -> None:
+        msg = "load_workspace should await abuild()"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(AsyncioWorkspaceBuilder, "build", sync_build)
+    config_file = tmp_path / ".tmuxp.yaml"
+    config_file.write_text(
+        """\
+session_name: async-load
+workspace_builder: asyncio
+windows:
+- window_name: one
+  panes:
+  - echo one
+- window_name: two
+  panes:
+  - echo two
+""",
+        encoding="utf-8",
+    )
+
+    session = load_workspace(config_file, socket_name=server.socket_name, detached=True)
+
+    assert isinstance(session, Session)
+    assert [w.window_name for w in session.windows] == ["one", "two"]
+
+
+def test_load_workspace_reconcile(
+    tmp_path: pathlib.Path,
+    server: Server,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """``reconcile`` recreates a missing window in the running session."""
+    config_file = tmp_path / ".tmuxp.yaml"
+    config_file.write_text(
+        """\
+session_name: reconcile-load
+windows:
+- window_name: one
+  panes:
+  - echo one
+- window_name: two
+  panes:
+  - echo two
+""",
+        encoding="utf-8",
+    )
+    session = load_workspace(config_file, socket_name=server.socket_name, detached=True)
+    assert isinstance(session, Session)
+    first = session.windows[0]
+    session.windows[1].kill()
+
+    reconciled = load_workspace(
+        config_file,
+        socket_name=server.socket_name,
+        detached=True,
+        reconcile=True,
+    )
+
+    assert isinstance(reconciled, Session)
+    assert reconciled.session_id == session.session_id
+    assert [w.window_name for w in reconciled.windows] == ["one", "two"]
+    assert reconciled.windows[0].window_id == first.window_id
+    assert "Reconciled" in capsys.readouterr().out
+
+
 def test_plugin_system_before_script(
     monkeypatch_plugin_test_packages: None,
     server: Server,
@@ -943,6 +1018,79 @@ def test_progress_disable_logic(
     assert result is expected_disabled
 
 
+def test_load_workspace_profile(
+    tmp_path: pathlib.Path,
+    server: Server,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """``profile`` writes the build's phases as a Chrome trace."""
+    monkeypatch.delenv("TMUX", raising=False)
+    config_file = tmp_path / ".tmuxp.yaml"
+    config_file.write_text(
+        """\
+session_name: profile-load
+windows:
+- window_name: one
+  panes:
+  - echo one
+- window_name: two
+  panes:
+  - echo two
+  - echo three
+""",
+        encoding="utf-8",
+    )
+    profile = tmp_path / "profile.json"
+
+    session = load_workspace(
+        config_file,
+        socket_name=server.socket_name,
+        detached=True,
+        profile=profile,
+    )
+
+    assert isinstance(session, Session)
+    trace = json.loads(profile.read_text(encoding="utf-8"))
+    events = trace["traceEvents"]
+    tracks = {e["args"]["name"]: e["tid"] for e in events if e["ph"] == "M"}
+    assert {"session", "one", "two"} <= set(tracks)
+    spans = [(e["name"], e["tid"]) for e in events if e["ph"] == "X"]
+    assert ("build", tracks["session"]) in spans
+    assert ("window", tracks["one"]) in spans
+    assert ("create panes", tracks["two"]) in spans
+    assert all(e["dur"] >= 0 for e in events if e["ph"] == "X")
+    assert ("new-window", tracks["tmux"]) in spans
+    assert trace["otherData"]["tmux_commands"]["new-window"] == 1
+    assert trace["otherData"]["tmux_commands"]["respawn-window"] == 1
+    assert trace["otherData"]["tmux_processes"] > 0
+
+
+def test_load_workspace_logs_tmux_calls(
+    server: Server,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """At debug level, a load logs the tmux calls its build made."""
+    monkeypatch.delenv("TMUX", raising=False)
+    session_file = FIXTURE_PATH / "workspace/builder" / "two_pane.yaml"
+
+    with caplog.at_level(logging.DEBUG, logger="tmuxp"):
+        load_workspace(
+            session_file,
+            socket_name=server.socket_name,
+            detached=True,
+            no_progress=True,
+        )
+
+    messages = [
+        r.getMessage()
+        for r in caplog.records
+        if r.name == "tmuxp.workspace.builder.accounting"
+    ]
+    assert messages[0].startswith("tmux calls: ")
+    assert "tmux split-window: 1" in messages
+
+
 def test_load_workspace_no_progress(
     server: Server,
     monkeypatch: pytest.MonkeyPatch,
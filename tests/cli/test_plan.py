@@ -0,0 +1,94 @@
+"""CLI tests for tmuxp plan."""
+
+from __future__ import annotations
+
+import json
+import typing as t
+
+import pytest
+
+from tmuxp import cli
+
+if t.TYPE_CHECKING:
+    import pathlib
+
+WORKSPACE = """\
+session_name: plan-cli
+windows:
+- window_name: editor
+  panes:
+  - echo one
+  - shell_command:
+    - cmd: echo two
+      sleep_before: 2
+"""
+
+
+class PlanOutputFixture(t.NamedTuple):
+    """Test fixture for tmuxp plan output modes."""
+
+    test_id: str
+    cli_args: list[str]
+
+
+PLAN_OUTPUT_FIXTURES: list[PlanOutputFixture] = [
+    PlanOutputFixture("human", ["--color", "never", "plan"]),
+    PlanOutputFixture("json", ["plan", "--json"]),
+    PlanOutputFixture("ndjson", ["plan", "--ndjson"]),
+]
+
+
+@pytest.mark.parametrize(
+    list(PlanOutputFixture._fields),
+    PLAN_OUTPUT_FIXTURES,
+    ids=[test.test_id for test in PLAN_OUTPUT_FIXTURES],
+)
+def test_plan(
+    test_id: str,
+    cli_args: list[str],
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Plan prints a workspace's commands without starting tmux."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".tmuxp.yaml").write_text(WORKSPACE, encoding="utf-8")
+    cli.cli([*cli_args, "."])
+    out = capsys.readouterr().out
+
+    if test_id == "human":
+        assert "Plan for plan-cli" in out
+        assert "send-keys -t %1.1 ' echo two' Enter (after 2s)" in out
+        assert "Estimate: 6 tmux commands in 5 processes" in out
+    elif test_id == "json":
+        plan = json.loads(out)
+        assert plan["session_name"] == "plan-cli"
+        assert plan["counts"]["send-keys"] == 2
+        assert plan["estimate"]["pause_seconds"] == 2
+    else:
+        commands = [json.loads(line) for line in out.splitlines()]
+        assert commands[0]["args"] == ["new-session", "-d", "-s", "plan-cli"]
+        assert commands[-1]["delay"] == 2
+
+
+def test_plan_lists_before_script_steps(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Plan lists each before_script step with the steps it needs."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".tmuxp.yaml").write_text(
+        WORKSPACE
+        + "before_script:\n"
+        + "  up: ./up.sh\n"
+        + "  seed:\n"
+        + "    script: ./seed.sh\n"
+        + "    needs: up\n",
+        encoding="utf-8",
+    )
+    cli.cli(["--color", "never", "plan", "."])
+    out = capsys.readouterr().out
+
+    assert f"    up: {tmp_path / 'up.sh'}\n" in out
+    assert f"    seed: {tmp_path / 'seed.sh'} (needs up)\n" in out
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import pathlib
+import typing as t
 
 from tests.constants import FIXTURE_PATH
+from tmuxp._internal.config_reader import ConfigReader
 
 
 def get_workspace_file(
@@ -27,6 +29,25 @@ def read_workspace_file(
     return get_workspace_file(file).open().read()
 
 
+def load_workspace_file(
+    file: pathlib.Path | str,
+    **overrides: t.Any,
+) -> dict[str, t.Any]:
+    """Return fixture workspace as a dict, with top-level ``overrides`` applied.
+
+    ``workspace_builder_options`` in ``overrides`` are merged into the
+    fixture's own rather than replacing them.
+    """
+    workspace = ConfigReader._from_file(get_workspace_file(file))
+    builder_options = overrides.pop("workspace_builder_options", {})
+    workspace.update(overrides)
+    workspace["workspace_builder_options"] = {
+        **workspace.get("workspace_builder_options", {}),
+        **builder_options,
+    }
+    return workspace
+
+
 def write_config(
     config_path: pathlib.Path,
     filename: str,
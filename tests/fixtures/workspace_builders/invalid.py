@@ -17,3 +17,18 @@ class MissingPluginsBuilder:
 
     def build(self, session: t.Any = None, append: bool = False) -> None:
         """No-op build for validation tests."""
+
+
+class SyncAbuildBuilder:
+    """A builder claiming async support whose ``abuild`` is not a coroutine."""
+
+    supports_async = True
+
+    def __init__(self, **kwargs: t.Any) -> None:
+        self.kwargs = kwargs
+
+    def build(self, session: t.Any = None, append: bool = False) -> None:
+        """No-op build for validation tests."""
+
+    def abuild(self, session: t.Any = None, append: bool = False) -> None:
+        """Build synchronously, which does not make an async entry point."""
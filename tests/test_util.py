@@ -6,13 +6,20 @@ import logging
 import os
 import pathlib
 import sys
+import time
 import typing as t
 
 import pytest
 
 from tmuxp import exc
 from tmuxp.exc import BeforeLoadScriptError, BeforeLoadScriptNotExists
-from tmuxp.util import get_pane, get_session, oh_my_zsh_auto_title, run_before_script
+from tmuxp.util import (
+    BEFORE_SCRIPT_STDERR_TAIL,
+    get_pane,
+    get_session,
+    oh_my_zsh_auto_title,
+    run_before_script,
+)
 
 from .constants import FIXTURE_PATH
 
@@ -138,6 +145,54 @@ def test_beforeload_returns_stderr_messages() -> None:
         assert excinfo.match(r"failed with returncode")
 
 
+def _script(tmp_path: pathlib.Path, body: str) -> pathlib.Path:
+    """Write an executable shell script to ``tmp_path``."""
+    script = tmp_path / "script.sh"
+    script.write_text(f"#!/bin/sh\n{body}\n")
+    script.chmod(0o755)
+    return script
+
+
+def test_run_before_script_streams_stderr_while_stdout_is_quiet(
+    tmp_path: pathlib.Path,
+) -> None:
+    """A line on stderr arrives while stdout has nothing to say."""
+    script = _script(tmp_path, "echo early >&2\nsleep 1\necho late")
+    started = time.monotonic()
+    arrivals: list[tuple[str, float]] = []
+
+    run_before_script(
+        script,
+        on_line=lambda line: arrivals.append((line, time.monotonic() - started)),
+    )
+
+    assert [line for line, _ in arrivals] == ["early\n", "late\n"]
+    assert arrivals[0][1] < 0.8
+
+
+def test_run_before_script_keeps_stderr_tail(tmp_path: pathlib.Path) -> None:
+    """A failing script's error carries only the last lines of its stderr."""
+    script = _script(
+        tmp_path,
+        "i=0\n"
+        "while [ $i -lt 1000 ]; do echo out-$i; echo err-$i >&2; i=$((i+1)); done\n"
+        "printf 'no newline' >&2\n"
+        "exit 3",
+    )
+    lines: list[str] = []
+
+    with pytest.raises(BeforeLoadScriptError) as excinfo:
+        run_before_script(script, on_line=lines.append)
+
+    assert len(lines) == 2001
+    assert lines[-1] == "no newline"
+    assert excinfo.value.returncode == 3
+    output = (excinfo.value.output or "").splitlines()
+    assert len(output) == BEFORE_SCRIPT_STDERR_TAIL
+    assert output[0] == f"err-{1001 - BEFORE_SCRIPT_STDERR_TAIL}"
+    assert output[-1] == "no newline"
+
+
 def test_get_session_should_default_to_local_attached_session(
     server: Server,
     monkeypatch: pytest.MonkeyPatch,
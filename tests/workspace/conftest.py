@@ -3,10 +3,17 @@
 from __future__ import annotations
 
 import types
+import typing as t
 
 import pytest
 
 from tests.fixtures.structures import WorkspaceTestData
+from tmuxp.workspace.builder.accounting import TmuxCallLog, record_tmux_calls
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from libtmux.server import Server
 
 
 @pytest.fixture
@@ -25,3 +32,28 @@ def config_fixture() -> WorkspaceTestData:
             if isinstance(v, types.ModuleType)
         },
     )
+
+
+@pytest.fixture
+def tmux_calls(server: Server) -> Iterator[TmuxCallLog]:
+    """Record every tmux call the test makes against ``server`` and others."""
+    with record_tmux_calls() as calls:
+        yield calls
+
+
+@pytest.fixture
+def tmux_call_budget(tmux_calls: TmuxCallLog) -> Callable[[int, float], None]:
+    """Return a check that the calls made so far fit ``per_pane`` per pane.
+
+    On failure the message lists the calls by subcommand, so a regression
+    shows which command it added.
+    """
+
+    def check(panes: int, per_pane: float) -> None:
+        budget = panes * per_pane
+        assert len(tmux_calls) <= budget, (
+            f"{len(tmux_calls)} tmux calls for {panes} panes, budget {budget:g}: "
+            f"{dict(tmux_calls.by_command().most_common())}"
+        )
+
+    return check
@@ -0,0 +1,204 @@
+"""Tests for ``before_script`` steps and their ``needs``."""
+
+from __future__ import annotations
+
+import pathlib
+import time
+import typing as t
+
+import pytest
+
+from tmuxp import exc
+from tmuxp.workspace import loader
+from tmuxp.workspace.before_script import before_script_steps, run_before_scripts
+from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+
+if t.TYPE_CHECKING:
+    from libtmux.server import Server
+
+
+def _script(tmp_path: pathlib.Path, name: str, body: str) -> str:
+    """Write an executable shell script to ``tmp_path``; return its path."""
+    script = tmp_path / name
+    script.write_text(f"#!/bin/sh\n{body}\n")
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_independent_steps_run_concurrently(tmp_path: pathlib.Path) -> None:
+    """Steps that need nothing run at the same time."""
+    steps = {
+        name: _script(tmp_path, f"{name}.sh", f"sleep 1\necho {name}-done")
+        for name in ("containers", "caches", "secrets")
+    }
+    lines: list[str] = []
+    started = time.monotonic()
+
+    run_before_scripts(steps, on_line=lines.append)
+
+    assert time.monotonic() - started < 2.5
+    assert sorted(lines) == [
+        "[caches] caches-done\n",
+        "[containers] containers-done\n",
+        "[secrets] secrets-done\n",
+    ]
+
+
+def test_step_starts_once_its_needs_succeed(tmp_path: pathlib.Path) -> None:
+    """A step runs after every step it needs, and sees what they did."""
+    steps = [
+        {
+            "name": "migrate",
+            "script": _script(tmp_path, "migrate.sh", "cat up seed"),
+            "needs": ["up", "seed"],
+        },
+        {"name": "up", "script": _script(tmp_path, "up.sh", "sleep 0.5\necho up>up")},
+        {
+            "name": "seed",
+            "script": _script(tmp_path, "seed.sh", "echo seed>seed"),
+            "needs": "up",
+        },
+    ]
+    lines: list[str] = []
+
+    run_before_scripts(steps, cwd=tmp_path, on_line=lines.append)
+
+    assert lines == ["[migrate] up\n", "[migrate] seed\n"]
+
+
+def test_failed_step_stops_its_dependents(tmp_path: pathlib.Path) -> None:
+    """No step starts after one fails; the failure is raised."""
+    steps = {
+        "broken": _script(tmp_path, "broken.sh", "echo oops >&2\nexit 4"),
+        "slow": _script(tmp_path, "slow.sh", "sleep 0.5\ntouch slow-done"),
+        "after": {
+            "script": _script(tmp_path, "after.sh", "touch after-done"),
+            "needs": "broken",
+        },
+    }
+
+    with pytest.raises(exc.BeforeLoadScriptError) as excinfo:
+        run_before_scripts(steps, cwd=tmp_path)
+
+    assert excinfo.value.returncode == 4
+    assert excinfo.value.output == "oops"
+    assert (tmp_path / "slow-done").exists()
+    assert not (tmp_path / "after-done").exists()
+
+
+class InvalidStepsFixture(t.NamedTuple):
+    """Test fixture for a ``before_script`` that cannot be run."""
+
+    test_id: str
+    before_script: t.Any
+    match: str
+
+
+INVALID_STEPS_FIXTURES: list[InvalidStepsFixture] = [
+    InvalidStepsFixture(
+        "unknown-need",
+        {"db": {"script": "./db.sh", "needs": "cache"}},
+        "step 'db' needs unknown step 'cache'",
+    ),
+    InvalidStepsFixture(
+        "duplicate-name",
+        ["./scripts/up.sh", "./other/up.sh"],
+        "more than one step is named 'up.sh'",
+    ),
+    InvalidStepsFixture(
+        "self-need",
+        {"db": {"script": "./db.sh", "needs": "db"}},
+        "steps db need each other",
+    ),
+    InvalidStepsFixture("no-script", [{"name": "db"}], "has no script"),
+    InvalidStepsFixture("not-a-script", 42, "got int"),
+]
+
+
+@pytest.mark.parametrize(
+    list(InvalidStepsFixture._fields),
+    INVALID_STEPS_FIXTURES,
+    ids=[f.test_id for f in INVALID_STEPS_FIXTURES],
+)
+def test_invalid_steps(test_id: str, before_script: t.Any, match: str) -> None:
+    """Steps that cannot be ordered are rejected before any runs."""
+    with pytest.raises(exc.InvalidBeforeScript, match=match):
+        before_script_steps(before_script)
+
+
+def test_expand_resolves_each_step(tmp_path: pathlib.Path) -> None:
+    """Relative step scripts resolve against the workspace directory."""
+    workspace = loader.expand(
+        {
+            "session_name": "steps",
+            "before_script": {
+                "up": "./up.sh",
+                "seed": {"script": "~/seed.sh", "needs": "up"},
+            },
+            "windows": [{"window_name": "main", "panes": [None]}],
+        },
+        cwd=tmp_path,
+    )
+
+    assert workspace["before_script"] == [
+        {"name": "up", "script": str(tmp_path / "up.sh"), "needs": []},
+        {
+            "name": "seed",
+            "script": str(pathlib.Path("~/seed.sh").expanduser()),
+            "needs": ["up"],
+        },
+    ]
+
+
+def test_builder_runs_steps(server: Server, tmp_path: pathlib.Path) -> None:
+    """A workspace's steps run before its windows, output tagged per step."""
+    workspace = loader.trickle(
+        loader.expand(
+            {
+                "session_name": "before-script-steps",
+                "start_directory": str(tmp_path),
+                "before_script": [
+                    _script(tmp_path, "one.sh", "echo first"),
+                    {
+                        "script": _script(tmp_path, "two.sh", "echo second"),
+                        "needs": "one.sh",
+                    },
+                ],
+                "windows": [{"window_name": "main", "panes": [None]}],
+            },
+        ),
+    )
+    lines: list[str] = []
+    builder = ClassicWorkspaceBuilder(
+        session_config=workspace,
+        server=server,
+        on_script_output=lines.append,
+    )
+    builder.build()
+
+    assert lines == ["[one.sh] first\n", "[two.sh] second\n"]
+    assert server.has_session("before-script-steps")
+
+
+@pytest.mark.parametrize("before_script", [[], {}], ids=["list", "mapping"])
+def test_builder_empty_steps(server: Server, before_script: t.Any) -> None:
+    """An empty list or mapping of steps runs nothing, and the build goes on."""
+    workspace = loader.trickle(
+        loader.expand(
+            {
+                "session_name": "before-script-empty",
+                "before_script": before_script,
+                "windows": [{"window_name": "main", "panes": [None]}],
+            },
+        ),
+    )
+    lines: list[str] = []
+    builder = ClassicWorkspaceBuilder(
+        session_config=workspace,
+        server=server,
+        on_script_output=lines.append,
+    )
+    builder.build()
+
+    assert lines == []
+    assert server.has_session("before-script-empty")
@@ -15,6 +15,7 @@ import pytest
 from libtmux._internal.query_list import ObjectDoesNotExist
 from libtmux.exc import LibTmuxException
 from libtmux.pane import Pane
+from libtmux.server import Server
 from libtmux.session import Session
 from libtmux.test.retry import retry_until
 from libtmux.test.temporary import temp_session
@@ -26,11 +27,23 @@ from tmuxp import exc
 from tmuxp._internal.config_reader import ConfigReader
 from tmuxp.cli.load import load_plugins
 from tmuxp.workspace import loader
-from tmuxp.workspace.builder import WorkspaceBuilder, classic as builder_classic
-from tmuxp.workspace.builder.classic import _wait_for_pane_ready
+from tmuxp.workspace.builder import (
+    AsyncioWorkspaceBuilder,
+    ClassicWorkspaceBuilder,
+    ControlModeWorkspaceBuilder,
+    WorkspaceBuilder,
+    classic as builder_classic,
+)
+from tmuxp.workspace.builder.classic import (
+    _wait_for_pane_ready,
+    _wait_for_panes_ready,
+)
+from tmuxp.workspace.options import PaneReadinessStrategy
 
 if t.TYPE_CHECKING:
-    from libtmux.server import Server
+    from collections.abc import Callable, Sequence
+
+    from tmuxp.workspace.builder.accounting import TmuxCallLog
 
     class AssertCallbackProtocol(t.Protocol):
         """Assertion callback type protocol."""
@@ -448,7 +461,13 @@ def test_automatic_rename_option(
     w: Window = session.windows[0]
     assert len(session.windows) == 1
 
-    assert w.name != "renamed_window"
+    def check_window_renamed() -> bool:
+        w.refresh()
+        return w.name != "renamed_window"
+
+    # tmux renames a window at most twice a second, and the first window is
+    # the one tmux created with the session, named moments before.
+    assert retry_until(check_window_renamed, 2, interval=0.1)
 
     def check_window_name_mismatch() -> bool:
         return bool(w.name != portable_command)
@@ -1445,9 +1464,11 @@ DEFAULT_SIZE_FIXTURES = [
         confoverrides={},
     ),
     DefaultSizeNamespaceFixture(
-        test_id="v1.13.1 default-size-breaks",
+        # Planned splits fit the panes without relayouts in between, so the
+        # small default-size that used to run out of room now builds.
+        test_id="v1.13.1 default-size-80x24",
         TMUXP_DEFAULT_SIZE=None,
-        raises=True,
+        raises=False,
         confoverrides={"options": {"default-size": "80x24"}},
     ),
     DefaultSizeNamespaceFixture(
@@ -1547,6 +1568,113 @@ def test_wait_for_pane_ready_timeout(session: Session) -> None:
     assert result is False
 
 
+def test_wait_for_panes_ready_one_query_per_tick(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Waiting on several panes polls them all with one ``list-panes``."""
+    window = session.active_window
+    assert window.active_pane is not None
+    panes = [window.active_pane.split(shell="sleep 999") for _ in range(3)]
+
+    calls: list[tuple[t.Any, ...]] = []
+    original = Server.cmd
+
+    def recording_cmd(self: Server, cmd: str, *args: t.Any, **kwargs: t.Any) -> t.Any:
+        calls.append((cmd, *args))
+        return original(self, cmd, *args, **kwargs)
+
+    monkeypatch.setattr(Server, "cmd", recording_cmd)
+    ready = _wait_for_panes_ready(panes, timeout=0.3, interval=0.1)
+
+    assert ready == set()
+    assert calls
+    assert all(call[:2] == ("list-panes", "-a") for call in calls)
+    # One query per tick for all three panes, not one per pane.
+    assert len(calls) <= 4
+
+
+def test_wait_for_panes_ready_global_deadline(session: Session) -> None:
+    """The timeout bounds the whole group, not each pane."""
+    window = session.active_window
+    assert window.active_pane is not None
+    ready_pane = window.active_pane
+    stuck = [ready_pane.split(shell="sleep 999") for _ in range(4)]
+
+    started = time.monotonic()
+    ready = _wait_for_panes_ready([ready_pane, *stuck], timeout=0.5)
+    elapsed = time.monotonic() - started
+
+    assert ready == {ready_pane.pane_id}
+    assert elapsed < 1.5
+
+
+def _count_listings(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Count ``list-panes`` queries made through :meth:`Server.cmd`."""
+    counter = [0]
+    original = Server.cmd
+
+    def counting_cmd(self: Server, cmd: str, *args: t.Any, **kwargs: t.Any) -> t.Any:
+        if cmd == "list-panes":
+            counter[0] += 1
+        return original(self, cmd, *args, **kwargs)
+
+    monkeypatch.setattr(Server, "cmd", counting_cmd)
+    return counter
+
+
+@pytest.mark.parametrize(
+    ("strategy", "max_listings"),
+    [
+        (PaneReadinessStrategy.POLL, None),
+        (PaneReadinessStrategy.BACKOFF, 8),
+        (PaneReadinessStrategy.EVENT, 3),
+    ],
+    ids=["poll", "backoff", "event"],
+)
+def test_wait_for_panes_ready_strategy_listings(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+    strategy: PaneReadinessStrategy,
+    max_listings: int | None,
+) -> None:
+    """Backoff and event waits check a silent pane far less often than polling."""
+    window = session.active_window
+    assert window.active_pane is not None
+    stuck = window.active_pane.split(shell="sleep 999")
+
+    counter = _count_listings(monkeypatch)
+    ready = _wait_for_panes_ready([stuck], timeout=1.5, strategy=strategy)
+
+    assert ready == set()
+    if max_listings is None:
+        assert counter[0] > 8
+    else:
+        assert 1 <= counter[0] <= max_listings
+
+
+def test_wait_for_panes_ready_event_wakes_on_output(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The event strategy re-checks as soon as the pane prints its prompt."""
+    window = session.active_window
+    assert window.active_pane is not None
+    pane = window.active_pane.split(shell="sleep 0.3; exec sh")
+
+    counter = _count_listings(monkeypatch)
+    started = time.monotonic()
+    ready = _wait_for_panes_ready(
+        [pane],
+        timeout=5.0,
+        strategy=PaneReadinessStrategy.EVENT,
+    )
+
+    assert ready == {pane.pane_id}
+    assert time.monotonic() - started < 2.0
+    assert counter[0] <= 3
+
+
 class PaneReadinessFixture(t.NamedTuple):
     """Test fixture for pane readiness call count verification."""
 
@@ -1639,20 +1767,16 @@ def test_pane_readiness_call_count(
     yaml: str,
     expected_wait_count: int,
 ) -> None:
-    """Verify _wait_for_pane_ready is called only for appropriate panes."""
+    """Verify readiness waits cover only the appropriate panes."""
     call_count = 0
-    original = builder_classic._wait_for_pane_ready
+    original = builder_classic._wait_for_panes_ready
 
-    def counting_wait(
-        pane: Pane,
-        timeout: float = 2.0,
-        interval: float = 0.05,
-    ) -> bool:
+    def counting_wait(panes: Sequence[Pane], **kwargs: t.Any) -> set[str]:
         nonlocal call_count
-        call_count += 1
-        return original(pane, timeout=timeout, interval=interval)
+        call_count += len(panes)
+        return original(panes, **kwargs)
 
-    monkeypatch.setattr(builder_classic, "_wait_for_pane_ready", counting_wait)
+    monkeypatch.setattr(builder_classic, "_wait_for_panes_ready", counting_wait)
 
     yaml_workspace = tmp_path / "readiness.yaml"
     yaml_workspace.write_text(yaml, encoding="utf-8")
@@ -1673,24 +1797,20 @@ def _count_readiness_waits(
     yaml: str,
     shell: str | None = None,
 ) -> int:
-    """Build a workspace from ``yaml`` and count ``_wait_for_pane_ready`` calls.
+    """Build a workspace from ``yaml`` and count the panes waited on.
 
     When ``shell`` is given, the resolved session shell is forced so ``auto``
     detection is deterministic regardless of the shell the suite runs under.
     """
     call_count = 0
-    original = builder_classic._wait_for_pane_ready
+    original = builder_classic._wait_for_panes_ready
 
-    def counting_wait(
-        pane: Pane,
-        timeout: float = 2.0,
-        interval: float = 0.05,
-    ) -> bool:
+    def counting_wait(panes: Sequence[Pane], **kwargs: t.Any) -> set[str]:
         nonlocal call_count
-        call_count += 1
-        return original(pane, timeout=timeout, interval=interval)
+        call_count += len(panes)
+        return original(panes, **kwargs)
 
-    monkeypatch.setattr(builder_classic, "_wait_for_pane_ready", counting_wait)
+    monkeypatch.setattr(builder_classic, "_wait_for_panes_ready", counting_wait)
     if shell is not None:
         monkeypatch.setattr(
             builder_classic,
@@ -1815,7 +1935,7 @@ def test_select_layout_not_called_after_yield(
     server: Server,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    """Verify select_layout is called once per pane, not duplicated in build()."""
+    """Verify select_layout is called once per window, not per pane."""
     call_count = 0
     original_select_layout = Window.select_layout
 
@@ -1846,8 +1966,84 @@ windows:
 
     builder = WorkspaceBuilder(session_config=workspace, server=server)
     builder.build()
-    # 3 panes = 3 layout calls (one per pane in iter_create_panes), not 6
-    assert call_count == 3
+    # Planned splits need no relayout in between: one call for the window.
+    assert call_count == 1
+
+
+class LayoutPlanFixture(t.NamedTuple):
+    """Test fixture for layouts built from a split plan."""
+
+    test_id: str
+    layout: str
+    pane_count: int
+
+
+LAYOUT_PLAN_FIXTURES: list[LayoutPlanFixture] = [
+    LayoutPlanFixture("even-horizontal", "even-horizontal", 6),
+    LayoutPlanFixture("even-vertical", "even-vertical", 8),
+    LayoutPlanFixture("main-horizontal", "main-horizontal", 10),
+    LayoutPlanFixture("main-vertical", "main-vertical", 10),
+    LayoutPlanFixture("tiled", "tiled", 16),
+    LayoutPlanFixture(
+        "custom",
+        "9813,80x24,0,0[80x8,0,0{39x8,0,0,0,40x8,40,0,2},80x15,0,9,1]",
+        3,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(LayoutPlanFixture._fields),
+    LAYOUT_PLAN_FIXTURES,
+    ids=[f.test_id for f in LAYOUT_PLAN_FIXTURES],
+)
+@pytest.mark.parametrize("batch_commands", [False, True], ids=["unbatched", "batched"])
+def test_layout_plan_fits_small_window(
+    server: Server,
+    tmp_path: pathlib.Path,
+    test_id: str,
+    layout: str,
+    pane_count: int,
+    batch_commands: bool,
+) -> None:
+    """Many panes fit an 80x24 window, in workspace order, with one relayout."""
+    directories = [tmp_path / f"pane-{number}" for number in range(pane_count)]
+    for directory in directories:
+        directory.mkdir()
+    workspace = loader.trickle(
+        loader.expand(
+            {
+                "session_name": f"layout-plan-{test_id}",
+                "options": {"default-size": "80x24"},
+                "workspace_builder_options": {
+                    "pane_readiness": "never",
+                    "batch_commands": batch_commands,
+                },
+                "windows": [
+                    {
+                        "layout": layout,
+                        "panes": [
+                            {"shell_command": [], "start_directory": str(directory)}
+                            for directory in directories
+                        ],
+                    },
+                ],
+            },
+        ),
+    )
+    builder = WorkspaceBuilder(session_config=workspace, server=server)
+    builder.build()
+
+    window = builder.session.windows[0]
+    panes = window.panes
+    assert len(panes) == pane_count
+    # Panes are listed in workspace order, and the last one is active, as when
+    # each pane splits the one before it.
+    assert [pane.pane_current_path for pane in panes] == [
+        str(directory) for directory in directories
+    ]
+    assert window.active_pane is not None
+    assert window.active_pane.pane_id == panes[-1].pane_id
 
 
 def test_builder_logs_session_created(
@@ -1925,3 +2121,238 @@ def test_builder_logs_window_and_pane_creation(
     assert len(cmd_logs) >= 1
 
     builder.session.kill()
+
+
+class TmuxCallBudgetFixture(t.NamedTuple):
+    """Test fixture for the tmux calls a build may make per pane."""
+
+    test_id: str
+    builder_class: type[ClassicWorkspaceBuilder]
+    batch_commands: bool
+    per_pane: float
+
+
+# Budgets for a 3-window, 3-pane build without readiness waits. Unbatched
+# builds pay for libtmux's own lookups after every split; batched ones spend
+# a couple of calls on the session and about three per window.
+TMUX_CALL_BUDGET_FIXTURES: list[TmuxCallBudgetFixture] = [
+    TmuxCallBudgetFixture(
+        test_id="unbatched",
+        builder_class=ClassicWorkspaceBuilder,
+        batch_commands=False,
+        per_pane=10,
+    ),
+    TmuxCallBudgetFixture(
+        test_id="batched",
+        builder_class=ClassicWorkspaceBuilder,
+        batch_commands=True,
+        per_pane=1.25,
+    ),
+    TmuxCallBudgetFixture(
+        test_id="asyncio",
+        builder_class=AsyncioWorkspaceBuilder,
+        batch_commands=False,
+        per_pane=1.25,
+    ),
+    TmuxCallBudgetFixture(
+        test_id="control",
+        builder_class=ControlModeWorkspaceBuilder,
+        batch_commands=True,
+        per_pane=1.25,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(TmuxCallBudgetFixture._fields),
+    TMUX_CALL_BUDGET_FIXTURES,
+    ids=[f.test_id for f in TMUX_CALL_BUDGET_FIXTURES],
+)
+def test_build_tmux_call_budget(
+    server: Server,
+    tmux_calls: TmuxCallLog,
+    tmux_call_budget: Callable[[int, float], None],
+    test_id: str,
+    builder_class: type[ClassicWorkspaceBuilder],
+    batch_commands: bool,
+    per_pane: float,
+) -> None:
+    """A build stays within its tmux call budget, asking shared state once."""
+    workspace = loader.trickle(
+        loader.expand(
+            {
+                "session_name": f"call-budget-{test_id}",
+                "workspace_builder_options": {
+                    "pane_readiness": "never",
+                    "batch_commands": batch_commands,
+                },
+                "windows": [
+                    {
+                        "window_name": f"window-{number}",
+                        "layout": "tiled",
+                        "panes": [{"shell_command": ["echo hi"]}] * 3,
+                    }
+                    for number in range(3)
+                ],
+            },
+        ),
+    )
+    builder_class(session_config=workspace, server=server).build()
+
+    tmux_call_budget(9, per_pane)
+    # The session's state comes with new-session, and its initial window
+    # becomes the first window rather than being replaced.
+    commands = tmux_calls.by_command()
+    assert commands["show-options"] == 0
+    assert commands["kill-window"] == 0
+    assert commands["new-window"] == 2
+
+
+def test_first_window_pass_asks_tmux_once(
+    session: Session,
+    tmux_calls: TmuxCallLog,
+) -> None:
+    """A session the builder did not create is asked about once, not per window."""
+    builder = WorkspaceBuilder(
+        session_config={"session_name": "first-pass", "windows": []},
+        server=session.server,
+    )
+
+    assert builder.first_window_pass(1, session, append=False)
+    assert not builder.first_window_pass(2, session, append=False)
+    assert not builder.first_window_pass(3, session, append=False)
+    assert not builder.first_window_pass(1, session, append=True)
+    assert builder._get_pane_base_index(session.active_window) == 0
+
+    commands = tmux_calls.by_command()
+    assert commands["display-message"] == 1
+    assert commands["list-windows"] == 1  # session.active_window, above
+    assert commands["show-options"] == 0
+
+
+class InitialWindowFixture(t.NamedTuple):
+    """Test fixture for reusing the window tmux creates with the session."""
+
+    test_id: str
+    builder_class: type[ClassicWorkspaceBuilder]
+    batch_commands: bool
+    options: dict[str, t.Any]
+    window_index: int | None
+    expected_index: str
+
+
+INITIAL_WINDOW_FIXTURES: list[InitialWindowFixture] = [
+    InitialWindowFixture(
+        test_id="unbatched",
+        builder_class=ClassicWorkspaceBuilder,
+        batch_commands=False,
+        options={},
+        window_index=None,
+        expected_index="1",
+    ),
+    InitialWindowFixture(
+        test_id="batched-base-index",
+        builder_class=ClassicWorkspaceBuilder,
+        batch_commands=True,
+        options={"base-index": 5},
+        window_index=None,
+        expected_index="5",
+    ),
+    InitialWindowFixture(
+        test_id="asyncio-window-index",
+        builder_class=AsyncioWorkspaceBuilder,
+        batch_commands=False,
+        options={},
+        window_index=3,
+        expected_index="3",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(InitialWindowFixture._fields),
+    INITIAL_WINDOW_FIXTURES,
+    ids=[f.test_id for f in INITIAL_WINDOW_FIXTURES],
+)
+def test_first_window_reuses_initial_window(
+    server: Server,
+    tmp_path: pathlib.Path,
+    tmux_calls: TmuxCallLog,
+    test_id: str,
+    builder_class: type[ClassicWorkspaceBuilder],
+    batch_commands: bool,
+    options: dict[str, t.Any],
+    window_index: int | None,
+    expected_index: str,
+) -> None:
+    """The first window respawns the session's initial window in place."""
+    first_window: dict[str, t.Any] = {
+        "window_name": "first",
+        "start_directory": str(tmp_path),
+        "environment": {"REUSED": "yes"},
+        "panes": [{"shell_command": []}],
+    }
+    if window_index is not None:
+        first_window["window_index"] = window_index
+    workspace = loader.trickle(
+        loader.expand(
+            {
+                "session_name": f"initial-window-{test_id}",
+                "options": options,
+                "workspace_builder_options": {
+                    "pane_readiness": "never",
+                    "batch_commands": batch_commands,
+                },
+                "windows": [
+                    first_window,
+                    {"window_name": "second", "panes": [{"shell_command": []}]},
+                ],
+            },
+        ),
+    )
+    builder = builder_class(session_config=workspace, server=server)
+    builder.build()
+
+    commands = tmux_calls.by_command()
+    assert commands["respawn-window"] == 1
+    assert commands["new-window"] == 1
+    assert commands["kill-window"] == 0
+
+    window = builder.session.windows.get(window_name="first")
+    assert window is not None
+    assert window.window_index == expected_index
+    pane = window.active_pane
+    assert pane is not None
+    assert retry_until(
+        lambda: (
+            pane.display_message("#{pane_current_path}", get_text=True)
+            == [str(tmp_path)]
+        ),
+        raises=False,
+    )
+    pane.send_keys("echo $REUSED")
+    assert retry_until(lambda: "yes" in pane.capture_pane(), raises=False)
+
+
+def test_first_window_replaces_initial_window_with_default_shell(
+    server: Server,
+    tmux_calls: TmuxCallLog,
+) -> None:
+    """A respawned pane keeps its old shell, so ``default-shell`` gets a new window."""
+    workspace = loader.trickle(
+        loader.expand(
+            {
+                "session_name": "initial-window-shell",
+                "options": {"default-shell": "/bin/sh"},
+                "workspace_builder_options": {"pane_readiness": "never"},
+                "windows": [{"window_name": "first", "panes": [{"shell_command": []}]}],
+            },
+        ),
+    )
+    builder = WorkspaceBuilder(session_config=workspace, server=server)
+    builder.build()
+
+    commands = tmux_calls.by_command()
+    assert commands["respawn-window"] == 0
+    assert commands["kill-window"] == 1
+    assert [w.window_name for w in builder.session.windows] == ["first"]
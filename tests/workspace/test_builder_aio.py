@@ -0,0 +1,135 @@
+"""Tests for the asyncio builder (:mod:`tmuxp.workspace.builder.aio`)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import typing as t
+
+from libtmux.test.retry import retry_until
+
+from tests.fixtures import utils as test_utils
+from tmuxp.workspace import loader
+from tmuxp.workspace.builder import registry
+from tmuxp.workspace.builder.aio import AsyncioWorkspaceBuilder
+from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+from tmuxp.workspace.builder.protocol import (
+    AsyncWorkspaceBuilderProtocol,
+    is_async_builder,
+)
+
+if t.TYPE_CHECKING:
+    from libtmux.server import Server
+
+
+def _workspace(session_name: str, **pane_extra: t.Any) -> dict[str, t.Any]:
+    """Return an expanded, trickled three-window workspace."""
+    workspace = test_utils.load_workspace_file(
+        "workspace/builder/editor_logs.yaml",
+        session_name=session_name,
+        workspace_builder="asyncio",
+    )
+    editor, logs = workspace["windows"]
+    shell_pane: dict[str, t.Any] = {"shell_command": ["true"]}
+    workspace["windows"].append({"window_name": "shell", "panes": [shell_pane]})
+    for pane in (editor["panes"][0], logs["panes"][0], shell_pane):
+        pane.update(pane_extra)
+    return loader.trickle(loader.expand(workspace))
+
+
+def test_asyncio_builder_is_registered() -> None:
+    """``workspace_builder: asyncio`` resolves to an async-capable builder."""
+    assert "asyncio" in registry.available_builders()
+    resolved = registry.resolve_builder_class(_workspace("x"))
+    assert resolved is AsyncioWorkspaceBuilder
+    assert is_async_builder(resolved)
+    assert not is_async_builder(ClassicWorkspaceBuilder)
+
+
+def test_asyncio_builder_satisfies_async_protocol(server: Server) -> None:
+    """Instances satisfy the async protocol, and so the sync one too."""
+    builder = AsyncioWorkspaceBuilder(session_config=_workspace("x"), server=server)
+    assert isinstance(builder, AsyncWorkspaceBuilderProtocol)
+
+
+def test_asyncio_builder_builds_workspace(server: Server) -> None:
+    """Concurrent windows end up identical to a classic build."""
+    builder = AsyncioWorkspaceBuilder(
+        session_config=_workspace("asyncio-build"),
+        server=server,
+    )
+    builder.build()
+    session = builder.session
+
+    assert [w.window_name for w in session.windows] == ["editor", "logs", "shell"]
+    assert [w.window_index for w in session.windows] == ["1", "2", "3"]
+    editor = session.windows[0]
+    assert len(editor.panes) == 2
+    assert editor.show_option("main-pane-width") == 40
+    assert editor.show_option("synchronize-panes") is True
+    assert session.active_window.window_name == "logs"
+    assert editor.active_pane is not None
+    assert editor.active_pane.pane_id == editor.panes[1].pane_id
+
+    second = editor.panes[1]
+
+    def command_sent() -> bool:
+        return any("echo second;" in line for line in second.capture_pane())
+
+    assert retry_until(command_sent, seconds=5)
+
+
+def test_asyncio_builder_events_match_classic(server: Server) -> None:
+    """Build events are replayed in the order a classic build emits them."""
+    classic_events: list[dict[str, t.Any]] = []
+    ClassicWorkspaceBuilder(
+        session_config=_workspace("events-classic"),
+        server=server,
+        on_build_event=classic_events.append,
+    ).build()
+
+    async_events: list[dict[str, t.Any]] = []
+    AsyncioWorkspaceBuilder(
+        session_config=_workspace("events-asyncio"),
+        server=server,
+        on_build_event=async_events.append,
+    ).build()
+
+    def strip(events: list[dict[str, t.Any]]) -> list[dict[str, t.Any]]:
+        return [
+            {k: v for k, v in e.items() if k not in {"name", "time", "duration"}}
+            for e in events
+        ]
+
+    assert strip(async_events) == strip(classic_events)
+
+
+def test_asyncio_builder_overlaps_window_sleeps(server: Server) -> None:
+    """Each window's ``sleep_after`` runs concurrently with the others'."""
+    config = _workspace("asyncio-sleeps", sleep_after=1.5)
+
+    started = time.monotonic()
+    AsyncioWorkspaceBuilder(session_config=config, server=server).build()
+    elapsed = time.monotonic() - started
+
+    # Sequentially the three windows' sleeps alone take 4.5 seconds.
+    assert elapsed < 4.0
+
+
+def test_asyncio_builder_leaves_loop_free_for_before_script(server: Server) -> None:
+    """Other tasks on the loop keep running while ``before_script`` runs."""
+    config = _workspace("asyncio-before-script")
+    config["before_script"] = "sleep 1"
+    builder = AsyncioWorkspaceBuilder(session_config=config, server=server)
+
+    async def build_and_tick() -> int:
+        ticks = 0
+        build = asyncio.ensure_future(builder.abuild())
+        while not build.done():
+            ticks += 1
+            await asyncio.sleep(0.05)
+        await build
+        return ticks
+
+    # A blocked loop would tick once or twice in all.
+    assert asyncio.run(build_and_tick()) >= 10
@@ -0,0 +1,158 @@
+"""Tests for ``workspace_builder_options.background_before_script``."""
+
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+from libtmux.test.retry import retry_until
+
+from tests.fixtures import utils as test_utils
+from tmuxp import exc
+from tmuxp.workspace import loader
+from tmuxp.workspace.builder.aio import AsyncioWorkspaceBuilder
+from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+from tmuxp.workspace.builder.control import ControlModeWorkspaceBuilder
+
+if t.TYPE_CHECKING:
+    import pathlib
+
+    from libtmux.server import Server
+
+
+def _script(tmp_path: pathlib.Path, body: str) -> pathlib.Path:
+    """Write an executable shell script to ``tmp_path``."""
+    script = tmp_path / "before.sh"
+    script.write_text(f"#!/bin/sh\n{body}\n")
+    script.chmod(0o755)
+    return script
+
+
+def _workspace(
+    session_name: str,
+    tmp_path: pathlib.Path,
+    script: pathlib.Path,
+    **builder_options: t.Any,
+) -> dict[str, t.Any]:
+    """Return a workspace whose panes read what ``script`` writes."""
+    return loader.trickle(
+        loader.expand(
+            test_utils.load_workspace_file(
+                "workspace/builder/background_before_script.yaml",
+                session_name=session_name,
+                start_directory=str(tmp_path),
+                before_script=str(script),
+                workspace_builder_options=builder_options,
+            ),
+        ),
+    )
+
+
+class BackgroundScriptFixture(t.NamedTuple):
+    """Test fixture for a builder running ``before_script`` in the background."""
+
+    test_id: str
+    builder_class: type[ClassicWorkspaceBuilder]
+    builder_options: dict[str, t.Any]
+
+
+BACKGROUND_SCRIPT_FIXTURES: list[BackgroundScriptFixture] = [
+    BackgroundScriptFixture("unbatched", ClassicWorkspaceBuilder, {}),
+    BackgroundScriptFixture(
+        "batched",
+        ClassicWorkspaceBuilder,
+        {"batch_commands": True},
+    ),
+    BackgroundScriptFixture(
+        "parallel",
+        ClassicWorkspaceBuilder,
+        {"parallel_windows": 2},
+    ),
+    BackgroundScriptFixture("asyncio", AsyncioWorkspaceBuilder, {}),
+    BackgroundScriptFixture(
+        "control",
+        ControlModeWorkspaceBuilder,
+        {"batch_commands": True},
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(BackgroundScriptFixture._fields),
+    BACKGROUND_SCRIPT_FIXTURES,
+    ids=[f.test_id for f in BACKGROUND_SCRIPT_FIXTURES],
+)
+def test_background_script_overlaps_pane_creation(
+    server: Server,
+    tmp_path: pathlib.Path,
+    test_id: str,
+    builder_class: type[ClassicWorkspaceBuilder],
+    builder_options: dict[str, t.Any],
+) -> None:
+    """Panes are created while the script runs; commands wait for it."""
+    script = _script(tmp_path, "sleep 1\necho script-ready > marker")
+    builder = builder_class(
+        session_config=_workspace(
+            f"background-{test_id}",
+            tmp_path,
+            script,
+            **builder_options,
+        ),
+        server=server,
+    )
+    events: list[dict[str, t.Any]] = []
+    builder.on_build_event = events.append
+    builder.build()
+
+    names = [e["event"] for e in events]
+    assert names.count("before_script_done") == 1
+    started = events[names.index("before_script_started")]
+    done = events[names.index("before_script_done")]
+    assert done["duration"] >= 1
+    assert done["time"] - done["duration"] == pytest.approx(started["time"], abs=0.1)
+    pane_total = sum(
+        e["pane_total"] for e in events if e["event"] == "panes_created"
+    ) or len(builder.session.panes)
+    assert pane_total == 3
+    assert any(
+        e["event"] in {"pane_creating", "panes_created"} and e["time"] < done["time"]
+        for e in events
+    )
+
+    pane = builder.session.windows[0].panes[0]
+    assert retry_until(
+        lambda: "script-ready" in "\n".join(pane.capture_pane()),
+        seconds=5,
+        raises=False,
+    )
+
+
+@pytest.mark.parametrize(
+    list(BackgroundScriptFixture._fields),
+    BACKGROUND_SCRIPT_FIXTURES,
+    ids=[f.test_id for f in BACKGROUND_SCRIPT_FIXTURES],
+)
+def test_background_script_failure_kills_session(
+    server: Server,
+    tmp_path: pathlib.Path,
+    test_id: str,
+    builder_class: type[ClassicWorkspaceBuilder],
+    builder_options: dict[str, t.Any],
+) -> None:
+    """A failing script kills the session and fails the build, as before."""
+    script = _script(tmp_path, "sleep 0.5\nexit 1")
+    session_name = f"background-fail-{test_id}"
+    builder = builder_class(
+        session_config=_workspace(session_name, tmp_path, script, **builder_options),
+        server=server,
+    )
+    events: list[dict[str, t.Any]] = []
+    builder.on_build_event = events.append
+    with pytest.raises(exc.BeforeLoadScriptError):
+        builder.build()
+
+    assert not server.has_session(session_name)
+    names = [e["event"] for e in events]
+    assert names.count("before_script_done") == 1
+    assert "workspace_built" not in names
+    assert not (tmp_path / "marker").exists()
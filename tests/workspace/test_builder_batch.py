@@ -0,0 +1,346 @@
+"""Tests for batched tmux dispatch (:mod:`tmuxp.workspace.builder.batch`)."""
+
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+from libtmux.common import tmux_cmd
+from libtmux.exc import LibTmuxException
+from libtmux.test.retry import retry_until
+
+from tests.fixtures import utils as test_utils
+from tmuxp import exc
+from tmuxp.workspace import loader
+from tmuxp.workspace.builder import WorkspaceBuilder
+from tmuxp.workspace.builder.batch import TmuxCommandBatch
+
+if t.TYPE_CHECKING:
+    from libtmux.server import Server
+    from libtmux.session import Session
+
+
+def _workspace(batch_commands: bool) -> dict[str, t.Any]:
+    """Return an expanded, trickled workspace exercising the batched paths."""
+    workspace = test_utils.load_workspace_file(
+        "workspace/builder/editor_logs.yaml",
+        session_name=f"batch-{batch_commands}",
+        workspace_builder_options={"batch_commands": batch_commands},
+    )
+    workspace["windows"][0]["panes"].append({"shell_command": []})
+    return loader.trickle(loader.expand(workspace))
+
+
+def _count_tmux_processes(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Count tmux processes libtmux spawns from here on."""
+    counter = [0]
+    original = tmux_cmd.__init__
+
+    def counting_init(self: tmux_cmd, *args: t.Any, **kwargs: t.Any) -> None:
+        counter[0] += 1
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(tmux_cmd, "__init__", counting_init)
+    return counter
+
+
+@pytest.mark.parametrize("batch_commands", [False, True], ids=["unbatched", "batched"])
+def test_batched_build_matches_unbatched(server: Server, batch_commands: bool) -> None:
+    """A batched build creates the same windows, panes, options and commands."""
+    builder = WorkspaceBuilder(
+        session_config=_workspace(batch_commands),
+        server=server,
+    )
+    builder.build()
+    session = builder.session
+
+    assert [w.window_name for w in session.windows] == ["editor", "logs"]
+    editor, logs = session.windows
+    assert len(editor.panes) == 3
+    assert len(logs.panes) == 1
+    assert editor.show_option("main-pane-width") == 40
+    assert editor.show_option("synchronize-panes") is True
+    assert session.active_window.window_name == "logs"
+    assert editor.active_pane is not None
+    assert editor.active_pane.pane_id == editor.panes[1].pane_id
+
+    second = editor.panes[1]
+
+    def command_sent() -> bool:
+        return any("echo second" in line for line in second.capture_pane())
+
+    assert retry_until(command_sent, seconds=5)
+
+
+def test_batched_send_keys_keeps_trailing_semicolon(server: Server) -> None:
+    """A command ending in ``;`` is typed literally, not read as a separator."""
+    builder = WorkspaceBuilder(session_config=_workspace(True), server=server)
+    builder.build()
+    second = builder.session.windows[0].panes[1]
+
+    def command_sent() -> bool:
+        return any("echo second;" in line for line in second.capture_pane())
+
+    assert retry_until(command_sent, seconds=5)
+
+
+def test_batched_build_spawns_fewer_processes(
+    server: Server,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Batching chains commands into far fewer tmux processes."""
+    counter = _count_tmux_processes(monkeypatch)
+    WorkspaceBuilder(session_config=_workspace(False), server=server).build()
+    unbatched = counter[0]
+
+    counter[0] = 0
+    WorkspaceBuilder(session_config=_workspace(True), server=server).build()
+    batched = counter[0]
+
+    assert batched < unbatched / 2
+
+
+def test_batch_flush_runs_one_process(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A flush of several commands is a single tmux process."""
+    batch = TmuxCommandBatch(server=session.server)
+    for name in ("one", "two", "three"):
+        batch.queue("new-window", "-d", "-t", f"{session.session_id}:", "-n", name)
+
+    counter = _count_tmux_processes(monkeypatch)
+    batch.flush()
+    assert counter[0] == 1
+    assert [w.window_name for w in session.windows][-3:] == ["one", "two", "three"]
+
+
+def test_batch_flush_splits_long_chains(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A chain too long for one tmux command line runs as several."""
+    batch = TmuxCommandBatch(server=session.server)
+    # Long capture formats, like the list-panes rows splits capture.
+    slots = [
+        batch.queue(
+            "new-window",
+            "-d",
+            "-t",
+            f"{session.session_id}:",
+            capture=f"{number} {'x' * 2000}",
+        )
+        for number in range(12)
+    ]
+
+    counter = _count_tmux_processes(monkeypatch)
+    results = batch.flush()
+    assert counter[0] > 1
+    assert [results[slot] for slot in slots] == [
+        f"{number} {'x' * 2000}" for number in range(12)
+    ]
+
+
+def test_batch_flush_error(session: Session) -> None:
+    """A failing command raises, and is still a libtmux error."""
+    batch = TmuxCommandBatch(server=session.server)
+    batch.queue("set-option", "-t", str(session.session_id), "status", "on")
+    batch.queue("set-option", "-t", str(session.session_id), "no-such-option", "x")
+
+    with pytest.raises(exc.TmuxCommandBatchError, match="no-such-option") as excinfo:
+        batch.flush()
+    assert isinstance(excinfo.value, LibTmuxException)
+    assert len(excinfo.value.commands) == 2
+    assert len(batch) == 0
+
+
+def test_batch_flush_report_all(session: Session) -> None:
+    """``report_all`` names every failing command and applies the rest."""
+    batch = TmuxCommandBatch(server=session.server)
+    batch.queue("set-option", "-t", str(session.session_id), "bad-one", "x")
+    batch.queue("set-option", "-t", str(session.session_id), "status", "off")
+    batch.queue("set-option", "-t", str(session.session_id), "bad-two", "y")
+
+    with pytest.raises(exc.TmuxCommandsFailedError) as excinfo:
+        batch.flush(report_all=True)
+    assert isinstance(excinfo.value, exc.TmuxCommandBatchError)
+    assert [command[3] for command in excinfo.value.commands] == [
+        "bad-one",
+        "bad-two",
+    ]
+    assert "bad-one" in str(excinfo.value)
+    assert "bad-two" in str(excinfo.value)
+    assert session.show_option("status") is False
+
+
+def test_session_settings_one_process_per_scope(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Session options, global options and environment take a process each."""
+    builder = WorkspaceBuilder(
+        session_config={
+            "session_name": session.name,
+            "options": {"status": False, "base-index": 1, "status-left": "ok;"},
+            "global_options": {"repeat-time": 700, "display-time": 900},
+            "environment": {f"TMUXP_BULK_{n}": str(n) for n in range(5)},
+            "windows": [{"panes": [{"shell_command": []}]}],
+        },
+        server=session.server,
+    )
+    counter = _count_tmux_processes(monkeypatch)
+    builder._apply_session_settings()
+    assert counter[0] == 3
+
+    assert session.show_option("status") is False
+    assert session.show_option("status-left") == "ok;"
+    assert session.show_option("repeat-time", global_=True) == 700
+    assert session.show_environment()["TMUXP_BULK_4"] == "4"
+
+
+def test_session_settings_report_each_bad_option(session: Session) -> None:
+    """Every rejected session option is reported, not only the first."""
+    builder = WorkspaceBuilder(
+        session_config={
+            "session_name": session.name,
+            "options": {"bad-one": 1, "status": False, "bad-two": 2},
+            "windows": [{"panes": [{"shell_command": []}]}],
+        },
+        server=session.server,
+    )
+    with pytest.raises(exc.TmuxCommandsFailedError) as excinfo:
+        builder._apply_session_settings()
+    assert len(excinfo.value.failures) == 2
+    assert session.show_option("status") is False
+
+
+def _send_keys_workspace(
+    batch_send_keys: bool, batch_commands: bool
+) -> dict[str, t.Any]:
+    """Return a workspace whose pane runs a long ``shell_command_before`` chain."""
+    return loader.trickle(
+        loader.expand(
+            {
+                "session_name": f"send-keys-{batch_send_keys}-{batch_commands}",
+                "workspace_builder_options": {
+                    "batch_commands": batch_commands,
+                    "batch_send_keys": batch_send_keys,
+                    "pane_readiness": "never",
+                },
+                "shell_command_before": [f"echo before-{n}" for n in range(6)],
+                "windows": [
+                    {
+                        "panes": [
+                            {
+                                "shell_command": [
+                                    "echo first;",
+                                    {"cmd": "echo paused", "sleep_before": 0.1},
+                                    {"cmd": "echo typed", "enter": False},
+                                ],
+                            },
+                        ],
+                    },
+                ],
+            },
+        ),
+    )
+
+
+@pytest.mark.parametrize("batch_commands", [False, True], ids=["unbatched", "batched"])
+def test_batch_send_keys_merges_runs(
+    server: Server,
+    monkeypatch: pytest.MonkeyPatch,
+    batch_commands: bool,
+) -> None:
+    """Runs of commands share one send-keys and type the same keys."""
+    sent: list[tuple[str, ...]] = []
+    original = tmux_cmd.__init__
+
+    def recording_init(self: tmux_cmd, *args: t.Any, **kwargs: t.Any) -> None:
+        sent.append(tuple(str(a) for a in args))
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(tmux_cmd, "__init__", recording_init)
+
+    def send_keys_commands() -> int:
+        return sum(sum(1 for arg in argv if arg == "send-keys") for argv in sent)
+
+    WorkspaceBuilder(
+        session_config=_send_keys_workspace(False, batch_commands),
+        server=server,
+    ).build()
+    separate = send_keys_commands()
+
+    sent.clear()
+    builder = WorkspaceBuilder(
+        session_config=_send_keys_workspace(True, batch_commands),
+        server=server,
+    )
+    builder.build()
+    merged = send_keys_commands()
+
+    # Six inherited commands and "echo first;" share one send-keys. The
+    # sleep_before carries forward, so each later command is a run of its own.
+    assert merged == 3
+    assert merged < separate
+
+    pane = builder.session.windows[0].panes[0]
+
+    def all_typed() -> bool:
+        screen = "\n".join(pane.capture_pane())
+        return all(
+            text in screen
+            for text in ("before-5", "echo first;", "paused", "echo typed")
+        )
+
+    assert retry_until(all_typed, seconds=5)
+
+
+@pytest.mark.parametrize("batch_commands", [False, True], ids=["unbatched", "batched"])
+def test_bad_window_option_retries_only_options(
+    server: Server,
+    monkeypatch: pytest.MonkeyPatch,
+    batch_commands: bool,
+) -> None:
+    """A rejected window option retries the options, not the window's setup."""
+    dispatched: list[tuple[str, ...]] = []
+    original = TmuxCommandBatch._dispatch
+
+    def recording_dispatch(
+        self: TmuxCommandBatch,
+        commands: list[t.Any],
+    ) -> tuple[list[str], list[str]]:
+        dispatched.extend(command.args for command in commands)
+        return original(self, commands)
+
+    monkeypatch.setattr(TmuxCommandBatch, "_dispatch", recording_dispatch)
+    builder = WorkspaceBuilder(
+        session_config=loader.trickle(
+            loader.expand(
+                {
+                    "session_name": f"bad-option-{batch_commands}",
+                    "workspace_builder_options": {
+                        "batch_commands": batch_commands,
+                        "pane_readiness": "never",
+                    },
+                    "windows": [
+                        {
+                            "window_name": "first",
+                            "options": {"no-such-option": 1},
+                            "panes": [{"shell_command": []}],
+                        },
+                    ],
+                },
+            ),
+        ),
+        server=server,
+    )
+    with pytest.raises(exc.TmuxCommandsFailedError):
+        builder.build()
+
+    retried = [
+        args
+        for args in dispatched
+        if args[0] != "set-option" and dispatched.count(args) > 1
+    ]
+    assert retried == []
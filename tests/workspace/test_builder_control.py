@@ -0,0 +1,137 @@
+"""Tests for the control-mode builder (:mod:`tmuxp.workspace.builder.control`)."""
+
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+from libtmux.common import tmux_cmd
+from libtmux.test.retry import retry_until
+
+from tests.fixtures import utils as test_utils
+from tmuxp import exc
+from tmuxp.workspace import loader
+from tmuxp.workspace.builder import registry
+from tmuxp.workspace.builder.accounting import record_tmux_calls
+from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+from tmuxp.workspace.builder.control import (
+    ControlModeClient,
+    ControlModeWorkspaceBuilder,
+)
+
+if t.TYPE_CHECKING:
+    from libtmux.server import Server
+    from libtmux.session import Session
+
+
+def _workspace(session_name: str = "control-builder") -> dict[str, t.Any]:
+    """Return an expanded, trickled workspace for the control builder."""
+    workspace = test_utils.load_workspace_file(
+        "workspace/builder/editor_logs.yaml",
+        session_name=session_name,
+        workspace_builder="control",
+    )
+    workspace["windows"][0]["panes"][0]["shell_command"] = ["echo 'first #1'"]
+    return loader.trickle(loader.expand(workspace))
+
+
+def test_control_builder_is_registered() -> None:
+    """``workspace_builder: control`` resolves through the entry-point group."""
+    assert "control" in registry.available_builders()
+    resolved = registry.resolve_builder_class(_workspace())
+    assert resolved is ControlModeWorkspaceBuilder
+
+
+def test_control_builder_builds_workspace(server: Server) -> None:
+    """The control builder creates the same structure as the classic builder."""
+    builder = ControlModeWorkspaceBuilder(session_config=_workspace(), server=server)
+    builder.build()
+    session = builder.session
+
+    assert [w.window_name for w in session.windows] == ["editor", "logs"]
+    editor = session.windows[0]
+    assert len(editor.panes) == 2
+    assert editor.show_option("main-pane-width") == 40
+    assert session.active_window.window_name == "logs"
+    assert editor.active_pane is not None
+    assert editor.active_pane.pane_id == editor.panes[1].pane_id
+
+    first, second = editor.panes
+
+    def commands_sent() -> bool:
+        return any("first #1" in line for line in first.capture_pane()) and any(
+            "echo second;" in line for line in second.capture_pane()
+        )
+
+    assert retry_until(commands_sent, seconds=5)
+
+    # The control client detached when the build finished.
+    assert server.cmd("list-clients").stdout == []
+
+
+def test_control_builder_spawns_fewer_processes(
+    server: Server,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Flushes go over the pipe, so fewer tmux processes run than batched."""
+    counter = [0]
+    original = tmux_cmd.__init__
+
+    def counting_init(self: tmux_cmd, *args: t.Any, **kwargs: t.Any) -> None:
+        counter[0] += 1
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(tmux_cmd, "__init__", counting_init)
+
+    batched = _workspace(session_name="batched")
+    batched["workspace_builder_options"]["batch_commands"] = True
+    ClassicWorkspaceBuilder(session_config=batched, server=server).build()
+    batched_count = counter[0]
+
+    counter[0] = 0
+    ControlModeWorkspaceBuilder(session_config=_workspace(), server=server).build()
+
+    assert counter[0] < batched_count
+
+
+def test_control_builder_reports_tmux_errors(server: Server) -> None:
+    """A failing command raises and the control client is still closed."""
+    config = _workspace()
+    config["windows"][0]["options"] = {"no-such-option": "x"}
+    builder = ControlModeWorkspaceBuilder(session_config=config, server=server)
+
+    with pytest.raises(exc.TmuxCommandBatchError, match="no-such-option"):
+        builder.build()
+    assert server.cmd("list-clients").stdout == []
+
+
+def test_control_client_attach_error(session: Session) -> None:
+    """A client that cannot attach raises a control-mode error."""
+    with pytest.raises(exc.TmuxControlModeError):
+        ControlModeClient(server=session.server, target="no-such-session")
+
+
+def test_control_builder_waits_for_panes_over_the_pipe(server: Server) -> None:
+    """Pane readiness checks and reconciled panes go over the control pipe."""
+    config = _workspace()
+    config["workspace_builder_options"]["pane_readiness"] = "always"
+    ControlModeWorkspaceBuilder(session_config=config, server=server).build()
+    session = server.sessions.get(session_name="control-builder")
+    assert session is not None
+    session.windows[0].panes[-1].kill()
+
+    builder = ControlModeWorkspaceBuilder(session_config=config, server=server)
+    with record_tmux_calls() as calls:
+        builder.reconcile()
+
+    assert len(session.windows[0].panes) == 2
+    # ``list-panes -a`` is the readiness check.
+    for command in (
+        ("list-panes", "-a"),
+        ("split-window",),
+        ("select-layout",),
+        ("send-keys",),
+    ):
+        sent = calls.matching(*command)
+        assert sent, command
+        assert {call.transport for call in sent} == {"control"}, command
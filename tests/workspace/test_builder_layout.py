@@ -0,0 +1,63 @@
+"""Tests for the split planner (:mod:`tmuxp.workspace.builder.layout`)."""
+
+from __future__ import annotations
+
+import pytest
+
+from tmuxp.workspace.builder.layout import parse_layout, plan_splits
+
+LAYOUTS = [
+    None,
+    "even-horizontal",
+    "even-vertical",
+    "main-horizontal",
+    "main-vertical",
+    "tiled",
+    "main-vertical-mirrored",
+    "9813,80x24,0,0[80x8,0,0{39x8,0,0,0,40x8,40,0,2},80x15,0,9,1]",
+]
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+@pytest.mark.parametrize("pane_count", [1, 2, 3, 5, 9, 16])
+def test_plan_splits_keeps_workspace_order(layout: str | None, pane_count: int) -> None:
+    """Every pane is created once, from an existing pane, in list order."""
+    steps = plan_splits(layout, pane_count)
+    assert len(steps) == pane_count - 1
+
+    order = [0]
+    for step in steps:
+        assert step.target in order
+        assert step.pane not in order
+        assert order[step.position] == step.target
+        # tmux lists a new pane right after the pane it split.
+        order.insert(step.position + 1, step.pane)
+        assert step.percent is None or 0 < step.percent < 100
+    assert order == list(range(pane_count))
+
+
+def test_plan_splits_custom_layout_sizes() -> None:
+    """A custom layout's splits reproduce its cell sizes."""
+    steps = plan_splits(
+        "9813,80x24,0,0[80x8,0,0{39x8,0,0,0,40x8,40,0,2},80x15,0,9,1]",
+        3,
+    )
+    assert [(s.pane, s.target, s.vertical, s.percent) for s in steps] == [
+        (2, 0, True, 62),  # 15 of 24 rows go to the bottom pane
+        (1, 0, False, 50),  # 40 of 80 columns go to the right pane
+    ]
+
+
+def test_plan_splits_mismatched_custom_layout() -> None:
+    """A custom layout for a different pane count is planned as tiled."""
+    layout = "9813,80x24,0,0[80x8,0,0{39x8,0,0,0,40x8,40,0,2},80x15,0,9,1]"
+    assert plan_splits(layout, 4) == plan_splits("tiled", 4)
+
+
+@pytest.mark.parametrize(
+    "layout",
+    ["", "tiled", "abcd,", "abcd,80x24", "abcd,80x24,0,0{80x24,0,0,1", "zz,1x1,0,0"],
+)
+def test_parse_layout_rejects(layout: str) -> None:
+    """Names and malformed strings are not custom layouts."""
+    assert parse_layout(layout) is None
@@ -0,0 +1,175 @@
+"""Tests for lazy windows, built when they are first selected."""
+
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+from libtmux.test.retry import retry_until
+
+from tests.fixtures import utils as test_utils
+from tmuxp.workspace import loader
+from tmuxp.workspace.builder.aio import AsyncioWorkspaceBuilder
+from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+from tmuxp.workspace.builder.control import ControlModeWorkspaceBuilder
+from tmuxp.workspace.builder.plan import compile_workspace
+
+if t.TYPE_CHECKING:
+    import pathlib
+
+    from libtmux.pane import Pane
+    from libtmux.server import Server
+    from libtmux.session import Session
+
+
+def _workspace(
+    session_name: str,
+    start_directory: pathlib.Path,
+    batch_commands: bool = False,
+    **lazy_window: t.Any,
+) -> dict[str, t.Any]:
+    """Return an expanded, trickled workspace with a lazy second window."""
+    workspace = test_utils.load_workspace_file(
+        "workspace/builder/lazy_window.yaml",
+        session_name=session_name,
+        workspace_builder_options={"batch_commands": batch_commands},
+    )
+    workspace["windows"][1].update(
+        start_directory=str(start_directory),
+        **lazy_window,
+    )
+    return loader.trickle(loader.expand(workspace))
+
+
+def _hooks(session: Session) -> str:
+    """Return the session's hooks as ``show-hooks`` prints them."""
+    return "\n".join(session.cmd("show-hooks").stdout)
+
+
+class LazyFixture(t.NamedTuple):
+    """Test fixture for a builder that defers lazy windows."""
+
+    test_id: str
+    builder_class: type[ClassicWorkspaceBuilder]
+    batch_commands: bool
+
+
+LAZY_FIXTURES: list[LazyFixture] = [
+    LazyFixture("unbatched", ClassicWorkspaceBuilder, batch_commands=False),
+    LazyFixture("batched", ClassicWorkspaceBuilder, batch_commands=True),
+    LazyFixture("asyncio", AsyncioWorkspaceBuilder, batch_commands=False),
+    LazyFixture("control", ControlModeWorkspaceBuilder, batch_commands=True),
+]
+
+
+@pytest.mark.parametrize(
+    list(LazyFixture._fields),
+    LAZY_FIXTURES,
+    ids=[f.test_id for f in LAZY_FIXTURES],
+)
+def test_lazy_window_builds_on_first_selection(
+    server: Server,
+    tmp_path: pathlib.Path,
+    test_id: str,
+    builder_class: type[ClassicWorkspaceBuilder],
+    batch_commands: bool,
+) -> None:
+    """A lazy window holds a placeholder until selected, then builds its panes."""
+    builder = builder_class(
+        session_config=_workspace(f"lazy-{test_id}", tmp_path, batch_commands),
+        server=server,
+    )
+    events: list[dict[str, t.Any]] = []
+    builder.on_build_event = events.append
+    builder.build()
+
+    session = builder.session
+    main, lazy = session.windows
+    assert len(main.panes) == 1
+    assert len(lazy.panes) == 1
+    assert not lazy.show_option("synchronize-panes")
+    assert f"session-window-changed[{str(lazy.window_id)[1:]}]" in _hooks(session)
+    assert {"event": "window_deferred", "window": "lazy"}.items() <= next(
+        e for e in events if e["event"] == "window_deferred"
+    ).items()
+
+    lazy.select()
+
+    def lazy_built() -> bool:
+        lazy.refresh()
+        return len(lazy.panes) == 3
+
+    assert retry_until(lazy_built, seconds=5, raises=False)
+    panes = lazy.panes
+    assert all(pane.pane_current_command != "cat" for pane in panes)
+    assert panes[1].pane_active == "1"
+    assert lazy.show_option("synchronize-panes") is True
+    assert str(lazy.window_id)[1:] not in _hooks(session)
+    for pane in panes:
+
+        def in_start_directory(pane: Pane = pane) -> bool:
+            pane.refresh()
+            return pane.pane_current_path == str(tmp_path)
+
+        assert retry_until(in_start_directory, seconds=5, raises=False)
+    assert retry_until(
+        lambda: "lazy-zero" in "\n".join(panes[0].capture_pane()),
+        seconds=5,
+        raises=False,
+    )
+
+    # Coming back to the window does not build it again.
+    main.select()
+    lazy.select()
+    assert len(lazy.panes) == 3
+
+
+class EagerFixture(t.NamedTuple):
+    """Test fixture for a lazy window that is built at once."""
+
+    test_id: str
+    window: int
+    workspace_focus: bool
+
+
+EAGER_FIXTURES: list[EagerFixture] = [
+    EagerFixture("first-window", window=0, workspace_focus=False),
+    EagerFixture("focused-window", window=1, workspace_focus=True),
+]
+
+
+@pytest.mark.parametrize(
+    list(EagerFixture._fields),
+    EAGER_FIXTURES,
+    ids=[f.test_id for f in EAGER_FIXTURES],
+)
+def test_lazy_ignored_on_current_window(
+    server: Server,
+    tmp_path: pathlib.Path,
+    test_id: str,
+    window: int,
+    workspace_focus: bool,
+) -> None:
+    """The window that is current after the build is never lazy."""
+    workspace = _workspace(f"eager-{test_id}", tmp_path)
+    for number, window_config in enumerate(workspace["windows"]):
+        window_config["lazy"] = number == window
+    if workspace_focus:
+        workspace["windows"][window]["focus"] = True
+    builder = ClassicWorkspaceBuilder(session_config=workspace, server=server)
+    builder.build()
+
+    built = builder.session.windows[window]
+    assert len(built.panes) == len(workspace["windows"][window]["panes"])
+    assert "session-window-changed" not in _hooks(builder.session)
+
+
+def test_plan_shows_lazy_window_hook(tmp_path: pathlib.Path) -> None:
+    """``tmuxp plan`` shows a lazy window as its placeholder and hook."""
+    plan = compile_workspace(_workspace("lazy-plan", tmp_path))
+    lazy = [c for c in plan.commands if "@2" in " ".join(c.args)]
+    assert [c.subcommand for c in lazy] == ["set-hook"]
+    window = next(c for c in plan.commands if c.subcommand == "new-window")
+    assert window.args[-1] == "cat"
+    assert plan.counts().get("split-window", 0) == 0
+    assert "split-window" in lazy[0].args[-1]
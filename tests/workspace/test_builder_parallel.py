@@ -0,0 +1,174 @@
+"""Tests for ``workspace_builder_options.parallel_windows``."""
+
+from __future__ import annotations
+
+import time
+import typing as t
+
+import pytest
+from libtmux.test.retry import retry_until
+
+from tests.fixtures import utils as test_utils
+from tmuxp import exc
+from tmuxp.workspace import loader
+from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+from tmuxp.workspace.builder.control import ControlModeWorkspaceBuilder
+
+if t.TYPE_CHECKING:
+    from libtmux.server import Server
+    from libtmux.session import Session
+    from libtmux.window import Window
+
+
+class RecordingPlugin:
+    """Record the plugin hooks a build calls, in order."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str | None]] = []
+
+    def before_workspace_builder(self, session: Session) -> None:
+        """Record the session hook."""
+        self.calls.append(("before_workspace_builder", None))
+
+    def on_window_create(self, window: Window) -> None:
+        """Record a window being created."""
+        self.calls.append(("on_window_create", window.window_name))
+
+    def after_window_finished(self, window: Window) -> None:
+        """Record a window being finished."""
+        self.calls.append(("after_window_finished", window.window_name))
+
+
+def _workspace(
+    session_name: str,
+    parallel_windows: int,
+    batch_commands: bool = False,
+    **pane_extra: t.Any,
+) -> dict[str, t.Any]:
+    """Return an expanded, trickled four-window workspace."""
+    workspace = test_utils.load_workspace_file(
+        "workspace/builder/editor_logs.yaml",
+        session_name=session_name,
+        workspace_builder_options={
+            "batch_commands": batch_commands,
+            "parallel_windows": parallel_windows,
+        },
+    )
+    editor, logs = workspace["windows"]
+    logs["window_index"] = 5
+    workspace["windows"] += [
+        {"window_name": "shell", "panes": [{"shell_command": ["true"]}] * 3},
+        {"window_name": "tests", "panes": [{"shell_command": ["true"]}]},
+    ]
+    panes = [editor["panes"][0]] + [
+        pane for window in workspace["windows"][1:] for pane in window["panes"]
+    ]
+    for pane in panes:
+        pane.update(pane_extra)
+    return loader.trickle(loader.expand(workspace))
+
+
+class ParallelFixture(t.NamedTuple):
+    """A builder and build mode to compare against a sequential build."""
+
+    test_id: str
+    builder_class: type[ClassicWorkspaceBuilder]
+    batch_commands: bool
+
+
+PARALLEL_FIXTURES: list[ParallelFixture] = [
+    ParallelFixture("classic", ClassicWorkspaceBuilder, batch_commands=False),
+    ParallelFixture("batched", ClassicWorkspaceBuilder, batch_commands=True),
+    ParallelFixture("control", ControlModeWorkspaceBuilder, batch_commands=True),
+]
+
+
+@pytest.mark.parametrize(
+    list(ParallelFixture._fields),
+    PARALLEL_FIXTURES,
+    ids=[f.test_id for f in PARALLEL_FIXTURES],
+)
+def test_parallel_windows_match_sequential(
+    server: Server,
+    test_id: str,
+    builder_class: type[ClassicWorkspaceBuilder],
+    batch_commands: bool,
+) -> None:
+    """Parallel windows build, report and focus like a sequential build."""
+    results = {}
+    for parallel_windows in (1, 4):
+        events: list[dict[str, t.Any]] = []
+        progress: list[str] = []
+        plugin = RecordingPlugin()
+        builder = builder_class(
+            session_config=_workspace(
+                f"{test_id}-parallel-{parallel_windows}",
+                parallel_windows,
+                batch_commands,
+            ),
+            server=server,
+            plugins=[plugin],
+            on_build_event=events.append,
+            on_progress=progress.append,
+        )
+        builder.build()
+        session = builder.session
+        results[parallel_windows] = (
+            [
+                {k: v for k, v in e.items() if k not in {"time", "duration"}}
+                for e in events
+                if e["event"] != "session_created"
+            ],
+            progress[1:],
+            sorted(plugin.calls, key=lambda call: call[0]),
+            [(w.window_name, w.window_index) for w in session.windows],
+            session.active_window.window_name,
+        )
+
+        editor = session.windows[0]
+        assert len(editor.panes) == 2
+        assert editor.show_option("main-pane-width") == 40
+        assert editor.show_option("synchronize-panes") is True
+        assert editor.active_pane is not None
+        assert editor.active_pane.pane_id == editor.panes[1].pane_id
+        assert [len(w.panes) for w in session.windows] == [2, 3, 1, 1]
+
+        second = editor.panes[1]
+
+        def command_sent(pane: t.Any = second) -> bool:
+            return any("echo second" in line for line in pane.capture_pane())
+
+        assert retry_until(command_sent, seconds=5)
+
+    # Every window is created before the first one is filled, so the two
+    # hooks interleave differently; each hook still runs in window order.
+    assert results[4] == results[1]
+    assert results[4][3] == [
+        ("editor", "1"),
+        ("shell", "2"),
+        ("tests", "3"),
+        ("logs", "5"),
+    ]
+    assert results[4][4] == "logs"
+
+
+def test_parallel_windows_overlap_sleeps(server: Server) -> None:
+    """Each window's ``sleep_after`` runs alongside the other windows'."""
+    config = _workspace("parallel-sleeps", 4, sleep_after=1.0)
+
+    started = time.monotonic()
+    ClassicWorkspaceBuilder(session_config=config, server=server).build()
+    elapsed = time.monotonic() - started
+
+    # Sequentially the four windows' sleeps alone take 6 seconds.
+    assert elapsed < 4.0
+
+
+def test_parallel_windows_raise_window_errors(server: Server) -> None:
+    """A failing window stops the build with that window's error."""
+    config = _workspace("parallel-errors", 2)
+    config["windows"][2]["options_after"] = {"no-such-option": 1}
+
+    builder = ClassicWorkspaceBuilder(session_config=config, server=server)
+    with pytest.raises(exc.TmuxCommandsFailedError, match="no-such-option"):
+        builder.build()
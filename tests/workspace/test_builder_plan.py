@@ -0,0 +1,90 @@
+"""Tests for compiling a workspace into a tmux command plan."""
+
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+from libtmux.common import tmux_cmd
+
+from tests.fixtures import utils as test_utils
+from tmuxp.workspace import loader
+from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+from tmuxp.workspace.builder.plan import compile_workspace
+
+if t.TYPE_CHECKING:
+    from libtmux.server import Server
+
+STRUCTURAL_COMMANDS = (
+    "respawn-window",
+    "rename-window",
+    "move-window",
+    "new-window",
+    "kill-window",
+    "split-window",
+    "select-layout",
+    "send-keys",
+)
+
+
+def _workspace(session_name: str, batch_commands: bool) -> dict[str, t.Any]:
+    """Return an expanded, trickled workspace with layouts and pauses."""
+    return loader.trickle(
+        loader.expand(
+            test_utils.load_workspace_file(
+                "workspace/builder/layouts_and_pauses.yaml",
+                session_name=session_name,
+                workspace_builder_options={"batch_commands": batch_commands},
+            ),
+        ),
+    )
+
+
+@pytest.mark.parametrize("batch_commands", [False, True], ids=["unbatched", "batched"])
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"default-shell": "/bin/sh"}],
+    ids=["respawned", "default-shell"],
+)
+def test_plan_matches_build(
+    server: Server,
+    monkeypatch: pytest.MonkeyPatch,
+    batch_commands: bool,
+    options: dict[str, t.Any],
+) -> None:
+    """A build runs the structural commands its plan lists."""
+    config = _workspace(f"plan-{batch_commands}-{len(options)}", batch_commands)
+    config["options"].update(options)
+    plan = compile_workspace(config)
+
+    sent: list[tuple[str, ...]] = []
+    original = tmux_cmd.__init__
+
+    def recording_init(self: tmux_cmd, *args: t.Any, **kwargs: t.Any) -> None:
+        sent.append(tuple(str(a) for a in args))
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(tmux_cmd, "__init__", recording_init)
+    ClassicWorkspaceBuilder(session_config=config, server=server).build()
+
+    planned = plan.counts()
+    for subcommand in STRUCTURAL_COMMANDS:
+        ran = sum(argv.count(subcommand) for argv in sent)
+        assert ran == planned.get(subcommand, 0), subcommand
+
+
+def test_plan_estimate() -> None:
+    """Batching folds each window's steps into a few processes."""
+    plan = compile_workspace(_workspace("plan-estimate", batch_commands=True))
+    estimate = plan.estimate()
+
+    assert estimate.commands == len(plan.commands)
+    assert estimate.batched_processes < estimate.processes <= estimate.commands
+    assert estimate.pause_seconds == pytest.approx(0.1)
+
+    # The paused command goes out on its own, after the rest of its window.
+    paused = [command for command in plan.commands if command.delay]
+    assert [str(command) for command in paused] == [
+        "send-keys -t %1.1 ' echo four' Enter",
+    ]
+    assert sum(command.chain == paused[0].chain for command in plan.commands) == 1
@@ -0,0 +1,190 @@
+"""Tests for ``workspace_builder_options.shell_pool``."""
+
+from __future__ import annotations
+
+import pathlib
+import typing as t
+
+import pytest
+from libtmux.test.retry import retry_until
+
+from tests.fixtures import utils as test_utils
+from tmuxp.workspace import loader
+from tmuxp.workspace.builder.accounting import record_tmux_calls
+from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+from tmuxp.workspace.builder.control import ControlModeWorkspaceBuilder
+from tmuxp.workspace.builder.pool import POOL_SESSION, ShellPool
+
+if t.TYPE_CHECKING:
+    from libtmux.pane import Pane
+    from libtmux.server import Server
+
+
+def _workspace(
+    session_name: str,
+    start_directory: pathlib.Path,
+    **extra: t.Any,
+) -> dict[str, t.Any]:
+    """Return an expanded, trickled workspace of three panes in two windows."""
+    return loader.trickle(
+        loader.expand(
+            test_utils.load_workspace_file(
+                "workspace/builder/shell_pool.yaml",
+                session_name=session_name,
+                start_directory=str(start_directory),
+                **extra,
+            ),
+        ),
+    )
+
+
+def _warm_pool(server: Server) -> set[str]:
+    """Wait for the pool's shells to draw their prompts; return their pane IDs."""
+    pool = ShellPool(server, size=3)
+    assert retry_until(lambda: pool.load() == 3, seconds=10, raises=False)
+    return {pool.take() or "" for _ in range(3)}
+
+
+class PoolFixture(t.NamedTuple):
+    """Test fixture for a build that takes its panes from the shell pool."""
+
+    test_id: str
+    builder_class: type[ClassicWorkspaceBuilder]
+
+
+POOL_FIXTURES: list[PoolFixture] = [
+    PoolFixture(test_id="batched", builder_class=ClassicWorkspaceBuilder),
+    PoolFixture(test_id="control", builder_class=ControlModeWorkspaceBuilder),
+]
+
+
+@pytest.mark.parametrize(
+    list(PoolFixture._fields),
+    POOL_FIXTURES,
+    ids=[f.test_id for f in POOL_FIXTURES],
+)
+def test_build_takes_panes_from_shell_pool(
+    server: Server,
+    tmp_path: pathlib.Path,
+    test_id: str,
+    builder_class: type[ClassicWorkspaceBuilder],
+) -> None:
+    """A second build moves the shells the first one left in the pool."""
+    first = builder_class(
+        session_config=_workspace("pool-first", tmp_path),
+        server=server,
+    )
+    first.build()
+    pool_session = server.sessions.get(session_name=POOL_SESSION)
+    assert pool_session is not None
+    assert len(pool_session.panes) == 3
+    pooled = _warm_pool(server)
+
+    start_directory = tmp_path / "project"
+    start_directory.mkdir()
+    builder = builder_class(
+        session_config=_workspace("pool-second", start_directory),
+        server=server,
+    )
+    with record_tmux_calls() as calls:
+        builder.build()
+
+    session = builder.session
+    assert session is not None
+    panes = session.panes
+    assert {pane.pane_id for pane in panes} == pooled
+    assert calls.by_command()["split-window"] == 0
+    assert calls.by_command()["respawn-window"] == 0
+    # The only new windows are the pool's own, refilling it.
+    assert all(
+        target == f"={POOL_SESSION}:"
+        for call in calls.matching("new-window")
+        for target in call.targets
+    )
+    assert [w.window_name for w in session.windows] == ["editor", "logs"]
+
+    for pane in panes:
+
+        def in_start_directory(pane: Pane = pane) -> bool:
+            pane.refresh()
+            return pane.pane_current_path == str(start_directory)
+
+        assert retry_until(in_start_directory, seconds=5, raises=False)
+    editor, logs = session.windows
+    assert logs.window_width == editor.window_width
+    assert logs.window_height == editor.window_height
+    assert logs.show_option("window-size") is None
+
+    # The build refilled the pool behind itself.
+    pool_session = server.sessions.get(session_name=POOL_SESSION)
+    assert pool_session is not None
+    assert len(pool_session.panes) == 3
+
+
+class UnpooledPaneFixture(t.NamedTuple):
+    """Test fixture for a workspace whose panes need shells of their own."""
+
+    test_id: str
+    extra: dict[str, t.Any]
+
+
+UNPOOLED_PANE_FIXTURES: list[UnpooledPaneFixture] = [
+    UnpooledPaneFixture(
+        test_id="session-environment",
+        extra={"environment": {"POOL_TEST": "1"}},
+    ),
+    UnpooledPaneFixture(
+        test_id="default-shell",
+        extra={"options": {"default-shell": "/bin/sh"}},
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(UnpooledPaneFixture._fields),
+    UNPOOLED_PANE_FIXTURES,
+    ids=[f.test_id for f in UNPOOLED_PANE_FIXTURES],
+)
+def test_shell_pool_skipped_for_workspace_shells(
+    server: Server,
+    tmp_path: pathlib.Path,
+    test_id: str,
+    extra: dict[str, t.Any],
+) -> None:
+    """A workspace that changes how its shells start does not use the pool."""
+    ClassicWorkspaceBuilder(
+        session_config=_workspace("pool-fill", tmp_path),
+        server=server,
+    ).build()
+    pooled = _warm_pool(server)
+
+    builder = ClassicWorkspaceBuilder(
+        session_config=_workspace("pool-skipped", tmp_path, **extra),
+        server=server,
+    )
+    builder.build()
+
+    assert not {pane.pane_id for pane in builder.session.panes} & pooled
+
+
+def test_shell_pool_skips_panes_with_own_shell(
+    server: Server,
+    tmp_path: pathlib.Path,
+) -> None:
+    """Panes with a ``shell`` or ``environment`` start their own shells."""
+    ClassicWorkspaceBuilder(
+        session_config=_workspace("pool-fill", tmp_path),
+        server=server,
+    ).build()
+    pooled = _warm_pool(server)
+
+    workspace = _workspace("pool-mixed", tmp_path)
+    editor_panes = workspace["windows"][0]["panes"]
+    editor_panes[0]["shell"] = "sh"
+    editor_panes[1]["environment"] = {"POOL_TEST": "1"}
+    builder = ClassicWorkspaceBuilder(session_config=workspace, server=server)
+    builder.build()
+
+    editor, logs = builder.session.windows
+    assert not {pane.pane_id for pane in editor.panes} & pooled
+    assert {pane.pane_id for pane in logs.panes} <= pooled
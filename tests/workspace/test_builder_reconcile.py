@@ -0,0 +1,210 @@
+"""Tests for reconciling a running session with its workspace."""
+
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+from libtmux.test.retry import retry_until
+
+from tests.fixtures import utils as test_utils
+from tmuxp.workspace import loader
+from tmuxp.workspace.builder.classic import ClassicWorkspaceBuilder
+from tmuxp.workspace.builder.control import ControlModeWorkspaceBuilder
+from tmuxp.workspace.builder.reconcile import LiveWindow, plan_reconcile
+
+if t.TYPE_CHECKING:
+    from libtmux.pane import Pane
+    from libtmux.server import Server
+
+
+class PlanFixture(t.NamedTuple):
+    """A workspace, the live windows, and the steps expected to reconcile them."""
+
+    test_id: str
+    window_configs: list[dict[str, t.Any]]
+    live_windows: list[LiveWindow]
+    expected: list[tuple[int, int | None, str, int]]
+
+
+PLAN_FIXTURES: list[PlanFixture] = [
+    PlanFixture(
+        "pinned-index-renamed",
+        [{"window_name": "logs", "window_index": 5, "panes": [{}]}],
+        [LiveWindow("other", 5, 1)],
+        [(0, None, "", 1)],
+    ),
+    PlanFixture(
+        "pinned-index-free",
+        [{"window_name": "logs", "window_index": 5, "panes": [{}]}],
+        [LiveWindow("editor", 0, 1)],
+        [(0, None, "5", 1)],
+    ),
+    PlanFixture(
+        "duplicate-names-match-in-order",
+        [
+            {"window_name": "sh", "panes": [{}]},
+            {"window_name": "sh", "panes": [{}, {}]},
+        ],
+        [LiveWindow("sh", 0, 1), LiveWindow("sh", 1, 1)],
+        [(1, 1, "", 1)],
+    ),
+    PlanFixture(
+        "unnamed-by-position",
+        [{"panes": [{}]}, {"panes": [{}, {}]}],
+        [LiveWindow("zsh", 0, 1), LiveWindow("vim", 1, 2)],
+        [],
+    ),
+    PlanFixture(
+        "extra-live-windows-and-panes-are-kept",
+        [{"window_name": "editor", "panes": [{}]}],
+        [LiveWindow("editor", 0, 3), LiveWindow("scratch", 1, 1)],
+        [],
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(PlanFixture._fields),
+    PLAN_FIXTURES,
+    ids=[f.test_id for f in PLAN_FIXTURES],
+)
+def test_plan_reconcile(
+    test_id: str,
+    window_configs: list[dict[str, t.Any]],
+    live_windows: list[LiveWindow],
+    expected: list[tuple[int, int | None, str, int]],
+) -> None:
+    """Windows match by index, then name, then position."""
+    assert plan_reconcile(window_configs, live_windows) == expected
+
+
+def _workspace(session_name: str, batch_commands: bool) -> dict[str, t.Any]:
+    """Return an expanded, trickled three-window workspace."""
+    return loader.trickle(
+        loader.expand(
+            test_utils.load_workspace_file(
+                "workspace/builder/editor_server_logs.yaml",
+                session_name=session_name,
+                workspace_builder_options={"batch_commands": batch_commands},
+            ),
+        ),
+    )
+
+
+class ReconcileFixture(t.NamedTuple):
+    """A builder and build mode to reconcile with."""
+
+    test_id: str
+    builder_class: type[ClassicWorkspaceBuilder]
+    batch_commands: bool
+
+
+RECONCILE_FIXTURES: list[ReconcileFixture] = [
+    ReconcileFixture("classic", ClassicWorkspaceBuilder, batch_commands=False),
+    ReconcileFixture("batched", ClassicWorkspaceBuilder, batch_commands=True),
+    ReconcileFixture("control", ControlModeWorkspaceBuilder, batch_commands=True),
+]
+
+
+@pytest.mark.parametrize(
+    list(ReconcileFixture._fields),
+    RECONCILE_FIXTURES,
+    ids=[f.test_id for f in RECONCILE_FIXTURES],
+)
+def test_reconcile_creates_only_what_is_missing(
+    server: Server,
+    test_id: str,
+    builder_class: type[ClassicWorkspaceBuilder],
+    batch_commands: bool,
+) -> None:
+    """A lost window and a lost pane come back; everything else is untouched."""
+    config = _workspace(f"reconcile-{test_id}", batch_commands)
+    builder_class(session_config=config, server=server).build()
+
+    session = server.sessions.get(session_name=config["session_name"])
+    assert session is not None
+    editor = session.windows.get(window_name="editor")
+    assert editor is not None
+    server_window = session.windows.get(window_name="server")
+    assert server_window is not None
+    server_index = server_window.window_index
+    server_window.kill()
+    editor.panes[-1].kill()
+
+    kept = {pane.pane_id for pane in session.panes}
+    marker = "still-running"
+    for pane in session.panes:
+        pane.send_keys(f"echo {marker}")
+
+    builder = builder_class(session_config=config, server=server)
+    steps = builder.reconcile()
+
+    names = [config["windows"][step.position]["window_name"] for step in steps]
+    assert names == ["editor", "server"]
+    assert [step.missing for step in steps] == [False, True]
+    assert [(w.window_name, w.window_index, len(w.panes)) for w in session.windows] == [
+        ("editor", editor.window_index, 3),
+        ("server", server_index, 1),
+        ("logs", session.windows[2].window_index, 1),
+    ]
+
+    # The panes that survived were not respawned or sent anything again.
+    assert kept <= {pane.pane_id for pane in session.panes}
+    for pane in session.panes:
+        if pane.pane_id not in kept:
+            continue
+        text = "\n".join(pane.capture_pane())
+        assert text.count("echo editor") + text.count("echo logs") <= 1
+
+        def marker_shown(pane: Pane = pane) -> bool:
+            return any(marker in line for line in pane.capture_pane())
+
+        assert retry_until(marker_shown, seconds=5)
+
+    added = [pane for pane in session.panes if pane.pane_id not in kept]
+    assert len(added) == 2
+
+    def added_commands_sent() -> bool:
+        text = "\n".join(line for pane in added for line in pane.capture_pane())
+        return "echo editor-three" in text and "echo server" in text
+
+    assert retry_until(added_commands_sent, seconds=5)
+
+    # Nothing left to do the second time round.
+    assert builder_class(session_config=config, server=server).reconcile() == []
+
+
+def test_reconcile_uses_session_base_index(server: Server) -> None:
+    """A window lost from a session with its own ``base-index`` returns there."""
+    config = loader.trickle(
+        loader.expand(
+            {
+                "session_name": "reconcile-base-index",
+                # The session's own base-index, not the global one, applies.
+                "global_options": {"base-index": 0},
+                "options": {"base-index": 1},
+                "workspace_builder_options": {"pane_readiness": "never"},
+                "windows": [
+                    {"window_name": name, "panes": [{"shell_command": []}]}
+                    for name in ("a", "b", "c")
+                ],
+            },
+        ),
+    )
+    ClassicWorkspaceBuilder(session_config=config, server=server).build()
+    session = server.sessions.get(session_name="reconcile-base-index")
+    assert session is not None
+    assert [w.window_index for w in session.windows] == ["1", "2", "3"]
+    first = session.windows.get(window_name="a")
+    assert first is not None
+    first.kill()
+
+    steps = ClassicWorkspaceBuilder(session_config=config, server=server).reconcile()
+
+    assert [(step.position, step.window_index) for step in steps] == [(0, "1")]
+    assert [(w.window_name, w.window_index) for w in session.windows] == [
+        ("a", "1"),
+        ("b", "2"),
+        ("c", "3"),
+    ]
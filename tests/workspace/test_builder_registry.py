@@ -95,6 +95,14 @@ def test_resolve_rejects_constructor_without_plugins() -> None:
         )
 
 
+def test_resolve_rejects_async_flag_without_coroutine() -> None:
+    """A builder declaring ``supports_async`` needs an ``async def abuild``."""
+    with pytest.raises(exc.InvalidWorkspaceBuilder, match="abuild"):
+        registry.resolve_builder_class(
+            {"workspace_builder": f"{INVALID}:SyncAbuildBuilder"},
+        )
+
+
 def test_available_builders_includes_classic() -> None:
     """The classic entry point is discoverable."""
     assert "classic" in registry.available_builders()
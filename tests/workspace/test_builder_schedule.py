@@ -0,0 +1,135 @@
+"""Tests for deferred pane pauses (:mod:`tmuxp.workspace.builder.schedule`)."""
+
+from __future__ import annotations
+
+import threading
+import time
+import typing as t
+
+import pytest
+from libtmux.test.retry import retry_until
+
+from tests.fixtures import utils as test_utils
+from tmuxp.workspace import loader
+from tmuxp.workspace.builder import WorkspaceBuilder
+from tmuxp.workspace.builder.schedule import PauseScheduler, run_steps
+
+if t.TYPE_CHECKING:
+    from libtmux.pane import Pane
+    from libtmux.server import Server
+
+
+def test_scheduler_keeps_step_order_per_chain() -> None:
+    """Chains interleave by their pauses; each keeps its own order."""
+    scheduler = PauseScheduler()
+    calls: list[str] = []
+    try:
+        run_steps(
+            [lambda: calls.append("a1"), 0.2, lambda: calls.append("a2")],
+            scheduler,
+            key="a",
+        )
+        run_steps(
+            [lambda: calls.append("b1"), 0.05, lambda: calls.append("b2")],
+            scheduler,
+            key="b",
+        )
+        assert calls == ["a1", "b1"]
+        scheduler.wait("b")
+        assert calls == ["a1", "b1", "b2"]
+        assert scheduler.pending("a")
+        scheduler.wait()
+        assert calls == ["a1", "b1", "b2", "a2"]
+    finally:
+        scheduler.close()
+
+
+def test_scheduler_reraises_step_errors() -> None:
+    """An exception from a deferred step surfaces on ``wait``."""
+    scheduler = PauseScheduler()
+
+    def fail() -> None:
+        msg = "pane went away"
+        raise RuntimeError(msg)
+
+    try:
+        run_steps([0.0, fail], scheduler, key="@1")
+        with pytest.raises(RuntimeError, match="pane went away"):
+            scheduler.wait("@1")
+    finally:
+        scheduler.close()
+
+
+def test_scheduler_close_drops_pending() -> None:
+    """Closing drops callbacks that have not run yet."""
+    scheduler = PauseScheduler()
+    ran = threading.Event()
+    scheduler.call_later(10, ran.set, key="@1")
+    scheduler.close()
+    assert not scheduler.pending()
+    assert not ran.is_set()
+
+
+def _workspace(session_name: str, batch_commands: bool) -> dict[str, t.Any]:
+    """Return a workspace whose first window waits on a slow pane."""
+    return loader.trickle(
+        loader.expand(
+            test_utils.load_workspace_file(
+                "workspace/builder/pane_pauses.yaml",
+                session_name=session_name,
+                workspace_builder_options={"batch_commands": batch_commands},
+            ),
+        ),
+    )
+
+
+@pytest.mark.parametrize("batch_commands", [False, True], ids=["unbatched", "batched"])
+def test_pane_pauses_do_not_block_build(
+    server: Server,
+    batch_commands: bool,
+) -> None:
+    """Pauses in different windows overlap, and each pane keeps its order."""
+    events: list[dict[str, t.Any]] = []
+    builder = WorkspaceBuilder(
+        session_config=_workspace(f"pauses-{batch_commands}", batch_commands),
+        server=server,
+        on_build_event=events.append,
+    )
+
+    started = time.monotonic()
+    builder.build()
+    elapsed = time.monotonic() - started
+
+    # Inline sleeps would take 3 seconds in all.
+    assert elapsed < 2.6
+
+    assert [e["event"] for e in events] == [
+        "session_created",
+        "window_started",
+        "pane_creating",
+        "pane_creating",
+        "panes_created",
+        "commands_sent",
+        "window_done",
+        "window_started",
+        "pane_creating",
+        "panes_created",
+        "commands_sent",
+        "window_done",
+        "workspace_built",
+    ]
+
+    db = builder.session.windows[0]
+    slow, other = db.panes
+
+    def typed_in_order(pane: Pane = slow) -> bool:
+        text = "\n".join(pane.capture_pane())
+        positions = [text.find(f"echo {word}") for word in ("first", "waited", "last")]
+        return -1 not in positions and positions == sorted(positions)
+
+    assert retry_until(typed_in_order, seconds=5)
+
+    # options_after waited for the slow pane: with synchronize-panes on any
+    # earlier, its delayed commands would have been typed into both panes.
+    assert db.show_option("synchronize-panes") is True
+    assert not any("echo waited" in line for line in other.capture_pane())
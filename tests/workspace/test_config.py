@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
+import copy
 import logging
+import os
 import pathlib
+import time
 import typing as t
 
 import pytest
 
-from tests.constants import EXAMPLE_PATH
+from tests.constants import EXAMPLE_PATH, FIXTURE_PATH
 from tmuxp import exc
 from tmuxp._internal.config_reader import ConfigReader
 from tmuxp.workspace import loader, validation
@@ -364,6 +367,116 @@ def test_trickle_logs_debug(
     assert getattr(records[0], "tmux_session", None) == "test_trickle"
 
 
+WORKSPACE_FILES = sorted(
+    [
+        *EXAMPLE_PATH.glob("*.yaml"),
+        *EXAMPLE_PATH.glob("*.json"),
+        *(FIXTURE_PATH / "workspace").rglob("*.yaml"),
+        *(FIXTURE_PATH / "workspace").rglob("*.json"),
+    ],
+)
+
+
+@pytest.mark.parametrize(
+    "workspace_file",
+    WORKSPACE_FILES,
+    ids=[str(path.relative_to(EXAMPLE_PATH.parent)) for path in WORKSPACE_FILES],
+)
+def test_normalize_matches_expand_and_trickle(workspace_file: pathlib.Path) -> None:
+    """normalize() gives what expand() then trickle() give, key order included."""
+    workspace = load_workspace(workspace_file)
+    if not isinstance(workspace, dict) or "windows" not in workspace:
+        pytest.skip("not a workspace with windows")
+    cwd = str(workspace_file.parent)
+    try:
+        expected = loader.trickle(loader.expand(copy.deepcopy(workspace), cwd=cwd))
+    except TypeError:
+        # Templates whose placeholders have not been filled in fail the same way.
+        with pytest.raises(TypeError):
+            loader.normalize(copy.deepcopy(workspace), cwd=cwd)
+        return
+    normalized = loader.normalize(copy.deepcopy(workspace), cwd=cwd)
+
+    assert normalized == expected
+    assert [list(window) for window in normalized["windows"]] == [
+        list(window) for window in expected["windows"]
+    ]
+
+
+def _large_workspace() -> dict[str, t.Any]:
+    """Return a workspace of 1,000 windows of four panes each."""
+    return {
+        "session_name": "large",
+        "start_directory": "./",
+        "shell_command_before": ["source $HOME/.venv/bin/activate"],
+        "windows": [
+            {
+                "window_name": f"window-{number}",
+                "start_directory": "./src",
+                "shell_command_before": "cd ~/src",
+                "panes": [
+                    {"shell_command": [f"echo $HOME {pane}", "ls ~"]}
+                    for pane in range(4)
+                ],
+            }
+            for number in range(1000)
+        ],
+    }
+
+
+def test_normalize_large_workspace_matches(tmp_path: pathlib.Path) -> None:
+    """normalize() gives what expand() then trickle() give for 1,000 windows."""
+    expected = loader.trickle(loader.expand(_large_workspace(), cwd=tmp_path))
+    assert loader.normalize(_large_workspace(), cwd=tmp_path) == expected
+
+
+benchmark = pytest.mark.skipif(
+    os.getenv("TMUXP_BENCHMARK") != "1",
+    reason="wall-clock benchmark; set TMUXP_BENCHMARK=1 to run",
+)
+
+
+@benchmark
+def test_normalize_faster_than_expand_and_trickle(tmp_path: pathlib.Path) -> None:
+    """normalize() beats expand() then trickle() on a 1,000-window workspace."""
+
+    def best_time(normalizer: t.Callable[[dict[str, t.Any]], t.Any]) -> float:
+        times = []
+        for _ in range(5):
+            workspace = _large_workspace()
+            start = time.perf_counter()
+            normalizer(workspace)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    separate = best_time(
+        lambda workspace: loader.trickle(loader.expand(workspace, cwd=tmp_path)),
+    )
+    fused = best_time(lambda workspace: loader.normalize(workspace, cwd=tmp_path))
+    assert fused < separate
+
+
+def test_normalize_shares_inherited_commands() -> None:
+    """Commands inherited by several panes are the same objects in each."""
+    workspace = loader.normalize(_large_workspace())
+    first, second = workspace["windows"][0]["panes"][:2]
+    assert first["shell_command"][0] is second["shell_command"][0]
+    assert first["shell_command"][1] is second["shell_command"][1]
+
+
+def test_normalize_logs_debug(
+    tmp_path: pathlib.Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """normalize() logs DEBUG with tmux_session extra."""
+    workspace = {"session_name": "test_normalize", "windows": [{"window_name": "a"}]}
+    with caplog.at_level(logging.DEBUG, logger="tmuxp.workspace.loader"):
+        loader.normalize(workspace, cwd=str(tmp_path))
+    records = [r for r in caplog.records if r.msg == "normalizing workspace config"]
+    assert len(records) == 1
+    assert getattr(records[0], "tmux_session", None) == "test_normalize"
+
+
 def test_validate_schema_logs_debug(
     caplog: pytest.LogCaptureFixture,
 ) -> None:
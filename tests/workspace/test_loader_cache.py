@@ -0,0 +1,231 @@
+"""Tests for the cache of expanded workspaces."""
+
+from __future__ import annotations
+
+import pathlib
+import typing as t
+
+import pytest
+
+from tests.constants import EXAMPLE_PATH
+from tmuxp._internal.config_reader import ConfigReader
+from tmuxp.workspace import loader
+
+WORKSPACE = """\
+session_name: ${LOADER_CACHE_NAME}
+start_directory: ./project
+windows:
+- window_name: home
+  start_directory: ~/notes
+  panes:
+  - echo $LOADER_CACHE_PANE
+- window_name: link
+  start_directory: ./link
+  panes:
+  - null
+"""
+
+
+@pytest.fixture
+def cache_dir(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Point the workspace cache at a temporary directory and turn it on."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    monkeypatch.delenv("TMUXP_CONFIG_CACHE", raising=False)
+    monkeypatch.setenv("LOADER_CACHE_NAME", "cached")
+    monkeypatch.setenv("LOADER_CACHE_PANE", "pane")
+    return tmp_path / "xdg" / "tmuxp" / "workspace"
+
+
+def _workspace(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Write :data:`WORKSPACE`, with a project directory holding a symlink."""
+    project = tmp_path / "project"
+    (project / "one").mkdir(parents=True)
+    (project / "two").mkdir()
+    (project / "link").symlink_to(project / "one")
+    path = tmp_path / "workspace.yaml"
+    path.write_text(WORKSPACE, encoding="utf-8")
+    return path
+
+
+def _uncached(path: pathlib.Path, cwd: str) -> dict[str, t.Any]:
+    """Return ``path`` expanded and trickled without any cache."""
+    return loader.trickle(loader.expand(ConfigReader._from_file(path), cwd=cwd))
+
+
+def test_expand_file_reuses_expanded_workspace(
+    cache_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A second load of an unchanged workspace skips expanding it."""
+    path = _workspace(tmp_path)
+    first = loader.expand_file(path)
+    assert first == _uncached(path, str(tmp_path))
+    assert len(list(cache_dir.iterdir())) == 1
+
+    def no_expand(*args: t.Any, **kwargs: t.Any) -> t.NoReturn:
+        raise AssertionError
+
+    monkeypatch.setattr(loader, "expand", no_expand)
+    monkeypatch.setattr(loader, "trickle", no_expand)
+    # A variable the workspace does not use changes nothing.
+    monkeypatch.setenv("LOADER_CACHE_UNUSED", "1")
+    second = loader.expand_file(path)
+    assert second == first
+    assert second["windows"][1]["start_directory"] == str(
+        tmp_path / "project" / "one",
+    )
+
+    # Callers may change what they are given without touching the cache.
+    second["session_name"] = "changed"
+    assert loader.expand_file(path)["session_name"] == "cached"
+
+
+class MissFixture(t.NamedTuple):
+    """Test fixture for a change that makes the expanded workspace stale."""
+
+    test_id: str
+    change: t.Callable[[pathlib.Path, pytest.MonkeyPatch], None]
+
+
+def _change_session_variable(path: pathlib.Path, mp: pytest.MonkeyPatch) -> None:
+    """Change a variable the session name reads."""
+    mp.setenv("LOADER_CACHE_NAME", "other")
+
+
+def _change_pane_variable(path: pathlib.Path, mp: pytest.MonkeyPatch) -> None:
+    """Change a variable a pane's command reads."""
+    mp.setenv("LOADER_CACHE_PANE", "other")
+
+
+def _unset_pane_variable(path: pathlib.Path, mp: pytest.MonkeyPatch) -> None:
+    """Remove a variable a pane's command reads."""
+    mp.delenv("LOADER_CACHE_PANE")
+
+
+def _change_home(path: pathlib.Path, mp: pytest.MonkeyPatch) -> None:
+    """Move the home directory a window's ``~`` reads."""
+    mp.setenv("HOME", str(path.parent / "home"))
+
+
+def _retarget_symlink(path: pathlib.Path, mp: pytest.MonkeyPatch) -> None:
+    """Point a resolved start directory somewhere else."""
+    link = path.parent / "project" / "link"
+    link.unlink()
+    link.symlink_to(path.parent / "project" / "two")
+
+
+def _change_content(path: pathlib.Path, mp: pytest.MonkeyPatch) -> None:
+    """Edit the workspace file."""
+    path.write_text(WORKSPACE.replace("home", "notes"), encoding="utf-8")
+
+
+MISS_FIXTURES: list[MissFixture] = [
+    MissFixture("session-variable", _change_session_variable),
+    MissFixture("pane-variable", _change_pane_variable),
+    MissFixture("unset-variable", _unset_pane_variable),
+    MissFixture("home", _change_home),
+    MissFixture("symlink", _retarget_symlink),
+    MissFixture("content", _change_content),
+]
+
+
+@pytest.mark.parametrize(
+    list(MissFixture._fields),
+    MISS_FIXTURES,
+    ids=[f.test_id for f in MISS_FIXTURES],
+)
+def test_expand_file_expands_again_after_change(
+    cache_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    test_id: str,
+    change: t.Callable[[pathlib.Path, pytest.MonkeyPatch], None],
+) -> None:
+    """A change to the file or anything its expansion read is not missed."""
+    path = _workspace(tmp_path)
+    first = loader.expand_file(path)
+    change(path, monkeypatch)
+
+    second = loader.expand_file(path)
+    assert second == _uncached(path, str(tmp_path))
+    assert second != first
+
+
+def test_expand_file_edited_while_loading(
+    cache_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An edit after the file is read is not cached under the old content."""
+    path = _workspace(tmp_path)
+    original = path.read_text(encoding="utf-8")
+    edited = original.replace("window_name: home", "window_name: edited")
+    read_bytes = pathlib.Path.read_bytes
+
+    def read_then_edit(self: pathlib.Path) -> bytes:
+        content = read_bytes(self)
+        if self == path:
+            self.write_text(edited, encoding="utf-8")
+        return content
+
+    with monkeypatch.context() as mp:
+        mp.setattr(pathlib.Path, "read_bytes", read_then_edit)
+        first = loader.expand_file(path)
+
+    assert first["windows"][0]["window_name"] == "home"
+    assert loader.expand_file(path)["windows"][0]["window_name"] == "edited"
+
+
+def test_expand_file_relative_to_current_directory(
+    cache_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A workspace expanded against the current directory follows it."""
+    path = tmp_path / "workspace.yaml"
+    path.write_text(
+        "session_name: relative\n"
+        "windows:\n"
+        "- window_name: main\n"
+        "  environment:\n"
+        "    DATA: ./data\n",
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(tmp_path)
+    first = loader.expand_file("workspace.yaml")
+    assert first["windows"][0]["environment"]["DATA"] == str(tmp_path / "data")
+
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    path.rename(elsewhere / "workspace.yaml")
+    monkeypatch.chdir(elsewhere)
+    second = loader.expand_file("workspace.yaml")
+    assert second["windows"][0]["environment"]["DATA"] == str(elsewhere / "data")
+
+
+def test_expand_file_cache_turned_off(
+    cache_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """``TMUXP_CONFIG_CACHE=0`` expands every load and caches nothing."""
+    monkeypatch.setenv("TMUXP_CONFIG_CACHE", "0")
+    path = _workspace(tmp_path)
+    assert loader.expand_file(path) == _uncached(path, str(tmp_path))
+    assert not cache_dir.exists()
+
+
+@pytest.mark.parametrize(
+    "example",
+    sorted(EXAMPLE_PATH.glob("*.yaml")) + sorted(EXAMPLE_PATH.glob("*.json")),
+    ids=lambda path: path.name,
+)
+def test_expand_file_matches_uncached(
+    cache_dir: pathlib.Path,
+    example: pathlib.Path,
+) -> None:
+    """Every example loads the same from the cache as without it."""
+    expected = _uncached(example, str(example.parent))
+    assert loader.expand_file(example) == expected
+    assert loader.expand_file(example) == expected
@@ -0,0 +1,212 @@
+"""Tests for the typed workspace model."""
+
+from __future__ import annotations
+
+import collections
+import typing as t
+
+import pytest
+
+from tests.constants import EXAMPLE_PATH
+from tmuxp._internal.config_reader import ConfigReader
+from tmuxp.workspace import loader
+from tmuxp.workspace.builder import WorkspaceBuilder
+from tmuxp.workspace.builder.plan import compile_workspace
+from tmuxp.workspace.model import Command, Pane, Session, Window
+
+if t.TYPE_CHECKING:
+    import pathlib
+
+    from libtmux.server import Server
+
+
+class PaneFixture(t.NamedTuple):
+    """Test fixture for what a pane inherits from its window."""
+
+    test_id: str
+    pane_config: dict[str, t.Any]
+    window_config: dict[str, t.Any]
+    expected: dict[str, t.Any]
+
+
+PANE_FIXTURES: list[PaneFixture] = [
+    PaneFixture(
+        test_id="own-settings",
+        pane_config={
+            "shell": "htop",
+            "start_directory": "/tmp",
+            "environment": {"PANE": "1"},
+            "focus": True,
+            "shell_command": [],
+        },
+        window_config={
+            "window_shell": "top",
+            "start_directory": "/srv",
+            "environment": {"WINDOW": "1"},
+        },
+        expected={
+            "shell": "htop",
+            "start_directory": "/tmp",
+            "environment": {"PANE": "1"},
+            "focus": True,
+        },
+    ),
+    PaneFixture(
+        test_id="window-settings",
+        pane_config={"shell_command": []},
+        window_config={
+            "window_shell": "top",
+            "start_directory": "/srv",
+            "environment": {"WINDOW": "1"},
+        },
+        expected={
+            "shell": "top",
+            "start_directory": "/srv",
+            "environment": {"WINDOW": "1"},
+            "focus": False,
+        },
+    ),
+    PaneFixture(
+        test_id="explicit-none-shell",
+        pane_config={"shell": None, "shell_command": []},
+        window_config={"window_shell": "top"},
+        expected={"shell": None, "start_directory": None, "environment": None},
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    list(PaneFixture._fields),
+    PANE_FIXTURES,
+    ids=[f.test_id for f in PANE_FIXTURES],
+)
+def test_pane_inherits_from_window(
+    test_id: str,
+    pane_config: dict[str, t.Any],
+    window_config: dict[str, t.Any],
+    expected: dict[str, t.Any],
+) -> None:
+    """A pane's own settings win over its window's."""
+    pane = Pane.from_config(pane_config, window_config)
+    for field, value in expected.items():
+        assert getattr(pane, field) == value
+    assert pane.config is pane_config
+
+
+def test_commands_carry_settings_forward() -> None:
+    """``enter`` and the sleeps carry from command to command."""
+    pane = Pane.from_config(
+        {
+            "enter": False,
+            "sleep_before": 1,
+            "shell_command": [
+                {"cmd": "a"},
+                {"cmd": "b", "enter": True, "sleep_before": None},
+                {"cmd": "c", "sleep_after": 2},
+            ],
+        },
+        {"suppress_history": False},
+    )
+    assert pane.commands == (
+        Command("a", False, False, 1, None),
+        Command("b", False, True, None, None),
+        Command("c", False, True, None, 2),
+    )
+
+
+def test_model_is_frozen_and_slotted() -> None:
+    """Models cannot be changed and carry no per-instance ``__dict__``."""
+    window = Window.from_config({"panes": [{"shell_command": [{"cmd": "ls"}]}]})
+    pane = window.panes[0]
+    for instance in (window, pane, pane.commands[0]):
+        assert not hasattr(instance, "__dict__")
+    with pytest.raises(AttributeError):
+        pane.shell = "top"  # type: ignore[misc]
+
+
+@pytest.mark.parametrize(
+    "example",
+    sorted(EXAMPLE_PATH.glob("*.yaml")),
+    ids=lambda path: path.name,
+)
+def test_session_model_keeps_config(example: pathlib.Path) -> None:
+    """Every window and pane of an example keeps its dict as ``config``."""
+    workspace = loader.normalize(
+        ConfigReader._from_file(example),
+        cwd=str(example.parent),
+    )
+    session = Session.from_config(workspace)
+
+    assert session.config is workspace
+    assert len(session.windows) == len(workspace["windows"])
+    for window, window_config in zip(
+        session.windows,
+        workspace["windows"],
+        strict=True,
+    ):
+        assert window.config is window_config
+        assert [pane.config for pane in window.panes] == window_config["panes"]
+        for pane in window.panes:
+            assert [command.cmd for command in pane.commands] == [
+                command["cmd"] for command in pane.config["shell_command"]
+            ]
+
+
+def _count_models(monkeypatch: pytest.MonkeyPatch) -> collections.Counter[str]:
+    """Count the sessions and windows resolved into models from here on."""
+    counter: collections.Counter[str] = collections.Counter()
+    for model_type in (Session, Window):
+        original = vars(model_type)["from_config"].__func__
+
+        def counting(
+            cls: type[t.Any],
+            config: dict[str, t.Any],
+            original: t.Callable[..., t.Any] = original,
+        ) -> t.Any:
+            counter[cls.__name__] += 1
+            return original(cls, config)
+
+        monkeypatch.setattr(model_type, "from_config", classmethod(counting))
+    return counter
+
+
+def _two_windows(batch_commands: bool) -> dict[str, t.Any]:
+    """Return a normalized workspace of two windows of two panes each."""
+    return loader.normalize(
+        {
+            "session_name": f"model-once-{batch_commands}",
+            "workspace_builder_options": {
+                "batch_commands": batch_commands,
+                "pane_readiness": "never",
+            },
+            "windows": [
+                {"window_name": "one", "panes": ["echo a", "echo b"]},
+                {"window_name": "two", "panes": ["echo c", "echo d"]},
+            ],
+        },
+    )
+
+
+@pytest.mark.parametrize("batch_commands", [False, True], ids=["unbatched", "batched"])
+def test_builder_resolves_each_window_once(
+    server: Server,
+    monkeypatch: pytest.MonkeyPatch,
+    batch_commands: bool,
+) -> None:
+    """A build resolves the session model once, not again per window."""
+    counter = _count_models(monkeypatch)
+    builder = WorkspaceBuilder(
+        session_config=_two_windows(batch_commands),
+        server=server,
+    )
+    builder.build()
+
+    assert counter == {"Session": 1, "Window": 2}
+    assert [len(window.panes) for window in builder.session.windows] == [2, 2]
+
+
+def test_plan_resolves_each_window_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Planning resolves each window once, through the session model."""
+    counter = _count_models(monkeypatch)
+    compile_workspace(_two_windows(batch_commands=True))
+    assert counter == {"Session": 1, "Window": 2}
@@ -9,7 +9,9 @@ import pytest
 from tmuxp import exc
 from tmuxp.workspace.options import (
     PaneReadiness,
+    PaneReadinessStrategy,
     WorkspaceBuilderOptions,
+    parse_flag,
     resolve_session_shell,
     shell_is_zsh,
 )
@@ -76,6 +78,66 @@ def test_workspace_builder_options_invalid_pane_readiness() -> None:
         )
 
 
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, False),
+        (True, True),
+        ("on", True),
+        ("YES", True),
+        (1, True),
+        (False, False),
+        ("off", False),
+        ("0", False),
+    ],
+)
+def test_parse_flag(value: t.Any, expected: bool) -> None:
+    """parse_flag accepts the same truthy/falsy aliases as pane_readiness."""
+    assert parse_flag("batch_commands", value) is expected
+
+
+def test_workspace_builder_options_batch_commands() -> None:
+    """batch_commands defaults off and is read from the catalog."""
+    assert WorkspaceBuilderOptions.from_config({}).batch_commands is False
+    cfg = {"workspace_builder_options": {"batch_commands": "on"}}
+    assert WorkspaceBuilderOptions.from_config(cfg).batch_commands is True
+
+
+def test_workspace_builder_options_invalid_batch_commands() -> None:
+    """An invalid batch_commands is wrapped as a builder-option error."""
+    with pytest.raises(exc.InvalidWorkspaceBuilderOption, match="batch_commands"):
+        WorkspaceBuilderOptions.from_config(
+            {"workspace_builder_options": {"batch_commands": "sometimes"}},
+        )
+
+
+def test_workspace_builder_options_batch_send_keys() -> None:
+    """batch_send_keys defaults off and is read from the catalog."""
+    assert WorkspaceBuilderOptions.from_config({}).batch_send_keys is False
+    cfg = {"workspace_builder_options": {"batch_send_keys": "yes"}}
+    assert WorkspaceBuilderOptions.from_config(cfg).batch_send_keys is True
+
+
+def test_workspace_builder_options_pane_readiness_strategy() -> None:
+    """pane_readiness_strategy defaults to backoff and is read from the catalog."""
+    options = WorkspaceBuilderOptions.from_config({})
+    assert options.pane_readiness_strategy is PaneReadinessStrategy.BACKOFF
+    cfg = {"workspace_builder_options": {"pane_readiness_strategy": "POLL"}}
+    options = WorkspaceBuilderOptions.from_config(cfg)
+    assert options.pane_readiness_strategy is PaneReadinessStrategy.POLL
+
+
+def test_workspace_builder_options_invalid_pane_readiness_strategy() -> None:
+    """An invalid pane_readiness_strategy is wrapped as a builder-option error."""
+    with pytest.raises(
+        exc.InvalidWorkspaceBuilderOption,
+        match="pane_readiness_strategy",
+    ):
+        WorkspaceBuilderOptions.from_config(
+            {"workspace_builder_options": {"pane_readiness_strategy": "yes"}},
+        )
+
+
 @pytest.mark.parametrize(
     ("shell", "expected"),
     [
@@ -148,3 +210,58 @@ def test_resolve_session_shell_reads_inherited_default_shell() -> None:
         env={"SHELL": "/bin/bash"},
     )
     assert shell == "/usr/bin/zsh"
+
+
+def test_workspace_builder_options_parallel_windows() -> None:
+    """parallel_windows defaults to 1 and is read from the catalog."""
+    assert WorkspaceBuilderOptions.from_config({}).parallel_windows == 1
+    cfg = {"workspace_builder_options": {"parallel_windows": "6"}}
+    assert WorkspaceBuilderOptions.from_config(cfg).parallel_windows == 6
+
+
+@pytest.mark.parametrize("value", [0, -2, "many", False])
+def test_workspace_builder_options_invalid_parallel_windows(value: t.Any) -> None:
+    """A parallel_windows that is not a positive integer is rejected."""
+    with pytest.raises(exc.InvalidWorkspaceBuilderOption, match="parallel_windows"):
+        WorkspaceBuilderOptions.from_config(
+            {"workspace_builder_options": {"parallel_windows": value}},
+        )
+
+
+def test_workspace_builder_options_shell_pool() -> None:
+    """shell_pool defaults to 0 (off) and needs batch_commands."""
+    assert WorkspaceBuilderOptions.from_config({}).shell_pool == 0
+    cfg = {"workspace_builder_options": {"shell_pool": "4", "batch_commands": True}}
+    assert WorkspaceBuilderOptions.from_config(cfg).shell_pool == 4
+    cfg = {"workspace_builder_options": {"shell_pool": 0}}
+    assert WorkspaceBuilderOptions.from_config(cfg).shell_pool == 0
+
+
+@pytest.mark.parametrize(
+    "catalog",
+    [
+        {"shell_pool": -1, "batch_commands": True},
+        {"shell_pool": "many", "batch_commands": True},
+        {"shell_pool": 4},
+    ],
+)
+def test_workspace_builder_options_invalid_shell_pool(
+    catalog: dict[str, t.Any],
+) -> None:
+    """A negative shell_pool, or one without batch_commands, is rejected."""
+    with pytest.raises(exc.InvalidWorkspaceBuilderOption, match="shell_pool"):
+        WorkspaceBuilderOptions.from_config({"workspace_builder_options": catalog})
+
+
+def test_workspace_builder_options_background_before_script() -> None:
+    """background_before_script defaults to off and takes flag aliases."""
+    assert not WorkspaceBuilderOptions.from_config({}).background_before_script
+    cfg = {"workspace_builder_options": {"background_before_script": "yes"}}
+    assert WorkspaceBuilderOptions.from_config(cfg).background_before_script
+    with pytest.raises(
+        exc.InvalidWorkspaceBuilderOption,
+        match="background_before_script",
+    ):
+        WorkspaceBuilderOptions.from_config(
+            {"workspace_builder_options": {"background_before_script": "maybe"}},
+        )
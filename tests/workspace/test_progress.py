@@ -256,3 +256,53 @@ def test_builder_on_build_event_pane_numbers(
     assert len(pane_events) == 3
     assert [e["pane_num"] for e in pane_events] == [1, 2, 3]
     assert all(e["pane_total"] == 3 for e in pane_events)
+
+
+def test_builder_on_build_event_timings(
+    server: Server,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Build events carry monotonic times; phase-closing events their duration."""
+    monkeypatch.delenv("TMUX", raising=False)
+
+    session_config = {
+        "session_name": "timing-test",
+        "before_script": "echo hello",
+        "windows": [
+            {
+                "window_name": "editor",
+                "panes": [
+                    {"shell_command": [{"cmd": "echo one"}]},
+                    {"shell_command": []},
+                ],
+            },
+        ],
+    }
+    events: list[dict[str, t.Any]] = []
+    builder = WorkspaceBuilder(
+        session_config=session_config,
+        server=server,
+        on_build_event=events.append,
+    )
+    builder.build()
+
+    times = [e["time"] for e in events]
+    assert times == sorted(times)
+
+    timed = {e["event"]: e for e in events if "duration" in e}
+    assert {
+        "session_created",
+        "before_script_done",
+        "panes_created",
+        "commands_sent",
+        "window_done",
+        "workspace_built",
+    } <= set(timed)
+    assert all(e["duration"] >= 0 for e in timed.values())
+    assert timed["panes_created"]["window"] == "editor"
+    assert timed["panes_created"]["pane_total"] == 2
+    assert timed["window_done"]["window"] == "editor"
+
+    built = timed["workspace_built"]
+    assert built["duration"] >= timed["window_done"]["duration"]
+    assert built["time"] - built["duration"] <= events[0]["time"]